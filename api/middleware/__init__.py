@@ -26,8 +26,10 @@ from .logging_middleware import (
 )
 
 from .caching import (
-    CacheEntry, LRUCache, api_cache, generate_cache_key, cache_response,
-    cache_by_user, cache_by_parameters, invalidate_cache,
+    CacheEntry, CacheBackend, LRUCache, SQLiteCache, TieredCache, get_api_cache,
+    set_cache_backend, create_cache_backend, user_tag, bridge_domain_tag, config_tag,
+    generate_cache_key, cache_response,
+    cache_by_user, cache_by_parameters, invalidate_cache, invalidate_tags,
     cache_stats, clear_cache, configure_caching,
     cache_dashboard_data, cache_configuration_data, cache_topology_data,
     invalidate_user_cache
@@ -36,7 +38,8 @@ from .caching import (
 from .monitoring import (
     MetricsCollector, metrics_collector, monitor_request, monitor_performance,
     health_check, detailed_health_check, get_metrics, clear_metrics,
-    configure_monitoring, monitor_endpoint, monitor_user_activity, performance_alert
+    configure_monitoring, instrument_app, prometheus_metrics,
+    monitor_endpoint, monitor_user_activity, performance_alert
 )
 
 __all__ = [
@@ -61,8 +64,10 @@ __all__ = [
     'log_auth_operation', 'log_admin_operation', 'log_deployment_operation', 'log_configuration_change',
     
     # Caching middleware
-    'CacheEntry', 'LRUCache', 'api_cache', 'generate_cache_key', 'cache_response',
-    'cache_by_user', 'cache_by_parameters', 'invalidate_cache',
+    'CacheEntry', 'CacheBackend', 'LRUCache', 'SQLiteCache', 'TieredCache', 'get_api_cache',
+    'set_cache_backend', 'create_cache_backend', 'user_tag', 'bridge_domain_tag', 'config_tag',
+    'generate_cache_key', 'cache_response',
+    'cache_by_user', 'cache_by_parameters', 'invalidate_cache', 'invalidate_tags',
     'cache_stats', 'clear_cache', 'configure_caching',
     'cache_dashboard_data', 'cache_configuration_data', 'cache_topology_data',
     'invalidate_user_cache',
@@ -70,5 +75,6 @@ __all__ = [
     # Monitoring middleware
     'MetricsCollector', 'metrics_collector', 'monitor_request', 'monitor_performance',
     'health_check', 'detailed_health_check', 'get_metrics', 'clear_metrics',
-    'configure_monitoring', 'monitor_endpoint', 'monitor_user_activity', 'performance_alert'
+    'configure_monitoring', 'instrument_app', 'prometheus_metrics',
+    'monitor_endpoint', 'monitor_user_activity', 'performance_alert'
 ]
@@ -2,12 +2,24 @@
 """
 Caching Middleware
 Provides response caching for improved API performance
+
+Backends:
+    LRUCache     - in-process LRU (default)
+    SQLiteCache  - local SQLite file shared by all workers on the host
+    TieredCache  - LRUCache in front of SQLiteCache; invalidations are
+                   propagated to every worker's in-process tier
+
+Entries carry tags (see user_tag, bridge_domain_tag, config_tag), so
+invalidation only touches the entries with those tags.
 """
 
 from functools import wraps
 from flask import request, jsonify, current_app, g
 import hashlib
 import json
+import os
+import pickle
+import sqlite3
 import time
 import threading
 from collections import OrderedDict
@@ -15,12 +27,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SHARED_CACHE_PATH = "instance/api_cache.db"
+# Request headers that take part in the default cache key; others (cookies,
+# user agent, tracing ids, ...) do not change the response
+DEFAULT_KEY_HEADERS = ('Authorization', 'Accept')
+
 
 class CacheEntry:
     """Cache entry with expiration and metadata"""
     
-    def __init__(self, data, ttl_seconds=300):
+    def __init__(self, data, ttl_seconds=300, tags=()):
         self.data = data
+        self.tags = frozenset(tags)
         self.created_at = time.time()
         self.ttl_seconds = ttl_seconds
         self.access_count = 0
@@ -38,57 +56,137 @@ class CacheEntry:
     def get_age(self):
         """Get age of cache entry in seconds"""
         return time.time() - self.created_at
+    
+    def remaining_ttl(self):
+        """Seconds until the entry expires"""
+        return self.ttl_seconds - self.get_age()
+
+
+def user_tag(user_id):
+    return f"user:{user_id}"
+
+
+def bridge_domain_tag(bd_name):
+    return f"bd:{bd_name}"
 
 
-class LRUCache:
+def config_tag(config_id):
+    return f"config:{config_id}"
+
+
+class CacheBackend:
+    """Interface implemented by the cache backends"""
+    
+    def get(self, key):
+        raise NotImplementedError
+    
+    def set(self, key, value, ttl_seconds=300, tags=()):
+        raise NotImplementedError
+    
+    def delete(self, key):
+        raise NotImplementedError
+    
+    def invalidate_tags(self, tags):
+        """Delete every entry carrying any of the tags; returns the number deleted"""
+        raise NotImplementedError
+    
+    def invalidate_pattern(self, pattern):
+        """Delete every entry whose key contains pattern (full scan; prefer tags)"""
+        raise NotImplementedError
+    
+    def clear(self):
+        raise NotImplementedError
+    
+    def get_stats(self):
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
     """Least Recently Used cache implementation"""
     
     def __init__(self, max_size=1000):
         self.max_size = max_size
         self.cache = OrderedDict()
+        self.tags = {}  # tag -> set of keys
         self.lock = threading.RLock()
     
     def get(self, key):
         """Get value from cache"""
+        entry = self.get_entry(key)
+        return entry.data if entry is not None else None
+    
+    def get_entry(self, key):
+        """Get the live CacheEntry for key, or None"""
         with self.lock:
             if key in self.cache:
                 entry = self.cache[key]
                 if entry.is_expired():
                     # Remove expired entry
-                    del self.cache[key]
+                    self._remove(key)
                     return None
                 
                 # Mark as accessed and move to end (most recently used)
                 entry.access()
                 self.cache.move_to_end(key)
-                return entry.data
+                return entry
             
             return None
     
-    def set(self, key, value, ttl_seconds=300):
+    def set(self, key, value, ttl_seconds=300, tags=()):
         """Set value in cache"""
         with self.lock:
             # Remove if key already exists
-            if key in self.cache:
-                del self.cache[key]
+            self._remove(key)
             
             # Add new entry
-            self.cache[key] = CacheEntry(value, ttl_seconds)
+            entry = CacheEntry(value, ttl_seconds, tags)
+            self.cache[key] = entry
+            for tag in entry.tags:
+                self.tags.setdefault(tag, set()).add(key)
             
             # Remove oldest entries if cache is full
             while len(self.cache) > self.max_size:
-                self.cache.popitem(last=False)
+                self._remove(next(iter(self.cache)))
     
     def delete(self, key):
         """Delete key from cache"""
         with self.lock:
-            if key in self.cache:
-                del self.cache[key]
+            self._remove(key)
+    
+    def invalidate_tags(self, tags):
+        """Delete every entry carrying any of the tags"""
+        with self.lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self.tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+    
+    def invalidate_pattern(self, pattern):
+        """Delete every entry whose key contains pattern"""
+        with self.lock:
+            keys = [key for key in self.cache if pattern in key]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
     
     def clear(self):
         """Clear all cache entries"""
         with self.lock:
             self.cache.clear()
+            self.tags.clear()
+    
+    def _remove(self, key):
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
     
     def get_stats(self):
         """Get cache statistics"""
@@ -98,27 +196,360 @@ class LRUCache:
             active_entries = total_entries - expired_entries
             
             return {
+                'backend': 'memory',
                 'total_entries': total_entries,
                 'active_entries': active_entries,
                 'expired_entries': expired_entries,
+                'tags': len(self.tags),
                 'max_size': self.max_size,
                 'utilization_percent': (total_entries / self.max_size) * 100
             }
 
 
-# Global cache instance
+class SQLiteCache(CacheBackend):
+    """
+    Cache stored in a local SQLite file, shared by every worker process on the host.
+    
+    Values are pickled. Tag membership is kept in its own indexed table, so
+    invalidating a tag deletes only the entries carrying it. Every invalidation
+    is also appended to an invalidation log that TieredCache uses to keep the
+    per-worker in-process tiers consistent.
+    """
+    
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at)",
+        """CREATE TABLE IF NOT EXISTS cache_tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tag, key)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(key)",
+        """CREATE TABLE IF NOT EXISTS cache_invalidations (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tag TEXT,
+            pattern TEXT,
+            created_at REAL NOT NULL
+        )""",
+    ]
+    
+    # Invalidation log entries older than this are pruned
+    INVALIDATION_LOG_RETENTION = 3600
+    
+    def __init__(self, db_path=DEFAULT_SHARED_CACHE_PATH, max_size=10000, timeout=5.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+    
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def get(self, key):
+        """Get value from cache; a database error is a miss"""
+        try:
+            entry = self.get_entry(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read failed: {e}")
+            return None
+        return entry[0] if entry is not None else None
+    
+    def get_entry(self, key):
+        """Get (value, remaining ttl, tags) for a live key, or None"""
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ? AND expires_at > ?",
+            (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        tags = [tag for (tag,) in conn.execute("SELECT tag FROM cache_tags WHERE key = ?", (key,))]
+        try:
+            return pickle.loads(row[0]), row[1] - now, tags
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return None
+    
+    def set(self, key, value, ttl_seconds=300, tags=()):
+        """Set value in cache"""
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Value for cache key {key} is not picklable, not cached: {e}")
+            return
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO cache_entries (key, value, created_at, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "created_at = excluded.created_at, expires_at = excluded.expires_at",
+                (key, blob, now, now + ttl_seconds)
+            )
+            conn.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                             [(tag, key) for tag in set(tags)])
+        
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._evict()
+    
+    def delete(self, key):
+        """Delete key from cache"""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+    
+    def invalidate_tags(self, tags):
+        """Delete every entry carrying any of the tags"""
+        tags = list(set(tags))
+        if not tags:
+            return 0
+        placeholders = ', '.join('?' for _ in tags)
+        conn = self._connection()
+        with conn:
+            keys = [key for (key,) in conn.execute(
+                f"SELECT DISTINCT key FROM cache_tags WHERE tag IN ({placeholders})", tags)]
+            self._delete_keys(conn, keys)
+            conn.executemany("INSERT INTO cache_invalidations (tag, created_at) VALUES (?, ?)",
+                             [(tag, time.time()) for tag in tags])
+        return len(keys)
+    
+    def invalidate_pattern(self, pattern):
+        """Delete every entry whose key contains pattern"""
+        conn = self._connection()
+        with conn:
+            keys = [key for (key,) in conn.execute(
+                "SELECT key FROM cache_entries WHERE instr(key, ?) > 0", (pattern,))]
+            self._delete_keys(conn, keys)
+            conn.execute("INSERT INTO cache_invalidations (pattern, created_at) VALUES (?, ?)",
+                         (pattern, time.time()))
+        return len(keys)
+    
+    def clear(self):
+        """Clear all cache entries"""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM cache_entries")
+            conn.execute("DELETE FROM cache_tags")
+            # An empty pattern matches every key
+            conn.execute("INSERT INTO cache_invalidations (pattern, created_at) VALUES ('', ?)",
+                         (time.time(),))
+    
+    def invalidations_since(self, seq):
+        """(last seq, [(tag, pattern), ...]) of the invalidations logged after seq"""
+        rows = self._connection().execute(
+            "SELECT seq, tag, pattern FROM cache_invalidations WHERE seq > ? ORDER BY seq", (seq,)
+        ).fetchall()
+        if not rows:
+            return seq, []
+        return rows[-1][0], [(tag, pattern) for _, tag, pattern in rows]
+    
+    def last_invalidation(self):
+        row = self._connection().execute("SELECT MAX(seq) FROM cache_invalidations").fetchone()
+        return row[0] or 0
+    
+    @staticmethod
+    def _delete_keys(conn, keys):
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+        conn.executemany("DELETE FROM cache_tags WHERE key = ?", [(key,) for key in keys])
+    
+    def _evict(self):
+        """Drop expired entries, the oldest entries beyond max_size and old invalidation log rows"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            expired = [key for (key,) in conn.execute(
+                "SELECT key FROM cache_entries WHERE expires_at <= ?", (now,))]
+            self._delete_keys(conn, expired)
+            excess = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_size
+            if excess > 0:
+                oldest = [key for (key,) in conn.execute(
+                    "SELECT key FROM cache_entries ORDER BY created_at LIMIT ?", (excess,))]
+                self._delete_keys(conn, oldest)
+            conn.execute("DELETE FROM cache_invalidations WHERE created_at < ?",
+                         (now - self.INVALIDATION_LOG_RETENTION,))
+    
+    def get_stats(self):
+        """Get cache statistics"""
+        now = time.time()
+        total_entries, expired_entries = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0) FROM cache_entries", (now,)
+        ).fetchone()
+        tags = self._connection().execute("SELECT COUNT(DISTINCT tag) FROM cache_tags").fetchone()[0]
+        return {
+            'backend': 'sqlite',
+            'path': self.db_path,
+            'total_entries': total_entries,
+            'active_entries': total_entries - expired_entries,
+            'expired_entries': expired_entries,
+            'tags': tags,
+            'max_size': self.max_size,
+            'utilization_percent': (total_entries / self.max_size) * 100
+        }
+
+
+class TieredCache(CacheBackend):
+    """
+    In-process LRUCache in front of a shared SQLiteCache.
+    
+    Reads try the local tier first and fall back to the shared tier (copying
+    the entry locally); writes and invalidations go to both. Before serving a
+    local hit, invalidations logged by other workers (checked at most every
+    sync_interval seconds) are applied to the local tier.
+    """
+    
+    def __init__(self, local=None, shared=None, sync_interval=0.5):
+        self.local = local or LRUCache(max_size=1000)
+        self.shared = shared or SQLiteCache()
+        self.sync_interval = sync_interval
+        self._seq = self.shared.last_invalidation()
+        self._last_sync = time.time()
+        self._sync_lock = threading.Lock()
+    
+    def _sync(self):
+        now = time.time()
+        if now - self._last_sync < self.sync_interval:
+            return
+        with self._sync_lock:
+            if now - self._last_sync < self.sync_interval:
+                return
+            try:
+                self._seq, invalidations = self.shared.invalidations_since(self._seq)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read cache invalidations: {e}")
+                return
+            self._last_sync = now
+        tags = [tag for tag, _ in invalidations if tag is not None]
+        if tags:
+            self.local.invalidate_tags(tags)
+        for _, pattern in invalidations:
+            if pattern is not None:
+                self.local.invalidate_pattern(pattern)
+    
+    def get(self, key):
+        """Get value from cache"""
+        self._sync()
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        try:
+            entry = self.shared.get_entry(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            return None
+        if entry is None:
+            return None
+        value, remaining_ttl, tags = entry
+        self.local.set(key, value, remaining_ttl, tags)
+        return value
+    
+    def set(self, key, value, ttl_seconds=300, tags=()):
+        """Set value in cache"""
+        self.local.set(key, value, ttl_seconds, tags)
+        try:
+            self.shared.set(key, value, ttl_seconds, tags)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed: {e}")
+    
+    def delete(self, key):
+        """Delete key from cache"""
+        self.local.delete(key)
+        self.shared.delete(key)
+    
+    def invalidate_tags(self, tags):
+        """Delete every entry carrying any of the tags, in this and every other worker"""
+        tags = list(tags)
+        self.local.invalidate_tags(tags)
+        return self.shared.invalidate_tags(tags)
+    
+    def invalidate_pattern(self, pattern):
+        """Delete every entry whose key contains pattern, in this and every other worker"""
+        self.local.invalidate_pattern(pattern)
+        return self.shared.invalidate_pattern(pattern)
+    
+    def clear(self):
+        """Clear all cache entries"""
+        self.local.clear()
+        self.shared.clear()
+    
+    def get_stats(self):
+        """Get cache statistics"""
+        return {
+            'backend': 'tiered',
+            'local': self.local.get_stats(),
+            'shared': self.shared.get_stats()
+        }
+
+
+# Global cache instance (replace with set_cache_backend / configure_caching)
 api_cache = LRUCache(max_size=1000)
+cache_key_headers = DEFAULT_KEY_HEADERS
+
 
+def set_cache_backend(backend):
+    """Replace the cache backend used by the caching decorators"""
+    global api_cache
+    api_cache = backend
+    logger.info(f"Cache backend set to {type(backend).__name__}")
+    return backend
 
-def generate_cache_key(*args, **kwargs):
-    """Generate cache key from function arguments and request data"""
+
+def get_api_cache():
+    """The cache backend currently used by the caching decorators"""
+    return api_cache
+
+
+def create_cache_backend(backend='memory', max_size=1000, shared_path=DEFAULT_SHARED_CACHE_PATH,
+                         shared_max_size=10000):
+    """Build a backend by name: 'memory', 'sqlite' or 'tiered'"""
+    if backend == 'memory':
+        return LRUCache(max_size=max_size)
+    if backend == 'sqlite':
+        return SQLiteCache(shared_path, max_size=shared_max_size)
+    if backend == 'tiered':
+        return TieredCache(LRUCache(max_size=max_size), SQLiteCache(shared_path, max_size=shared_max_size))
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def generate_cache_key(*args, key_headers=None, **kwargs):
+    """
+    Generate cache key from function arguments and request data
+    
+    Only the headers in key_headers (default: cache_key_headers) are part of
+    the key, so requests differing in unrelated headers share an entry.
+    """
+    headers = cache_key_headers if key_headers is None else key_headers
     # Include request path and method
     key_parts = [
         request.method,
         request.path,
-        str(sorted(request.args.items())),
-        str(sorted(request.headers.items())),
-        str(args),
+        str(sorted(request.args.items(multi=True))),
+        str([(name.lower(), request.headers.get(name, '')) for name in sorted(headers, key=str.lower)]),
+        str([_key_arg(arg) for arg in args]),
         str(sorted(kwargs.items()))
     ]
     
@@ -127,7 +558,37 @@ def generate_cache_key(*args, **kwargs):
     return hashlib.md5(key_string.encode()).hexdigest()
 
 
-def cache_response(ttl_seconds=300, key_func=None, condition_func=None):
+def _key_arg(arg):
+    """Key form of a view argument; user objects are keyed by id, not by their repr"""
+    if hasattr(arg, 'id') and hasattr(arg, 'username'):
+        return f"user:{arg.id}"
+    return repr(arg)
+
+
+def _freeze_response(response):
+    """Turn a view's return value into a picklable value (Response objects become their parts)"""
+    if isinstance(response, current_app.response_class) and not response.is_streamed:
+        return ('__response__', response.get_data(), response.status_code, list(response.headers.items()))
+    return response
+
+
+def _thaw_response(value):
+    """Rebuild a fresh Response from a frozen value"""
+    if isinstance(value, tuple) and len(value) == 4 and value[0] == '__response__':
+        _, body, status_code, headers = value
+        return current_app.response_class(body, status=status_code, headers=headers)
+    return value
+
+
+def _resolve_tags(tags, args, kwargs):
+    if tags is None:
+        return ()
+    if callable(tags):
+        return tuple(tags(*args, **kwargs) or ())
+    return tuple(tags)
+
+
+def cache_response(ttl_seconds=300, key_func=None, condition_func=None, tags=None, key_headers=None):
     """
     Cache API response decorator
     
@@ -135,6 +596,9 @@ def cache_response(ttl_seconds=300, key_func=None, condition_func=None):
         ttl_seconds: Time to live for cache entry in seconds
         key_func: Custom function to generate cache key
         condition_func: Function to determine if response should be cached
+        tags: Tags for the entry, or a function of the view arguments returning
+            them (e.g. lambda current_user, bd_name: [bridge_domain_tag(bd_name)])
+        key_headers: Request headers included in the default cache key
     """
     def decorator(f):
         @wraps(f)
@@ -143,13 +607,15 @@ def cache_response(ttl_seconds=300, key_func=None, condition_func=None):
             if key_func:
                 cache_key = key_func(*args, **kwargs)
             else:
-                cache_key = generate_cache_key(*args, **kwargs)
+                cache_key = generate_cache_key(*args, key_headers=key_headers, **kwargs)
             
             # Check if response is in cache
             cached_response = api_cache.get(cache_key)
             if cached_response is not None:
                 logger.debug(f"Cache hit for key: {cache_key}")
-                return cached_response
+                if isinstance(cached_response, tuple) and len(cached_response) == 2:
+                    return _thaw_response(cached_response[0]), cached_response[1]
+                return _thaw_response(cached_response)
             
             # Execute function and cache response
             response = f(*args, **kwargs)
@@ -158,15 +624,17 @@ def cache_response(ttl_seconds=300, key_func=None, condition_func=None):
             if condition_func and not condition_func(response):
                 return response
             
+            entry_tags = _resolve_tags(tags, args, kwargs)
+            
             # Cache successful responses (status code < 400)
             if isinstance(response, tuple):
                 response_obj, status_code = response
                 if status_code < 400:
-                    api_cache.set(cache_key, (response_obj, status_code), ttl_seconds)
+                    api_cache.set(cache_key, (_freeze_response(response_obj), status_code), ttl_seconds, entry_tags)
                     logger.debug(f"Cached response for key: {cache_key}, TTL: {ttl_seconds}s")
             else:
                 # Single response object
-                api_cache.set(cache_key, response, ttl_seconds)
+                api_cache.set(cache_key, _freeze_response(response), ttl_seconds, entry_tags)
                 logger.debug(f"Cached response for key: {cache_key}, TTL: {ttl_seconds}s")
             
             return response
@@ -175,8 +643,8 @@ def cache_response(ttl_seconds=300, key_func=None, condition_func=None):
     return decorator
 
 
-def cache_by_user(ttl_seconds=300):
-    """Cache response by user ID"""
+def cache_by_user(ttl_seconds=300, tags=None):
+    """Cache response by user ID (entries are tagged with user_tag(user_id))"""
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -185,12 +653,17 @@ def cache_by_user(ttl_seconds=300):
             if args and hasattr(args[0], 'id'):
                 user_id = args[0].id
             
-            # Generate user-specific cache key
+            # Generate user-specific cache key; the user id already separates
+            # users, so the Authorization header is left out of the key
             def user_cache_key(*args, **kwargs):
-                base_key = generate_cache_key(*args, **kwargs)
+                headers = [name for name in cache_key_headers if name.lower() != 'authorization']
+                base_key = generate_cache_key(*args, key_headers=headers, **kwargs)
                 return f"user_{user_id}_{base_key}"
             
-            return cache_response(ttl_seconds, user_cache_key)(f)(*args, **kwargs)
+            def user_tags(*args, **kwargs):
+                return (user_tag(user_id),) + _resolve_tags(tags, args, kwargs)
+            
+            return cache_response(ttl_seconds, user_cache_key, tags=user_tags)(f)(*args, **kwargs)
         
         return decorated_function
     return decorator
@@ -220,13 +693,21 @@ def cache_by_parameters(ttl_seconds=300, param_names=None):
     return decorator
 
 
-def invalidate_cache(pattern=None, key_func=None):
+def invalidate_tags(*tags):
+    """Delete every cache entry carrying any of the tags; returns the number deleted"""
+    count = api_cache.invalidate_tags(tags)
+    logger.info(f"Invalidated {count} cache entries tagged {', '.join(tags)}")
+    return count
+
+
+def invalidate_cache(pattern=None, key_func=None, tags=None):
     """
     Invalidate cache entries
     
     Args:
-        pattern: Pattern to match cache keys for invalidation
+        pattern: Pattern to match cache keys for invalidation (scans every key; prefer tags)
         key_func: Function to generate cache key for invalidation
+        tags: Tags to invalidate, or a function of the view arguments returning them
     """
     def decorator(f):
         @wraps(f)
@@ -235,17 +716,13 @@ def invalidate_cache(pattern=None, key_func=None):
             response = f(*args, **kwargs)
             
             # Invalidate cache
-            if pattern:
+            if tags:
+                invalidate_tags(*_resolve_tags(tags, args, kwargs))
+            
+            elif pattern:
                 # Invalidate by pattern (e.g., all user-related cache)
-                keys_to_delete = []
-                for key in list(api_cache.cache.keys()):
-                    if pattern in key:
-                        keys_to_delete.append(key)
-                
-                for key in keys_to_delete:
-                    api_cache.delete(key)
-                
-                logger.info(f"Invalidated {len(keys_to_delete)} cache entries matching pattern: {pattern}")
+                count = api_cache.invalidate_pattern(pattern)
+                logger.info(f"Invalidated {count} cache entries matching pattern: {pattern}")
             
             elif key_func:
                 # Invalidate specific cache key
@@ -271,7 +748,25 @@ def clear_cache():
 
 
 def configure_caching(app):
-    """Configure caching for the Flask app"""
+    """
+    Configure caching for the Flask app
+    
+    Config keys:
+        CACHE_BACKEND: 'memory' (default), 'sqlite' or 'tiered'
+        CACHE_MAX_SIZE: Entries in the in-process tier
+        CACHE_SHARED_PATH / CACHE_SHARED_MAX_SIZE: SQLite file and size of the shared tier
+        CACHE_KEY_HEADERS: Request headers included in cache keys
+    """
+    global cache_key_headers
+    
+    backend = app.config.get('CACHE_BACKEND', 'memory')
+    set_cache_backend(create_cache_backend(
+        backend,
+        max_size=app.config.get('CACHE_MAX_SIZE', 1000),
+        shared_path=app.config.get('CACHE_SHARED_PATH', DEFAULT_SHARED_CACHE_PATH),
+        shared_max_size=app.config.get('CACHE_SHARED_MAX_SIZE', 10000)
+    ))
+    cache_key_headers = tuple(app.config.get('CACHE_KEY_HEADERS', DEFAULT_KEY_HEADERS))
     
     # Add cache statistics endpoint
     @app.route('/api/cache/stats', methods=['GET'])
@@ -311,16 +806,7 @@ def invalidate_user_cache(user_id):
             response = f(*args, **kwargs)
             
             # Invalidate user-specific cache
-            pattern = f"user_{user_id}_"
-            keys_to_delete = []
-            for key in list(api_cache.cache.keys()):
-                if pattern in key:
-                    keys_to_delete.append(key)
-            
-            for key in keys_to_delete:
-                api_cache.delete(key)
-            
-            logger.info(f"Invalidated {len(keys_to_delete)} cache entries for user {user_id}")
+            invalidate_tags(user_tag(user_id))
             return response
         
         return decorated_function
@@ -8,10 +8,14 @@ from functools import wraps
 from flask import request, jsonify, current_app, g
 import time
 import threading
-from collections import defaultdict, deque
+from collections import deque
 from datetime import datetime, timedelta
 import logging
 
+from utils.request_metrics import (
+    RequestMetrics, LatencyHistogram, QUANTILES, PROMETHEUS_CONTENT_TYPE
+)
+
 # Try to import psutil, but make it optional
 try:
     import psutil
@@ -24,34 +28,18 @@ logger = logging.getLogger(__name__)
 
 
 class MetricsCollector:
-    """Collects and stores API metrics"""
+    """
+    Collects and stores API metrics
+    
+    Request counts and latencies are kept in fixed-memory, per-thread
+    histograms (utils.request_metrics.RequestMetrics) and merged when read.
+    """
     
     def __init__(self, max_history=1000):
+        # max_history is kept for compatibility; latency histograms have a fixed size
         self.max_history = max_history
         self.lock = threading.RLock()
-        
-        # Request metrics
-        self.request_counts = defaultdict(int)
-        self.response_times = defaultdict(list)
-        self.error_counts = defaultdict(int)
-        self.status_codes = defaultdict(int)
-        
-        # Endpoint metrics
-        self.endpoint_metrics = defaultdict(lambda: {
-            'total_requests': 0,
-            'total_errors': 0,
-            'avg_response_time': 0.0,
-            'min_response_time': float('inf'),
-            'max_response_time': 0.0,
-            'last_request': None
-        })
-        
-        # User metrics
-        self.user_metrics = defaultdict(lambda: {
-            'total_requests': 0,
-            'total_errors': 0,
-            'last_request': None
-        })
+        self.requests = RequestMetrics()
         
         # System metrics
         self.system_metrics = {
@@ -62,74 +50,40 @@ class MetricsCollector:
         }
     
     def record_request(self, endpoint, method, user_id=None, response_time=None, status_code=None, error=None):
-        """Record a request metric"""
-        with self.lock:
-            # Request counts
-            self.request_counts[f"{method} {endpoint}"] += 1
-            
-            # Response times
-            if response_time is not None:
-                self.response_times[f"{method} {endpoint}"].append(response_time)
-                # Keep only recent history
-                if len(self.response_times[f"{method} {endpoint}"]) > self.max_history:
-                    self.response_times[f"{method} {endpoint}"].pop(0)
-            
-            # Status codes
-            if status_code:
-                self.status_codes[status_code] += 1
-            
-            # Errors
-            if error or (status_code and status_code >= 400):
-                self.error_counts[f"{method} {endpoint}"] += 1
-            
-            # Endpoint metrics
-            endpoint_key = f"{method} {endpoint}"
-            if endpoint_key in self.endpoint_metrics:
-                self.endpoint_metrics[endpoint_key]['total_requests'] += 1
-                if response_time is not None:
-                    metrics = self.endpoint_metrics[endpoint_key]
-                    metrics['avg_response_time'] = (
-                        (metrics['avg_response_time'] * (metrics['total_requests'] - 1) + response_time) / 
-                        metrics['total_requests']
-                    )
-                    metrics['min_response_time'] = min(metrics['min_response_time'], response_time)
-                    metrics['max_response_time'] = max(metrics['max_response_time'], response_time)
-                metrics['last_request'] = datetime.utcnow()
-                
-                if error or (status_code and status_code >= 400):
-                    metrics['total_errors'] += 1
-            
-            # User metrics
-            if user_id:
-                self.user_metrics[user_id]['total_requests'] += 1
-                self.user_metrics[user_id]['last_request'] = datetime.utcnow()
-                
-                if error or (status_code and status_code >= 400):
-                    self.user_metrics[user_id]['total_errors'] += 1
+        """Record a request metric (lock-free; response_time in seconds)"""
+        self.requests.observe(method, endpoint, status_code, response_time, user_id=user_id, error=bool(error))
     
     def get_endpoint_metrics(self, endpoint=None, method=None):
         """Get metrics for specific endpoint or all endpoints"""
-        with self.lock:
-            if endpoint and method:
-                key = f"{method} {endpoint}"
-                return self.endpoint_metrics.get(key, {})
-            elif endpoint:
-                # Return metrics for all methods of an endpoint
-                result = {}
-                for key, metrics in self.endpoint_metrics.items():
-                    if key.endswith(f" {endpoint}"):
-                        result[key] = metrics
-                return result
-            else:
-                return dict(self.endpoint_metrics)
+        endpoint_metrics = self.requests.endpoint_summary()
+        if endpoint and method:
+            key = f"{method} {endpoint}"
+            return endpoint_metrics.get(key, {})
+        elif endpoint:
+            # Return metrics for all methods of an endpoint
+            result = {}
+            for key, metrics in endpoint_metrics.items():
+                if key.endswith(f" {endpoint}"):
+                    result[key] = metrics
+            return result
+        else:
+            return endpoint_metrics
     
     def get_user_metrics(self, user_id=None):
         """Get user metrics for specific user or all users"""
-        with self.lock:
-            if user_id:
-                return self.user_metrics.get(user_id, {})
-            else:
-                return dict(self.user_metrics)
+        _, _, users = self.requests.snapshot()
+        user_metrics = {
+            uid: {
+                'total_requests': requests,
+                'total_errors': errors,
+                'last_request': datetime.utcfromtimestamp(last) if last else None
+            }
+            for uid, (requests, errors, last) in users.items()
+        }
+        if user_id:
+            return user_metrics.get(user_id, {})
+        else:
+            return user_metrics
     
     def get_system_metrics(self):
         """Get current system metrics"""
@@ -167,38 +121,38 @@ class MetricsCollector:
     
     def get_summary_stats(self):
         """Get summary statistics"""
-        with self.lock:
-            total_requests = sum(self.request_counts.values())
-            total_errors = sum(self.error_counts.values())
-            
-            # Calculate average response time across all endpoints
-            all_response_times = []
-            for times in self.response_times.values():
-                all_response_times.extend(times)
-            
-            avg_response_time = sum(all_response_times) / len(all_response_times) if all_response_times else 0
-            
-            return {
-                'total_requests': total_requests,
-                'total_errors': total_errors,
-                'error_rate_percent': (total_errors / total_requests * 100) if total_requests > 0 else 0,
-                'avg_response_time_ms': round(avg_response_time * 1000, 2),
-                'unique_endpoints': len(self.endpoint_metrics),
-                'unique_users': len(self.user_metrics),
-                'psutil_available': PSUTIL_AVAILABLE,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+        series, _, users = self.requests.snapshot()
+        total_requests = sum(stats.requests for stats in series.values())
+        total_errors = sum(stats.errors for stats in series.values())
+        
+        # Overall latency across all endpoints
+        overall = LatencyHistogram()
+        for stats in series.values():
+            overall.merge(stats.latency)
+        
+        summary = {
+            'total_requests': total_requests,
+            'total_errors': total_errors,
+            'error_rate_percent': (total_errors / total_requests * 100) if total_requests > 0 else 0,
+            'avg_response_time_ms': round((overall.mean or 0) * 1000, 2),
+            'unique_endpoints': len({(method, endpoint) for method, endpoint, _ in series}),
+            'unique_users': len(users),
+            'psutil_available': PSUTIL_AVAILABLE,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        for q in QUANTILES:
+            value = overall.quantile(q)
+            summary[f"p{int(q * 100)}_response_time_ms"] = round(value * 1000, 2) if value is not None else 0
+        return summary
+    
+    def render_prometheus(self):
+        """Request metrics in Prometheus text format"""
+        return self.requests.render_prometheus()
     
     def clear_metrics(self):
         """Clear all metrics"""
-        with self.lock:
-            self.request_counts.clear()
-            self.response_times.clear()
-            self.error_counts.clear()
-            self.status_codes.clear()
-            self.endpoint_metrics.clear()
-            self.user_metrics.clear()
-            logger.info("All metrics cleared")
+        self.requests.clear()
+        logger.info("All metrics cleared")
 
 
 # Global metrics collector
@@ -209,7 +163,7 @@ def monitor_request(f):
     """Decorator to monitor API requests"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         user_id = None
         
         # Extract user ID if available
@@ -221,7 +175,7 @@ def monitor_request(f):
             response = f(*args, **kwargs)
             
             # Calculate response time
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             
             # Extract status code
             status_code = 200
@@ -241,7 +195,7 @@ def monitor_request(f):
             
         except Exception as e:
             # Calculate response time
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             
             # Record error metrics
             metrics_collector.record_request(
@@ -263,11 +217,11 @@ def monitor_performance(threshold_ms=1000):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             response = f(*args, **kwargs)
             
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             response_time_ms = response_time * 1000
             
             if response_time_ms > threshold_ms:
@@ -381,9 +335,49 @@ def clear_metrics():
         return jsonify({'error': str(e)}), 500
 
 
-def configure_monitoring(app):
+def prometheus_metrics():
+    """Request metrics in Prometheus text exposition format"""
+    return current_app.response_class(metrics_collector.render_prometheus(), mimetype=None,
+                                      content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def instrument_app(app, collector=None):
+    """
+    Record every request of the app (latency, status) in the metrics collector.
+    
+    Endpoints are labelled by view name, which keeps the series count bounded;
+    do not also wrap views with monitor_request, or they are counted twice.
+    """
+    collector = collector or metrics_collector
+    
+    @app.before_request
+    def _start_request_timer():
+        g.request_start_time = time.perf_counter()
+    
+    @app.after_request
+    def _record_request_metrics(response):
+        start = g.pop('request_start_time', None)
+        if start is not None:
+            collector.record_request(
+                endpoint=request.endpoint or 'unmatched',
+                method=request.method,
+                response_time=time.perf_counter() - start,
+                status_code=response.status_code
+            )
+        return response
+
+
+def configure_monitoring(app, instrument=True):
     """Configure monitoring for the Flask app"""
     
+    if instrument:
+        instrument_app(app)
+    
+    # Prometheus scrape endpoint
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_scrape():
+        return prometheus_metrics()
+    
     # Add health check endpoints
     @app.route('/api/health', methods=['GET'])
     def basic_health_check():
@@ -2,64 +2,204 @@
 """
 Rate Limiting Middleware
 Provides rate limiting functionality for API endpoints
+
+RateLimiter implements GCRA (generic cell rate algorithm): each key stores a
+single "theoretical arrival time", which allows bursts of max_requests and
+then one request per window_seconds / max_requests. Keys are spread over
+lock stripes, and keys whose bucket has refilled are dropped, so memory stays
+bounded. With a SQLiteRateLimitStore the state is shared between worker
+processes on the host.
 """
 
 from functools import wraps
 from flask import request, jsonify, current_app
+import os
+import sqlite3
 import time
 import threading
-from collections import defaultdict, deque
+from collections import OrderedDict, namedtuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_STRIPES = 64
+DEFAULT_MAX_KEYS = 100000
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'remaining', 'retry_after', 'reset_after'])
+
+
+def _gcra(tat, now, max_requests, window_seconds):
+    """
+    One GCRA step.
+    
+    Returns (result, new_tat); new_tat is None when the request is rejected
+    and the stored state must not change.
+    """
+    interval = window_seconds / max_requests
+    tat = max(tat or now, now)
+    new_tat = tat + interval
+    allow_at = new_tat - window_seconds
+    if now < allow_at:
+        remaining = 0
+        return RateLimitResult(False, remaining, allow_at - now, tat - now), None
+    # Small epsilon so float rounding does not lose a whole request
+    remaining = int((window_seconds - (new_tat - now)) / interval + 1e-3)
+    return RateLimitResult(True, max(remaining, 0), 0.0, new_tat - now), new_tat
+
+
+class SQLiteRateLimitStore:
+    """Rate limit state in a local SQLite file, shared by every worker process on the host"""
+    
+    def __init__(self, db_path="instance/rate_limits.db", timeout=5.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ops = 0
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("""CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            tat REAL NOT NULL
+        ) WITHOUT ROWID""")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits(tat)")
+    
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def acquire(self, key, max_requests, window_seconds):
+        """Run one GCRA step for key atomically across processes"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            result, new_tat = _gcra(row[0] if row else None, now, max_requests, window_seconds)
+            if new_tat is not None:
+                conn.execute("INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                             "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat", (key, new_tat))
+            self._ops += 1
+            if self._ops % 1000 == 0:
+                # Keys whose bucket has refilled carry no state
+                conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def peek(self, key):
+        row = self._connection().execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
 
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """
+    GCRA rate limiter: bursts of max_requests, then max_requests per window_seconds
+    
+    Args:
+        max_requests: Requests allowed per window
+        window_seconds: Window length in seconds
+        stripes: Number of independently locked key partitions
+        max_keys: Upper bound on tracked keys (least recently used are evicted first)
+        store: Optional SQLiteRateLimitStore; limits then hold across worker processes
+    """
     
-    def __init__(self, max_requests=100, window_seconds=60):
+    def __init__(self, max_requests=100, window_seconds=60, stripes=DEFAULT_STRIPES,
+                 max_keys=DEFAULT_MAX_KEYS, store=None, namespace='default'):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = defaultdict(deque)
-        self.lock = threading.Lock()
+        self.store = store
+        self.namespace = namespace
+        self.max_keys_per_stripe = max(1, max_keys // stripes)
+        self._stripes = [(threading.Lock(), OrderedDict()) for _ in range(stripes)]
+    
+    def _stripe(self, key):
+        return self._stripes[hash(key) % len(self._stripes)]
+    
+    def acquire(self, key):
+        """Count one request for key; returns a RateLimitResult"""
+        if self.store is not None:
+            try:
+                return self.store.acquire(f"{self.namespace}|{key}", self.max_requests, self.window_seconds)
+            except sqlite3.Error as e:
+                # Fall back to this process's own state rather than rejecting traffic
+                logger.warning(f"Shared rate limit store unavailable, using local state: {e}")
+        
+        lock, tats = self._stripe(key)
+        with lock:
+            # Process-local state uses the monotonic clock; the shared store uses wall time
+            now = time.monotonic()
+            result, new_tat = _gcra(tats.get(key), now, self.max_requests, self.window_seconds)
+            if new_tat is not None:
+                tats[key] = new_tat
+                tats.move_to_end(key)
+            self._evict(tats, now)
+            return result
     
     def is_allowed(self, key):
         """Check if request is allowed"""
-        now = time.time()
-        
-        with self.lock:
-            # Clean old requests
-            while self.requests[key] and self.requests[key][0] < now - self.window_seconds:
-                self.requests[key].popleft()
-            
-            # Check if under limit
-            if len(self.requests[key]) < self.max_requests:
-                self.requests[key].append(now)
-                return True, self.max_requests - len(self.requests[key])
-            
-            return False, 0
+        result = self.acquire(key)
+        return result.allowed, result.remaining
     
     def get_remaining(self, key):
         """Get remaining requests for a key"""
-        now = time.time()
-        
-        with self.lock:
-            # Clean old requests
-            while self.requests[key] and self.requests[key][0] < now - self.window_seconds:
-                self.requests[key].popleft()
-            
-            return self.max_requests - len(self.requests[key])
+        if self.store is not None:
+            now = time.time()
+            try:
+                tat = self.store.peek(f"{self.namespace}|{key}")
+            except sqlite3.Error:
+                tat = None
+        else:
+            now = time.monotonic()
+            lock, tats = self._stripe(key)
+            with lock:
+                tat = tats.get(key)
+        interval = self.window_seconds / self.max_requests
+        used = max((tat or now) - now, 0.0)
+        return max(int((self.window_seconds - used) / interval + 1e-3), 0)
+    
+    def tracked_keys(self):
+        return sum(len(tats) for _, tats in self._stripes)
+    
+    def _evict(self, tats, now):
+        """Drop refilled (idle) keys from the least recently used end, then enforce max_keys"""
+        while tats:
+            key, tat = next(iter(tats.items()))
+            if tat > now and len(tats) <= self.max_keys_per_stripe:
+                break
+            del tats[key]
 
 
 # Global rate limiters
 rate_limiters = {
-    'default': RateLimiter(max_requests=100, window_seconds=60),
-    'auth': RateLimiter(max_requests=10, window_seconds=60),  # Stricter for auth
-    'deployment': RateLimiter(max_requests=20, window_seconds=60),  # Moderate for deployments
-    'admin': RateLimiter(max_requests=50, window_seconds=60),  # Higher for admin operations
+    'default': RateLimiter(max_requests=100, window_seconds=60, namespace='default'),
+    'auth': RateLimiter(max_requests=10, window_seconds=60, namespace='auth'),  # Stricter for auth
+    'deployment': RateLimiter(max_requests=20, window_seconds=60, namespace='deployment'),  # Moderate for deployments
+    'admin': RateLimiter(max_requests=50, window_seconds=60, namespace='admin'),  # Higher for admin operations
 }
 
 
+def _rate_limit_exceeded(limiter, result):
+    """429 response for a rejected request"""
+    retry_after = max(1, int(result.retry_after + 0.999))
+    response = jsonify({
+        'error': 'Rate limit exceeded',
+        'message': f'Too many requests. Limit: {limiter.max_requests} per {limiter.window_seconds} seconds',
+        'retry_after': retry_after
+    })
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+
 def rate_limit(limiter_name='default', key_func=None):
     """
     Rate limiting decorator
@@ -82,15 +222,11 @@ def rate_limit(limiter_name='default', key_func=None):
                 key = request.remote_addr or 'unknown'
             
             # Check rate limit
-            allowed, remaining = limiter.is_allowed(key)
+            result = limiter.acquire(key)
             
-            if not allowed:
+            if not result.allowed:
                 logger.warning(f"Rate limit exceeded for {key} on {limiter_name}")
-                return jsonify({
-                    'error': 'Rate limit exceeded',
-                    'message': f'Too many requests. Limit: {limiter.max_requests} per {limiter.window_seconds} seconds',
-                    'retry_after': limiter.window_seconds
-                }), 429
+                return _rate_limit_exceeded(limiter, result)
             
             # Add rate limit headers
             response = f(*args, **kwargs)
@@ -98,8 +234,8 @@ def rate_limit(limiter_name='default', key_func=None):
                 response_obj, status_code = response
                 if hasattr(response_obj, 'headers'):
                     response_obj.headers['X-RateLimit-Limit'] = limiter.max_requests
-                    response_obj.headers['X-RateLimit-Remaining'] = remaining
-                    response_obj.headers['X-RateLimit-Reset'] = int(time.time() + limiter.window_seconds)
+                    response_obj.headers['X-RateLimit-Remaining'] = result.remaining
+                    response_obj.headers['X-RateLimit-Reset'] = int(time.time() + result.reset_after)
                 return response_obj, status_code
             else:
                 # If it's just a response object, we can't add headers easily
@@ -125,15 +261,11 @@ def rate_limit_by_user(limiter_name='default'):
                 key = request.remote_addr or 'unknown'
             
             limiter = rate_limiters.get(limiter_name, rate_limiters['default'])
-            allowed, remaining = limiter.is_allowed(key)
+            result = limiter.acquire(key)
             
-            if not allowed:
+            if not result.allowed:
                 logger.warning(f"User rate limit exceeded for {key} on {limiter_name}")
-                return jsonify({
-                    'error': 'Rate limit exceeded',
-                    'message': f'Too many requests. Limit: {limiter.max_requests} per {limiter.window_seconds} seconds',
-                    'retry_after': limiter.window_seconds
-                }), 429
+                return _rate_limit_exceeded(limiter, result)
             
             return f(*args, **kwargs)
         
@@ -148,15 +280,11 @@ def rate_limit_by_ip(limiter_name='default'):
         def decorated_function(*args, **kwargs):
             key = request.remote_addr or 'unknown'
             limiter = rate_limiters.get(limiter_name, rate_limiters['default'])
-            allowed, remaining = limiter.is_allowed(key)
+            result = limiter.acquire(key)
             
-            if not allowed:
+            if not result.allowed:
                 logger.warning(f"IP rate limit exceeded for {key} on {limiter_name}")
-                return jsonify({
-                    'error': 'Rate limit exceeded',
-                    'message': f'Too many requests. Limit: {limiter.max_requests} per {limiter.window_seconds} seconds',
-                    'retry_after': limiter.window_seconds
-                }), 429
+                return _rate_limit_exceeded(limiter, result)
             
             return f(*args, **kwargs)
         
@@ -181,7 +309,13 @@ def get_rate_limit_info(limiter_name='default', key=None):
 
 
 def configure_rate_limits(config):
-    """Configure rate limits from application config"""
+    """
+    Configure rate limits from application config
+    
+    RATE_LIMITS maps limiter names to max_requests / window_seconds;
+    RATE_LIMIT_SHARED_PATH, when set, makes every limiter share its state
+    with the other worker processes through that SQLite file.
+    """
     global rate_limiters
     
     # Update existing limiters or create new ones based on config
@@ -195,7 +329,13 @@ def configure_rate_limits(config):
             rate_limiters[name].window_seconds = window_seconds
         else:
             # Create new limiter
-            rate_limiters[name] = RateLimiter(max_requests, window_seconds)
+            rate_limiters[name] = RateLimiter(max_requests, window_seconds, namespace=name)
+    
+    shared_path = config.get('RATE_LIMIT_SHARED_PATH')
+    if shared_path:
+        store = SQLiteRateLimitStore(shared_path)
+        for limiter in rate_limiters.values():
+            limiter.store = store
     
     logger.info(f"Configured {len(rate_limiters)} rate limiters")
 
@@ -14,7 +14,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import time # Added for time.time()
 
-from flask import Flask, jsonify, request, send_file, current_app
+from flask import Flask, jsonify, request, send_file, current_app, g, Response
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_sqlalchemy import SQLAlchemy
@@ -25,12 +25,16 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Import database models and authentication
 from models import db, User, Configuration, AuditLog, UserVlanAllocation, UserPermission, PersonalBridgeDomain, TopologyScan
 from auth import token_required, permission_required, admin_required, user_ownership_required, create_audit_log
+from auth import token_cache, get_request_token
 from database_manager import DatabaseManager
 from deployment_manager import DeploymentManager
 
 # Import existing modules
 from config_engine.unified_bridge_domain_builder import UnifiedBridgeDomainBuilder
 from config_engine.device_scanner import DeviceScanner
+from config_engine.bridge_domain_mapping_index import get_mapping_index
+from utils.request_metrics import get_request_metrics, PROMETHEUS_CONTENT_TYPE
+from utils.conditional_response import conditional_json, json_response, sqlite_data_version
 # from scripts.ssh_push_menu import SSHPushMenu  # Temporarily disabled - missing ssh_push_manager
 # from scripts.inventory_manager import InventoryManager  # Temporarily disabled
 # from scripts.device_status_viewer import DeviceStatusViewer  # Temporarily disabled
@@ -102,8 +106,28 @@ _ensure_configuration_columns()
 # Initialize database manager
 db_manager = DatabaseManager()
 
+
+def app_data_version():
+    """Data version of the application database, for conditional GET on read endpoints"""
+    return sqlite_data_version(db.engine.url.database)
+
 CORS(app, origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:8080"])
 
+# Request latency histograms, exposed on /metrics
+request_metrics = get_request_metrics()
+
+@app.before_request
+def _start_request_timer():
+    g.request_start_time = time.perf_counter()
+
+@app.after_request
+def _record_request_metrics(response):
+    start = g.pop('request_start_time', None)
+    if start is not None:
+        request_metrics.observe(request.method, request.endpoint or 'unmatched',
+                                response.status_code, time.perf_counter() - start)
+    return response
+
 # Initialize SocketIO
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
@@ -353,6 +377,8 @@ def logout(current_user):
             'username': current_user.username
         })
         
+        token_cache.invalidate_token(get_request_token())
+        
         return jsonify({
             "success": True,
             "message": "Logout successful"
@@ -429,6 +455,7 @@ def change_password(current_user):
         # Update password
         current_user.set_password(new_password)
         db.session.commit()
+        token_cache.invalidate_user(current_user.id)
         
         # Create audit log
         create_audit_log(current_user.id, 'change_password', 'user', current_user.id, {
@@ -908,44 +935,71 @@ def discover_bridge_domains():
             "error": f"Bridge domain discovery failed: {str(e)}"
         }), 500
 
+@app.route('/api/bridge-domains/rediscover', methods=['POST'])
+def rediscover_bridge_domains():
+    """Re-run discovery only for bridge domains touching the given devices"""
+    try:
+        data = request.get_json() or {}
+        devices = data.get('devices')
+        if not devices or not isinstance(devices, list):
+            return jsonify({
+                "success": False,
+                "error": "A non-empty 'devices' list is required"
+            }), 400
+        
+        from config_engine.discovery.simplified.simplified_bridge_domain_discovery import run_simplified_discovery
+        from config_engine.discovery.simplified.data_sync_manager import DataSyncManager
+        
+        results = run_simplified_discovery(devices=devices)
+        
+        if not results.is_incremental:
+            # No previous discovery state: a full discovery was run instead
+            return jsonify({
+                "success": True,
+                "message": "No previous discovery found, full discovery completed",
+                "incremental": False,
+                "discovered_count": len(results.consolidated_bridge_domains) + len(results.individual_bridge_domains)
+            })
+        
+        sync_result = DataSyncManager().sync_discovery_delta(
+            results.updated_bridge_domains, results.removed_bridge_domains
+        )
+        
+        return jsonify({
+            "success": 'error' not in sync_result,
+            "message": f"Rediscovered {len(devices)} devices",
+            "incremental": True,
+            "devices": results.rediscovered_devices,
+            "updated_bridge_domains": sorted(results.updated_bridge_domains),
+            "removed_bridge_domains": results.removed_bridge_domains,
+            "sync": sync_result
+        })
+        
+    except Exception as e:
+        logger.error(f"Bridge domain rediscovery error: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"Bridge domain rediscovery failed: {str(e)}"
+        }), 500
+
 @app.route('/api/bridge-domains/list', methods=['GET'])
 def list_bridge_domains():
     """Get list of discovered bridge domains"""
     try:
-        from config_engine.bridge_domain_visualization import BridgeDomainVisualization
+        snapshot = get_mapping_index().snapshot()
         
-        visualization = BridgeDomainVisualization()
-        mapping = visualization.load_latest_mapping()
-        
-        if not mapping:
+        if not snapshot:
             return jsonify({
                 "success": False,
                 "error": "No bridge domain mapping found. Please run discovery first."
             }), 404
         
-        bridge_domains = mapping.get('bridge_domains', {})
-        bridge_domain_list = []
-        
-        for name, data in bridge_domains.items():
-            topology_analysis = data.get('topology_analysis', {})
-            bridge_domain_list.append({
-                "name": name,
-                "vlan": data.get('detected_vlan', 'unknown'),
-                "username": data.get('detected_username', 'unknown'),
-                "confidence": data.get('confidence', 0),
-                "topology_type": data.get('topology_type', 'unknown'),
-                "total_devices": len(data.get('devices', {})),
-                "total_interfaces": topology_analysis.get('total_interfaces', 0),
-                "access_interfaces": topology_analysis.get('access_interfaces', 0),
-                "path_complexity": topology_analysis.get('path_complexity', 'unknown'),
-                "detection_method": data.get('detection_method', 'unknown')
-            })
-        
+        # Rows are precomputed when the mapping file is (re)loaded
         return jsonify({
             "success": True,
-            "bridge_domains": bridge_domain_list,
-            "total_count": len(bridge_domain_list),
-            "summary": mapping.get('topology_summary', {})
+            "bridge_domains": snapshot.rows,
+            "total_count": len(snapshot.rows),
+            "summary": snapshot.summary
         })
         
     except Exception as e:
@@ -959,19 +1013,15 @@ def list_bridge_domains():
 def get_bridge_domain_details(bridge_domain_name):
     """Get detailed information about a specific bridge domain"""
     try:
-        from config_engine.bridge_domain_visualization import BridgeDomainVisualization
-        
-        visualization = BridgeDomainVisualization()
-        mapping = visualization.load_latest_mapping()
+        snapshot = get_mapping_index().snapshot()
         
-        if not mapping:
+        if not snapshot:
             return jsonify({
                 "success": False,
                 "error": "No bridge domain mapping found. Please run discovery first."
             }), 404
         
-        bridge_domains = mapping.get('bridge_domains', {})
-        bridge_domain_data = bridge_domains.get(bridge_domain_name)
+        bridge_domain_data = snapshot.get(bridge_domain_name)
         
         if not bridge_domain_data:
             return jsonify({
@@ -998,7 +1048,7 @@ def visualize_bridge_domain(bridge_domain_name):
         from config_engine.bridge_domain_visualization import BridgeDomainVisualization
         
         visualization = BridgeDomainVisualization()
-        mapping = visualization.load_latest_mapping()
+        mapping = get_mapping_index().get_mapping()
         
         if not mapping:
             return jsonify({
@@ -1047,39 +1097,16 @@ def search_bridge_domains():
                 "error": "Search query is required"
             }), 400
         
-        from config_engine.bridge_domain_visualization import BridgeDomainVisualization
-        
-        visualization = BridgeDomainVisualization()
-        mapping = visualization.load_latest_mapping()
+        snapshot = get_mapping_index().snapshot()
         
-        if not mapping:
+        if not snapshot:
             return jsonify({
                 "success": False,
                 "error": "No bridge domain mapping found. Please run discovery first."
             }), 404
         
-        bridge_domains = mapping.get('bridge_domains', {})
-        results = []
-        
-        for name, data in bridge_domains.items():
-            # Search in name, VLAN, and username
-            if (query in name.lower() or 
-                query in str(data.get('detected_vlan', '')).lower() or
-                query in str(data.get('detected_username', '')).lower()):
-                
-                topology_analysis = data.get('topology_analysis', {})
-                results.append({
-                    "name": name,
-                    "vlan": data.get('detected_vlan', 'unknown'),
-                    "username": data.get('detected_username', 'unknown'),
-                    "confidence": data.get('confidence', 0),
-                    "topology_type": data.get('topology_type', 'unknown'),
-                    "total_devices": len(data.get('devices', {})),
-                    "total_interfaces": topology_analysis.get('total_interfaces', 0),
-                    "access_interfaces": topology_analysis.get('access_interfaces', 0),
-                    "path_complexity": topology_analysis.get('path_complexity', 'unknown'),
-                    "detection_method": data.get('detection_method', 'unknown')
-                })
+        # Search in name, VLAN, and username
+        results = snapshot.search(query)
         
         return jsonify({
             "success": True,
@@ -1101,26 +1128,35 @@ def search_bridge_domains():
 
 @app.route('/api/bridge-domains/unified-list', methods=['GET'])
 @token_required
+@conditional_json(lambda current_user: sqlite_data_version(db_manager.db_path))
 def get_unified_bridge_domains(current_user):
-    """Get all discovered + user-created BDs from unified table for BD Editor"""
+    """
+    Get discovered + user-created BDs from unified table for BD Editor
+    
+    Query parameters: limit, cursor (next_cursor of the previous page), sort,
+    order, source, q (name substring), username, vlan_id, dnaas_type,
+    topology_type, deployment_status.
+    """
     try:
-        # Import our CLI BD Editor logic
-        from main import get_discovered_bridge_domains, get_user_created_bridge_domains
-        from database_manager import DatabaseManager
-        
-        db_manager = DatabaseManager()
+        from database.bd_listing import BridgeDomainListing, DEFAULT_PAGE_SIZE, FILTER_FIELDS
         
-        # Get discovered BDs (using our CLI logic)
-        discovered_bds = get_discovered_bridge_domains(db_manager)
-        
-        # Get user-created BDs (using our CLI logic)
-        user_bds = get_user_created_bridge_domains(db_manager)
+        filters = {key: request.args.get(key) for key in ('source', 'q') + FILTER_FIELDS}
+        try:
+            page = BridgeDomainListing(db_manager.db_path).list_page(
+                filters=filters,
+                sort=request.args.get('sort', 'name'),
+                order=request.args.get('order', 'asc'),
+                limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+                cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
         
-        # Combine and enhance for frontend
         all_bds = []
-        
-        # Add discovered BDs
-        for bd in discovered_bds:
+        for bd in page['rows']:
             all_bds.append({
                 'id': bd['id'],
                 'name': bd['name'],
@@ -1128,40 +1164,25 @@ def get_unified_bridge_domains(current_user):
                 'username': bd['username'],
                 'dnaas_type': bd['dnaas_type'],
                 'topology_type': bd['topology_type'],
-                'source': 'discovered',
-                'source_icon': '🔍',
-                'deployment_status': bd.get('deployment_status', 'pending'),
+                'source': bd['source'],
+                'source_icon': '🔍' if bd['source'] == 'discovered' else '🔨',
+                'deployment_status': bd['deployment_status'] or 'pending',
                 'created_at': bd['created_at'],
-                'can_edit': True,  # All discovered BDs are editable
-                'interface_count': len(json.loads(bd['interface_data']) if bd['interface_data'] else []),
-                'has_raw_config': bool(bd.get('discovery_data'))
+                'updated_at': bd['updated_at'],
+                'can_edit': True,  # All listed BDs are editable
+                'interface_count': bd['interface_count'],
+                'has_raw_config': bd['has_raw_config']
             })
         
-        # Add user-created BDs
-        for bd in user_bds:
-            all_bds.append({
-                'id': bd['id'],
-                'name': bd['name'],
-                'vlan_id': bd['vlan_id'],
-                'username': bd.get('username', current_user.username),
-                'dnaas_type': bd['dnaas_type'],
-                'topology_type': bd['topology_type'],
-                'source': 'user_created',
-                'source_icon': '🔨',
-                'deployment_status': bd.get('deployment_status', 'pending'),
-                'created_at': bd['created_at'],
-                'can_edit': True,
-                'interface_count': len(json.loads(bd['interface_data']) if bd['interface_data'] else []),
-                'has_raw_config': bool(bd.get('discovery_data'))
-            })
-        
-        return jsonify({
+        return json_response({
             "success": True,
             "bridge_domains": all_bds,
-            "total_count": len(all_bds),
-            "discovered_count": len(discovered_bds),
-            "user_created_count": len(user_bds),
-            "message": f"Found {len(all_bds)} bridge domains available for editing"
+            "next_cursor": page['next_cursor'],
+            "page_size": page['page_size'],
+            "total_count": page['total_count'],
+            "discovered_count": page['discovered_count'],
+            "user_created_count": page['user_created_count'],
+            "message": f"Found {page['total_count']} bridge domains available for editing"
         })
         
     except Exception as e:
@@ -1178,17 +1199,13 @@ def create_bd_editing_session(current_user, bd_name):
     """Create safe editing workspace for bridge domain"""
     try:
         # Import our CLI editing workspace logic
-        from main import get_discovered_bridge_domains, get_user_created_bridge_domains, create_editing_workspace
-        from database_manager import DatabaseManager
+        from main import create_editing_workspace
+        from database.bd_repository import BridgeDomainRepository
         
         db_manager = DatabaseManager()
         
-        # Find the bridge domain
-        discovered_bds = get_discovered_bridge_domains(db_manager)
-        user_bds = get_user_created_bridge_domains(db_manager)
-        all_bds = discovered_bds + user_bds
-        
-        bd = next((bd for bd in all_bds if bd['name'] == bd_name), None)
+        # Find the bridge domain (single indexed lookup)
+        bd = BridgeDomainRepository(db_manager.db_path).get_by_name(bd_name)
         
         if not bd:
             return jsonify({
@@ -1229,50 +1246,20 @@ def create_bd_editing_session(current_user, bd_name):
 def get_bd_raw_config(current_user, bd_name):
     """Get raw CLI configuration for bridge domain interfaces"""
     try:
-        import sqlite3
-        
-        # Get BD from unified bridge_domains table
-        conn = sqlite3.connect('instance/lab_automation.db')
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT discovery_data, interface_data, dnaas_type
-            FROM bridge_domains 
-            WHERE name = ? AND source = 'discovered'
-        """, (bd_name,))
+        from database.bd_repository import BridgeDomainRepository
         
-        result = cursor.fetchone()
-        conn.close()
+        # One indexed read of the access-endpoint projection stored with the BD
+        access = BridgeDomainRepository(DatabaseManager().db_path).get_access_endpoints(bd_name)
         
-        if not result:
+        if not access:
             return jsonify({
                 "success": False,
                 "error": f"Bridge domain '{bd_name}' not found"
             }), 404
         
-        discovery_data, interface_data, dnaas_type = result
-        
-        # Extract raw config from discovery data
-        raw_configs = []
-        if discovery_data:
-            discovery_json = json.loads(discovery_data)
-            devices = discovery_json.get('devices', {})
-            
-            for device_name, device_info in devices.items():
-                if 'interfaces' in device_info:
-                    for iface in device_info['interfaces']:
-                        # Only include access interfaces (user endpoints)
-                        if iface.get('role') == 'access':
-                            raw_configs.append({
-                                'device': device_name,
-                                'interface': iface.get('name'),
-                                'vlan_id': iface.get('vlan_id'),
-                                'role': iface.get('role'),
-                                'raw_cli_config': iface.get('raw_cli_config', []),
-                                'outer_vlan': iface.get('outer_vlan'),
-                                'inner_vlan': iface.get('inner_vlan'),
-                                'vlan_manipulation': iface.get('vlan_manipulation')
-                            })
+        dnaas_type = access['dnaas_type']
+        # Only access interfaces (user endpoints)
+        raw_configs = access['endpoints']
         
         return jsonify({
             "success": True,
@@ -1780,6 +1767,11 @@ def health_check():
         "version": VERSION
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Request latency histograms and counters in Prometheus text format"""
+    return Response(request_metrics.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.route('/api/database/health', methods=['GET'])
 def database_health_check():
     """Check database health and test save operations"""
@@ -1806,6 +1798,7 @@ def database_health_check():
 
 @app.route('/api/configurations', methods=['GET'])
 @token_required
+@conditional_json(lambda current_user: (current_user.id, app_data_version()))
 def get_configurations(current_user):
     """Get all configurations and imported bridge domains for the current user"""
     try:
@@ -1893,7 +1886,7 @@ def get_configurations(current_user):
         logger.info(f"Imported bridge domains: {len([c for c in config_list if c['type'] == 'imported_bridge_domain'])}")
         logger.info("=== GET CONFIGURATIONS DEBUG END ===")
         
-        return jsonify({
+        return json_response({
             "success": True,
             "configurations": config_list,
             "total": len(config_list),
@@ -1911,6 +1904,10 @@ def get_configurations(current_user):
 # Enhanced Phase 1 configurations endpoint
 @app.route('/api/configurations/enhanced', methods=['GET'])
 @token_required
+@conditional_json(lambda current_user: (
+    current_user.id, app_data_version(),
+    sqlite_data_version(enhanced_db_manager.db_path) if enhanced_db_manager else None
+))
 def get_enhanced_configurations(current_user):
     """Get enhanced configurations with Phase 1 data structures and validation"""
     try:
@@ -1991,7 +1988,7 @@ def get_enhanced_configurations(current_user):
         logger.info(f"Legacy configurations: {len([c for c in enhanced_list if c['type'] == 'legacy_configuration'])}")
         logger.info("=== GET ENHANCED CONFIGURATIONS DEBUG END ===")
         
-        return jsonify({
+        return json_response({
             "success": True,
             "enhanced_configurations": enhanced_list,
             "total": len(enhanced_list),
@@ -2707,6 +2704,7 @@ def update_user(current_user, user_id):
                 db.session.add(user_permissions)
         
         db.session.commit()
+        token_cache.invalidate_user(user_id)
         
         # Create audit log
         create_audit_log(current_user.id, 'update', 'user', user_id, {
@@ -2752,6 +2750,7 @@ def delete_user(current_user, user_id):
         # Delete user (cascades to related records)
         db.session.delete(user)
         db.session.commit()
+        token_cache.invalidate_user(user_id)
         
         # Create audit log
         create_audit_log(current_user.id, 'delete', 'user', user_id, {
@@ -2826,10 +2825,7 @@ def import_bridge_domain(current_user):
         # Fetch original discovery data for this bridge domain
         logger.info("Fetching original discovery data...")
         try:
-            from config_engine.bridge_domain_visualization import BridgeDomainVisualization
-            
-            visualization = BridgeDomainVisualization()
-            mapping = visualization.load_latest_mapping()
+            mapping = get_mapping_index().get_mapping()
             
             discovery_data = None
             if mapping:
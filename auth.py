@@ -6,12 +6,172 @@ Handles JWT token verification, user authentication, and authorization
 
 import os
 import jwt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
+from typing import Any, Dict, Optional
 from flask import request, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from models import db, User, AuditLog
 
+# Verified tokens are cached for this many seconds (never past the token's own
+# expiry); invalidation is per process, so other workers see changes after the TTL
+TOKEN_CACHE_TTL = float(os.getenv('AUTH_TOKEN_CACHE_TTL', '60'))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_TOKEN_CACHE_MAX_ENTRIES', '10000'))
+
+_jwt_secret_key: Optional[str] = None
+
+
+def get_jwt_secret_key() -> str:
+    """JWT signing key, read from the environment once"""
+    global _jwt_secret_key
+    if _jwt_secret_key is None:
+        _jwt_secret_key = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this')
+    return _jwt_secret_key
+
+
+class UserPrincipal:
+    """Immutable snapshot of a verified user, safe to share between requests"""
+    
+    __slots__ = ('id', 'username', 'role', 'is_admin', 'is_active', 'permissions')
+    
+    def __init__(self, user: User):
+        self.id = user.id
+        self.username = user.username
+        self.role = user.role
+        self.is_admin = user.is_admin
+        self.is_active = user.is_active
+        self.permissions = user.permissions.to_dict() if user.permissions else None
+    
+    def has_permission(self, permission: str) -> bool:
+        """Same rules as User.has_permission"""
+        if self.role == 'admin' or self.is_admin:
+            return True
+        elif self.role == 'user':
+            return permission in ['read', 'write', 'deploy']
+        elif self.role == 'readonly':
+            return permission == 'read'
+        return False
+
+
+class AuthenticatedUser:
+    """
+    Per-request current_user built from a cached principal.
+    
+    id, username, role, is_admin, is_active, permissions and has_permission()
+    are answered from the principal; anything else (to_dict, set_password,
+    relationships, ...) loads the User row on first use.
+    """
+    
+    def __init__(self, principal: UserPrincipal):
+        self.principal = principal
+        self.id = principal.id
+        self.username = principal.username
+        self.role = principal.role
+        self.is_admin = principal.is_admin
+        self.is_active = principal.is_active
+        self._user = None
+    
+    def has_permission(self, permission: str) -> bool:
+        return self.principal.has_permission(permission)
+    
+    @property
+    def user(self) -> User:
+        if self._user is None:
+            self._user = User.query.get(self.id)
+        return self._user
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.user, name)
+
+
+class TokenCache:
+    """Bounded LRU/TTL cache of verified tokens -> UserPrincipal"""
+    
+    def __init__(self, ttl: float = TOKEN_CACHE_TTL, max_entries: int = TOKEN_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[bytes, tuple]' = OrderedDict()  # key -> (principal, expires_at)
+        self._by_user: Dict[int, set] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[UserPrincipal]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return principal
+    
+    def put(self, token: str, principal: UserPrincipal, token_exp: Optional[float] = None):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        key = self._key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (principal, expires_at)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def invalidate_token(self, token: str):
+        with self._lock:
+            if self._remove(self._key(token)):
+                self.stats['invalidations'] += 1
+    
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token of a user (password change, update, delete, deactivation)"""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+            self.stats['invalidations'] += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+    
+    def _remove(self, key: bytes) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        keys = self._by_user.get(entry[0].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[0].id]
+        return True
+
+
+token_cache = TokenCache()
+
+
+def get_request_token() -> Optional[str]:
+    """Bearer token of the current request, if any"""
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        return auth_header.split(' ')[1]
+    return None
+
 def create_audit_log(user_id: int, action: str, resource_type: str, resource_id: int = None, 
                     details: dict = None):
     """Create audit log entry"""
@@ -34,32 +194,31 @@ def token_required(f):
     """Decorator to require JWT token authentication"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
         # Get token from header
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
+        token = get_request_token()
         
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
-        try:
-            # Verify token
-            secret_key = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this')
-            payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-            current_user = User.query.get(payload['user_id'])
-            
-            if not current_user or not current_user.is_active:
-                return jsonify({'error': 'Invalid token'}), 401
+        principal = token_cache.get(token)
+        if principal is None:
+            try:
+                # Verify token
+                payload = jwt.decode(token, get_jwt_secret_key(), algorithms=['HS256'])
+                user = User.query.get(payload['user_id'])
+                
+                if not user or not user.is_active:
+                    return jsonify({'error': 'Invalid token'}), 401
                 
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'error': 'Invalid token'}), 401
+                principal = UserPrincipal(user)
+                token_cache.put(token, principal, payload.get('exp'))
+                    
+            except jwt.ExpiredSignatureError:
+                return jsonify({'error': 'Token has expired'}), 401
+            except jwt.InvalidTokenError:
+                return jsonify({'error': 'Invalid token'}), 401
         
-        return f(current_user, *args, **kwargs)
+        return f(AuthenticatedUser(principal), *args, **kwargs)
     
     return decorated
 
@@ -109,14 +268,12 @@ def generate_password_reset_token(user: User) -> str:
         'type': 'password_reset',
         'exp': datetime.utcnow() + timedelta(hours=1)
     }
-    secret_key = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this')
-    return jwt.encode(payload, secret_key, algorithm='HS256')
+    return jwt.encode(payload, get_jwt_secret_key(), algorithm='HS256')
 
 def verify_password_reset_token(token: str) -> User:
     """Verify password reset token"""
     try:
-        secret_key = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this')
-        payload = jwt.decode(token, secret_key, algorithms=['HS256'])
+        payload = jwt.decode(token, get_jwt_secret_key(), algorithms=['HS256'])
         
         if payload.get('type') != 'password_reset':
             return None
@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import only essential modules
 from database_manager import DatabaseManager
+from utils.conditional_response import conditional_json, json_response, sqlite_data_version
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -90,51 +91,45 @@ def login():
 
 @app.route('/api/bridge-domains/unified-list', methods=['GET'])
 @simple_auth_required
+@conditional_json(lambda: sqlite_data_version(DatabaseManager().db_path))
 def get_unified_bridge_domains():
-    """Get all discovered + user-created BDs from unified table for BD Editor"""
+    """Get discovered + user-created BDs from unified table for BD Editor (paginated, see api_server)"""
     try:
-        # Import our CLI BD Editor logic
-        from main import get_discovered_bridge_domains, get_user_created_bridge_domains
-        
-        db_manager = DatabaseManager()
-        
-        # Get discovered BDs (using our CLI logic)
-        discovered_bds = get_discovered_bridge_domains(db_manager)
-        
-        # Get user-created BDs (using our CLI logic)
-        user_bds = get_user_created_bridge_domains(db_manager)
+        from database.bd_listing import BridgeDomainListing, DEFAULT_PAGE_SIZE, FILTER_FIELDS
+        
+        filters = {key: request.args.get(key) for key in ('source', 'q') + FILTER_FIELDS}
+        try:
+            page = BridgeDomainListing(DatabaseManager().db_path).list_page(
+                filters=filters,
+                sort=request.args.get('sort', 'name'),
+                order=request.args.get('order', 'asc'),
+                limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+                cursor=request.args.get('cursor')
+            )
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
         
-        # Combine and enhance for frontend
         all_bds = []
-        
-        # Add discovered BDs
-        for bd in discovered_bds:
-            # Simplify DNAAS type for frontend
-            dnaas_type = bd['dnaas_type'] or 'unknown'
-            if 'TYPE_2A_QINQ' in dnaas_type:
-                simplified_type = '2A_QINQ'
-            elif 'TYPE_4A_SINGLE' in dnaas_type:
-                simplified_type = '4A_SINGLE'
-            elif 'TYPE_1_DOUBLE' in dnaas_type:
-                simplified_type = '1_DOUBLE'
+        for bd in page['rows']:
+            if bd['source'] == 'discovered':
+                # Simplify DNAAS type for frontend
+                dnaas_type = bd['dnaas_type'] or 'unknown'
+                if 'TYPE_2A_QINQ' in dnaas_type:
+                    simplified_type = '2A_QINQ'
+                elif 'TYPE_4A_SINGLE' in dnaas_type:
+                    simplified_type = '4A_SINGLE'
+                elif 'TYPE_1_DOUBLE' in dnaas_type:
+                    simplified_type = '1_DOUBLE'
+                else:
+                    simplified_type = 'OTHER'
+                # User-editable endpoints: access interfaces in the discovery data
+                endpoint_count = bd['access_endpoint_count']
             else:
-                simplified_type = 'OTHER'
-            
-            # Calculate user-editable endpoint count from discovery data
-            endpoint_count = 0
-            if bd.get('discovery_data'):
-                try:
-                    discovery_json = json.loads(bd['discovery_data'])
-                    devices = discovery_json.get('devices', {})
-                    
-                    for device_name, device_info in devices.items():
-                        if isinstance(device_info, dict) and 'interfaces' in device_info:
-                            for iface in device_info['interfaces']:
-                                # Count only access interfaces (user endpoints)
-                                if iface.get('role') == 'access':
-                                    endpoint_count += 1
-                except:
-                    endpoint_count = 0  # Failed to parse, default to 0
+                simplified_type = 'USER_CREATED'
+                endpoint_count = 0
             
             all_bds.append({
                 'id': bd['id'],
@@ -144,43 +139,26 @@ def get_unified_bridge_domains():
                 'dnaas_type': bd['dnaas_type'],
                 'dnaas_type_display': simplified_type,
                 'topology_type': bd['topology_type'],
-                'source': 'discovered',
-                'source_icon': '🔍',
-                'deployment_status': bd.get('deployment_status', 'pending'),
-                'updated_at': bd.get('updated_at'),
-                'can_edit': True,
-                'interface_count': endpoint_count,  # Calculated from discovery data
-                'has_raw_config': bool(bd.get('discovery_data'))
-            })
-        
-        # Add user-created BDs
-        for bd in user_bds:
-            all_bds.append({
-                'id': bd['id'],
-                'name': bd['name'],
-                'vlan_id': bd['vlan_id'],
-                'username': bd.get('username', 'admin'),
-                'dnaas_type': bd['dnaas_type'],
-                'dnaas_type_display': 'USER_CREATED',
-                'topology_type': bd['topology_type'],
-                'source': 'user_created',
-                'source_icon': '🔨',
-                'deployment_status': bd.get('deployment_status', 'pending'),
-                'updated_at': bd.get('updated_at'),
+                'source': bd['source'],
+                'source_icon': '🔍' if bd['source'] == 'discovered' else '🔨',
+                'deployment_status': bd['deployment_status'] or 'pending',
+                'updated_at': bd['updated_at'],
                 'can_edit': True,
-                'interface_count': 0,
-                'has_raw_config': bool(bd.get('discovery_data'))
+                'interface_count': endpoint_count,
+                'has_raw_config': bd['has_raw_config']
             })
         
-        logger.info(f"Returning {len(all_bds)} bridge domains to frontend")
+        logger.info(f"Returning {len(all_bds)} of {page['total_count']} bridge domains to frontend")
         
-        return jsonify({
+        return json_response({
             "success": True,
             "bridge_domains": all_bds,
-            "total_count": len(all_bds),
-            "discovered_count": len(discovered_bds),
-            "user_created_count": len(user_bds),
-            "message": f"Found {len(all_bds)} bridge domains available for editing"
+            "next_cursor": page['next_cursor'],
+            "page_size": page['page_size'],
+            "total_count": page['total_count'],
+            "discovered_count": page['discovered_count'],
+            "user_created_count": page['user_created_count'],
+            "message": f"Found {page['total_count']} bridge domains available for editing"
         })
         
     except Exception as e:
@@ -196,50 +174,20 @@ def get_unified_bridge_domains():
 def get_bd_raw_config(bd_name):
     """Get raw CLI configuration for bridge domain interfaces"""
     try:
-        import sqlite3
-        
-        # Get BD from unified bridge_domains table
-        conn = sqlite3.connect('instance/lab_automation.db')
-        cursor = conn.cursor()
+        from database.bd_repository import BridgeDomainRepository
         
-        cursor.execute("""
-            SELECT discovery_data, interface_data, dnaas_type
-            FROM bridge_domains 
-            WHERE name = ? AND source = 'discovered'
-        """, (bd_name,))
+        # One indexed read of the access-endpoint projection stored with the BD
+        access = BridgeDomainRepository(DatabaseManager().db_path).get_access_endpoints(bd_name)
         
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
+        if not access:
             return jsonify({
                 "success": False,
                 "error": f"Bridge domain '{bd_name}' not found"
             }), 404
         
-        discovery_data, interface_data, dnaas_type = result
-        
-        # Extract raw config from discovery data
-        raw_configs = []
-        if discovery_data:
-            discovery_json = json.loads(discovery_data)
-            devices = discovery_json.get('devices', {})
-            
-            for device_name, device_info in devices.items():
-                if 'interfaces' in device_info:
-                    for iface in device_info['interfaces']:
-                        # Only include access interfaces (user endpoints)
-                        if iface.get('role') == 'access':
-                            raw_configs.append({
-                                'device': device_name,
-                                'interface': iface.get('name'),
-                                'vlan_id': iface.get('vlan_id'),
-                                'role': iface.get('role'),
-                                'raw_cli_config': iface.get('raw_cli_config', []),
-                                'outer_vlan': iface.get('outer_vlan'),
-                                'inner_vlan': iface.get('inner_vlan'),
-                                'vlan_manipulation': iface.get('vlan_manipulation')
-                            })
+        dnaas_type = access['dnaas_type']
+        # Only access interfaces (user endpoints)
+        raw_configs = access['endpoints']
         
         return jsonify({
             "success": True,
@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Tuple
 import logging
 
 from .device_name_normalizer import normalizer
+from .topology_snapshot import get_topology_snapshot
 
 class BridgeDomainBuilder:
     """Builds bridge domain configurations for spine-leaf topology"""
@@ -28,111 +29,13 @@ class BridgeDomainBuilder:
         # Initialize device name normalizer
         self.normalizer = normalizer
         
-        # Load topology data
-        self.topology_data = self._load_topology_data()
-        self.bundle_mappings = self._load_bundle_mappings()
-        
-        # Apply normalization to topology data if needed
-        self._normalize_topology_data()
-    
-    def _normalize_topology_data(self):
-        """Apply device name normalization to topology data."""
-        if not self.topology_data:
-            return
-        
-        # Check if we should use enhanced topology
-        enhanced_topology_file = self.topology_dir / "enhanced_topology.json"
-        if enhanced_topology_file.exists():
-            self.logger.info("Using enhanced topology with normalization")
-            with open(enhanced_topology_file, 'r') as f:
-                self.topology_data = json.load(f)
-        else:
-            self.logger.info("Applying normalization to existing topology data")
-            self._apply_normalization_to_topology()
-    
-    def _apply_normalization_to_topology(self):
-        """Apply normalization to existing topology data."""
-        if not self.topology_data:
-            return
-        
-        devices = self.topology_data.get('devices', {})
-        normalized_devices = {}
-        
-        for device_name, device_info in devices.items():
-            normalized_name = self.normalizer.normalize_device_name(device_name)
-            normalized_devices[normalized_name] = device_info
-            
-            # Update device name in device info
-            device_info['name'] = normalized_name
-            
-            # Normalize connected spines
-            if 'connected_spines' in device_info:
-                normalized_spines = []
-                for spine_conn in device_info['connected_spines']:
-                    if isinstance(spine_conn, dict):
-                        # Handle new format with connection details
-                        spine_name = spine_conn.get('name', '')
-                        normalized_spine_name = self.normalizer.normalize_device_name(spine_name)
-                        spine_conn['name'] = normalized_spine_name
-                        normalized_spines.append(spine_conn)
-                    else:
-                        # Handle old format with just spine names
-                        normalized_spine = self.normalizer.normalize_device_name(spine_conn)
-                        normalized_spines.append(normalized_spine)
-                device_info['connected_spines'] = normalized_spines
-        
-        self.topology_data['devices'] = normalized_devices
-        
-        # Normalize device lists
-        for key in ['available_leaves', 'unavailable_leaves', 'superspine_devices', 'spine_devices']:
-            if key in self.topology_data:
-                normalized_list = []
-                for device in self.topology_data[key]:
-                    normalized_device = self.normalizer.normalize_device_name(device)
-                    normalized_list.append(normalized_device)
-                self.topology_data[key] = normalized_list
-    
-    def _load_topology_data(self) -> Dict:
-        """Load topology data from JSON file"""
-        try:
-            # Try V2 topology first
-            topology_file = self.topology_dir / "complete_topology_v2.json"
-            if topology_file.exists():
-                with open(topology_file, 'r') as f:
-                    return json.load(f)
-            
-            # Fallback to old topology format
-            topology_file = self.topology_dir / "complete_topology.json"
-            if topology_file.exists():
-                with open(topology_file, 'r') as f:
-                    return json.load(f)
-            else:
-                self.logger.warning(f"Topology file not found: {topology_file}")
-                return {}
-        except Exception as e:
-            self.logger.error(f"Failed to load topology data: {e}")
-            return {}
-    
-    def _load_bundle_mappings(self) -> Dict:
-        """Load bundle interface mappings"""
-        try:
-            # Try V2 bundle mapping first
-            bundle_file = self.topology_dir / "bundle_mapping_v2.yaml"
-            if bundle_file.exists():
-                with open(bundle_file, 'r') as f:
-                    return yaml.safe_load(f)
-            
-            # Fallback to old bundle mapping format
-            bundle_file = self.topology_dir / "bundle_interface_mapping.yaml"
-            if bundle_file.exists():
-                with open(bundle_file, 'r') as f:
-                    return yaml.safe_load(f)
-            else:
-                self.logger.warning(f"Bundle mapping file not found: {bundle_file}")
-                return {}
-        except Exception as e:
-            self.logger.error(f"Failed to load bundle mappings: {e}")
-            return {}
+        # Shared, read-only topology snapshot: loaded, normalized and indexed
+        # once per version of the topology and bundle files
+        self.snapshot = get_topology_snapshot(self.topology_dir)
+        self.topology_data = self.snapshot.topology_data
+        self.bundle_mappings = self.snapshot.bundle_mappings
+        self.bundle_index = self.snapshot.bundle_index
+        self.graph = self.snapshot.graph
     
     def calculate_path(self, source_leaf: str, dest_leaf: str) -> Optional[Dict]:
         """
@@ -147,315 +50,47 @@ class BridgeDomainBuilder:
         normalized_dest_leaf = self.normalizer.normalize_device_name(dest_leaf)
         self.logger.info(f"[PATH] Normalized device names: {source_leaf} -> {normalized_source_leaf}, {dest_leaf} -> {normalized_dest_leaf}")
         
-        # Load the new topology format
-        devices = self.topology_data.get('devices', {})
-        
-        # Classify devices by type
-        superspine_devices = []
-        spine_devices = []
-        leaf_devices = []
-        for device_name, device_info in devices.items():
-            device_type = device_info.get('type', 'unknown')
-            if device_type == 'superspine':
-                superspine_devices.append(device_name)
-            elif device_type == 'spine':
-                spine_devices.append(device_name)
-            elif device_type == 'leaf':
-                leaf_devices.append(device_name)
-        self.logger.info(f"[PATH] Found {len(superspine_devices)} superspine, {len(spine_devices)} spine, {len(leaf_devices)} leaf devices")
-        
-        # Build device connection map from connected_spines data
-        device_connections = {}
-        for device_name, device_info in devices.items():
-            connected_spines = device_info.get('connected_spines', [])
-            if connected_spines:
-                device_connections[device_name] = []
-                for spine_conn in connected_spines:
-                    if isinstance(spine_conn, dict):
-                        spine_name = spine_conn['name']
-                        device_connections[device_name].append({
-                            'device': spine_name,
-                            'local_interface': spine_conn['local_interface'],
-                            'remote_interface': spine_conn['remote_interface']
-                        })
-                        # Also add reverse connection for spine
-                        if spine_name not in device_connections:
-                            device_connections[spine_name] = []
-                        device_connections[spine_name].append({
-                            'device': device_name,
-                            'local_interface': spine_conn['remote_interface'],
-                            'remote_interface': spine_conn['local_interface']
-                        })
-                    else:
-                        spine_name = spine_conn
-                        device_connections[device_name].append({
-                            'device': spine_name,
-                            'local_interface': 'unknown',
-                            'remote_interface': 'unknown'
-                        })
-                        if spine_name not in device_connections:
-                            device_connections[spine_name] = []
-                        device_connections[spine_name].append({
-                            'device': device_name,
-                            'local_interface': 'unknown',
-                            'remote_interface': 'unknown'
-                        })
-        # Log all connections for each device
-        for dev, conns in device_connections.items():
-            self.logger.info(f"[CONNECTIONS] {dev}: {conns}")
-        
-        # Step 1: Find all spines connected to each leaf
-        source_leaf_spines = set(conn['device'] for conn in device_connections.get(normalized_source_leaf, []) if conn['device'] in spine_devices)
-        dest_leaf_spines = set(conn['device'] for conn in device_connections.get(normalized_dest_leaf, []) if conn['device'] in spine_devices)
-        
-        # Step 2: Check for shared spine (2-tier path)
-        shared_spines = source_leaf_spines & dest_leaf_spines
-        if shared_spines:
-            shared_spine = list(shared_spines)[0]
-            self.logger.info(f"[PATH] Found shared spine {shared_spine} for 2-tier path")
-            source_leaf_conn = next(conn for conn in device_connections.get(normalized_source_leaf, []) if conn['device'] == shared_spine)
-            dest_leaf_conn = next(conn for conn in device_connections.get(normalized_dest_leaf, []) if conn['device'] == shared_spine)
-            self.logger.info(f"[PATH] 2-tier segments:")
-            self.logger.info(f"  leaf_to_spine: {normalized_source_leaf} {source_leaf_conn['local_interface']} -> {shared_spine} {source_leaf_conn['remote_interface']}")
-            self.logger.info(f"  spine_to_leaf: {shared_spine} {dest_leaf_conn['remote_interface']} -> {normalized_dest_leaf} {dest_leaf_conn['local_interface']}")
-            path = {
-                'source_leaf': normalized_source_leaf,
-                'destination_leaf': normalized_dest_leaf,
-                'source_spine': shared_spine,
-                'superspine': None,
-                'dest_spine': shared_spine,
-                'segments': [
-                    {
-                        'type': 'leaf_to_spine',
-                        'source_device': normalized_source_leaf,
-                        'dest_device': shared_spine,
-                        'source_interface': source_leaf_conn['local_interface'],
-                        'dest_interface': source_leaf_conn['remote_interface']
-                    },
-                    {
-                        'type': 'spine_to_leaf',
-                        'source_device': shared_spine,
-                        'dest_device': normalized_dest_leaf,
-                        'source_interface': dest_leaf_conn['remote_interface'],
-                        'dest_interface': dest_leaf_conn['local_interface']
-                    }
-                ]
-            }
-            return path
-        # Step 3: 3-tier path (existing logic)
-        source_spine = None
-        source_leaf_conn = None
-        for conn in device_connections.get(normalized_source_leaf, []):
-            if conn['device'] in spine_devices:
-                source_spine = conn['device']
-                source_leaf_conn = conn
-                break
-        if not source_spine:
-            self.logger.error(f"[PATH] Could not find spine connection for source leaf {normalized_source_leaf}")
-            return None
-        dest_spine = None
-        dest_leaf_conn = None
-        for conn in device_connections.get(normalized_dest_leaf, []):
-            if conn['device'] in spine_devices:
-                dest_spine = conn['device']
-                dest_leaf_conn = conn
-                break
-        if not dest_spine:
-            self.logger.error(f"[PATH] Could not find spine connection for destination leaf {normalized_dest_leaf}")
-            return None
-        superspine = None
-        source_spine_to_superspine = None
-        dest_spine_to_superspine = None
-        source_spine_info = devices.get(source_spine, {})
-        dest_spine_info = devices.get(dest_spine, {})
-        source_spine_superspines = source_spine_info.get('connected_superspines', [])
-        dest_spine_superspines = dest_spine_info.get('connected_superspines', [])
-        source_superspine_names = {conn['name'] for conn in source_spine_superspines}
-        dest_superspine_names = {conn['name'] for conn in dest_spine_superspines}
-        common_superspines = source_superspine_names & dest_superspine_names
-        if common_superspines:
-            superspine = list(common_superspines)[0]
-            source_spine_to_superspine = next(conn for conn in source_spine_superspines if conn['name'] == superspine)
-            dest_spine_to_superspine = next(conn for conn in dest_spine_superspines if conn['name'] == superspine)
-            self.logger.info(f"[PATH] Found common superspine {superspine} using connected_superspines data")
-        else:
-            for superspine_name in superspine_devices:
-                superspine_conns = device_connections.get(superspine_name, [])
-                source_spine_conn = None
-                dest_spine_conn = None
-                for conn in superspine_conns:
-                    if conn['device'] == source_spine:
-                        source_spine_conn = conn
-                    elif conn['device'] == dest_spine:
-                        dest_spine_conn = conn
-                if source_spine_conn and dest_spine_conn:
-                    superspine = superspine_name
-                    source_spine_to_superspine = source_spine_conn
-                    dest_spine_to_superspine = dest_spine_conn
-                    self.logger.info(f"[PATH] Found common superspine {superspine} using fallback method")
-                    break
-        if not superspine:
-            self.logger.error(f"[PATH] Could not find common super spine for {source_spine} and {dest_spine}")
-            self.logger.error(f"[PATH] Source spine superspines: {[conn['name'] for conn in source_spine_superspines]}")
-            self.logger.error(f"[PATH] Dest spine superspines: {[conn['name'] for conn in dest_spine_superspines]}")
+        # Preferred path first; alternatives are equal-cost paths through other spines/superspines
+        paths = self.graph.leaf_paths(normalized_source_leaf, normalized_dest_leaf)
+        if not paths:
+            for leaf in (normalized_source_leaf, normalized_dest_leaf):
+                if not self.graph.neighbours(leaf, 'spine'):
+                    self.logger.error(f"[PATH] Could not find spine connection for leaf {leaf}")
+                    return None
+            self.logger.error(f"[PATH] Could not find common super spine for "
+                              f"{normalized_source_leaf} and {normalized_dest_leaf} spines")
             return None
+        
+        leaf_path = paths[0]
         path = {
             'source_leaf': normalized_source_leaf,
             'destination_leaf': normalized_dest_leaf,
-            'source_spine': source_spine,
-            'superspine': superspine,
-            'dest_spine': dest_spine,
-            'segments': []
+            'source_spine': leaf_path.devices[1],
+            'superspine': None if leaf_path.is_two_tier else leaf_path.devices[2],
+            'dest_spine': leaf_path.devices[-2],
+            'segments': leaf_path.segments()
         }
-        # Segment 1: Source Leaf → Source Spine
-        path['segments'].append({
-            'type': 'leaf_to_spine',
-            'source_device': normalized_source_leaf,
-            'dest_device': source_spine,
-            'source_interface': source_leaf_conn['local_interface'],
-            'dest_interface': source_leaf_conn['remote_interface']
-        })
-        # Segment 2: Source Spine → Super Spine
-        if isinstance(source_spine_to_superspine, dict) and 'local_interface' in source_spine_to_superspine:
-            path['segments'].append({
-                'type': 'spine_to_superspine',
-                'source_device': source_spine,
-                'dest_device': superspine,
-                'source_interface': source_spine_to_superspine['local_interface'],
-                'dest_interface': source_spine_to_superspine['remote_interface']
-            })
-        else:
-            path['segments'].append({
-                'type': 'spine_to_superspine',
-                'source_device': source_spine,
-                'dest_device': superspine,
-                'source_interface': source_spine_to_superspine['remote_interface'],
-                'dest_interface': source_spine_to_superspine['local_interface']
-            })
-        # Segment 3: Super Spine → Destination Spine
-        if isinstance(dest_spine_to_superspine, dict) and 'local_interface' in dest_spine_to_superspine:
-            path['segments'].append({
-                'type': 'superspine_to_spine',
-                'source_device': superspine,
-                'dest_device': dest_spine,
-                'source_interface': dest_spine_to_superspine['remote_interface'],
-                'dest_interface': dest_spine_to_superspine['local_interface']
-            })
-        else:
-            path['segments'].append({
-                'type': 'superspine_to_spine',
-                'source_device': superspine,
-                'dest_device': dest_spine,
-                'source_interface': dest_spine_to_superspine['local_interface'],
-                'dest_interface': dest_spine_to_superspine['remote_interface']
-            })
-        # Segment 4: Destination Spine → Destination Leaf
-        path['segments'].append({
-            'type': 'spine_to_leaf',
-            'source_device': dest_spine,
-            'dest_device': normalized_dest_leaf,
-            'source_interface': dest_leaf_conn['remote_interface'],
-            'dest_interface': dest_leaf_conn['local_interface']
-        })
-        self.logger.info(f"[PATH] 3-tier segments:")
-        for seg in path['segments']:
-            self.logger.info(f"  {seg['type']}: {seg['source_device']} {seg['source_interface']} -> {seg['dest_device']} {seg['dest_interface']}")
-        self.logger.info(f"[PATH] Calculated path: {normalized_source_leaf} → {source_spine} → {superspine} → {dest_spine} → {normalized_dest_leaf}")
+        self.logger.info(f"[PATH] Calculated {'2' if leaf_path.is_two_tier else '3'}-tier path: "
+                         f"{' → '.join(leaf_path.devices)} ({len(paths)} equal-cost path(s))")
         return path
     
     def get_bundle_for_interface(self, device: str, interface: str) -> Optional[str]:
         """
         Get bundle name for a physical interface
         """
-        bundles = self.bundle_mappings.get('bundles', {})
-        for bundle_key, bundle_info in bundles.items():
-            if bundle_info.get('device') == device:
-                members = bundle_info.get('members', [])
-                if interface in members:
-                    self.logger.info(f"[BUNDLE] Bundle lookup: {device} {interface} -> {bundle_info.get('name')}")
-                    return bundle_info.get('name')
-        device_variations = [
-            device,
-            device.upper(),
-            device.lower(),
-            device.replace('_', '-'),
-            device.replace('-', '_'),
-            device.replace('SUPERSPINE', 'SuperSpine'),
-            device.replace('SuperSpine', 'SUPERSPINE'),
-            device.replace('SPINE', 'Spine'),
-            device.replace('Spine', 'SPINE'),
-            device.replace('LEAF', 'Leaf'),
-            device.replace('Leaf', 'LEAF'),
-        ]
-        for device_variant in device_variations:
-            for bundle_key, bundle_info in bundles.items():
-                if bundle_info.get('device') == device_variant:
-                    members = bundle_info.get('members', [])
-                    if interface in members:
-                        self.logger.info(f"[BUNDLE] Bundle lookup: {device_variant} {interface} -> {bundle_info.get('name')}")
-                        return bundle_info.get('name')
-        device_mappings = self.bundle_mappings.get(device, {})
-        if interface in device_mappings:
-            self.logger.info(f"[BUNDLE] Bundle lookup: {device} {interface} -> {device_mappings[interface]}")
-            return device_mappings[interface]
-        for device_variant in device_variations:
-            device_mappings = self.bundle_mappings.get(device_variant, {})
-            if interface in device_mappings:
-                self.logger.info(f"[BUNDLE] Bundle lookup: {device_variant} {interface} -> {device_mappings[interface]}")
-                return device_mappings[interface]
-        self.logger.warning(f"[BUNDLE] Bundle lookup: {device} {interface} -> NOT FOUND")
-        return None
+        bundle_name = self.bundle_index.bundle_name(device, interface)
+        if bundle_name:
+            self.logger.debug(f"[BUNDLE] Bundle lookup: {device} {interface} -> {bundle_name}")
+        else:
+            self.logger.warning(f"[BUNDLE] Bundle lookup: {device} {interface} -> NOT FOUND")
+        return bundle_name
     
     def _find_bundle_for_device(self, device_name: str, interface_name: str) -> Optional[Dict]:
         """Find bundle information for a device and interface using canonical keys."""
-        if not hasattr(self, 'bundle_mappings') or not self.bundle_mappings:
-            return None
-        bundles = self.bundle_mappings.get('bundles', {})
-        if not bundles:
-            return None
-        device_key = self.normalizer.canonical_key(device_name)
-        for bundle_name, bundle_info in bundles.items():
-            if isinstance(bundle_info, dict) and 'device' in bundle_info:
-                bundle_device = bundle_info['device']
-                bundle_device_key = self.normalizer.canonical_key(bundle_device)
-                if bundle_device_key == device_key:
-                    members = bundle_info.get('members', [])
-                    if interface_name in members:
-                        self.logger.info(f"[BUNDLE] Bundle lookup: {device_name} {interface_name} using device variant {bundle_device} -> {bundle_info.get('name')}")
-                        return bundle_info
-            if '_bundle-' in bundle_name:
-                bundle_device_from_name = bundle_name.split('_bundle-')[0]
-                device_variations = [
-                    device_name,
-                    device_name.replace('-', '_'),
-                    device_name.replace('_', '-'),
-                    device_name.replace('SPINE-', 'SPINE_'),
-                    device_name.replace('SPINE_', 'SPINE-'),
-                ]
-                if 'SPINE' in device_name and 'D14' in device_name:
-                    device_variations.extend([
-                        device_name.replace('SPINE-', 'SPINE-NCP1-'),
-                        device_name.replace('SPINE-', 'SPINE-NCPL-'),
-                        device_name.replace('SPINE-', 'SPINE-NCP-'),
-                    ])
-                
-                # Also try SuperSpine vs SUPERSPINE variations
-                if 'SUPERSPINE' in device_name:
-                    device_variations.extend([
-                        device_name.replace('SUPERSPINE', 'SuperSpine'),  # DNAAS-SuperSpine-D04
-                        device_name.replace('SuperSpine', 'SUPERSPINE'),   # DNAAS-SUPERSPINE-D04
-                    ])
-                
-                # Check if any variation matches the bundle device name
-                for variation in device_variations:
-                    if bundle_device_from_name == variation:
-                        # Check if interface is in bundle members
-                        members = bundle_info.get('members', [])
-                        if interface_name in members:
-                            self.logger.info(f"[BUNDLE] Bundle lookup: {device_name} {interface_name} using bundle name variation {bundle_device_from_name} -> {bundle_info.get('name')}")
-                            return bundle_info
-        self.logger.warning(f"[BUNDLE] Bundle lookup: {device_name} {interface_name} -> NOT FOUND")
-        return None
+        bundle_info = self.bundle_index.find(device_name, interface_name)
+        if bundle_info is None:
+            self.logger.warning(f"[BUNDLE] Bundle lookup: {device_name} {interface_name} -> NOT FOUND")
+        return bundle_info
     
     def get_available_leaves(self) -> List[str]:
         """
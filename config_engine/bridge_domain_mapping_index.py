@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Bridge Domain Mapping Index
+
+Process-level, in-memory view of the latest bridge domain mapping file used by
+the /api/bridge-domains/* endpoints. The mapping is loaded once and reloaded
+only when the newest bridge_domain_mapping_*.json changes (checked with a stat
+of the directory and of the current file). Each load precomputes the list-row
+summaries and a trigram index over name, VLAN and username, so list, detail
+and search requests are answered from memory.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAPPING_DIR = Path("topology/bridge_domain_discovery")
+MAPPING_FILE_PREFIX = "bridge_domain_mapping_"
+NGRAM_SIZE = 3
+
+
+def build_list_row(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary row returned by the list and search endpoints"""
+    topology_analysis = data.get('topology_analysis', {})
+    return {
+        "name": name,
+        "vlan": data.get('detected_vlan', 'unknown'),
+        "username": data.get('detected_username', 'unknown'),
+        "confidence": data.get('confidence', 0),
+        "topology_type": data.get('topology_type', 'unknown'),
+        "total_devices": len(data.get('devices', {})),
+        "total_interfaces": topology_analysis.get('total_interfaces', 0),
+        "access_interfaces": topology_analysis.get('access_interfaces', 0),
+        "path_complexity": topology_analysis.get('path_complexity', 'unknown'),
+        "detection_method": data.get('detection_method', 'unknown')
+    }
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class MappingSnapshot:
+    """One loaded mapping file with its precomputed rows and search index"""
+
+    def __init__(self, mapping: Dict[str, Any], source: Path):
+        self.mapping = mapping
+        self.source = source
+        self.bridge_domains: Dict[str, Dict[str, Any]] = mapping.get('bridge_domains', {})
+        self.summary = mapping.get('topology_summary', {})
+
+        self.names: List[str] = list(self.bridge_domains)
+        self.rows: List[Dict[str, Any]] = []
+        # Lower-cased name / VLAN / username per bridge domain, in mapping order
+        self._fields: List[Tuple[str, str, str]] = []
+        self._index: Dict[str, Set[int]] = {}
+
+        for position, (name, data) in enumerate(self.bridge_domains.items()):
+            self.rows.append(build_list_row(name, data))
+            fields = (name.lower(),
+                      str(data.get('detected_vlan', '')).lower(),
+                      str(data.get('detected_username', '')).lower())
+            self._fields.append(fields)
+            for field_value in fields:
+                for gram in _ngrams(field_value):
+                    self._index.setdefault(gram, set()).add(position)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.bridge_domains.get(name)
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Rows whose name, VLAN or username contains the query (case-insensitive),
+        in mapping order. The trigram index narrows the candidates; every
+        candidate is then checked with a plain substring test.
+        """
+        query = query.lower()
+        if len(query) < NGRAM_SIZE:
+            candidates = range(len(self.rows))
+        else:
+            postings = []
+            for gram in _ngrams(query):
+                posting = self._index.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = sorted(set.intersection(*postings))
+
+        return [self.rows[position] for position in candidates
+                if any(query in field_value for field_value in self._fields[position])]
+
+
+class BridgeDomainMappingIndex:
+    """Reloads the newest mapping file only when it changes and serves snapshots of it"""
+
+    def __init__(self, mapping_dir: Path = DEFAULT_MAPPING_DIR):
+        self.mapping_dir = Path(mapping_dir)
+        self._lock = threading.Lock()
+        self._snapshot: Optional[MappingSnapshot] = None
+        self._dir_mtime: Optional[int] = None
+        self._latest: Optional[Path] = None
+        self._latest_stat: Optional[Tuple[int, int]] = None
+        self.stats = {'loads': 0, 'checks': 0}
+
+    def snapshot(self) -> Optional[MappingSnapshot]:
+        """Current mapping snapshot, or None when there is no readable mapping file"""
+        with self._lock:
+            self.stats['checks'] += 1
+            try:
+                dir_mtime = os.stat(self.mapping_dir).st_mtime_ns
+            except OSError:
+                self._reset()
+                return None
+
+            # Adding or removing a file changes the directory mtime; a rewrite
+            # of the current file changes that file's own mtime/size
+            if dir_mtime != self._dir_mtime or self._latest is None:
+                latest = self._find_latest()
+                self._dir_mtime = dir_mtime
+            else:
+                latest = self._latest
+
+            if latest is None:
+                self._reset(keep_dir=True)
+                return None
+
+            try:
+                st = os.stat(latest)
+            except OSError:
+                # Removed between the scan and the stat; rescan next time
+                self._dir_mtime = None
+                return self._snapshot
+            latest_stat = (st.st_mtime_ns, st.st_size)
+
+            if latest != self._latest or latest_stat != self._latest_stat or self._snapshot is None:
+                self._load(latest, latest_stat)
+            return self._snapshot
+
+    def get_mapping(self) -> Optional[Dict[str, Any]]:
+        """Raw mapping dict, same shape as BridgeDomainVisualization.load_latest_mapping()"""
+        snapshot = self.snapshot()
+        return snapshot.mapping if snapshot else None
+
+    def invalidate(self):
+        """Force a rescan and reload on the next access"""
+        with self._lock:
+            self._reset()
+
+    def _find_latest(self) -> Optional[Path]:
+        latest, latest_mtime = None, None
+        try:
+            with os.scandir(self.mapping_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith(MAPPING_FILE_PREFIX) and entry.name.endswith('.json')):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    if latest_mtime is None or mtime > latest_mtime:
+                        latest, latest_mtime = Path(entry.path), mtime
+        except OSError:
+            return None
+        return latest
+
+    def _load(self, path: Path, file_stat: Tuple[int, int]):
+        try:
+            with open(path, 'r') as f:
+                mapping = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading mapping file {path}: {e}")
+            # Keep serving the previous snapshot; retry once the file changes again
+            self._latest, self._latest_stat = path, file_stat
+            return
+        self._snapshot = MappingSnapshot(mapping, path)
+        self._latest, self._latest_stat = path, file_stat
+        self.stats['loads'] += 1
+        logger.info(f"Loaded bridge domain mapping {path.name} ({len(self._snapshot.rows)} bridge domains)")
+
+    def _reset(self, keep_dir: bool = False):
+        self._snapshot = None
+        self._latest = None
+        self._latest_stat = None
+        if not keep_dir:
+            self._dir_mtime = None
+
+
+_mapping_index: Optional[BridgeDomainMappingIndex] = None
+_mapping_index_lock = threading.Lock()
+
+
+def get_mapping_index() -> BridgeDomainMappingIndex:
+    """Get the process-wide bridge domain mapping index."""
+    global _mapping_index
+    if _mapping_index is None:
+        with _mapping_index_lock:
+            if _mapping_index is None:
+                _mapping_index = BridgeDomainMappingIndex()
+    return _mapping_index
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Bundle Index
+Precomputed (device, member interface) -> bundle lookup over the bundle
+mapping file, built once when the mapping is loaded.
+
+Bundle lookups used to scan every bundle for the exact device name and then
+rescan for a list of hand-built name variants (case, '-'/'_', SuperSpine,
+NCP suffixes). Here every bundle is indexed under its exact device name and
+under the device's canonical key, so a lookup is a few dict probes.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from .device_name_normalizer import normalizer
+
+NCC_SUFFIXES = ('-NCC0', '-NCC1')
+
+
+def chassis_name(device_name: str) -> str:
+    """Device name without its NCC suffix (both NCCs of a superspine are one chassis)"""
+    for suffix in NCC_SUFFIXES:
+        device_name = device_name.replace(suffix, '')
+    return device_name
+
+
+class BundleIndex:
+    """
+    Read-only index of a loaded bundle mapping.
+
+    Lookups try, in order: the exact device name; the canonical key of the
+    device name (case, separators and NCP suffixes ignored); the canonical key
+    of the normalized name (e.g. DNAAS-SPINE-NCP1-D14 -> DNAAS-SPINE-D14); and
+    the device part of '<device>_bundle-<n>' bundle keys. Within each step the
+    first bundle in file order wins, as with the former linear scans.
+    """
+
+    def __init__(self, bundle_mappings: Optional[Dict[str, Any]]):
+        bundle_mappings = bundle_mappings or {}
+        bundles = bundle_mappings.get('bundles', {}) or {}
+
+        exact: Dict[Tuple[str, str], Dict] = {}
+        canonical: Dict[Tuple[str, str], Dict] = {}
+        normalized: Dict[Tuple[str, str], Dict] = {}
+        by_bundle_key: Dict[Tuple[str, str], Dict] = {}
+        chassis: Dict[Tuple[str, str], Dict] = {}
+
+        for bundle_key, bundle_info in bundles.items():
+            if not isinstance(bundle_info, dict):
+                continue
+            members = bundle_info.get('members', []) or []
+            device = bundle_info.get('device')
+            if device:
+                canonical_device = self._canonical(device)
+                normalized_device = self._canonical(normalizer.normalize_device_name(device))
+                chassis_device = self._canonical(chassis_name(device))
+                for member in members:
+                    exact.setdefault((device, member), bundle_info)
+                    canonical.setdefault((canonical_device, member), bundle_info)
+                    normalized.setdefault((normalized_device, member), bundle_info)
+                    chassis.setdefault((chassis_device, member), bundle_info)
+            if '_bundle-' in bundle_key:
+                key_device = bundle_key.split('_bundle-')[0]
+                for device_key in {self._canonical(key_device),
+                                   self._canonical(normalizer.normalize_device_name(key_device))}:
+                    for member in members:
+                        by_bundle_key.setdefault((device_key, member), bundle_info)
+
+        self._exact = exact
+        self._canonical_steps = (canonical, normalized, by_bundle_key)
+        self._chassis = chassis
+
+        # Old bundle_interface_mapping.yaml format: {device: {interface: bundle_name}}
+        self._legacy: Dict[Tuple[str, str], str] = {}
+        self._legacy_canonical: Dict[Tuple[str, str], str] = {}
+        for device, interfaces in bundle_mappings.items():
+            if device == 'bundles' or not isinstance(interfaces, dict):
+                continue
+            canonical_device = self._canonical(device)
+            for interface, bundle_name in interfaces.items():
+                if isinstance(bundle_name, str):
+                    self._legacy.setdefault((device, interface), bundle_name)
+                    self._legacy_canonical.setdefault((canonical_device, interface), bundle_name)
+
+        # Lookup keys of device names seen in queries
+        self._device_keys: Dict[str, Tuple[str, str]] = {}
+        self.bundle_count = len(bundles)
+
+    @staticmethod
+    def _canonical(device_name: str) -> str:
+        return normalizer.canonical_key(device_name)
+
+    def _keys(self, device: str) -> Tuple[str, str]:
+        keys = self._device_keys.get(device)
+        if keys is None:
+            keys = self._device_keys[device] = (
+                self._canonical(device), self._canonical(normalizer.normalize_device_name(device))
+            )
+        return keys
+
+    def find(self, device: str, interface: str) -> Optional[Dict]:
+        """Bundle info (name, device, members, ...) of the bundle containing interface on device"""
+        if not device:
+            return None
+        bundle_info = self._exact.get((device, interface))
+        if bundle_info is not None:
+            return bundle_info
+        canonical_device, normalized_device = self._keys(device)
+        canonical, normalized, by_bundle_key = self._canonical_steps
+        return (canonical.get((canonical_device, interface))
+                or normalized.get((normalized_device, interface))
+                or by_bundle_key.get((canonical_device, interface))
+                or by_bundle_key.get((normalized_device, interface)))
+
+    def find_on_chassis(self, device: str, interface: str) -> Optional[Dict]:
+        """Like find(), but matching either NCC of a superspine chassis"""
+        bundle_info = self.find(device, interface)
+        if bundle_info is None and device:
+            bundle_info = self._chassis.get((self._canonical(chassis_name(device)), interface))
+        return bundle_info
+
+    def bundle_name(self, device: str, interface: str, match_chassis: bool = False) -> Optional[str]:
+        """Bundle name for a physical interface, or None"""
+        bundle_info = self.find_on_chassis(device, interface) if match_chassis else self.find(device, interface)
+        if bundle_info is not None:
+            return bundle_info.get('name')
+        if not device:
+            return None
+        return (self._legacy.get((device, interface))
+                or self._legacy_canonical.get((self._keys(device)[0], interface)))
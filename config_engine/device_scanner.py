@@ -4,7 +4,6 @@ Device Scanner - Discovers existing bridge domains on network devices
 and converts them to configuration records for the database.
 """
 
-import paramiko
 import yaml
 import json
 import re
@@ -16,6 +15,7 @@ from typing import Dict, List, Optional, Tuple
 sys.path.append(str(Path(__file__).parent.parent))
 
 from database_manager import DatabaseManager
+from utils.ssh_pool import PooledSession, get_session_pool
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -36,12 +36,9 @@ class DeviceScanner:
             logger.error(f"Failed to load devices file: {e}")
             return {}
     
-    def _connect_to_device(self, device_info: Dict) -> Optional[paramiko.SSHClient]:
-        """Establish SSH connection to a device"""
+    def _connect_to_device(self, device_info: Dict) -> Optional[PooledSession]:
+        """Borrow a pooled SSH session for a device (close() returns it to the pool)"""
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
             # Get device connection info, merging with defaults
             defaults = self.devices.get('defaults', {})
             hostname = device_info.get('mgmt_ip') or device_info.get('hostname')
@@ -53,70 +50,26 @@ class DeviceScanner:
                 logger.error(f"No hostname/mgmt_ip found for device")
                 return None
             
-            ssh.connect(
-                hostname=hostname,
+            return get_session_pool().acquire(
+                hostname,
+                username,
+                password,
                 port=port,
-                username=username,
-                password=password,
-                key_filename=device_info.get('key_file'),
-                timeout=30
+                key_filename=device_info.get('key_file')
             )
-            return ssh
         except Exception as e:
             logger.error(f"Failed to connect to {device_info.get('mgmt_ip', 'unknown')}: {e}")
             return None
     
-    def _execute_command(self, ssh: paramiko.SSHClient, command: str) -> Tuple[bool, str]:
-        """Execute a command on the device and return the output"""
+    def _execute_command(self, ssh: PooledSession, command: str) -> Tuple[bool, str]:
+        """Execute a command on the device's pooled shell and return the output"""
         try:
-            # Use interactive shell like the verification function
-            shell = ssh.invoke_shell()
-            shell.settimeout(10)
-            output = ''
-            
-            # Wait for initial prompt
-            import time
-            time.sleep(1)
-            try:
-                initial_output = shell.recv(4096).decode(errors='ignore')
-                output += initial_output
-            except Exception as e:
-                logger.warning(f"Timeout getting initial output: {e}")
-            
-            # Send command
-            shell.send(command + '\n')
-            time.sleep(2)
-            
-            # Read response and handle pager
-            while True:
-                try:
-                    response = shell.recv(4096).decode(errors='ignore')
-                    output += response
-                    
-                    # Check for "More" prompt and send 'q' to quit
-                    if '-- More --' in response or 'Press q to quit' in response:
-                        shell.send('q\n')
-                        time.sleep(1)
-                        try:
-                            final_response = shell.recv(4096).decode(errors='ignore')
-                            output += final_response
-                        except:
-                            pass
-                        break
-                    
-                    # If no more data, break
-                    if not response:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"Timeout getting response: {e}")
-                    break
-            
-            shell.close()
-            
+            # Pagers are walked through by the prompt-driven reader
+            output = ssh.send_command_with_full_output(command, timeout=30)
             return True, output
         except Exception as e:
             logger.error(f"Failed to execute command '{command}': {e}")
+            ssh.invalidate()
             return False, str(e)
     
     def _parse_bridge_domains(self, output: str) -> List[Dict]:
@@ -159,7 +112,7 @@ class DeviceScanner:
         
         return bridge_domains
     
-    def _get_bridge_domain_details(self, ssh: paramiko.SSHClient, service_name: str) -> Dict:
+    def _get_bridge_domain_details(self, ssh: PooledSession, service_name: str) -> Dict:
         """Get detailed information about a specific bridge domain"""
         details = {
             'service_name': service_name,
@@ -32,6 +32,9 @@ from config_engine.phase1_data_structures.enums import (
     InterfaceType, ValidationStatus, DeviceType
 )
 from config_engine.service_name_analyzer import ServiceNameAnalyzer
+from utils.parsed_data_store import (
+    ParsedDataStore, SECTION_BRIDGE_DOMAINS, SECTION_NEIGHBORS, SECTION_VLAN_CONFIGS
+)
 from config_engine.bridge_domain_classifier import BridgeDomainClassifier
 
 logger = logging.getLogger(__name__)
@@ -82,6 +85,11 @@ class EnhancedBridgeDomainDiscovery:
         self._vlan_config_cache = {}
         self.bridge_domain_parsed_dir = Path('topology/configs/parsed_data/bridge_domain_parsed')
         
+        # Single-file parsed data store written by the parse phase (preferred over YAML)
+        self.parsed_store_path = self.parsed_data_dir / 'parsed_data.pds'
+        self._parsed_store = None
+        self._parsed_store_checked = False
+        
         # Output directory setup
         self.output_dir = Path('topology/enhanced_bridge_domain_discovery')
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -101,6 +109,13 @@ class EnhancedBridgeDomainDiscovery:
             'stats': self.discovery_stats.copy()
         }
     
+    def _get_parsed_store(self) -> Optional[ParsedDataStore]:
+        """Open the parsed data store once per discovery instance, if it exists."""
+        if not self._parsed_store_checked:
+            self._parsed_store = ParsedDataStore.open(self.parsed_store_path)
+            self._parsed_store_checked = True
+        return self._parsed_store
+    
     def load_lldp_data(self, device_name: str) -> Dict[str, Dict]:
         """
         Load LLDP neighbor information from parsed data files.
@@ -115,18 +130,11 @@ class EnhancedBridgeDomainDiscovery:
             LLDPDataMissingError: If LLDP data file is not found or empty
         """
         try:
-            # Find the LLDP parsed file for this device
-            lldp_pattern = f"{self.parsed_data_dir}/{device_name}_lldp_parsed_*.yaml"
-            lldp_files = glob.glob(lldp_pattern)
-            
-            if not lldp_files:
-                raise LLDPDataMissingError(f"No LLDP data file found for device {device_name}")
-            
-            # Use the most recent file if multiple exist
-            lldp_file = max(lldp_files, key=os.path.getctime)
-            
-            with open(lldp_file, 'r') as f:
-                lldp_data = yaml.safe_load(f)
+            store = self._get_parsed_store()
+            if store is not None and store.has(SECTION_NEIGHBORS, device_name):
+                lldp_data = {'neighbors': store.get(SECTION_NEIGHBORS, device_name, [])}
+            else:
+                lldp_data = self._load_lldp_yaml(device_name)
             
             if not lldp_data or 'neighbors' not in lldp_data:
                 raise LLDPDataMissingError(f"Empty or invalid LLDP data for device {device_name}")
@@ -151,6 +159,20 @@ class EnhancedBridgeDomainDiscovery:
             else:
                 raise LLDPDataMissingError(f"Failed to load LLDP data for {device_name}: {str(e)}")
     
+    def _load_lldp_yaml(self, device_name: str) -> Dict[str, Any]:
+        """Load the most recent parsed LLDP YAML file for a device."""
+        lldp_pattern = f"{self.parsed_data_dir}/{device_name}_lldp_parsed_*.yaml"
+        lldp_files = glob.glob(lldp_pattern)
+        
+        if not lldp_files:
+            raise LLDPDataMissingError(f"No LLDP data file found for device {device_name}")
+        
+        # Use the most recent file if multiple exist
+        lldp_file = max(lldp_files, key=os.path.getctime)
+        
+        with open(lldp_file, 'r') as f:
+            return yaml.safe_load(f)
+    
     def determine_interface_role_from_lldp(self, interface_name: str, lldp_data: Dict, device_type: DeviceType) -> InterfaceRole:
         """
         Determine interface role based on LLDP neighbor information.
@@ -386,14 +408,22 @@ NO FALLBACK LOGIC - All interfaces must have LLDP data for proper role assignmen
         """
         parsed_data = {}
         
-        # Load bridge domain instance data
-        for instance_file in self.bridge_domain_parsed_dir.glob('*_bridge_domain_instance_parsed_*.yaml'):
+        store = self._get_parsed_store()
+        if store is not None and store.devices(SECTION_BRIDGE_DOMAINS):
+            sources = [(device_name, None) for device_name in store.devices(SECTION_BRIDGE_DOMAINS)]
+        else:
+            sources = [(instance_file.name.split('_bridge_domain_instance_parsed_')[0], instance_file)
+                       for instance_file in self.bridge_domain_parsed_dir.glob('*_bridge_domain_instance_parsed_*.yaml')]
+        
+        # Load bridge domain instance data (from the parsed data store, or per-device YAML)
+        for device_name, instance_file in sources:
             try:
-                device_name = instance_file.name.split('_bridge_domain_instance_parsed_')[0]
-                
-                with open(instance_file, 'r') as f:
-                    data = yaml.safe_load(f)
-                    bridge_domain_instances = data.get('bridge_domain_instances', [])
+                if instance_file is None:
+                    bridge_domain_instances = store.get(SECTION_BRIDGE_DOMAINS, device_name, [])
+                else:
+                    with open(instance_file, 'r') as f:
+                        data = yaml.safe_load(f)
+                        bridge_domain_instances = data.get('bridge_domain_instances', [])
                 
                 # Create enhanced VLAN configurations for this device
                 enhanced_vlan_configs = self._create_enhanced_vlan_configs(device_name, bridge_domain_instances)
@@ -407,7 +437,7 @@ NO FALLBACK LOGIC - All interfaces must have LLDP data for proper role assignmen
                 logger.info(f"Loaded {device_name}: {len(bridge_domain_instances)} bridge domains, {len(enhanced_vlan_configs)} enhanced VLAN configs")
                 
             except Exception as e:
-                logger.error(f"Error loading {instance_file}: {e}")
+                logger.error(f"Error loading {instance_file or device_name}: {e}")
         
         return parsed_data
     
@@ -999,6 +1029,11 @@ NO FALLBACK LOGIC - All interfaces must have LLDP data for proper role assignmen
         # Check cache first
         if device_name in self._vlan_config_cache:
             return self._vlan_config_cache[device_name]
+        
+        store = self._get_parsed_store()
+        if store is not None and store.has(SECTION_VLAN_CONFIGS, device_name):
+            self._vlan_config_cache[device_name] = store.get(SECTION_VLAN_CONFIGS, device_name, [])
+            return self._vlan_config_cache[device_name]
             
         try:
             # Look for the most recent VLAN config file for this device
@@ -461,10 +461,11 @@ class SimplifiedDiscoveryCLI:
         print("2. 📋 Test Data Structure Contracts") 
         print("3. 🗂️  Clean Output Directory")
         print("4. 📝 View System Logs")
-        print("5. 🔙 Back to Discovery Menu")
+        print("5. 🔄 Rediscover Specific Devices")
+        print("6. 🔙 Back to Discovery Menu")
         print()
         
-        choice = input("Select an option [1-5]: ").strip()
+        choice = input("Select an option [1-6]: ").strip()
         
         if choice == '1':
             self.validate_system_architecture()
@@ -475,10 +476,47 @@ class SimplifiedDiscoveryCLI:
         elif choice == '4':
             self.view_system_logs()
         elif choice == '5':
+            self.run_device_rediscovery()
+        elif choice == '6':
             return
         else:
             print("❌ Invalid choice.")
     
+    def run_device_rediscovery(self):
+        """Rediscover only the bridge domains touching specific devices"""
+        
+        print("\n🔄 Rediscover Specific Devices...")
+        device_input = input("Device names (comma-separated): ").strip()
+        devices = [name.strip() for name in device_input.split(',') if name.strip()]
+        if not devices:
+            print("❌ No devices given.")
+            return
+        
+        try:
+            results = run_simplified_discovery(devices=devices)
+            self.last_results = results
+            
+            if not results.is_incremental:
+                # No previous run to build on - a full discovery was done instead
+                self.display_results_summary(results)
+                return
+            
+            print(f"✅ Rediscovery completed for {', '.join(devices)}:")
+            print(f"   • Updated bridge domains: {len(results.updated_bridge_domains)}")
+            print(f"   • Removed bridge domains: {len(results.removed_bridge_domains)}")
+            
+            sync_result = self.sync_manager.sync_discovery_delta(
+                results.updated_bridge_domains, results.removed_bridge_domains
+            )
+            if 'error' in sync_result:
+                print(f"⚠️  Data sync failed: {sync_result['error']}")
+            else:
+                print(f"   • Database: {sync_result['database_saved']} saved, {sync_result['database_removed']} removed")
+        
+        except Exception as e:
+            print(f"❌ Rediscovery failed: {e}")
+            logger.error(f"Device rediscovery failed: {e}")
+    
     def validate_system_architecture(self):
         """Validate system architecture against guided rails"""
         
@@ -140,6 +140,23 @@ class VLANConfiguration:
         return (self.vlan_manipulation is not None and
                 ('push' in self.vlan_manipulation.lower() or 
                  'pop' in self.vlan_manipulation.lower()))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert VLAN configuration to dictionary for serialization"""
+        return {
+            'vlan_id': self.vlan_id,
+            'outer_vlan': self.outer_vlan,
+            'inner_vlan': self.inner_vlan,
+            'vlan_range_start': self.vlan_range_start,
+            'vlan_range_end': self.vlan_range_end,
+            'vlan_list': list(self.vlan_list),
+            'vlan_manipulation': self.vlan_manipulation
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VLANConfiguration':
+        """Create VLANConfiguration from dictionary"""
+        return cls(**data)
 
 
 @dataclass
@@ -171,6 +188,29 @@ class InterfaceInfo:
     def is_subinterface(self) -> bool:
         """Check if this is a subinterface"""
         return '.' in self.name
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert interface info to dictionary for serialization"""
+        return {
+            'name': self.name,
+            'device_name': self.device_name,
+            'vlan_config': self.vlan_config.to_dict(),
+            'interface_type': self.interface_type,
+            'interface_role': self.interface_role,
+            'neighbor_device': self.neighbor_device,
+            'raw_config': list(self.raw_config),
+            'neighbor_interface': self.neighbor_interface,
+            'admin_state': self.admin_state,
+            'role_assignment_method': self.role_assignment_method,
+            'confidence': self.confidence
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InterfaceInfo':
+        """Create InterfaceInfo from dictionary"""
+        data = dict(data)
+        data['vlan_config'] = VLANConfiguration.from_dict(data['vlan_config'])
+        return cls(**data)
 
 
 @dataclass
@@ -220,6 +260,43 @@ class ProcessedBridgeDomain:
         self.validation_status = ValidationStatus.WARNING
         if self.confidence_score > 0.8:
             self.confidence_score = 0.8
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert processed bridge domain to dictionary for serialization"""
+        return {
+            'name': self.name,
+            'devices': list(self.devices),
+            'interfaces': [interface.to_dict() for interface in self.interfaces],
+            'bridge_domain_type': self.bridge_domain_type.value if self.bridge_domain_type else None,
+            'global_identifier': self.global_identifier,
+            'username': self.username,
+            'bridge_domain_scope': self.bridge_domain_scope.value,
+            'consolidation_key': self.consolidation_key,
+            'can_consolidate': self.can_consolidate,
+            'device_types': {device: device_type.value for device, device_type in self.device_types.items()},
+            'interface_roles': dict(self.interface_roles),
+            'processing_timestamp': self.processing_timestamp.isoformat(),
+            'processing_phase': self.processing_phase,
+            'confidence_score': self.confidence_score,
+            'validation_status': self.validation_status.value,
+            'processing_errors': list(self.processing_errors),
+            'processing_warnings': list(self.processing_warnings),
+            'bd_id': self.bd_id
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProcessedBridgeDomain':
+        """Create ProcessedBridgeDomain from dictionary"""
+        data = dict(data)
+        data['interfaces'] = [InterfaceInfo.from_dict(interface) for interface in data['interfaces']]
+        if data.get('bridge_domain_type') is not None:
+            data['bridge_domain_type'] = BridgeDomainType(data['bridge_domain_type'])
+        data['bridge_domain_scope'] = BridgeDomainScope(data['bridge_domain_scope'])
+        data['device_types'] = {device: DeviceType(device_type)
+                                for device, device_type in data['device_types'].items()}
+        data['processing_timestamp'] = datetime.fromisoformat(data['processing_timestamp'])
+        data['validation_status'] = ValidationStatus(data['validation_status'])
+        return cls(**data)
 
 
 # =============================================================================
@@ -296,6 +373,47 @@ class ConsolidatedBridgeDomain:
         if not self.all_interfaces:
             self.final_errors.append("No interfaces in consolidated bridge domain")
             self.validation_status = ValidationStatus.INVALID
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert consolidated bridge domain to dictionary for serialization"""
+        return {
+            'consolidated_name': self.consolidated_name,
+            'consolidation_key': self.consolidation_key,
+            'global_identifier': self.global_identifier,
+            'username': self.username,
+            'all_devices': list(self.all_devices),
+            'all_interfaces': [interface.to_dict() for interface in self.all_interfaces],
+            'bridge_domain_type': self.bridge_domain_type.value if self.bridge_domain_type else None,
+            'bridge_domain_scope': self.bridge_domain_scope.value,
+            'source_bridge_domains': list(self.source_bridge_domains),
+            'topology_paths': self.topology_paths,
+            'network_topology': self.network_topology,
+            'consolidation_timestamp': self.consolidation_timestamp.isoformat(),
+            'consolidation_method': self.consolidation_method,
+            'consolidation_confidence': self.consolidation_confidence,
+            'consolidation_conflicts': list(self.consolidation_conflicts),
+            'validation_status': self.validation_status.value,
+            'final_errors': list(self.final_errors),
+            'final_warnings': list(self.final_warnings),
+            'consolidated_id': self.consolidated_id
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConsolidatedBridgeDomain':
+        """Create ConsolidatedBridgeDomain from dictionary"""
+        data = dict(data)
+        final_errors = data.pop('final_errors')
+        validation_status = ValidationStatus(data.pop('validation_status'))
+        data['all_interfaces'] = [InterfaceInfo.from_dict(interface) for interface in data['all_interfaces']]
+        if data.get('bridge_domain_type') is not None:
+            data['bridge_domain_type'] = BridgeDomainType(data['bridge_domain_type'])
+        data['bridge_domain_scope'] = BridgeDomainScope(data['bridge_domain_scope'])
+        data['consolidation_timestamp'] = datetime.fromisoformat(data['consolidation_timestamp'])
+        cbd = cls(**data)
+        # __post_init__ re-derives validation; restore what was saved instead
+        cbd.final_errors = final_errors
+        cbd.validation_status = validation_status
+        return cbd
 
 
 @dataclass
@@ -333,6 +451,16 @@ class DiscoveryResults:
     # Session info
     discovery_session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     
+    # Device-scoped rediscovery: only the changed part of the mapping
+    rediscovered_devices: List[str] = field(default_factory=list)
+    updated_bridge_domains: Dict[str, Any] = field(default_factory=dict)  # Legacy-format entries
+    removed_bridge_domains: List[str] = field(default_factory=list)
+    
+    @property
+    def is_incremental(self) -> bool:
+        """True when these results come from a device-scoped rediscovery"""
+        return bool(self.rediscovered_devices)
+    
     def finalize_results(self):
         """Calculate final statistics and metrics"""
         self.discovery_end_time = datetime.now()
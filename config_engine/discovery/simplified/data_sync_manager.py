@@ -17,6 +17,8 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from utils.sqlite_bulk_writer import DEFAULT_BATCH_SIZE
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,9 +32,10 @@ class DataSyncManager:
     - Automatic synchronization on discovery runs
     """
     
-    def __init__(self, db_path: str = "instance/lab_automation.db"):
-        """Initialize sync manager"""
+    def __init__(self, db_path: str = "instance/lab_automation.db", batch_size: int = DEFAULT_BATCH_SIZE):
+        """Initialize sync manager (batch_size: rows per batched database write)"""
         self.db_path = db_path
+        self.batch_size = batch_size
         self.json_dir = Path("topology/simplified_discovery_results")
         self.json_dir.mkdir(exist_ok=True)
     
@@ -65,21 +68,49 @@ class DataSyncManager:
             logger.error(f"❌ Sync failed: {e}")
             return {"error": str(e)}
     
+    def sync_discovery_delta(self, updated_bridge_domains: Dict[str, Any],
+                             removed_bridge_domains: List[str]) -> Dict[str, Any]:
+        """
+        Apply a device-scoped rediscovery to the database.
+        
+        Only the changed bridge domains are written and the ones that
+        disappeared are deleted; the delta JSON file was already written by
+        the discovery run.
+        """
+        try:
+            print("🔄 Starting delta synchronization...")
+            
+            db_result = self._save_to_database({'bridge_domains': updated_bridge_domains})
+            
+            from database_manager import DatabaseManager
+            deleted = DatabaseManager(self.db_path).delete_simplified_discovery_results(removed_bridge_domains)
+            
+            print(f"✅ Delta sync: {len(updated_bridge_domains)} updated, {deleted} removed")
+            return {
+                "database_saved": db_result.get("saved_successfully", db_result.get("saved_count", 0)),
+                "database_removed": deleted,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Delta sync failed: {e}")
+            return {"error": str(e)}
+    
     def _save_to_database(self, discovery_results: Dict[str, Any]) -> Dict[str, Any]:
         """Save discovery results to database"""
         try:
             from database_manager import DatabaseManager
             
-            db_manager = DatabaseManager()
+            db_manager = DatabaseManager(self.db_path)
             
             # Check if discovery_results already has the correct structure
             if 'bridge_domains' in discovery_results:
                 # Full JSON structure - pass as is
-                result = db_manager.save_simplified_discovery_results(discovery_results)
+                result = db_manager.save_simplified_discovery_results(discovery_results, batch_size=self.batch_size)
             else:
                 # Just bridge domains - wrap in expected structure
                 wrapped_data = {'bridge_domains': discovery_results}
-                result = db_manager.save_simplified_discovery_results(wrapped_data)
+                result = db_manager.save_simplified_discovery_results(wrapped_data, batch_size=self.batch_size)
             
             print(f"✅ Database sync: {result['saved_successfully']}/{result['total_bridge_domains']} bridge domains")
             return result
@@ -17,9 +17,11 @@ Step 3: Consolidate and Save Results
 import os
 import sys
 import json
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 # Add parent directory to path for imports
@@ -47,9 +49,16 @@ from .data_structures import (
 from config_engine.phase1_data_structures.enums import (
     BridgeDomainType, DeviceType, ValidationStatus, BridgeDomainScope
 )
+from utils.parsed_data_store import (
+    ParsedDataStore, SECTION_BRIDGE_DOMAINS, SECTION_NEIGHBORS, SECTION_VLAN_CONFIGS
+)
 
 logger = logging.getLogger(__name__)
 
+# Step 2/3 results of the last run, reused by device-scoped rediscovery
+DISCOVERY_STATE_VERSION = 2
+DISCOVERY_STATE_FILE = Path("topology/simplified_discovery_results/discovery_state.json")
+
 
 class SimplifiedBridgeDomainDiscovery:
     """
@@ -59,16 +68,22 @@ class SimplifiedBridgeDomainDiscovery:
     the architectural logic flaws identified in the analysis.
     """
     
-    def __init__(self, config_dir: str = "topology/configs/parsed_data"):
+    def __init__(self, config_dir: str = "topology/configs/parsed_data", workers: int = 1,
+                 chunk_size: Optional[int] = None):
         """
         Initialize the simplified discovery system
         
         Args:
             config_dir: Directory containing parsed configuration data
+            workers: Worker processes for Step 2 (1 = process in this process)
+            chunk_size: Bridge domains per Step 2 work unit (default: spread evenly, 4 chunks per worker)
         """
         self.config_dir = Path(config_dir)
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
         self.bridge_domain_parsed_dir = self.config_dir / "bridge_domain_parsed"
         self.lldp_data_dir = Path("topology/lldp_data")
+        self.parsed_store_path = self.config_dir / "parsed_data.pds"
         
         # Processing statistics
         self.stats = {
@@ -76,7 +91,10 @@ class SimplifiedBridgeDomainDiscovery:
             'total_processed': 0, 
             'total_consolidated': 0,
             'total_errors': 0,
-            'processing_time': 0.0
+            'processing_time': 0.0,
+            'step2_errors': 0,
+            'step2_cpu_time': 0.0,
+            'step2_workers': 1
         }
         
         # Guided rails: Ensure directories exist
@@ -125,6 +143,7 @@ class SimplifiedBridgeDomainDiscovery:
             # Step 3: Consolidate and save results
             logger.info("🎯 Step 3: Consolidating and saving results...")
             final_results = self._step3_consolidate_and_save(processed_bds)
+            self._save_discovery_state(processed_bds, final_results)
             
             # Finalize results and statistics
             final_results.finalize_results()
@@ -149,6 +168,141 @@ class SimplifiedBridgeDomainDiscovery:
             # Return partial results if possible
             return self._create_error_results(str(e), start_time)
     
+    def discover_bridge_domains_for_devices(self, devices: List[str]) -> DiscoveryResults:
+        """
+        Device-scoped incremental rediscovery
+        
+        Re-runs Step 2 only for bridge domains that touch the given devices
+        (now or in the previous run), reuses the previous ProcessedBridgeDomain
+        results for everything else and re-consolidates only the affected
+        consolidation keys. Only the changed mapping entries are written, to a
+        bridge_domain_delta_*.json file, and returned in
+        updated_bridge_domains / removed_bridge_domains.
+        
+        Falls back to a full discovery when no previous state exists.
+        
+        Args:
+            devices: Names of the devices whose configuration changed
+            
+        Returns:
+            Discovery results for the whole fabric, with the delta attached
+        """
+        state = self._load_discovery_state()
+        if state is None:
+            logger.warning("⚠️ No previous discovery state found - running full discovery")
+            return self.discover_all_bridge_domains()
+        
+        logger.info(f"🚀 Starting device-scoped rediscovery for {len(devices)} devices: {', '.join(devices)}")
+        start_time = datetime.now()
+        device_set = set(devices)
+        
+        try:
+            # Step 1 (scoped): bridge domains that touch the devices now or did
+            # before; a BD that left a device is rebuilt from its remaining devices
+            all_raw_bds = self._load_bridge_domains()
+            previous_bds = state['processed_bds']
+            affected_names = {bd.name for bd in all_raw_bds if device_set.intersection(bd.devices)}
+            affected_names.update(bd.name for bd in previous_bds if device_set.intersection(bd.devices))
+            raw_bds = [bd for bd in all_raw_bds if bd.name in affected_names]
+            logger.info(f"📋 {len(affected_names)} bridge domains touch the rediscovered devices")
+            
+            # Step 2 (scoped)
+            new_bds = []
+            if raw_bds:
+                loaded_data = LoadedData(
+                    bridge_domains=raw_bds,
+                    device_types=self._load_device_types(raw_bds),
+                    lldp_data=self._load_lldp_data(raw_bds),
+                    validation_results=self._validate_loaded_data(raw_bds)
+                )
+                new_bds = self._step2_process_bridge_domains(loaded_data)
+            
+            # Merge: keep the previous order, replace affected BDs, append new ones
+            new_by_name = {bd.name: bd for bd in new_bds}
+            processed_bds = []
+            for bd in previous_bds:
+                if bd.name not in affected_names:
+                    processed_bds.append(bd)
+                elif bd.name in new_by_name:
+                    processed_bds.append(new_by_name.pop(bd.name))
+            processed_bds.extend(new_by_name.values())
+            
+            # Step 3 (scoped): re-consolidate only the keys the affected BDs belong to
+            previous_affected = [bd for bd in previous_bds
+                                 if bd.name in affected_names and bd.validation_status != ValidationStatus.INVALID]
+            current_affected = [bd for bd in new_bds if bd.validation_status != ValidationStatus.INVALID]
+            affected_keys = {self._consolidation_group_key(bd) for bd in previous_affected + current_affected}
+            
+            results = self._consolidate_processed(processed_bds, state['consolidated'], affected_keys)
+            results.discovery_start_time = start_time
+            results.rediscovered_devices = list(devices)
+            
+            # Delta: mapping entries produced by the affected keys, before and after
+            for cbd in results.consolidated_bridge_domains:
+                if cbd.consolidation_key in affected_keys:
+                    results.updated_bridge_domains[cbd.consolidated_name] = self._create_legacy_bridge_domain_structure(cbd)
+            for ibd in results.individual_bridge_domains:
+                if self._consolidation_group_key(ibd) in affected_keys:
+                    results.updated_bridge_domains[ibd.name] = self._create_legacy_individual_bridge_domain_structure(ibd)
+            
+            previous_names = set()
+            for bd in previous_affected:
+                previous_cbd = state['consolidated'].get(self._consolidation_group_key(bd))
+                previous_names.add(previous_cbd.consolidated_name if previous_cbd else bd.name)
+            results.removed_bridge_domains = sorted(previous_names - set(results.updated_bridge_domains))
+            
+            self._save_discovery_delta(results)
+            self._save_discovery_state(processed_bds, results)
+            
+            results.finalize_results()
+            self.stats['total_discovered'] = results.total_bridge_domains_discovered
+            self.stats['total_processed'] = results.total_bridge_domains_processed
+            self.stats['total_consolidated'] = results.total_bridge_domains_consolidated
+            self.stats['total_errors'] = results.total_errors
+            self.stats['processing_time'] = results.total_processing_time or 0.0
+            
+            logger.info(f"🎉 Rediscovery complete: {len(results.updated_bridge_domains)} updated, "
+                       f"{len(results.removed_bridge_domains)} removed bridge domains")
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Device-scoped rediscovery failed: {e}")
+            return self._create_error_results(str(e), start_time)
+    
+    def _save_discovery_state(self, processed_bds: List[ProcessedBridgeDomain], results: DiscoveryResults):
+        """Persist Step 2 results and consolidated BDs for later device-scoped runs"""
+        state = {
+            'version': DISCOVERY_STATE_VERSION,
+            'saved_at': datetime.now().isoformat(),
+            'processed_bds': [bd.to_dict() for bd in processed_bds],
+            'consolidated': {cbd.consolidation_key: cbd.to_dict() for cbd in results.consolidated_bridge_domains}
+        }
+        try:
+            DISCOVERY_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = DISCOVERY_STATE_FILE.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, DISCOVERY_STATE_FILE)
+        except Exception as e:
+            logger.warning(f"Failed to save discovery state: {e}")
+    
+    def _load_discovery_state(self) -> Optional[Dict[str, Any]]:
+        """Load the previous run's state, or None if missing or incompatible"""
+        if not DISCOVERY_STATE_FILE.exists():
+            return None
+        try:
+            with open(DISCOVERY_STATE_FILE) as f:
+                state = json.load(f)
+            if state.get('version') != DISCOVERY_STATE_VERSION:
+                return None
+            state['processed_bds'] = [ProcessedBridgeDomain.from_dict(bd) for bd in state['processed_bds']]
+            state['consolidated'] = {key: ConsolidatedBridgeDomain.from_dict(cbd)
+                                     for key, cbd in state['consolidated'].items()}
+            return state
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable discovery state {DISCOVERY_STATE_FILE}: {e}")
+            return None
+    
     # =========================================================================
     # STEP 1: LOAD AND VALIDATE DATA
     # =========================================================================
@@ -190,11 +344,37 @@ class SimplifiedBridgeDomainDiscovery:
         
         return loaded_data
     
-    def _load_bridge_domains(self) -> List[RawBridgeDomain]:
-        """Load bridge domains from parsed configuration files and aggregate by name"""
+    def _load_device_bridge_domain_data(self) -> List[tuple]:
+        """
+        Per-device bridge domain instances and VLAN configs (indexed by interface)
         
-        # First, collect all bridge domain instances from all devices
-        all_bd_instances = {}  # bd_name -> list of (device_name, bd_instance, source_file)
+        Reads the parse phase's parsed data store when present, falling back
+        to the per-device YAML files.
+        
+        Returns:
+            List of (device_name, bridge_domain_instances, vlan_configs, source_file)
+        """
+        store = ParsedDataStore.open(self.parsed_store_path)
+        if store is not None:
+            with store:
+                if store.devices(SECTION_BRIDGE_DOMAINS):
+                    logger.info(f"📦 Loading parsed data from store {self.parsed_store_path}")
+                    device_data = []
+                    for device_name in store.devices(SECTION_BRIDGE_DOMAINS):
+                        vlan_configs = {}
+                        for vlan_config in store.get(SECTION_VLAN_CONFIGS, device_name, []):
+                            interface_name = vlan_config.get('interface')
+                            if interface_name:
+                                vlan_configs[interface_name] = vlan_config
+                        device_data.append((
+                            device_name,
+                            store.get(SECTION_BRIDGE_DOMAINS, device_name, []),
+                            vlan_configs,
+                            store.entry(SECTION_BRIDGE_DOMAINS, device_name)['source'] or str(self.parsed_store_path)
+                        ))
+                    return device_data
+        
+        device_data = []
         
         # Look for parsed bridge domain files (YAML format)
         for bd_file in self.bridge_domain_parsed_dir.glob("*bridge_domain_instance_parsed*.yaml"):
@@ -228,29 +408,38 @@ class SimplifiedBridgeDomainDiscovery:
                             if interface_name:
                                 vlan_configs[interface_name] = vlan_config
                 
-                # Process each bridge domain instance in the file
-                bridge_domain_instances = bd_data.get('bridge_domain_instances', [])
-                
-                for bd_instance in bridge_domain_instances:
-                    bd_name = bd_instance.get('name')
-                    if not bd_name:
-                        continue
-                    
-                    # Group by bridge domain name across all devices
-                    if bd_name not in all_bd_instances:
-                        all_bd_instances[bd_name] = []
-                    
-                    all_bd_instances[bd_name].append({
-                        'device_name': device_name,
-                        'bd_instance': bd_instance,
-                        'vlan_configs': vlan_configs,  # Add VLAN config data
-                        'source_file': str(bd_file)
-                    })
+                device_data.append((device_name, bd_data.get('bridge_domain_instances', []),
+                                    vlan_configs, str(bd_file)))
                     
             except Exception as e:
                 logger.error(f"Failed to load bridge domain from {bd_file}: {e}")
                 continue
         
+        return device_data
+    
+    def _load_bridge_domains(self) -> List[RawBridgeDomain]:
+        """Load bridge domains from parsed configuration files and aggregate by name"""
+        
+        # First, collect all bridge domain instances from all devices
+        all_bd_instances = {}  # bd_name -> list of (device_name, bd_instance, source_file)
+        
+        for device_name, bridge_domain_instances, vlan_configs, source_file in self._load_device_bridge_domain_data():
+            for bd_instance in bridge_domain_instances:
+                bd_name = bd_instance.get('name')
+                if not bd_name:
+                    continue
+                
+                # Group by bridge domain name across all devices
+                if bd_name not in all_bd_instances:
+                    all_bd_instances[bd_name] = []
+                
+                all_bd_instances[bd_name].append({
+                    'device_name': device_name,
+                    'bd_instance': bd_instance,
+                    'vlan_configs': vlan_configs,  # Add VLAN config data
+                    'source_file': source_file
+                })
+        
         # Now aggregate bridge domains by name
         bridge_domains = []
         
@@ -596,6 +785,22 @@ class SimplifiedBridgeDomainDiscovery:
         for bd in bridge_domains:
             all_devices.update(bd.devices)
         
+        # Parsed LLDP neighbors from the parsed data store, keyed by local interface
+        store_neighbors = {}
+        store = ParsedDataStore.open(self.parsed_store_path)
+        if store is not None:
+            with store:
+                for device_name in all_devices:
+                    if store.has(SECTION_NEIGHBORS, device_name):
+                        store_neighbors[device_name] = {
+                            neighbor['local_interface']: {
+                                'neighbor_device': neighbor.get('neighbor_device', ''),
+                                'neighbor_interface': neighbor.get('neighbor_interface', '')
+                            }
+                            for neighbor in store.get(SECTION_NEIGHBORS, device_name, [])
+                            if neighbor.get('local_interface')
+                        }
+        
         # Try to load LLDP data for each device
         for device_name in all_devices:
             lldp_file = self.lldp_data_dir / f"{device_name}_lldp.yaml"
@@ -609,6 +814,8 @@ class SimplifiedBridgeDomainDiscovery:
                 except Exception as e:
                     logger.warning(f"Failed to load LLDP data for {device_name}: {e}")
                     lldp_data[device_name] = {}
+            elif device_name in store_neighbors:
+                lldp_data[device_name] = store_neighbors[device_name]
             else:
                 logger.debug(f"No LLDP data file found for {device_name}")
                 lldp_data[device_name] = {}
@@ -661,12 +868,75 @@ class SimplifiedBridgeDomainDiscovery:
         Returns:
             List of processed bridge domains ready for consolidation
         """
+        bridge_domains = loaded_data.bridge_domains
+        
+        if self.workers > 1 and len(bridge_domains) > 1:
+            processed_bds, chunk_stats = self._step2_process_parallel(loaded_data)
+        else:
+            processed_bds, stats = self._process_bridge_domain_chunk(
+                bridge_domains, loaded_data.device_types, loaded_data.lldp_data
+            )
+            chunk_stats = [stats]
+            self.stats['step2_workers'] = 1
+        
+        # Merge per-chunk statistics
+        self.stats['step2_errors'] = sum(stats['errors'] for stats in chunk_stats)
+        self.stats['step2_cpu_time'] = sum(stats['cpu_time'] for stats in chunk_stats)
+        self.stats['total_processed'] = sum(stats['processed'] for stats in chunk_stats)
+        
+        logger.info(f"🔄 BD-PROC pipeline complete: {len(processed_bds)} bridge domains processed")
+        return processed_bds
+    
+    def _step2_process_parallel(self, loaded_data: LoadedData) -> Tuple[List[ProcessedBridgeDomain], List[Dict[str, Any]]]:
+        """
+        Run the BD-PROC pipeline over chunks of bridge domains in a process pool
+        
+        Each bridge domain is independent until Step 3, so chunks are processed
+        in worker processes and their results are concatenated in input order.
+        Device types and LLDP data are sent once per worker, not per chunk.
+        """
+        bridge_domains = loaded_data.bridge_domains
+        workers = min(self.workers, len(bridge_domains))
+        chunk_size = self.chunk_size or max(1, -(-len(bridge_domains) // (workers * 4)))
+        chunks = [bridge_domains[i:i + chunk_size] for i in range(0, len(bridge_domains), chunk_size)]
+        
+        logger.info(f"🔄 Processing {len(bridge_domains)} bridge domains in {len(chunks)} chunks "
+                   f"across {workers} worker processes")
+        self.stats['step2_workers'] = workers
+        
         processed_bds = []
+        chunk_stats = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_bd_proc_worker,
+            initargs=(str(self.config_dir), loaded_data.device_types, loaded_data.lldp_data)
+        ) as executor:
+            futures = [executor.submit(_run_bd_proc_chunk, chunk) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    results, stats = future.result()
+                except Exception as e:
+                    # The whole chunk was lost (e.g. a worker died): record each BD as failed
+                    logger.error(f"BD-PROC worker failed for chunk starting at {chunk[0].name}: {e}")
+                    results = [self._create_error_bridge_domain(bd, f"BD-PROC worker failed: {e}") for bd in chunk]
+                    stats = {'processed': 0, 'errors': len(chunk), 'cpu_time': 0.0}
+                processed_bds.extend(results)
+                chunk_stats.append(stats)
+        
+        return processed_bds, chunk_stats
+    
+    def _process_bridge_domain_chunk(self, bridge_domains: List[RawBridgeDomain],
+                                     device_types: Dict[str, DeviceType],
+                                     lldp_data: Dict[str, Dict[str, Any]]) -> Tuple[List[ProcessedBridgeDomain], Dict[str, Any]]:
+        """Run the BD-PROC pipeline over bridge domains, returning results and chunk statistics"""
+        start_time = time.process_time()
+        processed_bds = []
+        errors = 0
         
-        for bd in loaded_data.bridge_domains:
+        for bd in bridge_domains:
             try:
                 # Run BD-PROC pipeline for this bridge domain
-                processed_bd = self._bd_proc_pipeline(bd, loaded_data.device_types, loaded_data.lldp_data)
+                processed_bd = self._bd_proc_pipeline(bd, device_types, lldp_data)
                 processed_bds.append(processed_bd)
                 
             except Exception as e:
@@ -674,13 +944,15 @@ class SimplifiedBridgeDomainDiscovery:
                 # Create error bridge domain to track the failure
                 error_bd = self._create_error_bridge_domain(bd, str(e))
                 processed_bds.append(error_bd)
+                errors += 1
                 continue
         
-        self.stats['total_processed'] = len([bd for bd in processed_bds 
-                                           if bd.validation_status != ValidationStatus.INVALID])
-        
-        logger.info(f"🔄 BD-PROC pipeline complete: {len(processed_bds)} bridge domains processed")
-        return processed_bds
+        stats = {
+            'processed': len([bd for bd in processed_bds if bd.validation_status != ValidationStatus.INVALID]),
+            'errors': errors,
+            'cpu_time': time.process_time() - start_time
+        }
+        return processed_bds, stats
     
     def _bd_proc_pipeline(self, bd: RawBridgeDomain, device_types: Dict[str, DeviceType], 
                          lldp_data: Dict[str, Dict[str, Any]]) -> ProcessedBridgeDomain:
@@ -1090,6 +1362,33 @@ class SimplifiedBridgeDomainDiscovery:
             Complete discovery results
         """
         
+        results = self._consolidate_processed(processed_bds)
+        consolidated_bds = results.consolidated_bridge_domains
+        individual_bds = results.individual_bridge_domains
+        
+        # Save results to files
+        self._save_discovery_results(results)
+        
+        logger.info(f"🎯 Step 3 complete: {len(consolidated_bds)} consolidated, "
+                   f"{len(individual_bds)} individual bridge domains")
+        
+        return results
+    
+    def _consolidate_processed(self, processed_bds: List[ProcessedBridgeDomain],
+                               previous_consolidated: Optional[Dict[str, ConsolidatedBridgeDomain]] = None,
+                               affected_keys: Optional[set] = None) -> DiscoveryResults:
+        """
+        Group and consolidate processed bridge domains into discovery results
+        
+        Args:
+            processed_bds: Processed bridge domains from Step 2
+            previous_consolidated: Consolidated BDs of a previous run by consolidation key;
+                groups whose key is not in affected_keys reuse these instead of being rebuilt
+            affected_keys: Consolidation keys that must be re-consolidated
+        """
+        previous_consolidated = previous_consolidated or {}
+        affected_keys = affected_keys or set()
+        
         # Filter valid bridge domains
         valid_bds = [bd for bd in processed_bds if bd.validation_status != ValidationStatus.INVALID]
         
@@ -1102,29 +1401,32 @@ class SimplifiedBridgeDomainDiscovery:
         
         for group in consolidation_groups:
             if len(group.bridge_domains) > 1 and group.can_merge_safely:
-                # Consolidate multiple bridge domains
-                consolidated_bd = self._consolidate_bridge_domain_group(group)
+                # Consolidate multiple bridge domains (unchanged groups keep their previous result)
+                consolidated_bd = None
+                if group.consolidation_key not in affected_keys:
+                    consolidated_bd = previous_consolidated.get(group.consolidation_key)
+                if consolidated_bd is None:
+                    consolidated_bd = self._consolidate_bridge_domain_group(group)
                 consolidated_bds.append(consolidated_bd)
             else:
                 # Keep as individual bridge domains
                 individual_bds.extend(group.bridge_domains)
         
         # Create final results
-        results = DiscoveryResults(
+        return DiscoveryResults(
             consolidated_bridge_domains=consolidated_bds,
             individual_bridge_domains=individual_bds,
             total_bridge_domains_discovered=len(processed_bds),
             total_bridge_domains_processed=len(valid_bds),
             total_bridge_domains_consolidated=len(consolidated_bds)
         )
-        
-        # Save results to files
-        self._save_discovery_results(results)
-        
-        logger.info(f"🎯 Step 3 complete: {len(consolidated_bds)} consolidated, "
-                   f"{len(individual_bds)} individual bridge domains")
-        
-        return results
+    
+    @staticmethod
+    def _consolidation_group_key(bd: ProcessedBridgeDomain) -> str:
+        """Key of the consolidation group a processed bridge domain belongs to"""
+        if bd.can_consolidate and bd.consolidation_key:
+            return bd.consolidation_key
+        return f"individual_{bd.name}"
     
     def _group_for_consolidation(self, processed_bds: List[ProcessedBridgeDomain]) -> List[ConsolidationGroup]:
         """Group bridge domains by consolidation key"""
@@ -1133,7 +1435,7 @@ class SimplifiedBridgeDomainDiscovery:
         
         for bd in processed_bds:
             if bd.can_consolidate and bd.consolidation_key:
-                key = bd.consolidation_key
+                key = self._consolidation_group_key(bd)
                 if key not in groups_dict:
                     groups_dict[key] = ConsolidationGroup(
                         consolidation_key=key,
@@ -1142,7 +1444,7 @@ class SimplifiedBridgeDomainDiscovery:
                 groups_dict[key].bridge_domains.append(bd)
             else:
                 # Individual bridge domain (no consolidation)
-                individual_key = f"individual_{bd.name}"
+                individual_key = self._consolidation_group_key(bd)
                 groups_dict[individual_key] = ConsolidationGroup(
                     consolidation_key=individual_key,
                     bridge_domains=[bd],
@@ -1255,6 +1557,32 @@ class SimplifiedBridgeDomainDiscovery:
         
         logger.info(f"💾 Results saved to {consolidated_file}")
     
+    def _save_discovery_delta(self, results: DiscoveryResults):
+        """Save the changed part of the mapping from a device-scoped rediscovery"""
+        
+        output_dir = Path("topology/simplified_discovery_results")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        delta_file = output_dir / f"bridge_domain_delta_{timestamp}.json"
+        
+        delta_format = {
+            "discovery_metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "discovery_method": "simplified_3_step_workflow_incremental",
+                "rediscovered_devices": results.rediscovered_devices,
+                "bridge_domains_updated": len(results.updated_bridge_domains),
+                "bridge_domains_removed": len(results.removed_bridge_domains)
+            },
+            "bridge_domains": results.updated_bridge_domains,
+            "removed_bridge_domains": results.removed_bridge_domains
+        }
+        
+        with open(delta_file, 'w') as f:
+            json.dump(delta_format, f, indent=2)
+        
+        logger.info(f"💾 Delta saved to {delta_file}")
+    
     def _create_legacy_bridge_domain_structure(self, cbd: ConsolidatedBridgeDomain):
         """Create legacy-compatible bridge domain structure"""
         
@@ -1518,6 +1846,30 @@ class SimplifiedBridgeDomainDiscovery:
         return results
 
 
+# =============================================================================
+# STEP 2 WORKER PROCESS HELPERS
+# =============================================================================
+
+_worker_discovery: Optional[SimplifiedBridgeDomainDiscovery] = None
+_worker_context: Dict[str, Any] = {}
+
+
+def _init_bd_proc_worker(config_dir: str, device_types: Dict[str, DeviceType],
+                         lldp_data: Dict[str, Dict[str, Any]]):
+    """Process pool initializer: build one discovery instance and keep the shared Step 1 data"""
+    global _worker_discovery
+    _worker_discovery = SimplifiedBridgeDomainDiscovery(config_dir)
+    _worker_context['device_types'] = device_types
+    _worker_context['lldp_data'] = lldp_data
+
+
+def _run_bd_proc_chunk(bridge_domains: List[RawBridgeDomain]) -> Tuple[List[ProcessedBridgeDomain], Dict[str, Any]]:
+    """Run the BD-PROC pipeline for one chunk inside a worker process"""
+    return _worker_discovery._process_bridge_domain_chunk(
+        bridge_domains, _worker_context['device_types'], _worker_context['lldp_data']
+    )
+
+
 # =============================================================================
 # GUIDED RAILS: WORKFLOW VALIDATION
 # =============================================================================
@@ -1561,12 +1913,16 @@ def validate_simplified_workflow():
 # MAIN ENTRY POINT
 # =============================================================================
 
-def run_simplified_discovery(config_dir: str = "topology/configs/parsed_data") -> DiscoveryResults:
+def run_simplified_discovery(config_dir: str = "topology/configs/parsed_data", workers: int = 1,
+                             devices: Optional[List[str]] = None) -> DiscoveryResults:
     """
     Main entry point for simplified bridge domain discovery
     
     Args:
         config_dir: Directory containing parsed configuration data
+        workers: Worker processes for Step 2 bridge domain processing
+        devices: Only rediscover bridge domains touching these devices, reusing
+            the previous run's results for the rest (see discover_bridge_domains_for_devices)
         
     Returns:
         Complete discovery results
@@ -1576,16 +1932,32 @@ def run_simplified_discovery(config_dir: str = "topology/configs/parsed_data") -
     validate_simplified_workflow()
     
     # Create and run discovery system
-    discovery_system = SimplifiedBridgeDomainDiscovery(config_dir)
-    results = discovery_system.discover_all_bridge_domains()
+    discovery_system = SimplifiedBridgeDomainDiscovery(config_dir, workers=workers)
+    if devices:
+        results = discovery_system.discover_bridge_domains_for_devices(devices)
+    else:
+        results = discovery_system.discover_all_bridge_domains()
     
     return results
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Simplified bridge domain discovery')
+    parser.add_argument('--devices', nargs='+', metavar='DEVICE',
+                        help='Only rediscover bridge domains touching these devices')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for Step 2 bridge domain processing')
+    args = parser.parse_args()
+    
     # Run the simplified discovery system
     try:
-        results = run_simplified_discovery()
+        results = run_simplified_discovery(workers=args.workers, devices=args.devices)
+        if results.is_incremental:
+            print(f"🔄 Rediscovered {', '.join(results.rediscovered_devices)}: "
+                  f"{len(results.updated_bridge_domains)} updated, "
+                  f"{len(results.removed_bridge_domains)} removed bridge domains")
         print(f"🎉 Discovery completed successfully!")
         print(f"📊 Results: {len(results.consolidated_bridge_domains)} consolidated, "
               f"{len(results.individual_bridge_domains)} individual")
@@ -15,7 +15,15 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path as csgraph_shortest_path
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
@@ -397,11 +405,20 @@ class PathCalculator:
     Path Calculator
     
     Calculates paths between devices and identifies forwarding paths.
+    
+    Hop distances and shortest-path predecessors from every device node are
+    computed once per topology (one BFS per source, with SciPy's csgraph
+    when available) and shared by path lookups and path statistics.
     """
     
     def __init__(self):
         self.topology_graph = {}
         self.paths = {}
+        self.node_ids: List[str] = []  # Graph node id per matrix column
+        self.node_index: Dict[str, int] = {}
+        self.source_rows: Dict[str, int] = {}  # Device node id -> matrix row
+        self.hop_distances = None  # Rows of hop counts per source, -1 when unreachable
+        self.predecessors = None  # Rows of predecessor columns per source, -1 for none
     
     def calculate_paths(self, topology_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -438,6 +455,7 @@ class PathCalculator:
             
             # Build graph representation
             self._build_graph(topology_data)
+            self._compute_hop_matrices(topology_data)
             
             # Calculate device-to-device paths
             logger.info("=== CALCULATING DEVICE PATHS ===")
@@ -493,8 +511,69 @@ class PathCalculator:
             self.topology_graph[source].append(target)
             self.topology_graph[target].append(source)
         
+        self.node_ids = list(self.topology_graph)
+        self.node_index = {node_id: index for index, node_id in enumerate(self.node_ids)}
+        
         logger.info(f"Built topology graph with {len(self.topology_graph)} nodes")
-        logger.debug(f"Graph structure: {self.topology_graph}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Graph structure: {self.topology_graph}")
+    
+    def _compute_hop_matrices(self, topology_data: Dict[str, Any]):
+        """
+        Hop distance and predecessor matrices from every device node to every
+        graph node, one BFS per device: SciPy's csgraph over a sparse
+        adjacency matrix when available, plain BFS otherwise.
+        """
+        device_ids = [node['id'] for node in topology_data.get('nodes', [])
+                      if node['type'] == 'device' and node['id'] in self.node_index]
+        self.source_rows = {node_id: row for row, node_id in enumerate(device_ids)}
+        sources = [self.node_index[node_id] for node_id in device_ids]
+        
+        if not sources:
+            self.hop_distances, self.predecessors = [], []
+        elif SCIPY_AVAILABLE:
+            rows, cols = [], []
+            for node_id, neighbors in self.topology_graph.items():
+                index = self.node_index[node_id]
+                for neighbor in neighbors:
+                    rows.append(index)
+                    cols.append(self.node_index[neighbor])
+            size = len(self.node_ids)
+            adjacency = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(size, size))
+            distances, predecessors = csgraph_shortest_path(
+                adjacency, method='D', directed=False, unweighted=True,
+                return_predecessors=True, indices=sources
+            )
+            self.hop_distances = np.where(np.isinf(distances), -1, distances).astype(np.int32)
+            self.predecessors = np.where(predecessors < 0, -1, predecessors).astype(np.int32)
+        else:
+            adjacency = [[self.node_index[neighbor] for neighbor in self.topology_graph[node_id]]
+                         for node_id in self.node_ids]
+            self.hop_distances, self.predecessors = [], []
+            for source in sources:
+                distances, predecessors = self._bfs(adjacency, source)
+                self.hop_distances.append(distances)
+                self.predecessors.append(predecessors)
+        
+        logger.info(f"Computed hop matrices for {len(sources)} devices over {len(self.node_ids)} nodes "
+                    f"({'scipy' if SCIPY_AVAILABLE else 'python'})")
+    
+    @staticmethod
+    def _bfs(adjacency: List[List[int]], source: int) -> Tuple[List[int], List[int]]:
+        """Hop distances (-1 when unreachable) and BFS predecessors (-1 for none) from source."""
+        distances = [-1] * len(adjacency)
+        predecessors = [-1] * len(adjacency)
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for neighbor in adjacency[current]:
+                if distances[neighbor] < 0:
+                    distances[neighbor] = next_distance
+                    predecessors[neighbor] = current
+                    queue.append(neighbor)
+        return distances, predecessors
     
     def _calculate_device_paths(self, topology_data: Dict[str, Any]) -> Dict[str, List[str]]:
         """Calculate paths between all device pairs."""
@@ -511,39 +590,33 @@ class PathCalculator:
         device_names = [d['data']['name'] for d in device_nodes]
         logger.info(f"Device names: {device_names}")
         
+        # Interfaces per device, grouped once instead of rescanned for every pair
+        interfaces_by_device = defaultdict(list)
+        for interface_node in interface_nodes:
+            interfaces_by_device[interface_node['data']['device_name']].append(interface_node)
+        
         # For now, create simple direct paths between devices that share interfaces
         # In a real implementation, this would use the actual topology graph
         for i, source_device in enumerate(device_nodes):
+            source_name = source_device['data']['name']
+            source_interfaces = interfaces_by_device.get(source_name)
+            logger.debug("Device %s has %d interfaces", source_name, len(source_interfaces or ()))
+            
             for target_device in device_nodes[i+1:]:
-                source_name = source_device['data']['name']
                 target_name = target_device['data']['name']
-                
-                logger.info(f"Processing path from {source_name} to {target_name}")
-                
-                # Check if devices share any interfaces (simplified approach)
-                source_interfaces = [n for n in interface_nodes 
-                                   if n['data']['device_name'] == source_name]
-                target_interfaces = [n for n in interface_nodes 
-                                   if n['data']['device_name'] == target_name]
-                
-                logger.info(f"Device {source_name} has {len(source_interfaces)} interfaces")
-                logger.info(f"Device {target_name} has {len(target_interfaces)} interfaces")
+                target_interfaces = interfaces_by_device.get(target_name)
                 
                 # If both devices have interfaces, assume they can communicate
                 if source_interfaces and target_interfaces:
                     key = f"{source_name}_to_{target_name}"
                     # Create a simple path through their interfaces
-                    path = [source_name]
-                    if source_interfaces:
-                        path.append(source_interfaces[0]['data']['name'])
-                    if target_interfaces:
-                        path.append(target_interfaces[0]['data']['name'])
-                    path.append(target_name)
+                    path = [source_name, source_interfaces[0]['data']['name'],
+                            target_interfaces[0]['data']['name'], target_name]
                     
                     device_paths[key] = path
-                    logger.info(f"Found path: {key} -> {path}")
+                    logger.debug("Found path: %s -> %s", key, path)
                 else:
-                    logger.info(f"No path between {source_name} and {target_name} - missing interfaces")
+                    logger.debug("No path between %s and %s - missing interfaces", source_name, target_name)
         
         logger.info(f"Calculated {len(device_paths)} device paths")
         
@@ -558,7 +631,7 @@ class PathCalculator:
                     key = f"{source_name}_to_{target_name}"
                     path = [source_name, target_name]
                     device_paths[key] = path
-                    logger.info(f"Created fallback path: {key} -> {path}")
+                    logger.debug("Created fallback path: %s -> %s", key, path)
         
         # Hardcoded test: if still no paths, create test paths
         if len(device_paths) == 0:
@@ -575,7 +648,7 @@ class PathCalculator:
             logger.info("Created 6 hardcoded test paths")
         
         logger.info(f"Final device paths count: {len(device_paths)}")
-        logger.info(f"Device paths: {device_paths}")
+        logger.debug("Device paths: %s", device_paths)
         return device_paths
     
     def _calculate_vlan_paths(self, topology_data: Dict[str, Any]) -> Dict[str, List[str]]:
@@ -616,7 +689,7 @@ class PathCalculator:
                 
                 # Get device names for this VLAN
                 devices_in_vlan = list(set([iface['data']['device_name'] for iface in interfaces]))
-                logger.info(f"Devices in VLAN {vlan_id}: {devices_in_vlan}")
+                logger.debug("Devices in VLAN %s: %s", vlan_id, devices_in_vlan)
                 
                 # Calculate paths between different devices in this VLAN
                 for i, source_interface in enumerate(interfaces):
@@ -628,14 +701,13 @@ class PathCalculator:
                         
                         # Skip if same device (intra-device paths)
                         if source_device == target_device:
-                            logger.debug(f"Skipping intra-device path: {source_device} -> {target_device}")
                             continue
                         
                         # Create VLAN path
                         key = f"vlan_{vlan_id}_{source_device}_{source_name}_to_{target_device}_{target_name}"
                         path = [source_device, source_name, f"vlan_{vlan_id}", target_name, target_device]
                         vlan_paths[key] = path
-                        logger.info(f"Found VLAN path: {key} -> {path}")
+                        logger.debug("Found VLAN path: %s -> %s", key, path)
             
             logger.info(f"Calculated {len(vlan_paths)} VLAN paths")
             
@@ -668,7 +740,7 @@ class PathCalculator:
                             logger.info(f"Created fallback VLAN path: {key} -> {path}")
             
             logger.info(f"Final VLAN paths count: {len(vlan_paths)}")
-            logger.info(f"VLAN paths: {vlan_paths}")
+            logger.debug("VLAN paths: %s", vlan_paths)
             logger.info("=== VLAN PATH CALCULATION COMPLETED ===")
             return vlan_paths
             
@@ -691,29 +763,36 @@ class PathCalculator:
         """Find shortest path between two nodes using BFS."""
         if source not in self.topology_graph or target not in self.topology_graph:
             logger.debug(f"Path not found: {source} or {target} not in graph")
-            logger.debug(f"Available nodes: {list(self.topology_graph.keys())}")
             return None
         
-        queue = [(source, [source])]
-        visited = set()
+        # Device sources are answered from the precomputed predecessor matrix
+        row = self.source_rows.get(source)
+        if row is not None:
+            distances, predecessors = self.hop_distances[row], self.predecessors[row]
+            index = self.node_index[target]
+            if distances[index] < 0:
+                logger.debug(f"No path found from {source} to {target}")
+                return None
+            path = [target]
+            while index != self.node_index[source]:
+                index = int(predecessors[index])
+                path.append(self.node_ids[index])
+            path.reverse()
+            return path
+        
+        queue = deque([(source, [source])])
+        visited = {source}
         
         while queue:
-            current, path = queue.pop(0)
+            current, path = queue.popleft()
             
             if current == target:
                 logger.debug(f"Found path from {source} to {target}: {path}")
                 return path
             
-            if current in visited:
-                continue
-            
-            visited.add(current)
-            
-            neighbors = self.topology_graph.get(current, [])
-            logger.debug(f"Node {current} has {len(neighbors)} neighbors: {neighbors}")
-            
-            for neighbor in neighbors:
+            for neighbor in self.topology_graph.get(current, []):
                 if neighbor not in visited:
+                    visited.add(neighbor)
                     queue.append((neighbor, path + [neighbor]))
         
         logger.debug(f"No path found from {source} to {target}")
@@ -743,7 +822,35 @@ class PathCalculator:
             'average_device_path_length': avg_device_path_length,
             'average_vlan_path_length': avg_vlan_path_length,
             'max_device_path_length': max(device_path_lengths) if device_path_lengths else 0,
-            'max_vlan_path_length': max(vlan_path_lengths) if vlan_path_lengths else 0
+            'max_vlan_path_length': max(vlan_path_lengths) if vlan_path_lengths else 0,
+            **self._hop_statistics()
+        }
+    
+    def _hop_statistics(self) -> Dict:
+        """Device-to-device reachability and hop counts in the topology graph, from the hop matrix."""
+        columns = [self.node_index[node_id] for node_id in self.source_rows]
+        if not columns:
+            return {'reachable_device_pairs': 0, 'average_device_hops': 0, 'max_device_hops': 0}
+        
+        if SCIPY_AVAILABLE:
+            device_distances = self.hop_distances[:, columns]
+            # Each unordered pair once, excluding a device to itself
+            pair_distances = device_distances[np.triu_indices(len(columns), k=1)]
+            reachable = pair_distances[pair_distances > 0]
+            count = int(reachable.size)
+            total = int(reachable.sum()) if count else 0
+            longest = int(reachable.max()) if count else 0
+        else:
+            reachable = [self.hop_distances[row][column]
+                         for row in range(len(columns)) for column in columns[row + 1:]
+                         if self.hop_distances[row][column] > 0]
+            count, total = len(reachable), sum(reachable)
+            longest = max(reachable) if reachable else 0
+        
+        return {
+            'reachable_device_pairs': count,
+            'average_device_hops': total / count if count else 0,
+            'max_device_hops': longest
         }
 
 class EnhancedTopologyScanner:
@@ -826,7 +933,7 @@ class EnhancedTopologyScanner:
             path_data = path_calculator.calculate_paths(topology_data)
             
             # Debug: log the path data after calculation
-            logger.info(f"Final path_data: {path_data}")
+            logger.debug("Final path_data: %s", path_data)
             logger.info(f"Path data type: {type(path_data)}")
             logger.info(f"Path data keys: {list(path_data.keys()) if path_data else 'None'}")
             
@@ -857,7 +964,7 @@ class EnhancedTopologyScanner:
                     'calculated_at': datetime.now().isoformat()
                 }
             
-            logger.info(f"Returning scan results with path_data: {path_data}")
+            logger.debug("Returning scan results with path_data: %s", path_data)
             
             # Create the response
             response = {
@@ -30,7 +30,7 @@ class P2MPBridgeDomainBuilder:
         self.base_builder = BridgeDomainBuilder(topology_dir)
         
         # Initialize P2MP components
-        self.path_calculator = P2MPPathCalculator(self.base_builder.topology_data)
+        self.path_calculator = P2MPPathCalculator(self.base_builder.topology_data, self.base_builder.graph)
         self.config_generator = P2MPConfigGenerator(self.base_builder)
     
     def build_p2mp_bridge_domain_config(self, service_name: str, vlan_id: int,
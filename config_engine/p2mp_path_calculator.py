@@ -7,66 +7,48 @@ Calculates optimal paths for Point-to-Multipoint bridge domain configurations
 import logging
 from typing import Dict, List, Optional, Tuple
 from .device_name_normalizer import normalizer
+from .p2mp_tree import build_distribution_tree
+from .topology_graph import LeafPath, TopologyGraph
 
 
 class P2MPPathCalculator:
     """Calculate optimal paths for P2MP bridge domain topology"""
     
-    def __init__(self, topology_data: Dict):
+    def __init__(self, topology_data: Dict, graph: Optional[TopologyGraph] = None):
         """
         Initialize P2MP path calculator
         
         Args:
             topology_data: Topology data from bridge domain builder
+            graph: Shared graph of the same topology (the builder's); built here if omitted
         """
         self.topology_data = topology_data
-        self.device_connections = self._build_connection_map()
+        self.graph = graph if graph is not None else TopologyGraph(topology_data)
+        self.device_connections = self.graph.connection_map()
         self.logger = logging.getLogger('P2MPPathCalculator')
         
         # Initialize device name normalizer
         self.normalizer = normalizer
     
-    def _build_connection_map(self) -> Dict:
-        """Build device connection map from topology data"""
-        devices = self.topology_data.get('devices', {})
-        device_connections = {}
-        
-        for device_name, device_info in devices.items():
-            connected_spines = device_info.get('connected_spines', [])
-            if connected_spines:
-                device_connections[device_name] = []
-                for spine_conn in connected_spines:
-                    if isinstance(spine_conn, dict):
-                        spine_name = spine_conn['name']
-                        device_connections[device_name].append({
-                            'device': spine_name,
-                            'local_interface': spine_conn['local_interface'],
-                            'remote_interface': spine_conn['remote_interface']
-                        })
-                        # Add reverse connection for spine
-                        if spine_name not in device_connections:
-                            device_connections[spine_name] = []
-                        device_connections[spine_name].append({
-                            'device': device_name,
-                            'local_interface': spine_conn['remote_interface'],
-                            'remote_interface': spine_conn['local_interface']
-                        })
-                    else:
-                        spine_name = spine_conn
-                        device_connections[device_name].append({
-                            'device': spine_name,
-                            'local_interface': 'unknown',
-                            'remote_interface': 'unknown'
-                        })
-                        if spine_name not in device_connections:
-                            device_connections[spine_name] = []
-                        device_connections[spine_name].append({
-                            'device': device_name,
-                            'local_interface': 'unknown',
-                            'remote_interface': 'unknown'
-                        })
-        
-        return device_connections
+    def _path_dict(self, leaf_path: LeafPath) -> Dict:
+        """Path in this calculator's dict format"""
+        if leaf_path.is_two_tier:
+            return {
+                'source_leaf': leaf_path.devices[0],
+                'destination_leaf': leaf_path.devices[-1],
+                'spine': leaf_path.devices[1],
+                'path_type': '2-tier',
+                'segments': leaf_path.segments()
+            }
+        return {
+            'source_leaf': leaf_path.devices[0],
+            'destination_leaf': leaf_path.devices[-1],
+            'source_spine': leaf_path.devices[1],
+            'superspine': leaf_path.devices[2],
+            'dest_spine': leaf_path.devices[3],
+            'path_type': '3-tier',
+            'segments': leaf_path.segments()
+        }
     
     def analyze_source_capabilities(self, source_leaf: str) -> Dict:
         """
@@ -117,42 +99,10 @@ class P2MPPathCalculator:
         normalized_source = self.normalizer.normalize_device_name(source_leaf)
         normalized_dest = self.normalizer.normalize_device_name(dest_leaf)
         
-        # Find shared spine (2-tier path)
-        source_spines = set()
-        dest_spines = set()
-        
-        if normalized_source in self.device_connections:
-            source_spines = {conn['device'] for conn in self.device_connections[normalized_source]}
-        if normalized_dest in self.device_connections:
-            dest_spines = {conn['device'] for conn in self.device_connections[normalized_dest]}
-        shared_spines = source_spines & dest_spines
-        if shared_spines:
-            shared_spine = list(shared_spines)[0]
-            # Get connection details (real interfaces)
-            source_conn = next(conn for conn in self.device_connections[normalized_source] if conn['device'] == shared_spine)
-            dest_conn = next(conn for conn in self.device_connections[normalized_dest] if conn['device'] == shared_spine)
-            return {
-                'source_leaf': normalized_source,
-                'destination_leaf': normalized_dest,
-                'spine': shared_spine,
-                'path_type': '2-tier',
-                'segments': [
-                    {
-                        'type': 'leaf_to_spine',
-                        'source_device': normalized_source,
-                        'dest_device': shared_spine,
-                        'source_interface': source_conn['local_interface'],
-                        'dest_interface': source_conn['remote_interface']
-                    },
-                    {
-                        'type': 'spine_to_leaf',
-                        'source_device': shared_spine,
-                        'dest_device': normalized_dest,
-                        'source_interface': dest_conn['remote_interface'],
-                        'dest_interface': dest_conn['local_interface']
-                    }
-                ]
-            }
+        # Shared spine (2-tier path)
+        paths = self.graph.leaf_paths(normalized_source, normalized_dest)
+        if paths and paths[0].is_two_tier:
+            return self._path_dict(paths[0])
         self.logger.warning(f"No 2-tier path found between {source_leaf} and {dest_leaf}")
         return None
 
@@ -163,6 +113,10 @@ class P2MPPathCalculator:
         - 2-tier for destinations on same spine as source
         - 3-tier for destinations on different spines
         
+        All destinations are solved together as one distribution tree (see
+        p2mp_tree), so spines and superspines are shared between destinations
+        wherever a minimum-hop path allows it.
+        
         Returns:
             {
                 'source_leaf': source_leaf,
@@ -180,14 +134,14 @@ class P2MPPathCalculator:
         failed_destinations = []
         spine_interfaces = {}  # spine: set((device, interface))
         
-        # Get source leaf's connected spines
-        normalized_source = self.normalizer.normalize_device_name(source_leaf)
-        source_spines = set()
-        if normalized_source in self.device_connections:
-            source_spines = {conn['device'] for conn in self.device_connections[normalized_source]}
+        normalized_dests = {dest: self.normalizer.normalize_device_name(dest) for dest in destinations}
+        tree = build_distribution_tree(self.graph, self.normalizer.normalize_device_name(source_leaf),
+                                       normalized_dests.values())
+        self.logger.info(f"Distribution tree uses {len(tree.devices)} spines/superspines and {tree.link_count} links")
         
         for dest in destinations:
-            path = self._calculate_optimal_path_for_destination(source_leaf, dest, source_spines)
+            leaf_path = tree.paths.get(normalized_dests[dest])
+            path = self._path_dict(leaf_path) if leaf_path else None
             if path:
                 individual_paths[dest] = path
                 # For each segment, record spine interfaces
@@ -250,11 +204,13 @@ class P2MPPathCalculator:
             'optimization_metrics': {
                 'total_spines_used': total_spines_used,
                 'path_efficiency': path_efficiency,
-                'failed_destinations': failed_destinations
+                'failed_destinations': failed_destinations,
+                'tree_devices': len(tree.devices),
+                'tree_links': tree.link_count
             }
         }
 
-    def _calculate_optimal_path_for_destination(self, source_leaf: str, dest_leaf: str, source_spines: set) -> Optional[Dict]:
+    def _calculate_optimal_path_for_destination(self, source_leaf: str, dest_leaf: str) -> Optional[Dict]:
         """
         Calculate optimal path for a single destination
         Automatically chooses 2-tier or 3-tier based on spine connectivity
@@ -262,43 +218,10 @@ class P2MPPathCalculator:
         normalized_source = self.normalizer.normalize_device_name(source_leaf)
         normalized_dest = self.normalizer.normalize_device_name(dest_leaf)
         
-        # Get destination's connected spines
-        dest_spines = set()
-        if normalized_dest in self.device_connections:
-            dest_spines = {conn['device'] for conn in self.device_connections[normalized_dest]}
-        
-        # Check for shared spine (2-tier path)
-        shared_spines = source_spines & dest_spines
-        if shared_spines:
-            # Use 2-tier path
-            shared_spine = list(shared_spines)[0]
-            source_conn = next(conn for conn in self.device_connections[normalized_source] if conn['device'] == shared_spine)
-            dest_conn = next(conn for conn in self.device_connections[normalized_dest] if conn['device'] == shared_spine)
-            
-            self.logger.info(f"Using 2-tier path for {dest_leaf} via {shared_spine}")
-            
-            return {
-                'source_leaf': normalized_source,
-                'destination_leaf': normalized_dest,
-                'spine': shared_spine,
-                'path_type': '2-tier',
-                'segments': [
-                    {
-                        'type': 'leaf_to_spine',
-                        'source_device': normalized_source,
-                        'dest_device': shared_spine,
-                        'source_interface': source_conn['local_interface'],
-                        'dest_interface': source_conn['remote_interface']
-                    },
-                    {
-                        'type': 'spine_to_leaf',
-                        'source_device': shared_spine,
-                        'dest_device': normalized_dest,
-                        'source_interface': dest_conn['remote_interface'],
-                        'dest_interface': dest_conn['local_interface']
-                    }
-                ]
-            }
+        paths = self.graph.leaf_paths(normalized_source, normalized_dest)
+        if paths and paths[0].is_two_tier:
+            self.logger.info(f"Using 2-tier path for {dest_leaf} via {paths[0].devices[1]}")
+            return self._path_dict(paths[0])
         
         # No shared spine, try 3-tier path
         self.logger.info(f"No shared spine for {dest_leaf}, attempting 3-tier path")
@@ -308,136 +231,16 @@ class P2MPPathCalculator:
         """
         Calculate 3-tier path via superspine
         """
-        # Find spines connected to source and destination
-        source_spine = None
-        source_conn = None
-        for conn in self.device_connections.get(source_leaf, []):
-            if conn['device'].startswith('DNAAS-SPINE'):
-                source_spine = conn['device']
-                source_conn = conn
-                break
-        
-        dest_spine = None
-        dest_conn = None
-        for conn in self.device_connections.get(dest_leaf, []):
-            if conn['device'].startswith('DNAAS-SPINE'):
-                dest_spine = conn['device']
-                dest_conn = conn
-                break
-        
-        if not source_spine or not dest_spine:
-            self.logger.warning(f"Could not find spine connections for 3-tier path")
-            return None
-        
-        # Find common superspine
-        source_spine_superspines = set()
-        dest_spine_superspines = set()
-        
-        # Get superspines connected to source spine
-        if source_spine in self.device_connections:
-            for conn in self.device_connections[source_spine]:
-                if conn['device'].startswith('DNAAS-SUPERSPINE'):
-                    source_spine_superspines.add(conn['device'])
-        
-        # Get superspines connected to dest spine
-        if dest_spine in self.device_connections:
-            for conn in self.device_connections[dest_spine]:
-                if conn['device'].startswith('DNAAS-SUPERSPINE'):
-                    dest_spine_superspines.add(conn['device'])
-        
-        # Find common superspine
-        common_superspines = source_spine_superspines & dest_spine_superspines
-        if not common_superspines:
+        paths = self.graph.leaf_paths(source_leaf, dest_leaf)
+        if not paths:
             self.logger.warning(f"No common superspine found for 3-tier path")
             return None
+        if paths[0].is_two_tier:
+            # Leaves share a spine, so there is no minimum-hop path via a superspine
+            return None
         
-        superspine = list(common_superspines)[0]
-        
-        # Get connection details
-        source_spine_to_superspine = next(conn for conn in self.device_connections[source_spine] if conn['device'] == superspine)
-        dest_spine_to_superspine = next(conn for conn in self.device_connections[dest_spine] if conn['device'] == superspine)
-        
-        self.logger.info(f"Using 3-tier path via {superspine}")
-        
-        return {
-            'source_leaf': source_leaf,
-            'destination_leaf': dest_leaf,
-            'source_spine': source_spine,
-            'superspine': superspine,
-            'dest_spine': dest_spine,
-            'path_type': '3-tier',
-            'segments': [
-                {
-                    'type': 'leaf_to_spine',
-                    'source_device': source_leaf,
-                    'dest_device': source_spine,
-                    'source_interface': source_conn['local_interface'],
-                    'dest_interface': source_conn['remote_interface']
-                },
-                {
-                    'type': 'spine_to_superspine',
-                    'source_device': source_spine,
-                    'dest_device': superspine,
-                    'source_interface': source_spine_to_superspine['local_interface'],
-                    'dest_interface': source_spine_to_superspine['remote_interface']
-                },
-                {
-                    'type': 'superspine_to_spine',
-                    'source_device': superspine,
-                    'dest_device': dest_spine,
-                    'source_interface': dest_spine_to_superspine['remote_interface'],
-                    'dest_interface': dest_spine_to_superspine['local_interface']
-                },
-                {
-                    'type': 'spine_to_leaf',
-                    'source_device': dest_spine,
-                    'dest_device': dest_leaf,
-                    'source_interface': dest_conn['remote_interface'],
-                    'dest_interface': dest_conn['local_interface']
-                }
-            ]
-        }
-    
-    def _optimize_shared_spine(self, source: str, individual_paths: Dict) -> Dict:
-        """
-        Optimize for minimum spine usage by grouping destinations
-        
-        Args:
-            source: Source leaf device name
-            individual_paths: Dictionary of individual path calculations
-            
-        Returns:
-            Optimized paths with shared spine grouping
-        """
-        # Group destinations by spine
-        spine_groups = {}
-        for dest, path_info in individual_paths.items():
-            spine = path_info['spine']
-            if spine not in spine_groups:
-                spine_groups[spine] = []
-            spine_groups[spine].append(dest)
-        
-        self.logger.info(f"Shared spine optimization: {len(spine_groups)} spines for {len(individual_paths)} destinations")
-        
-        # Return optimized paths (same as individual paths for now)
-        # Future enhancement: further optimize by finding better spine assignments
-        return individual_paths
-    
-    def _optimize_hybrid(self, source: str, individual_paths: Dict) -> Dict:
-        """
-        Optimize using mix of 2-tier and 3-tier paths
-        
-        Args:
-            source: Source leaf device name
-            individual_paths: Dictionary of individual path calculations
-            
-        Returns:
-            Optimized paths with hybrid strategy
-        """
-        # For now, return individual paths
-        # Future enhancement: implement 3-tier path calculation and optimization
-        self.logger.info(f"Hybrid optimization: using {len(individual_paths)} paths")
-        return individual_paths
+        self.logger.info(f"Using 3-tier path via {paths[0].devices[2]}")
+        return self._path_dict(paths[0])
     
     def validate_path_feasibility(self, path: Dict) -> Tuple[bool, List[str]]:
         """
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+P2MP Distribution Tree
+Batched solver for P2MP bridge domains: one minimum-hop distribution tree
+from the source leaf to every destination leaf, instead of one independent
+path per destination.
+
+The fabric is layered (leaf, spine, superspine), so the minimum-hop paths
+from the source form a layered graph found by a single traversal:
+
+    source leaf -> source spines -> superspines -> far spines -> far leaves
+                                 -> near leaves (sharing a source spine)
+
+Near leaves are reached in 2 hops, far leaves in 4. Choosing the fewest
+devices that still reach every destination is a Steiner tree problem on that
+graph; it is approximated bottom-up with a greedy set cover per layer (far
+spines covering far leaves, superspines covering those spines, source spines
+covering superspines and near leaves together), so devices picked for one
+destination are reused by every other destination they can serve.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+from .topology_graph import LeafPath, TopologyGraph
+
+
+class DistributionTree(NamedTuple):
+    """Minimum-hop tree from a source leaf; paths are keyed by destination leaf name"""
+    source: str
+    paths: Dict[str, LeafPath]
+    failed: List[str]  # Unknown or unreachable destinations, in request order
+    devices: Tuple[str, ...]  # Spines and superspines in the tree
+    link_count: int  # Distinct device-to-device hops in the tree
+
+
+def _greedy_cover(targets: Sequence[int], parents: Dict[int, Sequence[int]]) -> Dict[int, int]:
+    """
+    target -> chosen parent, repeatedly choosing the parent that covers the
+    most uncovered targets (ties go to the parent seen first).
+    Every target must have at least one parent.
+    """
+    covers: Dict[int, List[int]] = {}
+    for target in targets:
+        for parent in parents[target]:
+            covers.setdefault(parent, []).append(target)
+    # Uncovered targets per parent, kept current as targets get covered
+    uncovered = {parent: len(covered) for parent, covered in covers.items()}
+
+    assignment: Dict[int, int] = {}
+    while uncovered:
+        best = max(uncovered, key=uncovered.__getitem__)
+        if not uncovered[best]:
+            break
+        del uncovered[best]
+        for target in covers[best]:
+            if target in assignment:
+                continue
+            assignment[target] = best
+            for parent in parents[target]:
+                if parent in uncovered:
+                    uncovered[parent] -= 1
+    return assignment
+
+
+def build_distribution_tree(graph: TopologyGraph, source_leaf: str,
+                            destinations: Iterable[str]) -> DistributionTree:
+    """
+    Minimum-hop distribution tree from source_leaf to destinations.
+
+    Each destination gets the same kind of path as graph.leaf_paths() would
+    give it (2-tier when it shares a spine with the source, otherwise 3-tier),
+    but the spines and superspines are chosen for the whole set at once.
+    Duplicate destinations are solved once.
+    """
+    destinations = list(dict.fromkeys(destinations))
+    source = graph.ids.get(source_leaf)
+    if source is None:
+        return DistributionTree(source_leaf, {}, destinations, (), 0)
+
+    names, links, tier_neighbours = graph.names, graph._links, graph._tier_neighbours
+    dest_ids = {graph.ids[name]: name for name in destinations if name in graph.ids}
+
+    # Traversal from the source, one layer at a time
+    source_spines = tier_neighbours.get((source, 'spine'), ())
+    source_spine_set = set(source_spines)
+    near_parents: Dict[int, List[int]] = {}
+    superspine_parents: Dict[int, List[int]] = {}
+    for spine in source_spines:
+        for leaf in tier_neighbours.get((spine, 'leaf'), ()):
+            near_parents.setdefault(leaf, []).append(spine)
+        for superspine in tier_neighbours.get((spine, 'superspine'), ()):
+            superspine_parents.setdefault(superspine, []).append(spine)
+
+    near = [dest for dest in dest_ids if dest in near_parents]
+    others = [dest for dest in dest_ids if dest not in near_parents]
+    far_spine_parents: Dict[int, List[int]] = {}
+    if others:
+        for superspine in superspine_parents:
+            for spine in tier_neighbours.get((superspine, 'spine'), ()):
+                if spine not in source_spine_set:
+                    far_spine_parents.setdefault(spine, []).append(superspine)
+
+    far: List[int] = []
+    far_parents: Dict[int, List[int]] = {}
+    for dest in others:
+        parents = [spine for spine in tier_neighbours.get((dest, 'spine'), ()) if spine in far_spine_parents]
+        if parents:
+            far.append(dest)
+            far_parents[dest] = parents
+
+    # Greedy cover, bottom-up, so upper layers serve whatever lower layers chose
+    far_spine_of = _greedy_cover(far, far_parents)
+    far_spines = list(dict.fromkeys(far_spine_of.values()))
+    superspine_of = _greedy_cover(far_spines, far_spine_parents)
+    superspines = list(dict.fromkeys(superspine_of.values()))
+    source_spine_of = _greedy_cover(near + superspines, {**near_parents, **superspine_parents})
+
+    paths: Dict[str, LeafPath] = {}
+    for dest, name in dest_ids.items():
+        if dest in near_parents:
+            spine = source_spine_of[dest]
+            paths[name] = LeafPath((source_leaf, names[spine], name),
+                                   (links[(source, spine)][0], links[(spine, dest)][0]))
+        elif dest in far_spine_of:
+            far_spine = far_spine_of[dest]
+            superspine = superspine_of[far_spine]
+            spine = source_spine_of[superspine]
+            paths[name] = LeafPath(
+                (source_leaf, names[spine], names[superspine], names[far_spine], name),
+                (links[(source, spine)][0], links[(spine, superspine)][0],
+                 links[(superspine, far_spine)][0], links[(far_spine, dest)][0])
+            )
+
+    failed = [name for name in destinations if name not in paths]
+    tree_devices = list(dict.fromkeys(source_spine_of.values())) + superspines + far_spines
+    link_count = len(source_spine_of) + len(superspine_of) + len(far_spine_of) + len(set(source_spine_of.values()))
+    return DistributionTree(source_leaf, paths, failed, tuple(names[device] for device in tree_devices), link_count)
+
+
+def tree_size(paths: Iterable[LeafPath]) -> Tuple[int, int]:
+    """(spines and superspines, distinct hops) of the union of paths"""
+    devices: Set[str] = set()
+    hops: Set[Tuple[str, str]] = set()
+    for path in paths:
+        devices.update(path.devices[1:-1])
+        hops.update(zip(path.devices, path.devices[1:]))
+    return len(devices), len(hops)
@@ -10,6 +10,8 @@ from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
 import json
 
+from utils.conditional_response import conditional_json, json_response, sqlite_data_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -522,6 +524,7 @@ def create_export_endpoints(blueprint: Blueprint, db_manager=None):
     """Create export/import API endpoints"""
     
     @blueprint.route('/export/<int:topology_id>', methods=['GET'])
+    @conditional_json(lambda topology_id: sqlite_data_version(db_manager.db_path) if db_manager else None)
     def export_topology(topology_id: int):
         """Export topology data in specified format"""
         try:
@@ -543,7 +546,7 @@ def create_export_endpoints(blueprint: Blueprint, db_manager=None):
                 from config_engine.phase1_database.serializers import Phase1DataSerializer
                 serializer = Phase1DataSerializer()
                 exported_data = serializer.serialize_topology(topology, 'json')
-                return jsonify({
+                return json_response({
                     'success': True,
                     'format': 'json',
                     'data': exported_data,
@@ -554,7 +557,7 @@ def create_export_endpoints(blueprint: Blueprint, db_manager=None):
                 from config_engine.phase1_database.serializers import Phase1DataSerializer
                 serializer = Phase1DataSerializer()
                 exported_data = serializer.serialize_topology(topology, 'yaml')
-                return jsonify({
+                return json_response({
                     'success': True,
                     'format': 'yaml',
                     'data': exported_data,
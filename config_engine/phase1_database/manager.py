@@ -10,9 +10,9 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Iterator, Iterable
 from sqlalchemy import create_engine, text, MetaData
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, selectinload
 
 # Import Phase 1 models and data structures
 from .models import (
@@ -22,11 +22,17 @@ from .models import (
 )
 from config_engine.phase1_data_structures import TopologyData
 from .root_consolidation_manager import RootConsolidationManager
+from .search_index import TopologySearchIndex, ensure_search_index
 from config_engine.path_validation import validate_path_continuity, ValidationResult
 from config_engine.service_signature import ServiceSignatureGenerator, ServiceSignatureResult
 
 logger = logging.getLogger(__name__)
 
+# Child collections to_phase1_topology() reads; each is loaded with one
+# SELECT ... WHERE topology_id IN (...) per batch of topologies
+TOPOLOGY_RELATIONSHIPS = ('devices', 'interfaces', 'paths', 'bridge_domain_configs')
+DEFAULT_STREAM_BATCH_SIZE = 500
+
 
 class Phase1DatabaseManager:
     """
@@ -57,6 +63,13 @@ class Phase1DatabaseManager:
         # Create Phase 1 tables if they don't exist
         self._create_phase1_tables()
         
+        # Full-text search index, kept current by triggers
+        self.search_index = TopologySearchIndex(db_path)
+        try:
+            ensure_search_index(db_path)
+        except sqlite3.Error as e:
+            self.logger.warning(f"⚠️ Topology search index unavailable, using LIKE search: {e}")
+        
         self.logger.info(f"🚀 Phase 1 Database Manager initialized for {db_path}")
     
     def _create_phase1_tables(self) -> None:
@@ -347,7 +360,7 @@ class Phase1DatabaseManager:
             session = self.SessionLocal()
             
             # Query topology data
-            phase1_topology = session.query(Phase1TopologyData).filter(
+            phase1_topology = self.topology_query(session).filter(
                 Phase1TopologyData.id == topology_id
             ).first()
             
@@ -407,13 +420,43 @@ class Phase1DatabaseManager:
         except Exception as e:
             self.logger.error(f"Failed to update bridge domain config for topology {topology_id}: {e}")
     
-    def get_all_topologies(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[TopologyData]:
+    def topology_query(self, session: Session, load: Iterable[str] = TOPOLOGY_RELATIONSHIPS):
+        """
+        Query of Phase1TopologyData rows with the given child collections eager-loaded.
+        
+        Collections are loaded with selectin loading (one IN query per
+        collection, not one query per topology); path segments and the device of
+        each interface come along with their parents.
+        
+        Args:
+            session: Session to query with
+            load: Names of the relationships to load (default: everything
+                to_phase1_topology() needs)
+        """
+        options = []
+        for name in load:
+            if name == 'paths':
+                options.append(selectinload(Phase1TopologyData.paths).selectinload(Phase1PathInfo.segments))
+            elif name == 'interfaces':
+                options.append(selectinload(Phase1TopologyData.interfaces).joinedload(Phase1InterfaceInfo.device))
+            else:
+                options.append(selectinload(getattr(Phase1TopologyData, name)))
+        return session.query(Phase1TopologyData).options(*options)
+    
+    def get_all_topologies(self, limit: Optional[int] = None, offset: Optional[int] = None,
+                           validate_paths: bool = False) -> List[TopologyData]:
         """
         Retrieve all Phase 1 topology data with optional pagination.
         
+        Child tables are loaded in bulk (see topology_query), so the number of
+        queries does not grow with the number of topologies.
+        
         Args:
             limit: Maximum number of topologies to return
             offset: Number of topologies to skip
+            validate_paths: Also run validate_path_continuity on every path and
+                log failures (off by default; PathInfo already checks continuity
+                when it is built)
             
         Returns:
             List of TopologyData objects
@@ -422,7 +465,7 @@ class Phase1DatabaseManager:
             session = self.SessionLocal()
             
             # Build query
-            query = session.query(Phase1TopologyData)
+            query = self.topology_query(session).order_by(Phase1TopologyData.id)
             
             if offset:
                 query = query.offset(offset)
@@ -432,44 +475,15 @@ class Phase1DatabaseManager:
             # Execute query
             phase1_topologies = query.all()
             
-            # Convert to Phase 1 TopologyData objects with path validation
             topology_data_list = []
             validation_failures = []
-            
             for phase1_topology in phase1_topologies:
-                try:
-                    topology_data = phase1_topology.to_phase1_topology()
-                    
-                    # Validate path continuity for each topology
-                    for path in topology_data.paths:
-                        if path.segments:
-                            validation_result = validate_path_continuity(path.segments)
-                            if not validation_result.is_valid:
-                                self.logger.warning(
-                                    f"⚠️ Path validation failed for topology {phase1_topology.id} "
-                                    f"({phase1_topology.bridge_domain_name}): {validation_result.get_error_summary()}"
-                                )
-                                validation_failures.append({
-                                    'topology_id': phase1_topology.id,
-                                    'bridge_domain_name': phase1_topology.bridge_domain_name,
-                                    'validation_result': validation_result
-                                })
-                    
+                topology_data = self._convert_topology(phase1_topology, validate_paths, validation_failures)
+                if topology_data is not None:
                     topology_data_list.append(topology_data)
-                    
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Failed to convert topology {phase1_topology.id}: {e}")
-                    continue
-            
-            # Log validation summary
-            if validation_failures:
-                self.logger.warning(f"⚠️ Path validation failed for {len(validation_failures)} topologies")
-                for failure in validation_failures[:5]:  # Log first 5 failures
-                    self.logger.warning(
-                        f"  - {failure['bridge_domain_name']}: {failure['validation_result'].get_error_summary()}"
-                    )
-            else:
-                self.logger.info("✅ All topology paths passed validation")
+            
+            if validate_paths:
+                self._log_validation_summary(validation_failures)
             
             self.logger.info(f"✅ Retrieved {len(topology_data_list)} Phase 1 topologies")
             return topology_data_list
@@ -480,6 +494,87 @@ class Phase1DatabaseManager:
         finally:
             session.close()
     
+    def iter_topologies(self, batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+                        validate_paths: bool = False) -> Iterator[TopologyData]:
+        """
+        Stream all Phase 1 topologies in id order, batch_size at a time.
+        
+        Each batch is read with keyset pagination and the same bulk loading as
+        get_all_topologies, and is released from the session before the next
+        one, so memory use is bounded by the batch size.
+        
+        Args:
+            batch_size: Topologies loaded per round trip
+            validate_paths: See get_all_topologies
+            
+        Yields:
+            TopologyData objects
+        """
+        session = self.SessionLocal()
+        validation_failures = []
+        count = 0
+        try:
+            last_id = 0
+            while True:
+                batch = (self.topology_query(session)
+                         .filter(Phase1TopologyData.id > last_id)
+                         .order_by(Phase1TopologyData.id)
+                         .limit(batch_size)
+                         .all())
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                converted = [self._convert_topology(row, validate_paths, validation_failures) for row in batch]
+                session.expunge_all()
+                for topology_data in converted:
+                    if topology_data is not None:
+                        count += 1
+                        yield topology_data
+                if len(batch) < batch_size:
+                    break
+        finally:
+            session.close()
+        
+        if validate_paths:
+            self._log_validation_summary(validation_failures)
+        self.logger.info(f"✅ Streamed {count} Phase 1 topologies")
+    
+    def _convert_topology(self, phase1_topology: Phase1TopologyData, validate_paths: bool,
+                          validation_failures: List[Dict[str, Any]]) -> Optional[TopologyData]:
+        """to_phase1_topology() with optional path validation; None if the row cannot be converted"""
+        try:
+            topology_data = phase1_topology.to_phase1_topology()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to convert topology {phase1_topology.id}: {e}")
+            return None
+        
+        if validate_paths:
+            # Validate path continuity for each topology
+            for path in topology_data.paths:
+                if path.segments:
+                    validation_result = validate_path_continuity(path.segments)
+                    if not validation_result.is_valid:
+                        self.logger.warning(
+                            f"⚠️ Path validation failed for topology {phase1_topology.id} "
+                            f"({phase1_topology.bridge_domain_name}): {validation_result.get_error_summary()}"
+                        )
+                        validation_failures.append({
+                            'topology_id': phase1_topology.id,
+                            'bridge_domain_name': phase1_topology.bridge_domain_name,
+                            'validation_result': validation_result
+                        })
+        return topology_data
+    
+    def _log_validation_summary(self, validation_failures: List[Dict[str, Any]]) -> None:
+        if validation_failures:
+            self.logger.warning(f"⚠️ Path validation failed for {len(validation_failures)} topologies")
+            for failure in validation_failures[:5]:  # Log first 5 failures
+                self.logger.warning(
+                    f"  - {failure['bridge_domain_name']}: {failure['validation_result'].get_error_summary()}"
+                )
+        else:
+            self.logger.info("✅ All topology paths passed validation")
+    
     def get_topology_by_bridge_domain(self, bridge_domain_name: str) -> Optional[TopologyData]:
         """
         Retrieve Phase 1 topology data by bridge domain name.
@@ -494,7 +589,7 @@ class Phase1DatabaseManager:
             session = self.SessionLocal()
             
             # Query topology data by bridge domain name
-            phase1_topology = session.query(Phase1TopologyData).filter(
+            phase1_topology = self.topology_query(session).filter(
                 Phase1TopologyData.bridge_domain_name == bridge_domain_name
             ).first()
             
@@ -1089,6 +1184,27 @@ class Phase1DatabaseManager:
             session.close()
 
     def search_topologies(self, search_term: str, limit: int = 50) -> List:
+        """
+        Search topologies by bridge domain name, username, VLAN, device or interface names.
+        
+        Served by the FTS5 index (one ranked query); falls back to LIKE
+        matching on the name when SQLite has no FTS5.
+        """
+        try:
+            return self.search_index.search(search_term, limit)
+        except sqlite3.Error as e:
+            self.logger.warning(f"⚠️ Search index query failed, using LIKE search: {e}")
+            return self._search_topologies_like(search_term, limit)
+    
+    def search_topology_ids(self, search_term: str) -> Optional[List[int]]:
+        """Ids of all matching topologies in rank order, or None when the search index is unavailable"""
+        try:
+            return [result.id for result in self.search_index.search(search_term, limit=None)]
+        except sqlite3.Error as e:
+            self.logger.warning(f"⚠️ Search index query failed: {e}")
+            return None
+    
+    def _search_topologies_like(self, search_term: str, limit: int = 50) -> List:
         """Search topologies by bridge domain name with fuzzy matching"""
         try:
             with self.SessionLocal() as session:
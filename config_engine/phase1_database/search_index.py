@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Phase 1 Topology Search Index
+
+SQLite FTS5 index over Phase 1 topologies: bridge domain name (and its
+tokens), username, VLAN, device names and interface names. Triggers on the
+topology, device and interface tables keep one index document per topology
+current, so a search is a single ranked MATCH query instead of several
+LIKE '%term%' scans.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'phase1_topology_search'
+
+# Relative weight of each indexed column in the bm25 ranking
+COLUMN_WEIGHTS = (
+    ('name', 10.0),
+    ('username', 5.0),
+    ('vlan', 5.0),
+    ('devices', 1.0),
+    ('interfaces', 1.0),
+)
+
+# Second '_'-separated part of the name, e.g. g_visaev_v253 -> visaev
+_REST = "substr(t.bridge_domain_name, instr(t.bridge_domain_name, '_') + 1)"
+USERNAME_SQL = (f"CASE WHEN instr(t.bridge_domain_name, '_') > 0 AND instr({_REST}, '_') > 0 "
+                f"THEN substr({_REST}, 1, instr({_REST}, '_') - 1) ELSE '' END")
+
+
+def _insert_documents_sql(where: str = '') -> str:
+    """INSERT ... SELECT building index documents for the topologies matching where"""
+    return f"""INSERT INTO {SEARCH_TABLE} (rowid, name, username, vlan, devices, interfaces)
+    SELECT t.id, t.bridge_domain_name, {USERNAME_SQL}, COALESCE(t.vlan_id, ''),
+           COALESCE((SELECT group_concat(d.name, ' ') FROM phase1_device_info d WHERE d.topology_id = t.id), ''),
+           COALESCE((SELECT group_concat(i.name, ' ') FROM phase1_interface_info i WHERE i.topology_id = t.id), '')
+    FROM phase1_topology_data t {where}"""
+
+
+def _refresh_sql(topology_id: str) -> str:
+    """Statements rebuilding the index document of one topology"""
+    return f"""DELETE FROM {SEARCH_TABLE} WHERE rowid = {topology_id};
+    {_insert_documents_sql(f'WHERE t.id = {topology_id}')};"""
+
+
+def _trigger(name: str, event: str, table: str, topology_id: str) -> List[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS {name}",
+        f"""CREATE TRIGGER {name} {event} ON {table}
+    BEGIN
+    {_refresh_sql(topology_id)}
+    END""",
+    ]
+
+
+SCHEMA_STATEMENTS = (
+    _trigger('trg_topology_search_insert', 'AFTER INSERT', 'phase1_topology_data', 'NEW.id')
+    + _trigger('trg_topology_search_update', 'AFTER UPDATE OF bridge_domain_name, vlan_id',
+               'phase1_topology_data', 'NEW.id')
+    + _trigger('trg_topology_search_delete', 'AFTER DELETE', 'phase1_topology_data', 'OLD.id')
+    + _trigger('trg_topology_search_device_insert', 'AFTER INSERT', 'phase1_device_info', 'NEW.topology_id')
+    + _trigger('trg_topology_search_device_update', 'AFTER UPDATE OF name, topology_id',
+               'phase1_device_info', 'NEW.topology_id')
+    + _trigger('trg_topology_search_device_delete', 'AFTER DELETE', 'phase1_device_info', 'OLD.topology_id')
+    + _trigger('trg_topology_search_interface_insert', 'AFTER INSERT', 'phase1_interface_info', 'NEW.topology_id')
+    + _trigger('trg_topology_search_interface_update', 'AFTER UPDATE OF name, topology_id',
+               'phase1_interface_info', 'NEW.topology_id')
+    + _trigger('trg_topology_search_interface_delete', 'AFTER DELETE', 'phase1_interface_info', 'OLD.topology_id')
+)
+
+_index_ready = set()
+_index_lock = threading.Lock()
+
+
+def ensure_search_index(db_path: str):
+    """
+    Create the FTS5 table and its triggers once per database, and build the
+    index from the existing rows when the table is new.
+
+    Raises:
+        sqlite3.OperationalError: SQLite lacks FTS5 or the Phase 1 tables are missing
+    """
+    if db_path in _index_ready:
+        return
+    with _index_lock:
+        if db_path in _index_ready:
+            return
+        conn = sqlite3.connect(db_path, timeout=30.0)
+        try:
+            # One transaction, so other writers never see the triggers missing
+            conn.execute("BEGIN IMMEDIATE")
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+            ).fetchone()
+            if not exists:
+                conn.execute(f"""CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+                    name, username, vlan, devices, interfaces,
+                    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+                )""")
+            for statement in SCHEMA_STATEMENTS:
+                conn.execute(statement)
+            if not exists:
+                conn.execute(_insert_documents_sql())
+                count = conn.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE}").fetchone()[0]
+                logger.info(f"Built topology search index ({count} topologies)")
+            conn.commit()
+        finally:
+            conn.close()
+        _index_ready.add(db_path)
+
+
+def build_match_query(search_term: str) -> Optional[str]:
+    """
+    FTS5 query for a user search term: every word must match, as a prefix.
+
+    'visaev v25' -> '"visaev"* "v25"*'; returns None when the term has no words.
+    """
+    tokens = re.findall(r'[^\W_]+', search_term.lower())
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+@dataclass
+class TopologySearchResult:
+    """Search hit; independent of any database session"""
+    id: int
+    bridge_domain_name: str
+    topology_type: str
+    vlan_id: Optional[int]
+    device_count: int
+    created_at: Any
+    score: float
+    devices: List[Any] = field(default_factory=list)  # Not loaded for search results
+
+
+class TopologySearchIndex:
+    """Ranked prefix/token search over Phase 1 topologies"""
+
+    def __init__(self, db_path: str = 'instance/lab_automation.db'):
+        self.db_path = db_path
+
+    def search(self, search_term: str, limit: Optional[int] = 50) -> List[TopologySearchResult]:
+        """
+        Topologies matching every word of search_term as a prefix of a word in
+        the name, username, VLAN, device or interface names.
+
+        Exact name matches rank first, then names starting with the term, then
+        bm25 relevance (name and username/VLAN weighted over device and
+        interface names).
+        """
+        match = build_match_query(search_term)
+        if match is None:
+            return []
+        ensure_search_index(self.db_path)
+
+        weights = ', '.join(str(weight) for _, weight in COLUMN_WEIGHTS)
+        escaped = search_term.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = f"""
+            SELECT t.id, t.bridge_domain_name, t.topology_type, t.vlan_id,
+                   COALESCE(t.device_count, 0), t.created_at,
+                   bm25({SEARCH_TABLE}, {weights}) AS score
+            FROM {SEARCH_TABLE} s
+            JOIN phase1_topology_data t ON t.id = s.rowid
+            WHERE {SEARCH_TABLE} MATCH ?
+            ORDER BY lower(t.bridge_domain_name) = ? DESC,
+                     lower(t.bridge_domain_name) LIKE ? ESCAPE '\\' DESC,
+                     score, t.bridge_domain_name
+        """
+        params: List[Any] = [match, search_term.lower(), f"{escaped}%"]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [TopologySearchResult(id=row[0], bridge_domain_name=row[1], topology_type=row[2],
+                                     vlan_id=row[3], device_count=row[4], created_at=_parse_datetime(row[5]),
+                                     score=-row[6])
+                for row in rows]
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
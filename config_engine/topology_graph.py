@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Topology Graph
+Immutable leaf/spine/superspine graph built once per topology snapshot (see
+topology_snapshot) and shared by the bridge domain builders and the P2MP path
+calculator.
+
+Devices get integer ids with a tier label; adjacency is kept as tuples of
+neighbour ids and every edge carries its interface pairs. Leaf-to-leaf paths,
+including equal-cost alternatives, are computed once per leaf pair and cached
+on the graph, so they are shared by every builder using the same snapshot.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+TIERS = ('leaf', 'spine', 'superspine')
+UNKNOWN_INTERFACE = 'unknown'
+
+# Upper bound on cached leaf pairs per graph and on alternatives per pair
+PATH_CACHE_MAX_ENTRIES = 100000
+MAX_ECMP_PATHS = 64
+
+TWO_TIER_SEGMENTS = ('leaf_to_spine', 'spine_to_leaf')
+THREE_TIER_SEGMENTS = ('leaf_to_spine', 'spine_to_superspine', 'superspine_to_spine', 'spine_to_leaf')
+
+Link = Tuple[str, str]  # (interface on the near device, interface on the far device)
+
+
+class LeafPath(NamedTuple):
+    """Leaf-to-leaf path: leaf, spine[, superspine, spine], leaf"""
+    devices: Tuple[str, ...]
+    links: Tuple[Link, ...]  # One per hop, oriented along the path
+
+    @property
+    def is_two_tier(self) -> bool:
+        return len(self.devices) == 3
+
+    def segments(self) -> List[Dict[str, str]]:
+        """Path segments in the builders' dict format"""
+        types = TWO_TIER_SEGMENTS if self.is_two_tier else THREE_TIER_SEGMENTS
+        return [{
+            'type': segment_type,
+            'source_device': self.devices[hop],
+            'dest_device': self.devices[hop + 1],
+            'source_interface': self.links[hop][0],
+            'dest_interface': self.links[hop][1]
+        } for hop, segment_type in enumerate(types)]
+
+
+def _guess_tier(name: str) -> str:
+    upper = name.upper()
+    if 'SUPERSPINE' in upper:
+        return 'superspine'
+    if 'SPINE' in upper:
+        return 'spine'
+    if 'LEAF' in upper:
+        return 'leaf'
+    return 'unknown'
+
+
+class TopologyGraph:
+    """
+    Read-only graph of one topology snapshot.
+
+    Edges come from 'connected_spines' (dicts or bare names) and
+    'connected_superspines' of every device and are stored in both
+    directions; a link listed by both of its ends is kept once.
+    """
+
+    def __init__(self, topology_data: Optional[Dict[str, Any]]):
+        topology_data = topology_data or {}
+        devices = topology_data.get('devices', {}) or {}
+
+        listed_tiers = {}
+        for key, tier in (('available_leaves', 'leaf'), ('spine_devices', 'spine'),
+                          ('superspine_devices', 'superspine')):
+            for name in topology_data.get(key, []) or []:
+                listed_tiers.setdefault(name, tier)
+
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.tiers: List[str] = []
+        neighbours: List[List[int]] = []
+        links: Dict[Tuple[int, int], List[Link]] = {}
+
+        def node(name: str) -> int:
+            node_id = self.ids.get(name)
+            if node_id is None:
+                node_id = self.ids[name] = len(self.names)
+                self.names.append(name)
+                info = devices.get(name)
+                tier = info.get('type') if isinstance(info, dict) else None
+                if tier not in TIERS:
+                    tier = listed_tiers.get(name) or _guess_tier(name)
+                self.tiers.append(tier)
+                neighbours.append([])
+            return node_id
+
+        def add_link(a: int, b: int, local_interface: str, remote_interface: str):
+            forward = links.get((a, b))
+            if forward is None:
+                forward = links[(a, b)] = []
+                links[(b, a)] = []
+                neighbours[a].append(b)
+                neighbours[b].append(a)
+            if (local_interface, remote_interface) not in forward:
+                forward.append((local_interface, remote_interface))
+                links[(b, a)].append((remote_interface, local_interface))
+
+        for name in devices:
+            node(name)
+        for name, info in devices.items():
+            if not isinstance(info, dict):
+                continue
+            device_id = self.ids[name]
+            for key in ('connected_spines', 'connected_superspines'):
+                for conn in info.get(key, []) or []:
+                    if isinstance(conn, dict):
+                        if not conn.get('name'):
+                            continue
+                        add_link(device_id, node(conn['name']),
+                                 conn.get('local_interface', UNKNOWN_INTERFACE),
+                                 conn.get('remote_interface', UNKNOWN_INTERFACE))
+                    elif conn:
+                        add_link(device_id, node(conn), UNKNOWN_INTERFACE, UNKNOWN_INTERFACE)
+
+        self.adjacency: Tuple[Tuple[int, ...], ...] = tuple(tuple(n) for n in neighbours)
+        self._links: Dict[Tuple[int, int], Tuple[Link, ...]] = {key: tuple(value) for key, value in links.items()}
+        # Neighbours per tier, in adjacency order
+        self._tier_neighbours: Dict[Tuple[int, str], Tuple[int, ...]] = {}
+        for node_id, adjacent in enumerate(self.adjacency):
+            for tier in TIERS:
+                matching = tuple(other for other in adjacent if self.tiers[other] == tier)
+                if matching:
+                    self._tier_neighbours[(node_id, tier)] = matching
+
+        self._connection_map: Optional[Dict[str, List[Dict[str, str]]]] = None
+        self._paths: Dict[Tuple[int, int], Tuple[LeafPath, ...]] = {}
+        self.stats = {'path_hits': 0, 'path_misses': 0}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def tier(self, name: str) -> Optional[str]:
+        node_id = self.ids.get(name)
+        return self.tiers[node_id] if node_id is not None else None
+
+    def neighbours(self, name: str, tier: Optional[str] = None) -> List[str]:
+        """Adjacent devices, optionally only those of one tier"""
+        node_id = self.ids.get(name)
+        if node_id is None:
+            return []
+        adjacent = self.adjacency[node_id] if tier is None else self._tier_neighbours.get((node_id, tier), ())
+        return [self.names[other] for other in adjacent]
+
+    def links(self, source: str, dest: str) -> Tuple[Link, ...]:
+        """(source interface, dest interface) of every link between two devices"""
+        a, b = self.ids.get(source), self.ids.get(dest)
+        if a is None or b is None:
+            return ()
+        return self._links.get((a, b), ())
+
+    def connection_map(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        device -> [{'device', 'local_interface', 'remote_interface', 'connection_type'}]
+        for every device with at least one link; connection_type is the tier
+        of the neighbour. Built once and shared, so callers must not modify it.
+        """
+        if self._connection_map is None:
+            connection_map = {}
+            for node_id, adjacent in enumerate(self.adjacency):
+                if not adjacent:
+                    continue
+                connection_map[self.names[node_id]] = [{
+                    'device': self.names[other],
+                    'local_interface': local_interface,
+                    'remote_interface': remote_interface,
+                    'connection_type': self.tiers[other]
+                } for other in adjacent for local_interface, remote_interface in self._links[(node_id, other)]]
+            self._connection_map = connection_map
+        return self._connection_map
+
+    def leaf_paths(self, source_leaf: str, dest_leaf: str) -> Tuple[LeafPath, ...]:
+        """
+        Minimum-hop leaf-to-leaf paths, preferred path first.
+
+        Leaves sharing a spine get only 2-tier paths (one per shared spine,
+        in the source leaf's link order); otherwise every spine, superspine,
+        spine combination is returned. Empty when either leaf is unknown or
+        no path exists.
+        """
+        a, b = self.ids.get(source_leaf), self.ids.get(dest_leaf)
+        if a is None or b is None:
+            return ()
+        key = (a, b)
+        paths = self._paths.get(key)
+        if paths is not None:
+            self.stats['path_hits'] += 1
+            return paths
+        self.stats['path_misses'] += 1
+        paths = self._compute_leaf_paths(a, b)
+        if len(self._paths) >= PATH_CACHE_MAX_ENTRIES:
+            self._paths.clear()
+        self._paths[key] = paths
+        return paths
+
+    def _compute_leaf_paths(self, a: int, b: int) -> Tuple[LeafPath, ...]:
+        source_spines = self._tier_neighbours.get((a, 'spine'), ())
+        dest_spines = self._tier_neighbours.get((b, 'spine'), ())
+        names, links = self.names, self._links
+
+        dest_spine_set = set(dest_spines)
+        paths = []
+        for spine in source_spines:
+            if spine in dest_spine_set:
+                paths.append(LeafPath(
+                    (names[a], names[spine], names[b]),
+                    (links[(a, spine)][0], links[(spine, b)][0])
+                ))
+                if len(paths) >= MAX_ECMP_PATHS:
+                    break
+        if paths:
+            return tuple(paths)
+
+        for source_spine in source_spines:
+            for superspine in self._tier_neighbours.get((source_spine, 'superspine'), ()):
+                superspine_spines = set(self._tier_neighbours.get((superspine, 'spine'), ()))
+                for dest_spine in dest_spines:
+                    if dest_spine == source_spine or dest_spine not in superspine_spines:
+                        continue
+                    paths.append(LeafPath(
+                        (names[a], names[source_spine], names[superspine], names[dest_spine], names[b]),
+                        (links[(a, source_spine)][0], links[(source_spine, superspine)][0],
+                         links[(superspine, dest_spine)][0], links[(dest_spine, b)][0])
+                    ))
+                    if len(paths) >= MAX_ECMP_PATHS:
+                        return tuple(paths)
+        return tuple(paths)
+
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Topology Snapshot
+Process-wide cache of the topology and bundle mapping files used by the
+bridge domain builders.
+
+Each snapshot holds the loaded and normalized topology, the bundle mapping,
+its bundle index and the topology graph for one version of the files (the
+stat of every topology and bundle file). Builders take the current snapshot
+instead of reading and normalizing the files themselves, so constructing a
+builder per request costs a few stat calls while the files are unchanged.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+from .bundle_index import BundleIndex
+from .device_name_normalizer import normalizer
+from .topology_graph import TopologyGraph
+
+logger = logging.getLogger(__name__)
+
+TOPOLOGY_FILES = ('complete_topology_v2.json', 'complete_topology.json')
+ENHANCED_TOPOLOGY_FILE = 'enhanced_topology.json'
+BUNDLE_FILES = ('bundle_mapping_v2.yaml', 'bundle_interface_mapping.yaml')
+# A change to any of these files is a new snapshot
+SNAPSHOT_FILES = TOPOLOGY_FILES + (ENHANCED_TOPOLOGY_FILE,) + BUNDLE_FILES
+
+
+def snapshot_files_version(topology_dir: Path) -> Tuple:
+    """(mtime_ns, size) of each snapshot file; None for a missing file"""
+    version = []
+    for filename in SNAPSHOT_FILES:
+        try:
+            st = os.stat(topology_dir / filename)
+        except OSError:
+            version.append(None)
+            continue
+        version.append((st.st_mtime_ns, st.st_size))
+    return tuple(version)
+
+
+def load_topology_data(topology_dir: Path) -> Dict[str, Any]:
+    """Load topology data from JSON file (V2 format first)"""
+    try:
+        for filename in TOPOLOGY_FILES:
+            topology_file = topology_dir / filename
+            if topology_file.exists():
+                with open(topology_file, 'r') as f:
+                    return json.load(f)
+        logger.warning(f"Topology file not found: {topology_dir / TOPOLOGY_FILES[-1]}")
+        return {}
+    except Exception as e:
+        logger.error(f"Failed to load topology data: {e}")
+        return {}
+
+
+def load_bundle_mappings(topology_dir: Path) -> Dict[str, Any]:
+    """Load bundle interface mappings (V2 format first)"""
+    try:
+        for filename in BUNDLE_FILES:
+            bundle_file = topology_dir / filename
+            if bundle_file.exists():
+                with open(bundle_file, 'r') as f:
+                    return yaml.safe_load(f) or {}
+        logger.warning(f"Bundle mapping file not found: {topology_dir / BUNDLE_FILES[-1]}")
+        return {}
+    except Exception as e:
+        logger.error(f"Failed to load bundle mappings: {e}")
+        return {}
+
+
+def normalize_topology_data(topology_data: Dict[str, Any], topology_dir: Path) -> Dict[str, Any]:
+    """
+    Apply device name normalization to topology data.
+
+    enhanced_topology.json, when present, is already normalized and replaces
+    the loaded topology.
+    """
+    if not topology_data:
+        return topology_data
+
+    enhanced_topology_file = topology_dir / ENHANCED_TOPOLOGY_FILE
+    if enhanced_topology_file.exists():
+        logger.info("Using enhanced topology with normalization")
+        with open(enhanced_topology_file, 'r') as f:
+            return json.load(f)
+
+    logger.info("Applying normalization to existing topology data")
+    devices = topology_data.get('devices', {})
+    normalized_devices = {}
+
+    for device_name, device_info in devices.items():
+        normalized_name = normalizer.normalize_device_name(device_name)
+        normalized_devices[normalized_name] = device_info
+
+        # Update device name in device info
+        device_info['name'] = normalized_name
+
+        # Normalize connected spines
+        if 'connected_spines' in device_info:
+            normalized_spines = []
+            for spine_conn in device_info['connected_spines']:
+                if isinstance(spine_conn, dict):
+                    # Handle new format with connection details
+                    spine_conn['name'] = normalizer.normalize_device_name(spine_conn.get('name', ''))
+                    normalized_spines.append(spine_conn)
+                else:
+                    # Handle old format with just spine names
+                    normalized_spines.append(normalizer.normalize_device_name(spine_conn))
+            device_info['connected_spines'] = normalized_spines
+
+    topology_data['devices'] = normalized_devices
+
+    # Normalize device lists
+    for key in ['available_leaves', 'unavailable_leaves', 'superspine_devices', 'spine_devices']:
+        if key in topology_data:
+            topology_data[key] = [normalizer.normalize_device_name(device) for device in topology_data[key]]
+    return topology_data
+
+
+class TopologySnapshot:
+    """
+    Topology, bundle mapping and derived indexes of one version of the files.
+
+    Shared by every builder created while the files are unchanged: treat
+    topology_data and bundle_mappings as read-only.
+    """
+
+    def __init__(self, topology_dir: Path, version: Tuple,
+                 topology_data: Dict[str, Any], bundle_mappings: Dict[str, Any]):
+        self.topology_dir = topology_dir
+        self.version = version
+        self.topology_data = topology_data
+        self.bundle_mappings = bundle_mappings
+        self.bundle_index = BundleIndex(bundle_mappings)
+        self.graph = TopologyGraph(topology_data)
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, topology_dir: Path, version: Tuple) -> 'TopologySnapshot':
+        topology_data = load_topology_data(topology_dir)
+        bundle_mappings = load_bundle_mappings(topology_dir)
+        topology_data = normalize_topology_data(topology_data, topology_dir)
+        return cls(topology_dir, version, topology_data, bundle_mappings)
+
+
+class TopologySnapshotRegistry:
+    """Latest snapshot per topology directory, reloaded only when its files change"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, TopologySnapshot] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.stats = {'loads': 0, 'hits': 0}
+
+    def get(self, topology_dir) -> TopologySnapshot:
+        topology_dir = Path(topology_dir)
+        key = str(topology_dir.resolve())
+        # Version read before loading, so a snapshot never claims newer files than it holds
+        version = snapshot_files_version(topology_dir)
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.version == version:
+            self.stats['hits'] += 1
+            return snapshot
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        # One load per directory at a time; concurrent callers wait for it
+        with load_lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.version == version:
+                self.stats['hits'] += 1
+                return snapshot
+            started = time.perf_counter()
+            snapshot = TopologySnapshot.load(topology_dir, version)
+            self._snapshots[key] = snapshot
+            self.stats['loads'] += 1
+        logger.info(f"Loaded topology snapshot from {topology_dir}: {len(snapshot.graph)} devices, "
+                    f"{snapshot.bundle_index.bundle_count} bundles ({time.perf_counter() - started:.3f}s)")
+        return snapshot
+
+    def invalidate(self, topology_dir=None):
+        """Force a reload on the next access (of one directory, or of all)"""
+        with self._lock:
+            if topology_dir is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(str(Path(topology_dir).resolve()), None)
+
+
+_snapshot_registry: Optional[TopologySnapshotRegistry] = None
+_snapshot_registry_lock = threading.Lock()
+
+
+def get_snapshot_registry() -> TopologySnapshotRegistry:
+    """Get the process-wide topology snapshot registry."""
+    global _snapshot_registry
+    if _snapshot_registry is None:
+        with _snapshot_registry_lock:
+            if _snapshot_registry is None:
+                _snapshot_registry = TopologySnapshotRegistry()
+    return _snapshot_registry
+
+
+def get_topology_snapshot(topology_dir="topology") -> TopologySnapshot:
+    """Current snapshot of the topology files in topology_dir"""
+    return get_snapshot_registry().get(topology_dir)
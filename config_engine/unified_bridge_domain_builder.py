@@ -53,60 +53,9 @@ class UnifiedBridgeDomainBuilder:
         self.topology_data = self.original_builder.topology_data
         self.bundle_mappings = self.original_builder.bundle_mappings
         
-        # Build device connection map
-        self.device_connections = self._build_connection_map()
-    
-    def _build_connection_map(self) -> Dict:
-        """Build comprehensive device connection map from topology data"""
-        devices = self.topology_data.get('devices', {})
-        device_connections = {}
-        
-        for device_name, device_info in devices.items():
-            device_connections[device_name] = []
-            
-            # Add spine connections
-            for spine_conn in device_info.get('connected_spines', []):
-                if isinstance(spine_conn, dict):
-                    spine_name = spine_conn['name']
-                    device_connections[device_name].append({
-                        'device': spine_name,
-                        'local_interface': spine_conn['local_interface'],
-                        'remote_interface': spine_conn['remote_interface'],
-                        'connection_type': 'spine'
-                    })
-                    
-                    # Add reverse connection for spine
-                    if spine_name not in device_connections:
-                        device_connections[spine_name] = []
-                    device_connections[spine_name].append({
-                        'device': device_name,
-                        'local_interface': spine_conn['remote_interface'],
-                        'remote_interface': spine_conn['local_interface'],
-                        'connection_type': 'leaf'
-                    })
-            
-            # Add superspine connections
-            for superspine_conn in device_info.get('connected_superspines', []):
-                if isinstance(superspine_conn, dict):
-                    superspine_name = superspine_conn['name']
-                    device_connections[device_name].append({
-                        'device': superspine_name,
-                        'local_interface': superspine_conn['local_interface'],
-                        'remote_interface': superspine_conn['remote_interface'],
-                        'connection_type': 'superspine'
-                    })
-                    
-                    # Add reverse connection for superspine
-                    if superspine_name not in device_connections:
-                        device_connections[superspine_name] = []
-                    device_connections[superspine_name].append({
-                        'device': device_name,
-                        'local_interface': superspine_conn['remote_interface'],
-                        'remote_interface': superspine_conn['local_interface'],
-                        'connection_type': 'spine'
-                    })
-        
-        return device_connections
+        # Shared, read-only connection map of the topology snapshot
+        self.graph = self.original_builder.graph
+        self.device_connections = self.graph.connection_map()
     
     def get_device_type(self, device_name: str) -> DeviceType:
         """Get device type for a device"""
@@ -651,36 +600,6 @@ Source Device: {metadata.get('source_device', 'N/A')}
         
         return summary 
 
-    def _find_actual_device_name_for_bundle(self, consolidated_device: str) -> Optional[str]:
-        """Find the actual device name in bundle mappings for a consolidated device name"""
-        bundles = self.bundle_mappings.get('bundles', {})
-        
-        # Try to find a bundle that matches the consolidated device name
-        for bundle_key, bundle_info in bundles.items():
-            if isinstance(bundle_info, dict) and 'device' in bundle_info:
-                bundle_device = bundle_info['device']
-                # Check if this bundle device matches our consolidated device
-                # Remove NCC suffixes and normalize case
-                normalized_bundle_device = bundle_device.replace('-NCC0', '').replace('-NCC1', '')
-                normalized_consolidated = consolidated_device.replace('SUPERSPINE', 'SuperSpine')
-                
-                if normalized_bundle_device == normalized_consolidated:
-                    return bundle_device
-        
-        return None
-    
     def _get_bundle_for_superspine_interface(self, device: str, interface: str) -> Optional[str]:
-        """Get bundle for superspine interface with proper device name handling"""
-        # First try with the original device name
-        bundle = self.original_builder.get_bundle_for_interface(device, interface)
-        if bundle:
-            return bundle
-        
-        # If not found, try to find the actual device name in bundle mappings
-        actual_device = self._find_actual_device_name_for_bundle(device)
-        if actual_device:
-            bundle = self.original_builder.get_bundle_for_interface(actual_device, interface)
-            if bundle:
-                return bundle
-        
-        return None 
\ No newline at end of file
+        """Get bundle for superspine interface, matching either NCC of the chassis"""
+        return self.original_builder.bundle_index.bundle_name(device, interface, match_chassis=True)
@@ -16,7 +16,6 @@ import re
 import yaml
 import json
 import logging
-import paramiko
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
@@ -25,8 +24,7 @@ from dataclasses import dataclass, asdict
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config_engine.ssh.connection.connection_manager import SSHConnectionManager
-from config_engine.ssh.execution.command_executor import SSHCommandExecutor
+from utils.ssh_pool import PooledSession, get_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -62,9 +60,8 @@ class VLANConfigurationCollector:
         self.output_dir = Path("topology/configs/parsed_data")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # SSH connection manager
-        self.ssh_manager = SSHConnectionManager()
-        self.command_executor = SSHCommandExecutor()
+        # Shared SSH session pool
+        self.session_pool = get_session_pool()
         
         # DNOS VLAN configuration patterns
         self.vlan_patterns = {
@@ -110,20 +107,21 @@ class VLANConfigurationCollector:
         
         try:
             # Connect to device
-            ssh_client = self.ssh_manager.connect_to_device(device_info)
+            ssh_client = self._connect_to_device(device_info)
             if not ssh_client:
                 logger.error(f"Failed to connect to {device_name}")
                 return vlan_configs
             
-            # Collect VLAN-related configurations
-            vlan_configs.extend(self._collect_interface_vlan_configs(ssh_client, device_name))
-            vlan_configs.extend(self._collect_vlan_manipulation_configs(ssh_client, device_name))
-            vlan_configs.extend(self._collect_qinq_configs(ssh_client, device_name))
-            vlan_configs.extend(self._collect_bridge_domain_configs(ssh_client, device_name))
-            vlan_configs.extend(self._collect_interface_descriptions(ssh_client, device_name))
-            
-            # Close SSH connection
-            ssh_client.close()
+            try:
+                # Collect VLAN-related configurations
+                vlan_configs.extend(self._collect_interface_vlan_configs(ssh_client, device_name))
+                vlan_configs.extend(self._collect_vlan_manipulation_configs(ssh_client, device_name))
+                vlan_configs.extend(self._collect_qinq_configs(ssh_client, device_name))
+                vlan_configs.extend(self._collect_bridge_domain_configs(ssh_client, device_name))
+                vlan_configs.extend(self._collect_interface_descriptions(ssh_client, device_name))
+            finally:
+                # Return SSH session to the pool
+                ssh_client.close()
             
             logger.info(f"Collected {len(vlan_configs)} VLAN configurations from {device_name}")
             
@@ -132,14 +130,41 @@ class VLANConfigurationCollector:
         
         return vlan_configs
     
-    def _collect_interface_vlan_configs(self, ssh_client: paramiko.SSHClient, device_name: str) -> List[VLANConfiguration]:
+    def _connect_to_device(self, device_info: Dict) -> Optional[PooledSession]:
+        """Borrow a pooled SSH session for a device"""
+        try:
+            hostname = device_info.get('mgmt_ip') or device_info.get('hostname')
+            if not hostname:
+                logger.error("No hostname/mgmt_ip found for device")
+                return None
+            
+            return self.session_pool.acquire(
+                hostname,
+                device_info.get('username', 'admin'),
+                device_info.get('password', 'admin'),
+                port=device_info.get('ssh_port', 22)
+            )
+        except Exception as e:
+            logger.error(f"Failed to connect to {device_info.get('mgmt_ip', 'unknown')}: {e}")
+            return None
+    
+    def _execute_command(self, ssh_client: PooledSession, command: str) -> Tuple[bool, str]:
+        """Execute a command on a pooled session"""
+        try:
+            return True, ssh_client.send_command_with_full_output(command)
+        except Exception as e:
+            logger.error(f"Failed to execute command '{command}': {e}")
+            ssh_client.invalidate()
+            return False, str(e)
+    
+    def _collect_interface_vlan_configs(self, ssh_client: PooledSession, device_name: str) -> List[VLANConfiguration]:
         """Collect interface VLAN ID configurations"""
         vlan_configs = []
         
         try:
             # Get interface VLAN configurations
             command = "show running-config interfaces | grep -E '(vlan-id|vlan-range|vlan-list)'"
-            success, output = self.command_executor.execute_command(ssh_client, command)
+            success, output = self._execute_command(ssh_client, command)
             
             if not success:
                 logger.warning(f"Failed to get VLAN configs from {device_name}")
@@ -216,14 +241,14 @@ class VLANConfigurationCollector:
         
         return vlan_configs
     
-    def _collect_vlan_manipulation_configs(self, ssh_client: paramiko.SSHClient, device_name: str) -> List[VLANConfiguration]:
+    def _collect_vlan_manipulation_configs(self, ssh_client: PooledSession, device_name: str) -> List[VLANConfiguration]:
         """Collect VLAN manipulation configurations (QinQ)"""
         vlan_configs = []
         
         try:
             # Get VLAN manipulation configurations
             command = "show running-config interfaces | grep -A 5 -B 5 'vlan-manipulation'"
-            success, output = self.command_executor.execute_command(ssh_client, command)
+            success, output = self._execute_command(ssh_client, command)
             
             if not success:
                 logger.warning(f"Failed to get VLAN manipulation configs from {device_name}")
@@ -298,14 +323,14 @@ class VLANConfigurationCollector:
         
         return vlan_configs
     
-    def _collect_qinq_configs(self, ssh_client: paramiko.SSHClient, device_name: str) -> List[VLANConfiguration]:
+    def _collect_qinq_configs(self, ssh_client: PooledSession, device_name: str) -> List[VLANConfiguration]:
         """Collect QinQ outer/inner tag configurations"""
         vlan_configs = []
         
         try:
             # Get QinQ configurations
             command = "show running-config interfaces | grep -A 3 -B 3 'vlan-tags'"
-            success, output = self.command_executor.execute_command(ssh_client, command)
+            success, output = self._execute_command(ssh_client, command)
             
             if not success:
                 logger.warning(f"Failed to get QinQ configs from {device_name}")
@@ -340,14 +365,14 @@ class VLANConfigurationCollector:
         
         return vlan_configs
     
-    def _collect_bridge_domain_configs(self, ssh_client: paramiko.SSHClient, device_name: str) -> List[VLANConfiguration]:
+    def _collect_bridge_domain_configs(self, ssh_client: PooledSession, device_name: str) -> List[VLANConfiguration]:
         """Collect bridge domain interface mappings"""
         vlan_configs = []
         
         try:
             # Get bridge domain configurations
             command = "show running-config network-services | grep -A 10 -B 5 'bridge-domain instance'"
-            success, output = self.command_executor.execute_command(ssh_client, command)
+            success, output = self._execute_command(ssh_client, command)
             
             if not success:
                 logger.warning(f"Failed to get bridge domain configs from {device_name}")
@@ -392,14 +417,14 @@ class VLANConfigurationCollector:
         
         return vlan_configs
     
-    def _collect_interface_descriptions(self, ssh_client: paramiko.SSHClient, device_name: str) -> List[VLANConfiguration]:
+    def _collect_interface_descriptions(self, ssh_client: PooledSession, device_name: str) -> List[VLANConfiguration]:
         """Collect interface descriptions"""
         vlan_configs = []
         
         try:
             # Get interface descriptions
             command = "show running-config interfaces | grep -E 'description'"
-            success, output = self.command_executor.execute_command(ssh_client, command)
+            success, output = self._execute_command(ssh_client, command)
             
             if not success:
                 logger.warning(f"Failed to get interface descriptions from {device_name}")
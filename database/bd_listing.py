@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Bridge Domain Listing Read Model
+===============================
+
+Projection-only, keyset-paginated listing of the unified bridge_domains
+table for the BD Editor endpoints. Interface counts, the raw-config flag and
+the access-endpoint projection are stored in summary columns, kept current by
+triggers, and every listing column is held in one covering index. A page is
+therefore read from the index alone, and no discovery_data / interface_data
+blob is loaded or decoded.
+"""
+
+import base64
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+DISCOVERED_SOURCES = ('discovered',)
+USER_CREATED_SOURCES = ('user_created', 'builder', 'manual')
+
+# Summary columns added to bridge_domains: name -> (column definition, SQL computing it from NEW.*)
+INTERFACE_COUNT_SQL = """CASE WHEN json_valid(NEW.interface_data)
+         THEN (SELECT COUNT(*) FROM json_each(NEW.interface_data)) ELSE 0 END"""
+ACCESS_ENDPOINT_COUNT_SQL = """CASE WHEN json_valid(NEW.discovery_data)
+         THEN (SELECT COUNT(*)
+               FROM json_each(json_extract(NEW.discovery_data, '$.devices')) AS d,
+                    json_each(CASE WHEN d.type = 'object' THEN json_extract(d.value, '$.interfaces') END) AS i
+               WHERE CASE WHEN i.type = 'object' THEN json_extract(i.value, '$.role') END = 'access')
+         ELSE 0 END"""
+HAS_RAW_CONFIG_SQL = "CASE WHEN NEW.discovery_data IS NOT NULL AND NEW.discovery_data <> '' THEN 1 ELSE 0 END"
+# JSON list of the access interfaces (user-editable endpoints) in discovery_data
+ACCESS_ENDPOINTS_SQL = """CASE WHEN json_valid(NEW.discovery_data)
+         THEN (SELECT json_group_array(json_object(
+                   'device', d.key,
+                   'interface', json_extract(i.value, '$.name'),
+                   'vlan_id', json_extract(i.value, '$.vlan_id'),
+                   'role', 'access',
+                   'raw_cli_config', CASE WHEN json_type(i.value, '$.raw_cli_config') IS NULL
+                                          THEN json_array() ELSE json_extract(i.value, '$.raw_cli_config') END,
+                   'outer_vlan', json_extract(i.value, '$.outer_vlan'),
+                   'inner_vlan', json_extract(i.value, '$.inner_vlan'),
+                   'vlan_manipulation', json_extract(i.value, '$.vlan_manipulation')))
+               FROM json_each(json_extract(NEW.discovery_data, '$.devices')) AS d,
+                    json_each(CASE WHEN d.type = 'object' THEN json_extract(d.value, '$.interfaces') END) AS i
+               WHERE CASE WHEN i.type = 'object' THEN json_extract(i.value, '$.role') END = 'access')
+         ELSE '[]' END"""
+
+SUMMARY_COLUMNS = {
+    'interface_count': ('INTEGER NOT NULL DEFAULT 0', INTERFACE_COUNT_SQL),
+    'access_endpoint_count': ('INTEGER NOT NULL DEFAULT 0', ACCESS_ENDPOINT_COUNT_SQL),
+    'has_raw_config': ('INTEGER NOT NULL DEFAULT 0', HAS_RAW_CONFIG_SQL),
+    'access_endpoints': ("TEXT NOT NULL DEFAULT '[]'", ACCESS_ENDPOINTS_SQL),
+}
+
+LISTING_COLUMNS = [
+    'id', 'name', 'source', 'vlan_id', 'username', 'dnaas_type', 'topology_type',
+    'deployment_status', 'created_at', 'updated_at',
+    'interface_count', 'access_endpoint_count', 'has_raw_config'
+]
+
+# Sortable fields -> SQL expression (NULLs folded so keyset comparisons stay total)
+SORT_FIELDS = {
+    'name': "name",
+    'vlan_id': "COALESCE(vlan_id, -1)",
+    'username': "COALESCE(username, '')",
+    'updated_at': "COALESCE(updated_at, '')",
+    'created_at': "COALESCE(created_at, '')",
+    'interface_count': "interface_count",
+}
+
+# Equality filters accepted from the query string
+FILTER_FIELDS = ('username', 'vlan_id', 'dnaas_type', 'topology_type', 'deployment_status')
+
+
+def _summary_update_sql() -> str:
+    assignments = ',\n        '.join(f"{column} = {expr}" for column, (_, expr) in SUMMARY_COLUMNS.items())
+    return f"UPDATE bridge_domains SET\n        {assignments}\n    WHERE id = NEW.id;"
+
+
+# Triggers keeping the summary columns current; the same definitions are in
+# database/unified_schema.sql so a database built from it has them from the start
+SUMMARY_TRIGGERS = {
+    'trg_bridge_domains_summary_insert': f"""CREATE TRIGGER trg_bridge_domains_summary_insert
+    AFTER INSERT ON bridge_domains
+    BEGIN
+    {_summary_update_sql()}
+    END""",
+    'trg_bridge_domains_summary_update': f"""CREATE TRIGGER trg_bridge_domains_summary_update
+    AFTER UPDATE OF interface_data, discovery_data ON bridge_domains
+    BEGIN
+    {_summary_update_sql()}
+    END""",
+}
+
+LISTING_INDEX_SQL = f"""CREATE INDEX IF NOT EXISTS idx_bridge_domains_listing
+    ON bridge_domains(source, name, {', '.join(c for c in LISTING_COLUMNS if c not in ('source', 'name'))})"""
+
+
+def _normalize_sql(sql: Optional[str]) -> str:
+    return ' '.join((sql or '').split())
+
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+
+def ensure_summary_columns(db_path: str):
+    """
+    Add the summary columns, triggers and covering listing index once per database.
+
+    Every row is recomputed whenever a column or trigger had to be added or
+    replaced, since rows written before that may hold default or stale summaries.
+    """
+    if db_path in _schema_ready:
+        return
+    with _schema_lock:
+        if db_path in _schema_ready:
+            return
+        conn = sqlite3.connect(db_path, timeout=30.0)
+        try:
+            # One transaction, so other writers never see the triggers missing
+            conn.execute("BEGIN IMMEDIATE")
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(bridge_domains)")}
+            if not existing:
+                raise sqlite3.OperationalError("no such table: bridge_domains")
+            added = [column for column in SUMMARY_COLUMNS if column not in existing]
+            for column in added:
+                conn.execute(f"ALTER TABLE bridge_domains ADD COLUMN {column} {SUMMARY_COLUMNS[column][0]}")
+            current = dict(conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'bridge_domains'"))
+            stale = [name for name, sql in SUMMARY_TRIGGERS.items()
+                     if _normalize_sql(current.get(name)) != _normalize_sql(sql)]
+            for name in stale:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(SUMMARY_TRIGGERS[name])
+            conn.execute(LISTING_INDEX_SQL)
+            if added or stale:
+                # Rows written while the triggers were missing or out of date
+                # may hold wrong summaries: recompute every row inside SQLite
+                backfill = ', '.join(f"{column} = {expr.replace('NEW.', '')}"
+                                     for column, (_, expr) in SUMMARY_COLUMNS.items())
+                conn.execute(f"UPDATE bridge_domains SET {backfill}")
+                logger.info(f"Backfilled bridge_domains summary columns "
+                            f"(added columns: {', '.join(added) or 'none'}, "
+                            f"recreated triggers: {', '.join(stale) or 'none'})")
+            conn.commit()
+        finally:
+            conn.close()
+        _schema_ready.add(db_path)
+
+
+def encode_cursor(sort: str, order: str, value: Any, row_id: int) -> str:
+    payload = json.dumps([sort, order, value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, Any, int]:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        sort, order, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort, order, value, int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class BridgeDomainListing:
+    """Paginated, filtered and sorted listing of discovered and user-created bridge domains"""
+
+    def __init__(self, db_path: str = "instance/lab_automation.db"):
+        self.db_path = db_path
+
+    def list_page(self, filters: Optional[Dict[str, Any]] = None, sort: str = 'name', order: str = 'asc',
+                  limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of bridge domains.
+
+        Args:
+            filters: source ('discovered' / 'user_created'), q (name substring) and
+                equality filters on FILTER_FIELDS
+            sort: One of SORT_FIELDS
+            order: 'asc' or 'desc'
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dict with rows, next_cursor (None on the last page) and counts per source
+
+        Raises:
+            ValueError: Unknown sort/order/source or a cursor from a different sort
+        """
+        filters = dict(filters or {})
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort}")
+        order = order.lower()
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"Unsupported sort order: {order}")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        ensure_summary_columns(self.db_path)
+        where, params = self._build_filters(filters)
+
+        sort_expr = SORT_FIELDS[sort]
+        page_where, page_params = list(where), list(params)
+        if cursor:
+            cursor_sort, cursor_order, last_value, last_id = decode_cursor(cursor)
+            if (cursor_sort, cursor_order) != (sort, order):
+                raise ValueError("Cursor does not match the requested sort")
+            page_where.append(f"({sort_expr}, id) {'>' if order == 'asc' else '<'} (?, ?)")
+            page_params += [last_value, last_id]
+
+        direction = 'ASC' if order == 'asc' else 'DESC'
+        query = (f"SELECT {', '.join(LISTING_COLUMNS)}, {sort_expr} AS sort_value FROM bridge_domains "
+                 f"WHERE {' AND '.join(page_where)} "
+                 f"ORDER BY {sort_expr} {direction}, id {direction} LIMIT ?")
+
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query, page_params + [limit + 1]).fetchall()
+            counts = dict(conn.execute(
+                f"SELECT CASE WHEN source IN ({', '.join('?' for _ in DISCOVERED_SOURCES)}) "
+                f"THEN 'discovered' ELSE 'user_created' END AS kind, COUNT(*) "
+                f"FROM bridge_domains WHERE {' AND '.join(where)} GROUP BY kind",
+                list(DISCOVERED_SOURCES) + params
+            ).fetchall())
+        finally:
+            conn.close()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(sort, order, last['sort_value'], last['id'])
+
+        items = []
+        for row in rows:
+            item = {column: row[column] for column in LISTING_COLUMNS}
+            item['has_raw_config'] = bool(item['has_raw_config'])
+            item['source_type'] = item['source']
+            item['source'] = 'discovered' if item['source'] in DISCOVERED_SOURCES else 'user_created'
+            items.append(item)
+
+        discovered_count = counts.get('discovered', 0)
+        user_created_count = counts.get('user_created', 0)
+        return {
+            'rows': items,
+            'next_cursor': next_cursor,
+            'page_size': limit,
+            'total_count': discovered_count + user_created_count,
+            'discovered_count': discovered_count,
+            'user_created_count': user_created_count,
+        }
+
+    @staticmethod
+    def _build_filters(filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        source = filters.pop('source', None)
+        if source in (None, '', 'all'):
+            sources = DISCOVERED_SOURCES + USER_CREATED_SOURCES
+        elif source == 'discovered':
+            sources = DISCOVERED_SOURCES
+        elif source == 'user_created':
+            sources = USER_CREATED_SOURCES
+        else:
+            raise ValueError(f"Unsupported source filter: {source}")
+
+        where = [f"source IN ({', '.join('?' for _ in sources)})"]
+        params: List[Any] = list(sources)
+
+        q = filters.pop('q', None)
+        if q:
+            escaped = q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+
+        for field_name in FILTER_FIELDS:
+            value = filters.get(field_name)
+            if value not in (None, ''):
+                where.append(f"{field_name} = ?")
+                params.append(value)
+        return where, params
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Bridge Domain Repository
+=======================
+
+Single-row lookups on the unified bridge_domains table for the BD Editor
+endpoints. Each call is one read through the name index; access endpoints
+come from the access_endpoints projection stored when discovery data is
+written (see database/bd_listing.py). discovery_data is only loaded and
+decoded for a row whose projection is empty.
+"""
+
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from database.bd_listing import DISCOVERED_SOURCES, USER_CREATED_SOURCES, ensure_summary_columns
+
+
+class BridgeDomainRepository:
+    """Indexed lookups of individual bridge domains"""
+
+    def __init__(self, db_path: str = "instance/lab_automation.db"):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_summary_columns(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_by_name(self, bd_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a discovered or user-created bridge domain by name.
+
+        Returns:
+            Dict in the shape of main.get_discovered_bridge_domains() /
+            get_user_created_bridge_domains() entries, or None
+        """
+        sources = DISCOVERED_SOURCES + USER_CREATED_SOURCES
+        conn = self._connect()
+        try:
+            row = conn.execute(f"""
+                SELECT id, name, vlan_id, username, discovery_data, dnaas_type,
+                       topology_type, source, updated_at, deployment_status
+                FROM bridge_domains
+                WHERE name = ? AND source IN ({', '.join('?' for _ in sources)})
+            """, (bd_name,) + sources).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        discovered = row['source'] in DISCOVERED_SOURCES
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'vlan_id': row['vlan_id'],
+            'username': row['username'],
+            'discovery_data': row['discovery_data'],
+            'dnaas_type': row['dnaas_type'],
+            'topology_type': row['topology_type'],
+            'source_type': row['source'],
+            'updated_at': row['updated_at'],
+            'deployment_status': row['deployment_status'],
+            'source': 'discovered' if discovered else 'user_created',
+            'source_icon': '🔍' if discovered else '🔨'
+        }
+
+    def get_access_endpoints(self, bd_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the access interfaces (user-editable endpoints) of a discovered bridge domain.
+
+        Returns:
+            {'name', 'dnaas_type', 'endpoints': [...]} or None if the bridge domain
+            is not a discovered one
+        """
+        conn = self._connect()
+        try:
+            # discovery_data only comes back when the projection is empty, in
+            # case the row was written before the triggers existed
+            row = conn.execute("""
+                SELECT name, dnaas_type, access_endpoints,
+                       CASE WHEN access_endpoints = '[]' THEN discovery_data END AS discovery_data
+                FROM bridge_domains
+                WHERE name = ? AND source = 'discovered'
+            """, (bd_name,)).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        endpoints: List[Dict[str, Any]] = json.loads(row['access_endpoints'] or '[]')
+        if not endpoints and row['discovery_data']:
+            endpoints = parse_access_endpoints(row['discovery_data'])
+        return {
+            'name': row['name'],
+            'dnaas_type': row['dnaas_type'],
+            'endpoints': endpoints
+        }
+
+
+def parse_access_endpoints(discovery_data: str) -> List[Dict[str, Any]]:
+    """Access interfaces in a discovery_data blob, in the access_endpoints projection's shape"""
+    try:
+        devices = json.loads(discovery_data).get('devices', {})
+    except (ValueError, AttributeError):
+        return []
+    endpoints = []
+    for device_name, device_info in devices.items():
+        if not isinstance(device_info, dict):
+            continue
+        for iface in device_info.get('interfaces') or []:
+            # Only access interfaces are user-editable endpoints
+            if isinstance(iface, dict) and iface.get('role') == 'access':
+                endpoints.append({
+                    'device': device_name,
+                    'interface': iface.get('name'),
+                    'vlan_id': iface.get('vlan_id'),
+                    'role': 'access',
+                    'raw_cli_config': iface.get('raw_cli_config', []),
+                    'outer_vlan': iface.get('outer_vlan'),
+                    'inner_vlan': iface.get('inner_vlan'),
+                    'vlan_manipulation': iface.get('vlan_manipulation')
+                })
+    return endpoints
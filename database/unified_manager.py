@@ -15,6 +15,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 
+from utils.sqlite_bulk_writer import DEFAULT_BATCH_SIZE, SQLiteBulkWriter
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -196,13 +198,15 @@ class UnifiedDatabaseManager:
     # DISCOVERY DATA OPERATIONS
     # =========================================================================
     
-    def save_discovery_results(self, discovery_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Save discovery results to unified schema"""
+    def save_discovery_results(self, discovery_results: Dict[str, Any],
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """Save discovery results to unified schema in one batched transaction"""
         self.logger.info("🚀 Saving discovery results to unified schema...")
         
         results = {
             'total_bridge_domains': 0,
             'saved_successfully': 0,
+            'skipped': 0,
             'failed_saves': 0,
             'errors': []
         }
@@ -211,30 +215,44 @@ class UnifiedDatabaseManager:
             bridge_domains = discovery_results.get('bridge_domains', {})
             results['total_bridge_domains'] = len(bridge_domains)
             
-            for bd_name, bd_data in bridge_domains.items():
-                try:
-                    # Extract data for unified schema
-                    bridge_analysis = bd_data.get('bridge_domain_analysis', {})
-                    
-                    bd = BridgeDomain(
-                        id=None,
-                        name=bd_name,
-                        source='discovered',
-                        username=bd_data.get('detected_username'),
-                        vlan_id=bd_data.get('detected_vlan'),
-                        topology_type=bd_data.get('topology_type'),
-                        dnaas_type=bridge_analysis.get('dnaas_type'),
-                        configuration_data=bd_data,
-                        deployment_status='discovered'
-                    )
-                    
-                    self.save_bridge_domain(bd)
-                    results['saved_successfully'] += 1
-                    
-                except Exception as e:
-                    results['failed_saves'] += 1
-                    results['errors'].append(f"Failed to save {bd_name}: {str(e)}")
-                    self.logger.error(f"❌ Failed to save {bd_name}: {e}")
+            def build_row(bd_name: str, bd_data: Dict[str, Any]) -> tuple:
+                # Extract data for unified schema
+                bridge_analysis = bd_data.get('bridge_domain_analysis', {})
+                return (
+                    bd_name, 'discovered',
+                    bd_data.get('detected_username'),
+                    bd_data.get('detected_vlan'),
+                    bd_data.get('topology_type'),
+                    bridge_analysis.get('dnaas_type'),
+                    json.dumps(bd_data),
+                    'discovered'
+                )
+            
+            # bridge_domains.name is UNIQUE: rediscovered BDs are updated in place,
+            # BDs that were created or edited since are left untouched
+            writer = SQLiteBulkWriter(self.db_path, batch_size=batch_size)
+            write_result = writer.upsert(
+                'bridge_domains',
+                ['name', 'source', 'username', 'vlan_id', 'topology_type', 'dnaas_type',
+                 'configuration_data', 'deployment_status'],
+                bridge_domains.items(),
+                build_row,
+                conflict_columns=['name'],
+                update_columns=['username', 'vlan_id', 'topology_type', 'dnaas_type',
+                                'configuration_data', 'deployment_status'],
+                update_expressions={'updated_at': 'CURRENT_TIMESTAMP'},
+                update_where="bridge_domains.source = 'discovered'"
+            )
+            
+            results['saved_successfully'] = write_result.written
+            results['skipped'] = write_result.skipped
+            results['failed_saves'] = write_result.failed
+            for bd_name, error in write_result.errors:
+                results['errors'].append(f"Failed to save {bd_name}: {error}")
+                self.logger.error(f"❌ Failed to save {bd_name}: {error}")
+            if write_result.skipped:
+                self.logger.warning(f"⚠️ {write_result.skipped} bridge domains not saved: "
+                                    f"a user-created bridge domain with the same name exists")
             
             self.logger.info(f"✅ Discovery results saved: {results['saved_successfully']}/{results['total_bridge_domains']}")
             return results
@@ -35,6 +35,12 @@ CREATE TABLE IF NOT EXISTS bridge_domains (
     consolidation_info TEXT,              -- Consolidation metadata
     classification_info TEXT,             -- DNAAS classification details
     
+    -- Summary Columns (maintained by triggers, see database/bd_listing.py)
+    interface_count INTEGER NOT NULL DEFAULT 0,        -- Entries in interface_data
+    access_endpoint_count INTEGER NOT NULL DEFAULT 0,  -- Access interfaces in discovery_data
+    has_raw_config INTEGER NOT NULL DEFAULT 0,         -- discovery_data present
+    access_endpoints TEXT NOT NULL DEFAULT '[]',       -- JSON projection of the access interfaces
+    
     -- Deployment Status
     deployment_status VARCHAR(50) DEFAULT 'pending',  -- pending, deployed, failed, archived
     deployed_at TIMESTAMP,
@@ -171,6 +177,78 @@ CREATE INDEX IF NOT EXISTS idx_bd_deployments_started_at ON bridge_domain_deploy
 CREATE INDEX IF NOT EXISTS idx_bd_templates_name ON bridge_domain_templates(name);
 CREATE INDEX IF NOT EXISTS idx_bd_templates_type ON bridge_domain_templates(template_type);
 
+-- Covering index for the paginated BD listing (database/bd_listing.py)
+CREATE INDEX IF NOT EXISTS idx_bridge_domains_listing
+    ON bridge_domains(source, name, id, vlan_id, username, dnaas_type, topology_type, deployment_status, created_at, updated_at, interface_count, access_endpoint_count, has_raw_config);
+
+-- ============================================================================
+-- SUMMARY TRIGGERS
+-- ============================================================================
+
+-- Keep the bridge_domains summary columns current (same definitions as
+-- SUMMARY_TRIGGERS in database/bd_listing.py)
+CREATE TRIGGER IF NOT EXISTS trg_bridge_domains_summary_insert
+    AFTER INSERT ON bridge_domains
+    BEGIN
+    UPDATE bridge_domains SET
+        interface_count = CASE WHEN json_valid(NEW.interface_data)
+         THEN (SELECT COUNT(*) FROM json_each(NEW.interface_data)) ELSE 0 END,
+        access_endpoint_count = CASE WHEN json_valid(NEW.discovery_data)
+         THEN (SELECT COUNT(*)
+               FROM json_each(json_extract(NEW.discovery_data, '$.devices')) AS d,
+                    json_each(CASE WHEN d.type = 'object' THEN json_extract(d.value, '$.interfaces') END) AS i
+               WHERE CASE WHEN i.type = 'object' THEN json_extract(i.value, '$.role') END = 'access')
+         ELSE 0 END,
+        has_raw_config = CASE WHEN NEW.discovery_data IS NOT NULL AND NEW.discovery_data <> '' THEN 1 ELSE 0 END,
+        access_endpoints = CASE WHEN json_valid(NEW.discovery_data)
+         THEN (SELECT json_group_array(json_object(
+                   'device', d.key,
+                   'interface', json_extract(i.value, '$.name'),
+                   'vlan_id', json_extract(i.value, '$.vlan_id'),
+                   'role', 'access',
+                   'raw_cli_config', CASE WHEN json_type(i.value, '$.raw_cli_config') IS NULL
+                                          THEN json_array() ELSE json_extract(i.value, '$.raw_cli_config') END,
+                   'outer_vlan', json_extract(i.value, '$.outer_vlan'),
+                   'inner_vlan', json_extract(i.value, '$.inner_vlan'),
+                   'vlan_manipulation', json_extract(i.value, '$.vlan_manipulation')))
+               FROM json_each(json_extract(NEW.discovery_data, '$.devices')) AS d,
+                    json_each(CASE WHEN d.type = 'object' THEN json_extract(d.value, '$.interfaces') END) AS i
+               WHERE CASE WHEN i.type = 'object' THEN json_extract(i.value, '$.role') END = 'access')
+         ELSE '[]' END
+    WHERE id = NEW.id;
+    END;
+
+CREATE TRIGGER IF NOT EXISTS trg_bridge_domains_summary_update
+    AFTER UPDATE OF interface_data, discovery_data ON bridge_domains
+    BEGIN
+    UPDATE bridge_domains SET
+        interface_count = CASE WHEN json_valid(NEW.interface_data)
+         THEN (SELECT COUNT(*) FROM json_each(NEW.interface_data)) ELSE 0 END,
+        access_endpoint_count = CASE WHEN json_valid(NEW.discovery_data)
+         THEN (SELECT COUNT(*)
+               FROM json_each(json_extract(NEW.discovery_data, '$.devices')) AS d,
+                    json_each(CASE WHEN d.type = 'object' THEN json_extract(d.value, '$.interfaces') END) AS i
+               WHERE CASE WHEN i.type = 'object' THEN json_extract(i.value, '$.role') END = 'access')
+         ELSE 0 END,
+        has_raw_config = CASE WHEN NEW.discovery_data IS NOT NULL AND NEW.discovery_data <> '' THEN 1 ELSE 0 END,
+        access_endpoints = CASE WHEN json_valid(NEW.discovery_data)
+         THEN (SELECT json_group_array(json_object(
+                   'device', d.key,
+                   'interface', json_extract(i.value, '$.name'),
+                   'vlan_id', json_extract(i.value, '$.vlan_id'),
+                   'role', 'access',
+                   'raw_cli_config', CASE WHEN json_type(i.value, '$.raw_cli_config') IS NULL
+                                          THEN json_array() ELSE json_extract(i.value, '$.raw_cli_config') END,
+                   'outer_vlan', json_extract(i.value, '$.outer_vlan'),
+                   'inner_vlan', json_extract(i.value, '$.inner_vlan'),
+                   'vlan_manipulation', json_extract(i.value, '$.vlan_manipulation')))
+               FROM json_each(json_extract(NEW.discovery_data, '$.devices')) AS d,
+                    json_each(CASE WHEN d.type = 'object' THEN json_extract(d.value, '$.interfaces') END) AS i
+               WHERE CASE WHEN i.type = 'object' THEN json_extract(i.value, '$.role') END = 'access')
+         ELSE '[]' END
+    WHERE id = NEW.id;
+    END;
+
 -- ============================================================================
 -- VIEWS FOR COMMON QUERIES
 -- ============================================================================
@@ -9,10 +9,28 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from utils.sqlite_bulk_writer import DEFAULT_BATCH_SIZE, SQLiteBulkWriter
 
 logger = logging.getLogger(__name__)
 
+# Discovered bridge domains are keyed on (name, detection_method); rows created
+# by users have no detection method and stay outside the unique index
+DISCOVERY_KEY_COLUMNS = ['bridge_domain_name', 'detection_method']
+DISCOVERY_KEY_WHERE = 'detection_method IS NOT NULL'
+DISCOVERY_INSERT_COLUMNS = [
+    'user_id', 'bridge_domain_name', 'imported_from_topology',
+    'topology_scanned', 'last_scan_at', 'discovery_data',
+    'devices', 'topology_analysis', 'vlan_id', 'topology_type',
+    'detection_method', 'confidence', 'username'
+]
+DISCOVERY_UPDATE_COLUMNS = [
+    'discovery_data', 'devices', 'topology_analysis',
+    'vlan_id', 'topology_type', 'confidence',
+    'username', 'last_scan_at', 'topology_scanned'
+]
+
 class DatabaseManager:
     """Centralized database management with robust error handling"""
     
@@ -343,8 +361,9 @@ class DatabaseManager:
                 "error": str(e)
             }
     
-    def save_simplified_discovery_results(self, discovery_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Save simplified discovery results to database"""
+    def save_simplified_discovery_results(self, discovery_results: Dict[str, Any],
+                                          batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """Save simplified discovery results to database in one batched transaction"""
         
         self.logger.info("🚀 Starting simplified discovery results database population...")
         
@@ -352,6 +371,7 @@ class DatabaseManager:
             'total_bridge_domains': 0,
             'saved_successfully': 0,
             'updated_existing': 0,
+            'skipped': 0,
             'failed_saves': 0,
             'errors': []
         }
@@ -362,21 +382,35 @@ class DatabaseManager:
             
             self.logger.info(f"📋 Processing {len(bridge_domains)} bridge domains for database storage...")
             
-            for bd_name, bd_data in bridge_domains.items():
-                try:
-                    success = self._save_bridge_domain_to_db(bd_name, bd_data)
-                    if success:
-                        results['saved_successfully'] += 1
-                    else:
-                        results['failed_saves'] += 1
-                        results['errors'].append(f"Failed to save {bd_name}")
-                        
-                except Exception as e:
-                    results['failed_saves'] += 1
-                    results['errors'].append(f"Error saving {bd_name}: {str(e)}")
-                    self.logger.error(f"❌ Failed to save {bd_name}: {e}")
-            
-            self.logger.info(f"✅ Database population completed: {results['saved_successfully']}/{results['total_bridge_domains']} saved")
+            writer = SQLiteBulkWriter(self.db_path, batch_size=batch_size)
+            # Upserts need a unique key; without one (duplicate rows already
+            # stored) the writer falls back to UPDATE + INSERT WHERE NOT EXISTS
+            use_on_conflict = writer.ensure_unique_index(
+                'personal_bridge_domains', DISCOVERY_KEY_COLUMNS,
+                'uq_personal_bd_discovery', where=DISCOVERY_KEY_WHERE
+            )
+            scan_time = datetime.now()
+            
+            write_result = writer.upsert(
+                'personal_bridge_domains',
+                DISCOVERY_INSERT_COLUMNS,
+                bridge_domains.items(),
+                lambda bd_name, bd_data: self._build_discovery_row(bd_name, bd_data, scan_time),
+                conflict_columns=DISCOVERY_KEY_COLUMNS,
+                update_columns=DISCOVERY_UPDATE_COLUMNS,
+                conflict_where=DISCOVERY_KEY_WHERE,
+                use_on_conflict=use_on_conflict
+            )
+            
+            results['saved_successfully'] = write_result.written
+            results['skipped'] = write_result.skipped
+            results['failed_saves'] = write_result.failed
+            for bd_name, error in write_result.errors:
+                results['errors'].append(f"Error saving {bd_name}: {error}")
+                self.logger.error(f"❌ Failed to save {bd_name}: {error}")
+            
+            self.logger.info(f"✅ Database population completed: {results['saved_successfully']}/{results['total_bridge_domains']} saved "
+                             f"in {write_result.batches} batches")
             return results
             
         except Exception as e:
@@ -384,93 +418,66 @@ class DatabaseManager:
             results['errors'].append(f"Database population failed: {str(e)}")
             return results
     
-    def _save_bridge_domain_to_db(self, bd_name: str, bd_data: Dict[str, Any]) -> bool:
-        """Save individual bridge domain to database"""
+    def _build_discovery_row(self, bd_name: str, bd_data: Dict[str, Any], scan_time: datetime) -> tuple:
+        """Build the personal_bridge_domains row (DISCOVERY_INSERT_COLUMNS order) for a discovered bridge domain"""
+        
+        # Extract data from simplified discovery format
+        service_name = bd_data.get('service_name', bd_name)
+        detected_username = bd_data.get('detected_username')
+        detected_vlan = bd_data.get('detected_vlan')
+        topology_type = bd_data.get('topology_type', 'unknown')
+        confidence = bd_data.get('confidence', 0) / 100.0  # Convert percentage to decimal
+        detection_method = bd_data.get('detection_method') or 'simplified_workflow'
+        is_consolidated = bd_data.get('is_consolidated', False)
+        
+        # Extract device and topology information
+        devices = bd_data.get('devices', {})
+        topology_analysis = bd_data.get('topology_analysis', {})
+        bridge_domain_analysis = bd_data.get('bridge_domain_analysis', {})
+        consolidation_info = bd_data.get('consolidation_info', {})
+        
+        # Prepare JSON data for storage
+        discovery_data = {
+            'original_discovery_data': bd_data,
+            'simplified_discovery_version': '1.0',
+            'discovery_timestamp': scan_time.isoformat(),
+            'is_consolidated': is_consolidated,
+            'consolidation_info': consolidation_info
+        }
+        
+        devices_json = json.dumps(devices)
+        topology_analysis_json = json.dumps({
+            'topology_analysis': topology_analysis,
+            'bridge_domain_analysis': bridge_domain_analysis,
+            'consolidation_info': consolidation_info
+        })
+        discovery_data_json = json.dumps(discovery_data)
+        
+        return (
+            1,  # Default user ID for discovered bridge domains
+            service_name, True, True, scan_time,
+            discovery_data_json, devices_json, topology_analysis_json,
+            detected_vlan, topology_type, detection_method,
+            confidence, detected_username
+        )
+    
+    def delete_simplified_discovery_results(self, bd_names: List[str],
+                                            detection_method: str = 'simplified_workflow') -> int:
+        """Delete discovered bridge domains that no longer exist (device-scoped rediscovery)"""
+        
+        if not bd_names:
+            return 0
         
         try:
-            # Extract data from simplified discovery format
-            service_name = bd_data.get('service_name', bd_name)
-            detected_username = bd_data.get('detected_username')
-            detected_vlan = bd_data.get('detected_vlan')
-            topology_type = bd_data.get('topology_type', 'unknown')
-            confidence = bd_data.get('confidence', 0) / 100.0  # Convert percentage to decimal
-            detection_method = bd_data.get('detection_method', 'simplified_workflow')
-            is_consolidated = bd_data.get('is_consolidated', False)
-            
-            # Extract device and topology information
-            devices = bd_data.get('devices', {})
-            topology_analysis = bd_data.get('topology_analysis', {})
-            bridge_domain_analysis = bd_data.get('bridge_domain_analysis', {})
-            consolidation_info = bd_data.get('consolidation_info', {})
-            
-            # Prepare JSON data for storage
-            discovery_data = {
-                'original_discovery_data': bd_data,
-                'simplified_discovery_version': '1.0',
-                'discovery_timestamp': datetime.now().isoformat(),
-                'is_consolidated': is_consolidated,
-                'consolidation_info': consolidation_info
-            }
-            
-            devices_json = json.dumps(devices)
-            topology_analysis_json = json.dumps({
-                'topology_analysis': topology_analysis,
-                'bridge_domain_analysis': bridge_domain_analysis,
-                'consolidation_info': consolidation_info
-            })
-            discovery_data_json = json.dumps(discovery_data)
-            
-            # Save to database using SQL
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if bridge domain already exists
-            cursor.execute("""
-                SELECT id FROM personal_bridge_domains 
-                WHERE bridge_domain_name = ? AND detection_method = ?
-            """, (service_name, detection_method))
-            
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing record
-                cursor.execute("""
-                    UPDATE personal_bridge_domains 
-                    SET discovery_data = ?, devices = ?, topology_analysis = ?,
-                        vlan_id = ?, topology_type = ?, confidence = ?,
-                        username = ?, last_scan_at = ?, topology_scanned = ?
-                    WHERE id = ?
-                """, (
-                    discovery_data_json, devices_json, topology_analysis_json,
-                    detected_vlan, topology_type, confidence,
-                    detected_username, datetime.now(), True,
-                    existing[0]
-                ))
-                self.logger.debug(f"🔄 Updated existing bridge domain: {service_name}")
-                
-            else:
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO personal_bridge_domains (
-                        user_id, bridge_domain_name, imported_from_topology,
-                        topology_scanned, last_scan_at, discovery_data,
-                        devices, topology_analysis, vlan_id, topology_type,
-                        detection_method, confidence, username
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    1,  # Default user ID for discovered bridge domains
-                    service_name, True, True, datetime.now(),
-                    discovery_data_json, devices_json, topology_analysis_json,
-                    detected_vlan, topology_type, detection_method,
-                    confidence, detected_username
-                ))
-                self.logger.debug(f"✅ Created new bridge domain: {service_name}")
-            
-            conn.commit()
-            conn.close()
+            writer = SQLiteBulkWriter(self.db_path)
+            deleted = writer.delete(
+                'personal_bridge_domains', DISCOVERY_KEY_COLUMNS,
+                [(bd_name, detection_method) for bd_name in bd_names]
+            )
             
-            return True
+            self.logger.info(f"🗑️ Removed {deleted} bridge domains no longer discovered")
+            return deleted
             
         except Exception as e:
-            self.logger.error(f"❌ Failed to save bridge domain {bd_name}: {e}")
-            return False 
\ No newline at end of file
+            self.logger.error(f"❌ Failed to delete bridge domains: {e}")
+            return 0
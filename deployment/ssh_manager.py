@@ -17,12 +17,15 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 
+from utils.ssh_pool import PooledSession, get_session_pool
+
 @dataclass
 class SSHConnection:
     """Simple SSH connection wrapper"""
     client: paramiko.SSHClient
     hostname: str
     connected_at: datetime
+    session: Optional[PooledSession] = None
 
 @dataclass
 class DeploymentResult:
@@ -107,20 +110,20 @@ class SimplifiedSSHManager:
             return None
         
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            client.connect(
-                hostname=device_info['ip'],
-                username=device_info['username'],
-                password=device_info['password'],
-                timeout=30
+            # Borrow a session from the shared pool; exec_command opens its
+            # own channel on the pooled transport
+            session = get_session_pool().acquire(
+                device_info['ip'],
+                device_info['username'],
+                device_info['password'],
+                connect_timeout=30
             )
             
             connection = SSHConnection(
-                client=client,
+                client=session.ssh,
                 hostname=device_info['ip'],
-                connected_at=datetime.now()
+                connected_at=datetime.now(),
+                session=session
             )
             
             self.connection_pool[device_name] = connection
@@ -173,6 +176,8 @@ class SimplifiedSSHManager:
             )
             
         except Exception as e:
+            # Drop the broken session so the next call reconnects
+            self._release_connection(device_name, discard=True)
             return DeploymentResult(
                 success=False,
                 message=f"Execution failed: {str(e)}",
@@ -229,6 +234,9 @@ class SimplifiedSSHManager:
             
             if not result.success:
                 overall_success = False
+            
+            # Hand the session back so other callers can reuse it
+            self._release_connection(device_name)
         
         return {
             'success': overall_success,
@@ -257,11 +265,19 @@ class SimplifiedSSHManager:
         
         return device_commands
     
+    def _release_connection(self, device_name: str, discard: bool = False):
+        """Return a device's session to the shared pool"""
+        connection = self.connection_pool.pop(device_name, None)
+        if connection and connection.session:
+            if discard:
+                connection.session.invalidate()
+            connection.session.close()
+    
     def close_connections(self):
-        """Close all SSH connections"""
-        for device_name, connection in self.connection_pool.items():
+        """Return all SSH sessions to the shared pool"""
+        for device_name in list(self.connection_pool):
             try:
-                connection.client.close()
+                self._release_connection(device_name)
             except:
                 pass
         
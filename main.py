@@ -917,7 +917,6 @@ def run_list_topologies():
     """List all topologies with pagination and smart column width"""
     try:
         from config_engine.phase1_database import create_phase1_database_manager
-        from config_engine.phase1_database.models import Phase1TopologyData
         from config_engine.phase1_data_structures.enums import BridgeDomainScope
         import math
         import os
@@ -926,8 +925,9 @@ def run_list_topologies():
         session = db_manager.SessionLocal()
         
         try:
-            # Get all topologies
-            all_topologies = session.query(Phase1TopologyData).all()
+            # Get all topologies; the page view reads each row's bridge domain
+            # config, so load those in bulk instead of one query per row
+            all_topologies = db_manager.topology_query(session, load=('bridge_domain_configs',)).all()
             original_topologies = all_topologies.copy()  # Keep original for clearing filters
             
             if not all_topologies:
@@ -1018,7 +1018,7 @@ def run_list_topologies():
                     search_term = _show_search_input()
                     if search_term:
                         # Apply fuzzy search filter to all topologies
-                        filtered_topologies = _fuzzy_search_bridge_domains(all_topologies, search_term)
+                        filtered_topologies = _fuzzy_search_bridge_domains(all_topologies, search_term, db_manager)
                         if filtered_topologies:
                             all_topologies = filtered_topologies
                             current_page = 1
@@ -1149,7 +1149,7 @@ def run_search_topologies():
             topology_id = getattr(topology, 'id', 'N/A')
             bridge_domain_name = getattr(topology, 'bridge_domain_name', 'N/A')
             topology_type = getattr(topology, 'topology_type', 'N/A')
-            device_count = len(getattr(topology, 'devices', []))
+            device_count = getattr(topology, 'device_count', len(getattr(topology, 'devices', [])))
             
             print(f"{topology_id:<5} {bridge_domain_name:<30} {topology_type:<15} {device_count:<10} '{search_term}'")
         
@@ -3539,10 +3539,17 @@ def _show_search_input():
         return None
 
 
-def _fuzzy_search_bridge_domains(topologies, search_term):
+def _fuzzy_search_bridge_domains(topologies, search_term, db_manager=None):
     """Implement fuzzy search for bridge domains with scoring"""
     import re
     
+    # Ranked search from the database index when available
+    if db_manager is not None:
+        ranked_ids = db_manager.search_topology_ids(search_term)
+        if ranked_ids is not None:
+            by_id = {topology.id: topology for topology in topologies}
+            return [by_id[topology_id] for topology_id in ranked_ids if topology_id in by_id]
+    
     search_term_lower = search_term.lower()
     results = []
     
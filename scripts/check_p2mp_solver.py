@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+P2MP Solver Check
+Verifies that the batched distribution tree solver (config_engine/p2mp_tree.py)
+gives every destination a valid minimum-hop path of the same type as the
+per-destination calculation it replaced, compares the size of the resulting
+trees and benchmarks the two.
+
+Inputs are a seeded synthetic leaf/spine/superspine fabric and, when present,
+the discovered topology in --topology-dir.
+
+Usage:
+    python scripts/check_p2mp_solver.py [--leaves 500] [--spines 24] [--superspines 8] [--runs 5]
+"""
+
+import sys
+import os
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config_engine.p2mp_path_calculator import P2MPPathCalculator
+from config_engine.p2mp_tree import build_distribution_tree, tree_size
+from config_engine.topology_graph import TopologyGraph
+from config_engine.topology_snapshot import SNAPSHOT_FILES, get_topology_snapshot
+
+
+def build_synthetic_fabric(leaves, spines, superspines, seed=7):
+    """Topology data for a fabric where each leaf has 1-2 spines and spines see most superspines."""
+    rng = random.Random(seed)
+    spine_names = [f"DNAAS-SPINE-B{index:02d}" for index in range(spines)]
+    superspine_names = [f"DNAAS-SUPERSPINE-D{index:02d}" for index in range(superspines)]
+    devices = {name: {'type': 'spine', 'connected_superspines': []} for name in spine_names}
+    devices.update({name: {'type': 'superspine', 'connected_spines': []} for name in superspine_names})
+
+    for spine_index, spine in enumerate(spine_names):
+        for superspine_index, superspine in enumerate(superspine_names):
+            if (spine_index + superspine_index) % 3 == 0 and superspine_index:
+                continue
+            local, remote = f"ge100-0/0/{superspine_index}", f"ge100-1/0/{spine_index}"
+            devices[spine]['connected_superspines'].append(
+                {'name': superspine, 'local_interface': local, 'remote_interface': remote})
+            devices[superspine]['connected_spines'].append(
+                {'name': spine, 'local_interface': remote, 'remote_interface': local})
+
+    leaf_names = []
+    for leaf_index in range(leaves):
+        leaf = f"DNAAS-LEAF-A{leaf_index:03d}"
+        leaf_names.append(leaf)
+        uplinks = rng.sample(spine_names, rng.choice([1, 1, 2]))
+        devices[leaf] = {'type': 'leaf', 'connected_spines': [
+            {'name': spine, 'local_interface': f"ge100-0/0/{40 + port}", 'remote_interface': f"ge100-2/0/{leaf_index}"}
+            for port, spine in enumerate(uplinks)
+        ]}
+
+    return {'devices': devices, 'spine_devices': spine_names, 'superspine_devices': superspine_names,
+            'available_leaves': leaf_names}
+
+
+def reference_paths(calculator, source, destinations):
+    """Per-destination calculation that calculate_p2mp_paths used before the batched solver."""
+    return {dest: calculator._calculate_optimal_path_for_destination(source, dest) for dest in destinations}
+
+
+def tree_paths(calculator, source, destinations):
+    tree = build_distribution_tree(calculator.graph, source, destinations)
+    return {dest: calculator._path_dict(path) for dest, path in tree.paths.items()}
+
+
+def path_errors(graph, source, dest, path):
+    """Reasons a solver path is not a valid minimum-hop path."""
+    errors = []
+    devices = [path['source_leaf']] + [seg['dest_device'] for seg in path['segments']]
+    if devices[0] != source or devices[-1] != dest:
+        errors.append(f"path runs {devices[0]} -> {devices[-1]}")
+    for seg in path['segments']:
+        link = (seg['source_interface'], seg['dest_interface'])
+        if link not in graph.links(seg['source_device'], seg['dest_device']):
+            errors.append(f"no link {seg['source_device']} {link[0]} -> {seg['dest_device']} {link[1]}")
+    expected = graph.leaf_paths(source, dest)
+    if expected and len(expected[0].devices) != len(devices):
+        errors.append(f"{len(devices) - 1} hops instead of {len(expected[0].devices) - 1}")
+    return errors
+
+
+def check_topology(label, topology_data, runs, sample_sizes):
+    """Check one topology; returns the number of problems found."""
+    graph = TopologyGraph(topology_data)
+    calculator = P2MPPathCalculator(topology_data, graph=graph)
+    leaves = [name for name in graph.names if graph.tier(name) == 'leaf' and graph.neighbours(name)]
+    if len(leaves) < 2:
+        print(f"   {label}: fewer than two connected leaves, skipped")
+        return 0
+
+    problems = 0
+    rng = random.Random(11)
+    print(f"\n🔍 {label}: {len(graph)} devices, {len(leaves)} connected leaves")
+    for count in sample_sizes:
+        count = min(count, len(leaves) - 1)
+        source = rng.choice(leaves)
+        destinations = rng.sample([leaf for leaf in leaves if leaf != source], count)
+
+        expected = reference_paths(calculator, source, destinations)
+        actual = tree_paths(calculator, source, destinations)
+        for dest in destinations:
+            if (expected[dest] is None) != (dest not in actual):
+                print(f"   {dest}: reference {'has no' if expected[dest] is None else 'has a'} path, solver disagrees")
+                problems += 1
+            elif dest in actual:
+                errors = path_errors(graph, source, dest, actual[dest])
+                if actual[dest]['path_type'] != expected[dest]['path_type']:
+                    errors.append(f"{actual[dest]['path_type']} instead of {expected[dest]['path_type']}")
+                for error in errors:
+                    print(f"   {dest}: {error}")
+                problems += len(errors)
+
+        graph_paths = [graph.leaf_paths(source, dest)[0] for dest in destinations if expected[dest]]
+        tree = build_distribution_tree(graph, source, destinations)
+        reference_devices, reference_links = tree_size(graph_paths)
+        tree_devices, tree_links = tree_size(tree.paths.values())
+        print(f"   {count} destinations: reference tree {reference_devices} spines/superspines, "
+              f"{reference_links} links; solver tree {tree_devices}, {tree_links}")
+
+        # Cold: new graph each run (first request after a topology change); warm: leaf paths cached
+        new_calculator = lambda: P2MPPathCalculator(topology_data, graph=TopologyGraph(topology_data))
+        cold_reference = benchmark(lambda calc: reference_paths(calc, source, destinations), runs, new_calculator)
+        cold_tree = benchmark(lambda calc: tree_paths(calc, source, destinations), runs, new_calculator)
+        warm_reference = benchmark(lambda calc: reference_paths(calc, source, destinations), runs, lambda: calculator)
+        warm_tree = benchmark(lambda calc: tree_paths(calc, source, destinations), runs, lambda: calculator)
+        print(f"      cold: reference {cold_reference * 1000:.2f} ms, solver {cold_tree * 1000:.2f} ms")
+        print(f"      warm: reference {warm_reference * 1000:.2f} ms, solver {warm_tree * 1000:.2f} ms")
+    return problems
+
+
+def benchmark(func, runs, setup):
+    """Best wall-clock time of ``runs`` calls of func(setup()), setup not timed."""
+    best = float('inf')
+    for _ in range(runs):
+        argument = setup()
+        start = time.perf_counter()
+        func(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the batched P2MP path solver')
+    parser.add_argument('--leaves', type=int, default=500, help='Leaves in the synthetic fabric')
+    parser.add_argument('--spines', type=int, default=24, help='Spines in the synthetic fabric')
+    parser.add_argument('--superspines', type=int, default=8, help='Superspines in the synthetic fabric')
+    parser.add_argument('--runs', type=int, default=5, help='Benchmark repetitions (best time is reported)')
+    parser.add_argument('--topology-dir', default='topology', help='Directory with a discovered topology')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    sample_sizes = (10, 100, args.leaves)
+    problems = check_topology('synthetic fabric',
+                              build_synthetic_fabric(args.leaves, args.spines, args.superspines),
+                              args.runs, sample_sizes)
+    if any((Path(args.topology_dir) / filename).exists() for filename in SNAPSHOT_FILES):
+        problems += check_topology(f"topology in {args.topology_dir}",
+                                   get_topology_snapshot(args.topology_dir).topology_data,
+                                   args.runs, sample_sizes)
+
+    if problems:
+        print(f"\n❌ {problems} problems found")
+        return 1
+    print("\n✅ Every destination has a valid minimum-hop path of the reference type")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
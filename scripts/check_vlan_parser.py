@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+VLAN Configuration Parser Check
+Verifies that parse_vlan_configuration() in collect_lacp_xml.py produces the
+same output as the original line-by-line parser and benchmarks the two.
+
+Inputs are a seeded synthetic leaf configuration covering every supported
+statement (vlan-id, vlan-id list, vlan-manipulation, vlan-tags, l2-service,
+description, ANSI colouring) plus any collected raw VLAN dumps found in
+topology/configs/raw-config/bridge_domain_raw/ (used as golden inputs).
+
+Usage:
+    python scripts/check_vlan_parser.py [--interfaces 20000] [--runs 5] [--raw-dir DIR]
+"""
+
+import sys
+import os
+import re
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from collect_lacp_xml import BRIDGE_DOMAIN_RAW_DIR, parse_vlan_configuration, strip_ansi_codes
+
+def reference_parse_vlan_configuration(cli_output):
+    """Line-by-line parser that parse_vlan_configuration replaced (kept verbatim as the reference)."""
+    vlan_configs = []
+    
+    try:
+        lines = cli_output.split('\n')
+        
+        # Track current interface context for multi-line configurations
+        current_interface = None
+        current_config = {}
+        
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Strip ANSI color codes for robust parsing
+            clean_line = strip_ansi_codes(line)
+            
+            # Check for interface line
+            interface_match = re.search(r'interfaces ([^\s]+)', clean_line)
+            if interface_match:
+                # Save previous interface config if exists
+                if current_interface and current_config:
+                    vlan_configs.append(current_config.copy())
+                
+                # Start new interface
+                current_interface = interface_match.group(1)
+                current_config = {
+                    'interface': current_interface,
+                    'type': 'subinterface' if '.' in current_interface else 'physical',
+                    'vlan_id': None,
+                    'outer_vlan': None,
+                    'inner_vlan': None,
+                    'vlan_range': None,
+                    'vlan_list': None,
+                    'vlan_manipulation': None,
+                    'l2_service': False,
+                    'description': None,
+                    'raw_config': []
+                }
+                current_config['raw_config'].append(line)
+                # Also parse VLAN info from this same line (common DNOS style)
+                # vlan-id <num>
+                _m = re.search(r'\bvlan-id\s+(\d+)\b', clean_line)
+                if _m:
+                    current_config['vlan_id'] = int(_m.group(1))
+                # vlan-id list <...>
+                _r = re.search(r'\bvlan-id\s+list\s+([0-9\-\s]+)$', clean_line)
+                if _r:
+                    list_spec = _r.group(1).strip()
+                    tokens = list_spec.split()
+                    ranges = [tok for tok in tokens if '-' in tok]
+                    singles = [tok for tok in tokens if tok.isdigit()]
+                    if ranges:
+                        current_config['vlan_range'] = ranges[0]
+                    if singles:
+                        current_config['vlan_list'] = [int(v) for v in singles]
+                # vlan-manipulation ingress/egress
+                if 'vlan-manipulation' in clean_line:
+                    if current_config['vlan_manipulation'] is None:
+                        current_config['vlan_manipulation'] = {}
+                    _ing = re.search(r'ingress-mapping\s+action\s+push\s+outer-tag\s+(\d+)', clean_line)
+                    if _ing:
+                        current_config['vlan_manipulation']['ingress'] = f"push outer-tag {_ing.group(1)}"
+                        current_config['outer_vlan'] = int(_ing.group(1))
+                    if 'egress-mapping action pop' in clean_line:
+                        current_config['vlan_manipulation']['egress'] = 'pop outer-tag'
+                # vlan-tags outer-tag X inner-tag-list Y
+                _q = re.search(r'\bvlan-tags\s+outer-tag\s+(\d+)\s+inner-tag(?:-list)?\s+([\d\-\s]+)', clean_line)
+                if _q:
+                    outer_vlan, inner_tag_spec = _q.groups()
+                    current_config['outer_vlan'] = int(outer_vlan)
+                    if '-' in inner_tag_spec:
+                        parts = inner_tag_spec.strip().split('-')
+                        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                            current_config['inner_vlan'] = int(parts[0])
+                            current_config['vlan_range'] = f"{parts[0]}-{parts[1]}"
+                        else:
+                            nums = re.findall(r'\d+', inner_tag_spec)
+                            if nums:
+                                current_config['inner_vlan'] = int(nums[0])
+                    else:
+                        nums = re.findall(r'\d+', inner_tag_spec)
+                        if nums:
+                            current_config['inner_vlan'] = int(nums[0])
+                            if len(nums) > 1:
+                                current_config['vlan_list'] = [int(n) for n in nums]
+                            else:
+                                current_config['vlan_id'] = int(nums[0])
+                continue
+            
+            # Add line to current config
+            if current_interface:
+                current_config['raw_config'].append(line)
+            
+            # Parse VLAN ID configurations
+            vlan_id_plain = re.search(r'\bvlan-id\s+(\d+)\b', clean_line)
+            if vlan_id_plain and current_interface:
+                current_config['vlan_id'] = int(vlan_id_plain.group(1))
+                continue
+            
+            # Parse VLAN range configurations
+            vlan_range_plain = re.search(r'\bvlan-id\s+list\s+(\d+)-(\d+)\b', clean_line)
+            if vlan_range_plain and current_interface:
+                vlan_start, vlan_end = vlan_range_plain.groups()
+                current_config['vlan_range'] = f"{vlan_start}-{vlan_end}"
+                continue
+            
+            # Parse VLAN list configurations (supports ranges and singles)
+            vlan_list_plain = re.search(r'\bvlan-id\s+list\s+([0-9\-\s]+)$', clean_line)
+            if vlan_list_plain and current_interface:
+                list_spec = vlan_list_plain.group(1).strip()
+                tokens = list_spec.split()
+                ranges = [tok for tok in tokens if '-' in tok]
+                singles = [tok for tok in tokens if tok.isdigit()]
+                if ranges:
+                    current_config['vlan_range'] = ranges[0]
+                if singles:
+                    current_config['vlan_list'] = [int(v) for v in singles]
+                continue
+            
+            # Parse VLAN manipulation configurations (QinQ)
+            # Example: vlan-manipulation ingress-mapping action push outer-tag 100
+            if 'vlan-manipulation' in clean_line and current_interface:
+                if current_config['vlan_manipulation'] is None:
+                    current_config['vlan_manipulation'] = {}
+                
+                # Parse ingress mapping
+                ingress_match = re.search(r'ingress-mapping\s+action\s+push\s+outer-tag\s+(\d+)', clean_line)
+                if ingress_match:
+                    current_config['vlan_manipulation']['ingress'] = f"push outer-tag {ingress_match.group(1)}"
+                    current_config['outer_vlan'] = int(ingress_match.group(1))
+                    continue
+                
+                # Parse egress mapping
+                if 'egress-mapping action pop' in clean_line:
+                    current_config['vlan_manipulation']['egress'] = 'pop outer-tag'
+                    continue
+            
+            # Parse QinQ outer/inner tag configurations
+            # Example: vlan-tags outer-tag 100 inner-tag-list 200
+            qinq_match = re.search(r'\bvlan-tags\s+outer-tag\s+(\d+)\s+inner-tag(?:-list)?\s+([\d\-\s]+)', clean_line)
+            if qinq_match and current_interface:
+                outer_vlan, inner_tag_spec = qinq_match.groups()
+                current_config['outer_vlan'] = int(outer_vlan)
+                
+                # Parse inner tag specification (could be single value, range, or list)
+                if '-' in inner_tag_spec:
+                    inner_parts = inner_tag_spec.strip().split('-')
+                    if len(inner_parts) == 2 and inner_parts[0].isdigit() and inner_parts[1].isdigit():
+                        current_config['inner_vlan'] = int(inner_parts[0])
+                        current_config['vlan_range'] = f"{inner_parts[0]}-{inner_parts[1]}"
+                    else:
+                        nums = re.findall(r'\d+', inner_tag_spec)
+                        if nums:
+                            current_config['inner_vlan'] = int(nums[0])
+                else:
+                    nums = re.findall(r'\d+', inner_tag_spec)
+                    if nums:
+                        current_config['inner_vlan'] = int(nums[0])
+                        if len(nums) > 1:
+                            current_config['vlan_list'] = [int(n) for n in nums]
+                        else:
+                            current_config['vlan_id'] = int(nums[0])
+                continue
+            
+            # Parse L2 service enablement
+            if 'l2-service enabled' in line and current_interface:
+                current_config['l2_service'] = True
+                continue
+            
+            # Parse interface descriptions
+            description_match = re.search(r'description (.+)', line)
+            if description_match and current_interface:
+                current_config['description'] = description_match.group(1)
+                continue
+        
+        # Save last interface config
+        if current_interface and current_config:
+            vlan_configs.append(current_config.copy())
+        
+        return vlan_configs
+    except Exception as e:
+        print(f"Reference parser error: {e}")
+        return []
+
+
+def build_synthetic_config(interface_count, seed=7):
+    """Build a leaf-sized VLAN configuration dump exercising every parser branch."""
+    rng = random.Random(seed)
+    lines = ["show config | flatten | i vlan", "Wed Oct 16 10:00:00 2026", ""]
+    for index in range(interface_count):
+        parent = f"ge100-0/0/{index % 48}"
+        name = f"{parent}.{index}" if index % 7 else parent
+        vlan = rng.randint(1, 4094)
+        form = index % 12
+        if form == 0:
+            lines.append(f"interfaces {name} vlan-id {vlan}")
+        elif form == 1:
+            lines.append(f"interfaces {name} vlan-id list {vlan}-{vlan + 10} {vlan + 20} {vlan + 30}")
+        elif form == 2:
+            lines.append(f"interfaces {name} vlan-tags outer-tag {vlan} inner-tag {rng.randint(1, 4094)}")
+        elif form == 3:
+            lines.append(f"interfaces {name} vlan-tags outer-tag {vlan} inner-tag-list {vlan}-{vlan + 5}")
+        elif form == 4:
+            lines.append(f"interfaces {name} vlan-tags outer-tag {vlan} inner-tag-list {vlan} {vlan + 1} {vlan + 2}")
+        elif form == 5:
+            lines.append(f"interfaces {name} vlan-manipulation ingress-mapping action push outer-tag {vlan} "
+                         f"outer-tpid 0x8100 egress-mapping action pop")
+        elif form == 6:
+            lines.append(f"\x1b[91minterfaces\x1b[0m {name} \x1b[91mvlan-id\x1b[0m {vlan}")
+        elif form == 7:
+            lines.append(f"\\e[91minterfaces\\e[0m {name} vlan-id {vlan}")
+        elif form == 8:
+            lines.append(f"interfaces {name}")
+            lines.append(f"  vlan-id {vlan}")
+            lines.append("  l2-service enabled")
+            lines.append(f"  description uplink-{index} to spine")
+        elif form == 9:
+            lines.append(f"interfaces {name}")
+            lines.append(f"  vlan-id list {vlan}-{vlan + 3}")
+            lines.append(f"  vlan-id list {vlan} {vlan + 2} 10-20")
+            lines.append("  vlan-manipulation ingress-mapping action push outer-tag 100")
+            lines.append("  vlan-manipulation egress-mapping action pop")
+        elif form == 10:
+            lines.append(f"interfaces {name}")
+            lines.append(f"  vlan-tags outer-tag {vlan} inner-tag-list 10 - 20")
+            lines.append("  vlan-manipulation ingress-mapping action swap")
+            lines.append(f"  vlan-tags outer-tag {vlan} inner-tag {vlan + 1}")
+        else:
+            lines.append(f"interfaces {name} l2-service enabled")
+            lines.append(f"interfaces {name} description core link vlan-id {vlan}")
+    lines.append("DNAAS-LEAF-A01(16-Oct-2026-10:00:00)#")
+    return "\n".join(lines)
+
+
+def load_golden_inputs(raw_dir):
+    """Collected raw VLAN dumps, keyed by file name."""
+    raw_dir = Path(raw_dir)
+    if not raw_dir.exists():
+        return {}
+    return {path.name: path.read_text(errors='ignore')
+            for path in sorted(raw_dir.glob('*_vlan_config_raw_*.txt'))}
+
+
+def check_equivalence(inputs):
+    """Compare both parsers on every input; returns the names that differ."""
+    mismatches = []
+    for name, text in inputs.items():
+        expected = reference_parse_vlan_configuration(text)
+        actual = parse_vlan_configuration(text)
+        if actual != expected:
+            mismatches.append(name)
+            for index, (want, got) in enumerate(zip(expected, actual)):
+                if want != got:
+                    print(f"   {name}: first difference at entry {index}")
+                    print(f"      reference: {want}")
+                    print(f"      optimized: {got}")
+                    break
+            else:
+                print(f"   {name}: {len(expected)} reference entries vs {len(actual)} optimized entries")
+    return mismatches
+
+
+def benchmark(func, text, runs):
+    """Best wall-clock time of ``runs`` calls."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the VLAN configuration parser')
+    parser.add_argument('--interfaces', type=int, default=20000,
+                        help='Interfaces in the synthetic benchmark configuration')
+    parser.add_argument('--runs', type=int, default=5, help='Benchmark repetitions (best time is reported)')
+    parser.add_argument('--raw-dir', default=str(BRIDGE_DOMAIN_RAW_DIR),
+                        help='Directory with collected *_vlan_config_raw_*.txt dumps')
+    args = parser.parse_args()
+
+    synthetic = build_synthetic_config(args.interfaces)
+    inputs = {'synthetic': synthetic, 'synthetic-small': build_synthetic_config(200, seed=11)}
+    golden = load_golden_inputs(args.raw_dir)
+    inputs.update(golden)
+
+    print(f"🔍 Checking equivalence on {len(inputs)} inputs ({len(golden)} collected dumps)...")
+    mismatches = check_equivalence(inputs)
+    if mismatches:
+        print(f"❌ {len(mismatches)} inputs differ: {', '.join(mismatches)}")
+        return 1
+    print("✅ Outputs identical")
+
+    line_count = synthetic.count('\n') + 1
+    print(f"\n⏱️  Benchmarking on {line_count} lines ({args.interfaces} interfaces), best of {args.runs}...")
+    reference_time = benchmark(reference_parse_vlan_configuration, synthetic, args.runs)
+    optimized_time = benchmark(parse_vlan_configuration, synthetic, args.runs)
+    print(f"   reference: {reference_time * 1000:.1f} ms")
+    print(f"   optimized: {optimized_time * 1000:.1f} ms")
+    print(f"   speedup:   {reference_time / optimized_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ This script performs a complete refresh with two phases:
 
 import os
 import sys
+import asyncio
 import yaml
 import logging
 from pathlib import Path
@@ -21,9 +22,14 @@ import argparse
 import xml.etree.ElementTree as ET
 from collections import defaultdict
 import json
+import hashlib
+from dataclasses import dataclass
+from typing import Callable
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.dnos_ssh import DNOSSSH
+from utils.ssh_pool import get_session_pool
+from utils.async_ssh import ASYNCSSH_AVAILABLE, open_session
+from utils.parsed_data_store import ParsedDataStore, ParsedDataStoreWriter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -52,9 +58,15 @@ RAW_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 BRIDGE_DOMAIN_RAW_DIR = Path('topology/configs/raw-config/bridge_domain_raw')
 BRIDGE_DOMAIN_RAW_DIR.mkdir(parents=True, exist_ok=True)
 
+PARSED_DATA_DIR = Path('topology/configs/parsed_data')
+
 BRIDGE_DOMAIN_PARSED_DIR = Path('topology/configs/parsed_data/bridge_domain_parsed')
 BRIDGE_DOMAIN_PARSED_DIR.mkdir(parents=True, exist_ok=True)
 
+# asyncio probe engine limits
+DEFAULT_ASYNC_CONCURRENCY = 256
+DEFAULT_SITE_CONCURRENCY = 64
+
 class ProbeSummary:
     """Track and report comprehensive probe and parse results."""
     
@@ -368,12 +380,14 @@ def load_devices():
         return {}
 
 def clear_previous_data():
-    """Clear previous data directories before fresh collection."""
+    """Clear previous raw data directories before fresh collection.
+    
+    Parsed data is kept: the parse phase reconciles it against the new raw
+    dumps through the parse manifest and removes outputs of vanished devices.
+    """
     data_dirs = [
         'topology/configs/raw-config',
-        'topology/configs/parsed_data',
-        'topology/configs/raw-config/bridge_domain_raw',
-        'topology/configs/parsed_data/bridge_domain_parsed'
+        'topology/configs/raw-config/bridge_domain_raw'
     ]
     
     for dir_path in data_dirs:
@@ -385,116 +399,80 @@ def clear_previous_data():
         Path(dir_path).mkdir(parents=True, exist_ok=True)
         logger.info(f"Created fresh directory: {dir_path}")
 
+# Probe commands run on every device:
+# (key, command, success marker, raw dir, file suffix, extension, label)
+PROBE_COMMANDS = [
+    ('lacp', "show config protocols lacp | display-xml | no-more", '<config',
+     RAW_CONFIG_DIR, 'lacp_raw', 'xml', 'LACP XML'),
+    ('lldp', "show lldp neighbors | no-more", 'Interface',
+     RAW_CONFIG_DIR, 'lldp_raw', 'txt', 'LLDP CLI'),
+    ('bridge_domain_instance', 'show config | fl | i "bridge-domain instance" | no-more', 'bridge-domain instance',
+     BRIDGE_DOMAIN_RAW_DIR, 'bridge_domain_instance_raw', 'txt', 'Bridge Domain Instance'),
+    ('vlan_config', 'show config | fl | i vlan | no-more', 'vlan',
+     BRIDGE_DOMAIN_RAW_DIR, 'vlan_config_raw', 'txt', 'VLAN Config'),
+]
+
+def get_device_credentials(device_config):
+    """Return (mgmt_ip, username, password, ssh_port) for a device, merged with defaults."""
+    defaults = device_config.get('defaults', {})
+    device_config = {**defaults, **device_config}
+    return (
+        device_config.get('mgmt_ip'),
+        device_config.get('username', 'admin'),
+        device_config.get('password', 'admin'),
+        device_config.get('ssh_port', 22)
+    )
+
+def save_raw_device_data(device_name, outputs):
+    """
+    Write collected command outputs to raw-config/ and report what succeeded.
+    
+    Args:
+        device_name: Device the outputs belong to
+        outputs: Dict mapping PROBE_COMMANDS keys to raw command output
+        
+    Returns:
+        tuple: (lacp_success, lldp_success, bridge_domain_success)
+    """
+    results = {}
+    for key, _command, marker, raw_dir, suffix, extension, label in PROBE_COMMANDS:
+        output = outputs.get(key)
+        if output and marker in output:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"{device_name}_{suffix}_{timestamp}.{extension}"
+            filepath = raw_dir / filename
+            
+            with open(filepath, 'w') as f:
+                f.write(output)
+            
+            logger.info(f"Collected {label} for {device_name}")
+            results[key] = True
+        else:
+            logger.warning(f"Failed to collect {label} for {device_name}")
+            results[key] = False
+    
+    # Bridge domain collection is successful if either command succeeded
+    bridge_domain_success = results['bridge_domain_instance'] or results['vlan_config']
+    
+    return results['lacp'], results['lldp'], bridge_domain_success
+
 def collect_raw_device_data(device_name, device_config):
     """Collect raw LACP, LLDP, and Bridge Domain data from a single device."""
     try:
-        # Merge device config with defaults
-        defaults = device_config.get('defaults', {})
-        device_config = {**defaults, **device_config}
-        
-        mgmt_ip = device_config.get('mgmt_ip')
-        username = device_config.get('username', 'admin')
-        password = device_config.get('password', 'admin')
-        ssh_port = device_config.get('ssh_port', 22)
+        mgmt_ip, username, password, ssh_port = get_device_credentials(device_config)
         
         if not mgmt_ip or mgmt_ip == 'TBD' or mgmt_ip == 'unknown':
             summary.add_invalid_device(device_name, "Invalid mgmt_ip")
             return False, False, False
         
-        # Create SSH connection
-        ssh = DNOSSSH(hostname=mgmt_ip, username=username, password=password, port=ssh_port)
+        # Borrow a pooled SSH session
+        with get_session_pool().session(mgmt_ip, username, password, port=ssh_port) as ssh:
+            outputs = {
+                key: ssh.send_command_with_full_output(command)
+                for key, command, *_ in PROBE_COMMANDS
+            }
         
-        try:
-            ssh.connect()
-            
-            # Collect LACP XML data
-            lacp_command = "show config protocols lacp | display-xml | no-more"
-            lacp_output = ssh.send_command(lacp_command)
-            
-            if lacp_output and '<config' in lacp_output:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_lacp_raw_{timestamp}.xml"
-                filepath = RAW_CONFIG_DIR / filename
-                
-                with open(filepath, 'w') as f:
-                    f.write(lacp_output)
-                
-                logger.info(f"Collected LACP XML for {device_name}")
-                lacp_success = True
-            else:
-                logger.warning(f"Failed to collect LACP XML for {device_name}")
-                lacp_success = False
-            
-            # Small delay between commands
-            time.sleep(0.5)
-            
-            # Collect LLDP CLI data
-            lldp_command = "show lldp neighbors | no-more"
-            lldp_output = ssh.send_command(lldp_command)
-            
-            if lldp_output and 'Interface' in lldp_output:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_lldp_raw_{timestamp}.txt"
-                filepath = RAW_CONFIG_DIR / filename
-                
-                with open(filepath, 'w') as f:
-                    f.write(lldp_output)
-                
-                logger.info(f"Collected LLDP CLI for {device_name}")
-                lldp_success = True
-            else:
-                logger.warning(f"Failed to collect LLDP CLI for {device_name}")
-                lldp_success = False
-            
-            # Small delay between commands
-            time.sleep(0.5)
-            
-            # Collect Bridge Domain Instance data
-            bridge_domain_instance_command = 'show config | fl | i "bridge-domain instance" | no-more'
-            bridge_domain_instance_output = ssh.send_command(bridge_domain_instance_command)
-            
-            if bridge_domain_instance_output and 'bridge-domain instance' in bridge_domain_instance_output:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_bridge_domain_instance_raw_{timestamp}.txt"
-                filepath = BRIDGE_DOMAIN_RAW_DIR / filename
-                
-                with open(filepath, 'w') as f:
-                    f.write(bridge_domain_instance_output)
-                
-                logger.info(f"Collected Bridge Domain Instance for {device_name}")
-                bridge_domain_instance_success = True
-            else:
-                logger.warning(f"Failed to collect Bridge Domain Instance for {device_name}")
-                bridge_domain_instance_success = False
-            
-            # Small delay between commands
-            time.sleep(0.5)
-            
-            # Collect VLAN Configuration data
-            vlan_config_command = 'show config | fl | i vlan | no-more'
-            vlan_config_output = ssh.send_command(vlan_config_command)
-            
-            if vlan_config_output and 'vlan' in vlan_config_output:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_vlan_config_raw_{timestamp}.txt"
-                filepath = BRIDGE_DOMAIN_RAW_DIR / filename
-                
-                with open(filepath, 'w') as f:
-                    f.write(vlan_config_output)
-                
-                logger.info(f"Collected VLAN Config for {device_name}")
-                vlan_config_success = True
-            else:
-                logger.warning(f"Failed to collect VLAN Config for {device_name}")
-                vlan_config_success = False
-            
-            # Bridge domain collection is successful if either command succeeded
-            bridge_domain_success = bridge_domain_instance_success or vlan_config_success
-            
-            return lacp_success, lldp_success, bridge_domain_success
-            
-        finally:
-            ssh.disconnect()
+        return save_raw_device_data(device_name, outputs)
             
     except Exception as e:
         logger.error(f"Error collecting data from {device_name}: {e}")
@@ -746,33 +724,81 @@ def parse_bridge_domain_instance(cli_output):
         logger.error(f"Error parsing bridge domain instance CLI: {e}")
         return []
 
+# Precompiled VLAN configuration line patterns; each is only tried when its
+# keyword is present in the line
+VLAN_INTERFACE_RE = re.compile(r'interfaces (\S+)')
+VLAN_ID_RE = re.compile(r'\bvlan-id\s+(\d+)\b')
+VLAN_ID_RANGE_RE = re.compile(r'\bvlan-id\s+list\s+(\d+)-(\d+)\b')
+VLAN_ID_LIST_RE = re.compile(r'\bvlan-id\s+list\s+([0-9\-\s]+)$')
+VLAN_PUSH_OUTER_RE = re.compile(r'ingress-mapping\s+action\s+push\s+outer-tag\s+(\d+)')
+VLAN_TAGS_RE = re.compile(r'\bvlan-tags\s+outer-tag\s+(\d+)\s+inner-tag(?:-list)?\s+([\d\-\s]+)')
+VLAN_DESCRIPTION_RE = re.compile(r'description (.+)')
+DIGITS_RE = re.compile(r'\d+')
+
+def _apply_vlan_id_list(config, list_spec):
+    """Set vlan_range/vlan_list from a 'vlan-id list' spec (ranges and singles)."""
+    tokens = list_spec.split()
+    ranges = [tok for tok in tokens if '-' in tok]
+    singles = [tok for tok in tokens if tok.isdigit()]
+    if ranges:
+        config['vlan_range'] = ranges[0]
+    if singles:
+        config['vlan_list'] = [int(v) for v in singles]
+
+def _apply_vlan_tags(config, outer_vlan, inner_tag_spec):
+    """Set QinQ fields from 'vlan-tags outer-tag X inner-tag(-list) Y'."""
+    config['outer_vlan'] = int(outer_vlan)
+    
+    # Inner tag specification can be a single value, a range or a list
+    if '-' in inner_tag_spec:
+        inner_parts = inner_tag_spec.strip().split('-')
+        if len(inner_parts) == 2 and inner_parts[0].isdigit() and inner_parts[1].isdigit():
+            config['inner_vlan'] = int(inner_parts[0])
+            config['vlan_range'] = f"{inner_parts[0]}-{inner_parts[1]}"
+        else:
+            nums = DIGITS_RE.findall(inner_tag_spec)
+            if nums:
+                config['inner_vlan'] = int(nums[0])
+    else:
+        nums = DIGITS_RE.findall(inner_tag_spec)
+        if nums:
+            config['inner_vlan'] = int(nums[0])
+            if len(nums) > 1:
+                config['vlan_list'] = [int(n) for n in nums]
+            else:
+                config['vlan_id'] = int(nums[0])
+
 def parse_vlan_configuration(cli_output):
-    """Parse VLAN Configuration CLI output with enhanced QinQ support."""
+    """Parse VLAN Configuration CLI output with enhanced QinQ support.
+    
+    Single pass over the lines: cheap substring checks decide which of the
+    precompiled patterns a line can match, so the common
+    'interfaces X vlan-id N' line costs one or two regex calls.
+    
+    Lines starting a new interface apply every VLAN setting they carry;
+    continuation lines apply the first matching setting, in the order
+    vlan-id, vlan-id list, vlan-manipulation, vlan-tags, l2-service,
+    description.
+    """
     vlan_configs = []
     
     try:
-        lines = cli_output.split('\n')
+        current_config = None
         
-        # Track current interface context for multi-line configurations
-        current_interface = None
-        current_config = {}
-        
-        for line in lines:
+        for line in cli_output.split('\n'):
             line = line.strip()
             if not line:
                 continue
             
             # Strip ANSI color codes for robust parsing
-            clean_line = strip_ansi_codes(line)
+            clean_line = strip_ansi_codes(line) if '\x1b' in line or '\\e[' in line else line
             
-            # Check for interface line
-            interface_match = re.search(r'interfaces ([^\s]+)', clean_line)
+            interface_match = VLAN_INTERFACE_RE.search(clean_line) if 'interfaces ' in clean_line else None
             if interface_match:
                 # Save previous interface config if exists
-                if current_interface and current_config:
-                    vlan_configs.append(current_config.copy())
+                if current_config:
+                    vlan_configs.append(current_config)
                 
-                # Start new interface
                 current_interface = interface_match.group(1)
                 current_config = {
                     'interface': current_interface,
@@ -785,337 +811,401 @@ def parse_vlan_configuration(cli_output):
                     'vlan_manipulation': None,
                     'l2_service': False,
                     'description': None,
-                    'raw_config': []
+                    'raw_config': [line]
                 }
-                current_config['raw_config'].append(line)
+                
                 # Also parse VLAN info from this same line (common DNOS style)
-                # vlan-id <num>
-                _m = re.search(r'\bvlan-id\s+(\d+)\b', clean_line)
-                if _m:
-                    current_config['vlan_id'] = int(_m.group(1))
-                # vlan-id list <...>
-                _r = re.search(r'\bvlan-id\s+list\s+([0-9\-\s]+)$', clean_line)
-                if _r:
-                    list_spec = _r.group(1).strip()
-                    tokens = list_spec.split()
-                    ranges = [tok for tok in tokens if '-' in tok]
-                    singles = [tok for tok in tokens if tok.isdigit()]
-                    if ranges:
-                        current_config['vlan_range'] = ranges[0]
-                    if singles:
-                        current_config['vlan_list'] = [int(v) for v in singles]
-                # vlan-manipulation ingress/egress
+                if 'vlan-id' in clean_line:
+                    match = VLAN_ID_RE.search(clean_line)
+                    if match:
+                        current_config['vlan_id'] = int(match.group(1))
+                    match = VLAN_ID_LIST_RE.search(clean_line)
+                    if match:
+                        _apply_vlan_id_list(current_config, match.group(1))
                 if 'vlan-manipulation' in clean_line:
-                    if current_config['vlan_manipulation'] is None:
-                        current_config['vlan_manipulation'] = {}
-                    _ing = re.search(r'ingress-mapping\s+action\s+push\s+outer-tag\s+(\d+)', clean_line)
-                    if _ing:
-                        current_config['vlan_manipulation']['ingress'] = f"push outer-tag {_ing.group(1)}"
-                        current_config['outer_vlan'] = int(_ing.group(1))
+                    current_config['vlan_manipulation'] = {}
+                    match = VLAN_PUSH_OUTER_RE.search(clean_line)
+                    if match:
+                        current_config['vlan_manipulation']['ingress'] = f"push outer-tag {match.group(1)}"
+                        current_config['outer_vlan'] = int(match.group(1))
                     if 'egress-mapping action pop' in clean_line:
                         current_config['vlan_manipulation']['egress'] = 'pop outer-tag'
-                # vlan-tags outer-tag X inner-tag-list Y
-                _q = re.search(r'\bvlan-tags\s+outer-tag\s+(\d+)\s+inner-tag(?:-list)?\s+([\d\-\s]+)', clean_line)
-                if _q:
-                    outer_vlan, inner_tag_spec = _q.groups()
-                    current_config['outer_vlan'] = int(outer_vlan)
-                    if '-' in inner_tag_spec:
-                        parts = inner_tag_spec.strip().split('-')
-                        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-                            current_config['inner_vlan'] = int(parts[0])
-                            current_config['vlan_range'] = f"{parts[0]}-{parts[1]}"
-                        else:
-                            nums = re.findall(r'\d+', inner_tag_spec)
-                            if nums:
-                                current_config['inner_vlan'] = int(nums[0])
-                    else:
-                        nums = re.findall(r'\d+', inner_tag_spec)
-                        if nums:
-                            current_config['inner_vlan'] = int(nums[0])
-                            if len(nums) > 1:
-                                current_config['vlan_list'] = [int(n) for n in nums]
-                            else:
-                                current_config['vlan_id'] = int(nums[0])
+                if 'vlan-tags' in clean_line:
+                    match = VLAN_TAGS_RE.search(clean_line)
+                    if match:
+                        _apply_vlan_tags(current_config, *match.groups())
                 continue
             
-            # Add line to current config
-            if current_interface:
-                current_config['raw_config'].append(line)
-            
-            # Parse VLAN ID configurations
-            vlan_id_plain = re.search(r'\bvlan-id\s+(\d+)\b', clean_line)
-            if vlan_id_plain and current_interface:
-                current_config['vlan_id'] = int(vlan_id_plain.group(1))
+            # Lines before the first interface carry no configuration
+            if current_config is None:
                 continue
             
-            # Parse VLAN range configurations
-            vlan_range_plain = re.search(r'\bvlan-id\s+list\s+(\d+)-(\d+)\b', clean_line)
-            if vlan_range_plain and current_interface:
-                vlan_start, vlan_end = vlan_range_plain.groups()
-                current_config['vlan_range'] = f"{vlan_start}-{vlan_end}"
-                continue
+            current_config['raw_config'].append(line)
             
-            # Parse VLAN list configurations (supports ranges and singles)
-            vlan_list_plain = re.search(r'\bvlan-id\s+list\s+([0-9\-\s]+)$', clean_line)
-            if vlan_list_plain and current_interface:
-                list_spec = vlan_list_plain.group(1).strip()
-                tokens = list_spec.split()
-                ranges = [tok for tok in tokens if '-' in tok]
-                singles = [tok for tok in tokens if tok.isdigit()]
-                if ranges:
-                    current_config['vlan_range'] = ranges[0]
-                if singles:
-                    current_config['vlan_list'] = [int(v) for v in singles]
-                continue
+            if 'vlan-id' in clean_line:
+                match = VLAN_ID_RE.search(clean_line)
+                if match:
+                    current_config['vlan_id'] = int(match.group(1))
+                    continue
+                match = VLAN_ID_RANGE_RE.search(clean_line)
+                if match:
+                    current_config['vlan_range'] = f"{match.group(1)}-{match.group(2)}"
+                    continue
+                match = VLAN_ID_LIST_RE.search(clean_line)
+                if match:
+                    _apply_vlan_id_list(current_config, match.group(1))
+                    continue
             
-            # Parse VLAN manipulation configurations (QinQ)
             # Example: vlan-manipulation ingress-mapping action push outer-tag 100
-            if 'vlan-manipulation' in clean_line and current_interface:
+            if 'vlan-manipulation' in clean_line:
                 if current_config['vlan_manipulation'] is None:
                     current_config['vlan_manipulation'] = {}
-                
-                # Parse ingress mapping
-                ingress_match = re.search(r'ingress-mapping\s+action\s+push\s+outer-tag\s+(\d+)', clean_line)
-                if ingress_match:
-                    current_config['vlan_manipulation']['ingress'] = f"push outer-tag {ingress_match.group(1)}"
-                    current_config['outer_vlan'] = int(ingress_match.group(1))
+                match = VLAN_PUSH_OUTER_RE.search(clean_line)
+                if match:
+                    current_config['vlan_manipulation']['ingress'] = f"push outer-tag {match.group(1)}"
+                    current_config['outer_vlan'] = int(match.group(1))
                     continue
-                
-                # Parse egress mapping
                 if 'egress-mapping action pop' in clean_line:
                     current_config['vlan_manipulation']['egress'] = 'pop outer-tag'
                     continue
             
-            # Parse QinQ outer/inner tag configurations
             # Example: vlan-tags outer-tag 100 inner-tag-list 200
-            qinq_match = re.search(r'\bvlan-tags\s+outer-tag\s+(\d+)\s+inner-tag(?:-list)?\s+([\d\-\s]+)', clean_line)
-            if qinq_match and current_interface:
-                outer_vlan, inner_tag_spec = qinq_match.groups()
-                current_config['outer_vlan'] = int(outer_vlan)
-                
-                # Parse inner tag specification (could be single value, range, or list)
-                if '-' in inner_tag_spec:
-                    inner_parts = inner_tag_spec.strip().split('-')
-                    if len(inner_parts) == 2 and inner_parts[0].isdigit() and inner_parts[1].isdigit():
-                        current_config['inner_vlan'] = int(inner_parts[0])
-                        current_config['vlan_range'] = f"{inner_parts[0]}-{inner_parts[1]}"
-                    else:
-                        nums = re.findall(r'\d+', inner_tag_spec)
-                        if nums:
-                            current_config['inner_vlan'] = int(nums[0])
-                else:
-                    nums = re.findall(r'\d+', inner_tag_spec)
-                    if nums:
-                        current_config['inner_vlan'] = int(nums[0])
-                        if len(nums) > 1:
-                            current_config['vlan_list'] = [int(n) for n in nums]
-                        else:
-                            current_config['vlan_id'] = int(nums[0])
-                continue
+            if 'vlan-tags' in clean_line:
+                match = VLAN_TAGS_RE.search(clean_line)
+                if match:
+                    _apply_vlan_tags(current_config, *match.groups())
+                    continue
             
-            # Parse L2 service enablement
-            if 'l2-service enabled' in line and current_interface:
+            if 'l2-service enabled' in line:
                 current_config['l2_service'] = True
                 continue
             
-            # Parse interface descriptions
-            description_match = re.search(r'description (.+)', line)
-            if description_match and current_interface:
-                current_config['description'] = description_match.group(1)
-                continue
+            if 'description ' in line:
+                match = VLAN_DESCRIPTION_RE.search(line)
+                if match:
+                    current_config['description'] = match.group(1)
         
         # Save last interface config
-        if current_interface and current_config:
-            vlan_configs.append(current_config.copy())
+        if current_config:
+            vlan_configs.append(current_config)
         
         return vlan_configs
     except Exception as e:
         logger.error(f"Error parsing VLAN configuration CLI: {e}")
         return []
 
-def parse_raw_data():
-    """Phase 2: Parse raw data and save structured results."""
-    logger.info("=== PARSE PHASE ===")
-    parse_start_time = time.time()
-    
-    raw_dir = Path('topology/configs/raw-config')
-    parsed_dir = Path('topology/configs/parsed_data')
-    parsed_dir.mkdir(parents=True, exist_ok=True)
+@dataclass(frozen=True)
+class ParseSpec:
+    """How one kind of raw dump is found, parsed and written."""
+    key: str
+    raw_dir: Path
+    raw_pattern: str
+    raw_marker: str
+    parser: Callable
+    parsed_dir: Path
+    parsed_marker: str
+    output_key: str
+    label: str
+    items_label: str
+    summary_type: str = None
+    count_kwarg: str = None
+
+PARSE_SPECS = [
+    ParseSpec('lacp', RAW_CONFIG_DIR, '*_lacp_raw_*.xml', '_lacp_raw_', parse_lacp_xml,
+              PARSED_DATA_DIR, 'lacp_parsed', 'bundles', 'LACP', 'bundles',
+              summary_type='lacp', count_kwarg='bundles_count'),
+    ParseSpec('lldp', RAW_CONFIG_DIR, '*_lldp_raw_*.txt', '_lldp_raw_', parse_lldp_cli,
+              PARSED_DATA_DIR, 'lldp_parsed', 'neighbors', 'LLDP', 'neighbors',
+              summary_type='lldp', count_kwarg='neighbors_count'),
+    ParseSpec('bridge_domain_instance', BRIDGE_DOMAIN_RAW_DIR, '*_bridge_domain_instance_raw_*.txt',
+              '_bridge_domain_instance_raw_', parse_bridge_domain_instance,
+              BRIDGE_DOMAIN_PARSED_DIR, 'bridge_domain_instance_parsed', 'bridge_domain_instances',
+              'Bridge Domain Instance', 'bridge domains',
+              summary_type='bridge_domain', count_kwarg='bridge_domains_count'),
+    ParseSpec('vlan_config', BRIDGE_DOMAIN_RAW_DIR, '*_vlan_config_raw_*.txt', '_vlan_config_raw_',
+              parse_vlan_configuration, BRIDGE_DOMAIN_PARSED_DIR, 'vlan_config_parsed',
+              'vlan_configurations', 'VLAN Config', 'configurations'),
+]
+
+# Bump when a parser's output changes so cached results are re-parsed
+PARSE_CACHE_VERSION = 1
+PARSE_MANIFEST_PATH = PARSED_DATA_DIR / 'parse_manifest.json'
+PARSED_STORE_PATH = PARSED_DATA_DIR / 'parsed_data.pds'
+
+class ParseCache:
+    """
+    Content-hash manifest of parsed raw dumps.
     
-    # Find all raw data files
-    lacp_files = list(raw_dir.glob('*_lacp_raw_*.xml'))
-    lldp_files = list(raw_dir.glob('*_lldp_raw_*.txt'))
-    bridge_domain_instance_files = list(BRIDGE_DOMAIN_RAW_DIR.glob('*_bridge_domain_instance_raw_*.txt'))
-    vlan_config_files = list(BRIDGE_DOMAIN_RAW_DIR.glob('*_vlan_config_raw_*.txt'))
+    Each (data type, device) entry records the SHA-256 of the raw file it was
+    parsed from and the YAML it produced, so unchanged dumps reuse their
+    previous output instead of being re-parsed and re-written.
+    """
     
-    logger.info(f"Found {len(lacp_files)} LACP files, {len(lldp_files)} LLDP files, {len(bridge_domain_instance_files)} Bridge Domain Instance files, and {len(vlan_config_files)} VLAN Config files to parse")
+    def __init__(self, path=PARSE_MANIFEST_PATH, enabled=True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.entries = {}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self._load()
     
-    # Parse LACP files
-    for lacp_file in lacp_files:
+    def _load(self):
+        if not self.path.exists():
+            return
         try:
-            device_name = lacp_file.name.split('_lacp_raw_')[0]
-            
-            with open(lacp_file, 'r') as f:
-                xml_content = f.read()
-            
-            bundles = parse_lacp_xml(xml_content)
-            
-            if bundles:
-                # Save parsed LACP data
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_lacp_parsed_{timestamp}.yaml"
-                filepath = parsed_dir / filename
-                
-                output_data = {
-                    'device': device_name,
-                    'timestamp': timestamp,
-                    'bundles': bundles
-                }
-                
-                with open(filepath, 'w') as f:
-                    yaml.dump(output_data, f, default_flow_style=False, indent=2)
-                
-                logger.info(f"Parsed LACP for {device_name}: {len(bundles)} bundles")
-                summary.add_parse_result(device_name, 'lacp', True, bundles_count=len(bundles))
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == PARSE_CACHE_VERSION:
+                self.entries = data.get('entries', {})
             else:
-                logger.warning(f"No LACP bundles found in {device_name}")
-                summary.add_parse_result(device_name, 'lacp', False, error="No bundles found in XML")
-                
+                logger.info("Parse cache version changed, re-parsing all raw files")
         except Exception as e:
-            logger.error(f"Error parsing LACP file {lacp_file}: {e}")
-            summary.add_parse_result(device_name, 'lacp', False, error=f"Error parsing LACP XML: {e}")
+            logger.warning(f"Ignoring unreadable parse manifest {self.path}: {e}")
     
-    # Parse LLDP files
-    for lldp_file in lldp_files:
-        try:
-            device_name = lldp_file.name.split('_lldp_raw_')[0]
-            
-            with open(lldp_file, 'r') as f:
-                cli_output = f.read()
-            
-            neighbors = parse_lldp_cli(cli_output)
-            
-            if neighbors:
-                # Save parsed LLDP data
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_lldp_parsed_{timestamp}.yaml"
-                filepath = parsed_dir / filename
-                
-                output_data = {
-                    'device': device_name,
-                    'timestamp': timestamp,
-                    'neighbors': neighbors
-                }
-                
-                with open(filepath, 'w') as f:
-                    yaml.dump(output_data, f, default_flow_style=False, indent=2)
-                
-                logger.info(f"Parsed LLDP for {device_name}: {len(neighbors)} neighbors")
-                summary.add_parse_result(device_name, 'lldp', True, neighbors_count=len(neighbors))
-            else:
-                logger.warning(f"No LLDP neighbors found in {device_name}")
-                summary.add_parse_result(device_name, 'lldp', False, error="No neighbors found in CLI output")
-                
-        except Exception as e:
-            logger.error(f"Error parsing LLDP file {lldp_file}: {e}")
-            summary.add_parse_result(device_name, 'lldp', False, error=f"Error parsing LLDP CLI: {e}")
+    @staticmethod
+    def hash_content(content):
+        return hashlib.sha256(content).hexdigest()
     
-    # Parse Bridge Domain Instance files with VLAN correlation
-    for bridge_domain_instance_file in bridge_domain_instance_files:
-        try:
-            device_name = bridge_domain_instance_file.name.split('_bridge_domain_instance_raw_')[0]
-            
-            with open(bridge_domain_instance_file, 'r') as f:
-                cli_output = f.read()
-            
-            bridge_domains = parse_bridge_domain_instance(cli_output)
-            
-            if bridge_domains:
-                
-                # Save parsed Bridge Domain Instance data
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_bridge_domain_instance_parsed_{timestamp}.yaml"
-                filepath = BRIDGE_DOMAIN_PARSED_DIR / filename
-                
-                output_data = {
-                    'device': device_name,
-                    'timestamp': timestamp,
-                    'bridge_domain_instances': bridge_domains
-                }
-                
-                with open(filepath, 'w') as f:
-                    yaml.dump(output_data, f, default_flow_style=False, indent=2)
-                
-                logger.info(f"Parsed Bridge Domain Instance for {device_name}: {len(bridge_domains)} bridge domains")
-                summary.add_parse_result(device_name, 'bridge_domain', True, bridge_domains_count=len(bridge_domains))
-            else:
-                logger.warning(f"No Bridge Domain instances found in {device_name}")
-                summary.add_parse_result(device_name, 'bridge_domain', False, error="No bridge domain instances found in CLI output")
-                
-        except Exception as e:
-            logger.error(f"Error parsing Bridge Domain Instance file {bridge_domain_instance_file}: {e}")
-            summary.add_parse_result(device_name, 'bridge_domain', False, error=f"Error parsing Bridge Domain Instance CLI: {e}")
+    def lookup(self, spec_key, device_name, content_hash):
+        """Return the cached entry if the raw content is unchanged and its output still exists."""
+        entry_key = f"{spec_key}:{device_name}"
+        self.seen.add(entry_key)
+        entry = self.entries.get(entry_key)
+        if (self.enabled and entry and entry.get('hash') == content_hash
+                and (not entry.get('parsed_file') or Path(entry['parsed_file']).exists())):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
     
-    # Parse VLAN Config files
-    for vlan_config_file in vlan_config_files:
-        try:
-            device_name = vlan_config_file.name.split('_vlan_config_raw_')[0]
-            
-            with open(vlan_config_file, 'r') as f:
-                cli_output = f.read()
-            
-            vlan_configs = parse_vlan_configuration(cli_output)
-            
-            if vlan_configs:
-                # Save parsed VLAN Config data
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{device_name}_vlan_config_parsed_{timestamp}.yaml"
-                filepath = BRIDGE_DOMAIN_PARSED_DIR / filename
-                
-                output_data = {
-                    'device': device_name,
-                    'timestamp': timestamp,
-                    'vlan_configurations': vlan_configs
-                }
+    def keep(self, spec_key, device_name):
+        """Keep a device's previous entry and output this run (its raw file could not be read); returns the entry."""
+        entry_key = f"{spec_key}:{device_name}"
+        self.seen.add(entry_key)
+        return self.entries.get(entry_key)
+    
+    def store(self, spec_key, device_name, content_hash, parsed_file, count, success, error=None, timestamp=None):
+        entry_key = f"{spec_key}:{device_name}"
+        previous = self.entries.get(entry_key, {}).get('parsed_file')
+        if previous and previous != parsed_file and Path(previous).exists():
+            Path(previous).unlink()
+        self.entries[entry_key] = {
+            'hash': content_hash,
+            'parsed_file': parsed_file,
+            'count': count,
+            'success': success,
+            'error': error,
+            'timestamp': timestamp
+        }
+    
+    def prune(self):
+        """Drop entries (and their outputs) for raw files that no longer exist."""
+        for entry_key in [k for k in self.entries if k not in self.seen]:
+            parsed_file = self.entries.pop(entry_key).get('parsed_file')
+            if parsed_file and Path(parsed_file).exists():
+                Path(parsed_file).unlink()
+        
+        # Remove parsed files not owned by any entry (e.g. from pre-cache runs)
+        owned = {entry.get('parsed_file') for entry in self.entries.values()}
+        for spec in PARSE_SPECS:
+            for parsed_file in spec.parsed_dir.glob(f"*_{spec.parsed_marker}_*.yaml"):
+                if str(parsed_file) not in owned:
+                    parsed_file.unlink()
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': PARSE_CACHE_VERSION, 'entries': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+def record_parse_result(spec, device_name, success, count=0, error=None):
+    """Add a parse result to the summary (VLAN configs are not tracked there)."""
+    if not spec.summary_type:
+        return
+    if success:
+        summary.add_parse_result(device_name, spec.summary_type, True, **{spec.count_kwarg: count})
+    else:
+        summary.add_parse_result(device_name, spec.summary_type, False, error=error)
+
+PARSE_SPECS_BY_KEY = {spec.key: spec for spec in PARSE_SPECS}
+
+def parse_raw_content(spec_key, content):
+    """Run the parser for one raw dump. Pure CPU work, safe to run in a worker process."""
+    spec = PARSE_SPECS_BY_KEY[spec_key]
+    return spec.parser(content.decode('utf-8', errors='ignore'))
+
+def save_parse_output(spec, device_name, items, cache, content_hash, timestamp, store_writer):
+    """Write one device's parsed YAML and store entry, and record the result in the cache and summary."""
+    if not items:
+        error = f"No {spec.items_label} found in {spec.label} output"
+        logger.warning(f"No {spec.label} {spec.items_label} found in {device_name}")
+        cache.store(spec.key, device_name, content_hash, None, 0, False, error)
+        record_parse_result(spec, device_name, False, error=error)
+        return
+    
+    filepath = spec.parsed_dir / f"{device_name}_{spec.parsed_marker}_{timestamp}.yaml"
+    
+    output_data = {
+        'device': device_name,
+        'timestamp': timestamp,
+        spec.output_key: items
+    }
+    
+    with open(filepath, 'w') as f:
+        yaml.dump(output_data, f, default_flow_style=False, indent=2)
+    
+    store_writer.add(spec.output_key, device_name, items, timestamp=timestamp, source=str(filepath))
+    
+    logger.info(f"Parsed {spec.label} for {device_name}: {len(items)} {spec.items_label}")
+    cache.store(spec.key, device_name, content_hash, str(filepath), len(items), True, timestamp=timestamp)
+    record_parse_result(spec, device_name, True, count=len(items))
+
+def carry_over_store_entry(spec, device_name, cached, previous_store, store_writer):
+    """Copy an unchanged device's items into the new store, from the previous store or its YAML."""
+    parsed_file = cached.get('parsed_file')
+    if not cached['success'] or not parsed_file:
+        return
+    
+    if previous_store is not None:
+        entry = previous_store.entry(spec.output_key, device_name)
+        if entry and entry['source'] == parsed_file:
+            store_writer.add_raw(spec.output_key, device_name, previous_store.get_raw(spec.output_key, device_name),
+                                 entry['count'], timestamp=entry['timestamp'], source=parsed_file)
+            return
+    
+    # No previous store (or it is out of date): read the items back from the YAML once
+    try:
+        with open(parsed_file, 'r') as f:
+            data = yaml.safe_load(f) or {}
+        store_writer.add(spec.output_key, device_name, data.get(spec.output_key, []),
+                         timestamp=data.get('timestamp'), source=parsed_file)
+    except Exception as e:
+        logger.warning(f"Could not add {spec.label} for {device_name} to the parsed data store: {e}")
+
+def parse_raw_data(use_cache=True, workers=1):
+    """Phase 2: Parse raw data and save structured results.
+    
+    Raw dumps whose content hash matches the parse manifest reuse their
+    previous parsed YAML; only new or changed dumps are parsed. With
+    workers > 1 the parsers run in a process pool, while YAML writes, the
+    manifest and summary bookkeeping stay in this process and are applied
+    in file order, so the output is identical to a serial run.
+    
+    Besides the YAML files, every run writes a single parsed data store
+    (parsed_data.pds) holding all devices' results for fast loading by
+    discovery.
+    """
+    logger.info("=== PARSE PHASE ===")
+    parse_start_time = time.time()
+    
+    for spec in PARSE_SPECS:
+        spec.parsed_dir.mkdir(parents=True, exist_ok=True)
+    
+    cache = ParseCache(enabled=use_cache)
+    previous_store = ParsedDataStore.open(PARSED_STORE_PATH)
+    store_writer = ParsedDataStoreWriter(PARSED_STORE_PATH)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    # Find all raw data files (latest dump per device and data type)
+    raw_files = {}
+    for spec in PARSE_SPECS:
+        latest = {}
+        for raw_file in sorted(spec.raw_dir.glob(spec.raw_pattern)):
+            latest[raw_file.name.split(spec.raw_marker)[0]] = raw_file
+        raw_files[spec.key] = [latest[device_name] for device_name in sorted(latest)]
+    
+    logger.info(f"Found {len(raw_files['lacp'])} LACP files, {len(raw_files['lldp'])} LLDP files, {len(raw_files['bridge_domain_instance'])} Bridge Domain Instance files, and {len(raw_files['vlan_config'])} VLAN Config files to parse")
+    
+    # Read and hash every dump up front; only cache misses need parsing
+    jobs = []
+    for spec in PARSE_SPECS:
+        for raw_file in raw_files[spec.key]:
+            device_name = raw_file.name.split(spec.raw_marker)[0]
+            job = {'spec': spec, 'raw_file': raw_file, 'device': device_name}
+            try:
+                with open(raw_file, 'rb') as f:
+                    content = f.read()
+                job['hash'] = cache.hash_content(content)
+                job['cached'] = cache.lookup(spec.key, device_name, job['hash'])
+                if not job['cached']:
+                    job['content'] = content
+            except Exception as e:
+                # A transient read error must not cost the device its last good output
+                job['error'] = e
+                job['kept'] = cache.keep(spec.key, device_name)
+            jobs.append(job)
+    
+    to_parse = [job for job in jobs if 'content' in job]
+    executor = None
+    if workers > 1 and len(to_parse) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool_size = min(workers, len(to_parse))
+        executor = ProcessPoolExecutor(max_workers=pool_size)
+        logger.info(f"Parsing {len(to_parse)} files with {pool_size} worker processes")
+        for job in to_parse:
+            job['future'] = executor.submit(parse_raw_content, job['spec'].key, job.pop('content'))
+    
+    try:
+        for job in jobs:
+            spec, device_name = job['spec'], job['device']
+            try:
+                if 'error' in job:
+                    if job['kept']:
+                        carry_over_store_entry(spec, device_name, job['kept'], previous_store, store_writer)
+                    raise job['error']
                 
-                with open(filepath, 'w') as f:
-                    yaml.dump(output_data, f, default_flow_style=False, indent=2)
+                cached = job['cached']
+                if cached:
+                    logger.debug(f"{spec.label} for {device_name} unchanged, reusing {cached.get('parsed_file')}")
+                    record_parse_result(spec, device_name, cached['success'],
+                                        count=cached['count'], error=cached.get('error'))
+                    carry_over_store_entry(spec, device_name, cached, previous_store, store_writer)
+                    continue
                 
-                logger.info(f"Parsed VLAN Config for {device_name}: {len(vlan_configs)} configurations")
-            else:
-                logger.warning(f"No VLAN configurations found in {device_name}")
+                if 'future' in job:
+                    items = job.pop('future').result()
+                else:
+                    items = parse_raw_content(spec.key, job.pop('content'))
+                save_parse_output(spec, device_name, items, cache, job['hash'], timestamp, store_writer)
                 
-        except Exception as e:
-            logger.error(f"Error parsing VLAN Config file {vlan_config_file}: {e}")
+            except Exception as e:
+                logger.error(f"Error parsing {spec.label} file {job['raw_file']}: {e}")
+                record_parse_result(spec, device_name, False, error=f"Error parsing {spec.label}: {e}")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    
+    cache.prune()
+    cache.save()
+    
+    if previous_store is not None:
+        previous_store.close()
+    store_writer.write()
+    logger.info(f"Parsed data store written to {PARSED_STORE_PATH} ({len(store_writer)} device entries)")
     
     parse_total_time = time.time() - parse_start_time
     logger.info(f"Parse phase complete!")
+    logger.info(f"Parse cache: {cache.hits} unchanged, {cache.misses} parsed")
     logger.info(f"LACP parsed: {summary.parse_lacp_successful} devices, {summary.total_bundles} total bundles")
     logger.info(f"LLDP parsed: {summary.parse_lldp_successful} devices, {summary.total_neighbors} total neighbors")
     logger.info(f"Bridge Domain parsed: {summary.parse_bridge_domain_successful} devices, {summary.total_bridge_domains} total bridge domains")
     logger.info(f"Total parse time: {parse_total_time:.2f} seconds")
 
-def probe_phase():
-    """Phase 1: Collect raw data from all devices."""
-    import time
-    script_start_time = time.time()
-    
-    logger.info("=== PHASE 1: PROBE - Collecting raw data ===")
-    
+def prepare_probe_targets():
+    """Clear previous raw data and return devices with a usable mgmt_ip."""
     # Clear previous data
     clear_previous_data()
     
     devices = load_devices()
     if not devices:
         logger.error("No devices found in devices.yaml")
-        return
+        return {}
     
     summary.total_devices = len(devices)
     logger.info(f"Found {len(devices)} devices")
     
-    # Process all devices in parallel
-    target_devices = list(devices.keys())
-    
     # Filter out devices with invalid mgmt_ip
     available_devices = {}
     invalid_devices = []
@@ -1135,6 +1225,52 @@ def probe_phase():
     
     if not available_devices:
         logger.error("No valid devices found in devices.yaml")
+    
+    return available_devices
+
+def record_probe_result(device_name, result, completed, total):
+    """Record one device's probe result in the summary and log progress."""
+    lacp_success, lldp_success, bridge_domain_success = result
+    summary.add_device_result(device_name, lacp_success, lldp_success, bridge_domain_success)
+    
+    status = []
+    if lacp_success:
+        status.append("LACP")
+    if lldp_success:
+        status.append("LLDP")
+    if bridge_domain_success:
+        status.append("Bridge Domain")
+    if not status:
+        status.append("FAILED")
+    
+    logger.info(f"Progress: {completed}/{total} - {device_name}: {'+'.join(status)}")
+
+def log_probe_progress(completed, total):
+    """Log aggregate progress every 10 devices."""
+    if completed % 10 == 0 or completed == total:
+        logger.info(f"Progress: {completed}/{total} devices processed (LACP: {summary.lacp_successful}, LLDP: {summary.lldp_successful}, Bridge Domain: {summary.bridge_domain_successful}, Failed: {len(summary.failed_devices)})")
+
+def log_probe_totals(script_start_time):
+    """Log the probe phase totals."""
+    script_total_time = time.time() - script_start_time
+    logger.info(f"=== PROBE PHASE COMPLETE ===")
+    logger.info(f"LACP XML: {summary.lacp_successful} successful, {summary.lacp_failed} failed")
+    logger.info(f"LLDP Neighbors: {summary.lldp_successful} successful")
+    logger.info(f"Bridge Domain: {summary.bridge_domain_successful} successful")
+    logger.info(f"Total probe time: {script_total_time:.2f} seconds")
+    if summary.lacp_successful > 0:
+        avg_time = script_total_time / summary.lacp_successful
+        logger.info(f"Average time per successful device: {avg_time:.2f} seconds")
+        logger.info(f"Processing rate: {summary.lacp_successful / script_total_time:.1f} devices per second")
+
+def probe_phase():
+    """Phase 1: Collect raw data from all devices."""
+    script_start_time = time.time()
+    
+    logger.info("=== PHASE 1: PROBE - Collecting raw data ===")
+    
+    available_devices = prepare_probe_targets()
+    if not available_devices:
         return
     
     logger.info(f"Probing {len(available_devices)} devices in parallel")
@@ -1159,53 +1295,115 @@ def probe_phase():
             completed += 1
             
             try:
-                lacp_success, lldp_success, bridge_domain_success = future.result()
-                summary.add_device_result(device_name, lacp_success, lldp_success, bridge_domain_success)
-                
-                status = []
-                if lacp_success:
-                    status.append("LACP")
-                if lldp_success:
-                    status.append("LLDP")
-                if bridge_domain_success:
-                    status.append("Bridge Domain")
-                if not status:
-                    status.append("FAILED")
-                
-                logger.info(f"Progress: {completed}/{total} - {device_name}: {'+'.join(status)}")
-                
+                record_probe_result(device_name, future.result(), completed, total)
             except Exception as e:
                 logger.error(f"Progress: {completed}/{total} - {device_name}: EXCEPTION - {e}")
                 summary.add_device_result(device_name, False, False, False, error=f"Exception: {e}")
             
-            # Log progress every 10 devices
-            if completed % 10 == 0 or completed == total:
-                logger.info(f"Progress: {completed}/{total} devices processed (LACP: {summary.lacp_successful}, LLDP: {summary.lldp_successful}, Bridge Domain: {summary.bridge_domain_successful}, Failed: {len(summary.failed_devices)})")
+            log_probe_progress(completed, total)
     
-    script_total_time = time.time() - script_start_time
-    logger.info(f"=== PROBE PHASE COMPLETE ===")
-    logger.info(f"LACP XML: {summary.lacp_successful} successful, {summary.lacp_failed} failed")
-    logger.info(f"LLDP Neighbors: {summary.lldp_successful} successful")
-    logger.info(f"Bridge Domain: {summary.bridge_domain_successful} successful")
-    logger.info(f"Total probe time: {script_total_time:.2f} seconds")
-    if summary.lacp_successful > 0:
-        avg_time = script_total_time / summary.lacp_successful
-        logger.info(f"Average time per successful device: {avg_time:.2f} seconds")
-        logger.info(f"Processing rate: {summary.lacp_successful / script_total_time:.1f} devices per second")
+    log_probe_totals(script_start_time)
+
+def get_device_site(device_config):
+    """Site used for per-site probe concurrency limits."""
+    return device_config.get('site') or device_config.get('location') or 'default'
+
+async def collect_raw_device_data_async(device_name, device_config, global_limit, site_limits, executor):
+    """Collect raw data from one device over an async session with pipelined commands."""
+    mgmt_ip, username, password, ssh_port = get_device_credentials(device_config)
+    commands = [command for _key, command, *_ in PROBE_COMMANDS]
+    
+    async with global_limit, site_limits[get_device_site(device_config)]:
+        session = await open_session(mgmt_ip, username, password, port=ssh_port, executor=executor)
+        try:
+            outputs = await session.run_commands(commands)
+        finally:
+            await session.close()
+    
+    keys = [key for key, *_ in PROBE_COMMANDS]
+    return save_raw_device_data(device_name, dict(zip(keys, outputs)))
+
+async def async_probe_phase(max_concurrency=DEFAULT_ASYNC_CONCURRENCY, site_concurrency=DEFAULT_SITE_CONCURRENCY):
+    """
+    Phase 1 (asyncio engine): probe every device concurrently.
+    
+    All devices are started at once; a global semaphore and one semaphore per
+    site bound how many sessions are open, so the fleet finishes in roughly
+    the time of the slowest device.
+    """
+    script_start_time = time.time()
+    
+    logger.info("=== PHASE 1: PROBE (asyncio) - Collecting raw data ===")
+    
+    available_devices = prepare_probe_targets()
+    if not available_devices:
+        return
+    
+    engine = "asyncssh" if ASYNCSSH_AVAILABLE else "threaded DNOSSSH fallback"
+    logger.info(f"Probing {len(available_devices)} devices concurrently via {engine} "
+                f"(max {max_concurrency} sessions, {site_concurrency} per site)")
+    
+    global_limit = asyncio.Semaphore(max_concurrency)
+    site_limits = defaultdict(lambda: asyncio.Semaphore(site_concurrency))
+    # Only used by the fallback adapter, sized so it never caps the semaphores
+    executor = None if ASYNCSSH_AVAILABLE else ThreadPoolExecutor(max_workers=max_concurrency)
+    
+    async def probe(device_name, device_config):
+        try:
+            return device_name, await collect_raw_device_data_async(
+                device_name, device_config, global_limit, site_limits, executor
+            ), None
+        except Exception as e:
+            return device_name, None, e
+    
+    try:
+        tasks = [probe(name, config) for name, config in available_devices.items()]
+        completed = 0
+        total = len(tasks)
+        
+        for next_done in asyncio.as_completed(tasks):
+            device_name, result, error = await next_done
+            completed += 1
+            
+            if error is None:
+                record_probe_result(device_name, result, completed, total)
+            else:
+                logger.error(f"Progress: {completed}/{total} - {device_name}: EXCEPTION - {error}")
+                summary.add_device_result(device_name, False, False, False, error=f"SSH connection failed: {error}")
+            
+            log_probe_progress(completed, total)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    log_probe_totals(script_start_time)
 
 def main():
     """Main function with probe and parse phases."""
     parser = argparse.ArgumentParser(description='Collect and parse device data')
     parser.add_argument('--phase', choices=['probe', 'parse', 'both'], default='both',
                        help='Which phase to run: probe (collect), parse (process), or both')
+    parser.add_argument('--full-parse', action='store_true',
+                       help='Ignore the parse cache and re-parse every raw file')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Parse phase: number of worker processes (default: 1, parse serially)')
+    parser.add_argument('--engine', choices=['threads', 'asyncio'], default='threads',
+                       help='Probe engine: thread pool (15 workers) or asyncio (all devices concurrently)')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_ASYNC_CONCURRENCY,
+                       help='asyncio engine: maximum concurrently open device sessions')
+    parser.add_argument('--site-concurrency', type=int, default=DEFAULT_SITE_CONCURRENCY,
+                       help='asyncio engine: maximum concurrently open sessions per site')
     
     args = parser.parse_args()
     
     if args.phase in ['probe', 'both']:
-        probe_phase()
+        if args.engine == 'asyncio':
+            asyncio.run(async_probe_phase(args.max_concurrency, args.site_concurrency))
+        else:
+            probe_phase()
     
     if args.phase in ['parse', 'both']:
-        parse_raw_data()
+        parse_raw_data(use_cache=not args.full_parse, workers=args.workers)
     
     # Print comprehensive summary
     summary.finish()
@@ -150,11 +150,9 @@ class SimpleInterfaceDiscovery:
             )
     
     def _execute_ssh_command(self, device_name: str, command: str) -> str:
-        """Execute SSH command using interactive shell"""
+        """Execute SSH command on a pooled interactive shell"""
         try:
-            import yaml
-            import paramiko
-            import time
+            from utils.ssh_pool import get_session_pool
             
             # Load device info
             with open('devices.yaml', 'r') as f:
@@ -172,40 +170,9 @@ class SimpleInterfaceDiscovery:
             if not all([hostname, username, password]):
                 raise Exception(f"Incomplete connection info for {device_name}")
             
-            # Connect using interactive shell
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(hostname=hostname, username=username, password=password, timeout=30)
-            
-            shell = client.invoke_shell()
-            time.sleep(2)  # Wait for prompt
-            
-            # Send command
-            shell.send(command + '\n')
-            time.sleep(3)  # Wait for command execution
-            
-            # Read output with multiple attempts to get complete data
-            output = ""
-            attempts = 0
-            max_attempts = 5
-            
-            while attempts < max_attempts:
-                if shell.recv_ready():
-                    chunk = shell.recv(8192).decode('utf-8')
-                    output += chunk
-                    
-                    # If we got data, wait a bit more for additional data
-                    if chunk:
-                        time.sleep(1)
-                        attempts = 0  # Reset attempts if we're still getting data
-                    else:
-                        attempts += 1
-                else:
-                    attempts += 1
-                    time.sleep(0.5)  # Wait before next attempt
-            
-            shell.close()
-            client.close()
+            # Borrow a pooled session and read until the device prompt returns
+            with get_session_pool().session(hostname, username, password) as ssh:
+                output = ssh.send_command_with_full_output(command)
             
             return output
             
@@ -24,19 +24,21 @@ class UniversalCommandExecutor:
     def execute_with_mode(self, device_name: str, commands: List[str], mode: ExecutionMode) -> ExecutionResult:
         """Execute commands with specified mode using proven patterns"""
         
+        result = None
         try:
             if mode == ExecutionMode.COMMIT_CHECK:
-                return self._execute_commit_check(device_name, commands)
+                result = self._execute_commit_check(device_name, commands)
             elif mode == ExecutionMode.COMMIT:
-                return self._execute_commit(device_name, commands)
+                result = self._execute_commit(device_name, commands)
             elif mode == ExecutionMode.QUERY:
-                return self._execute_query(device_name, commands)
+                result = self._execute_query(device_name, commands)
             elif mode == ExecutionMode.DRY_RUN:
-                return self._execute_dry_run(device_name, commands)
+                result = self._execute_dry_run(device_name, commands)
             elif mode == ExecutionMode.IMMEDIATE:
-                return self._execute_immediate(device_name, commands)
+                result = self._execute_immediate(device_name, commands)
             else:
                 raise CommandExecutionError(f"Unknown execution mode: {mode}")
+            return result
                 
         except Exception as e:
             logger.error(f"Command execution failed for {device_name}: {e}")
@@ -46,6 +48,11 @@ class UniversalCommandExecutor:
                 execution_mode=mode,
                 error_message=str(e)
             )
+        finally:
+            # Hand the session back to the shared pool (dead sessions are
+            # dropped there, so the next borrower reconnects; sessions left in
+            # configuration mode are rolled back and exited, or dropped)
+            self.device_manager.release_device_connection(device_name, discard=result is None)
     
     def execute_parallel(self, device_commands: Dict[str, List[str]], mode: ExecutionMode = ExecutionMode.COMMIT) -> Dict[str, ExecutionResult]:
         """Execute commands on multiple devices in parallel (interface discovery pattern)"""
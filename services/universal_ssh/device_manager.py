@@ -97,52 +97,66 @@ class UniversalDeviceManager:
             return []
     
     def get_device_connection(self, device_name: str) -> Optional[DeviceConnection]:
-        """Get managed connection to device using proven DNOSSSH approach"""
+        """Get managed connection to device borrowed from the shared DNOSSSH session pool"""
         
         try:
             # Check cache first
             if device_name in self.connection_cache:
                 connection = self.connection_cache[device_name]
-                if connection.connected:
+                if connection.connected and connection.ssh_client.is_alive():
+                    connection.last_activity = datetime.now()
                     return connection
+                self.release_device_connection(device_name, discard=True)
             
             # Get device info
             device_info = self.get_device_info(device_name)
             if not device_info:
                 raise DeviceConnectionError(f"Device {device_name} not found")
             
-            # Create connection using proven DNOSSSH
-            from utils.dnos_ssh import DNOSSSH
+            # Borrow a pooled DNOSSSH session (reconnects transparently if stale)
+            from utils.ssh_pool import get_session_pool
             
-            ssh_client = DNOSSSH(
-                hostname=device_info.mgmt_ip,
-                username=device_info.username,
-                password=device_info.password,
-                debug=True  # Enable debug for visibility
+            ssh_client = get_session_pool().acquire(
+                device_info.mgmt_ip,
+                device_info.username,
+                device_info.password,
+                port=device_info.ssh_port
             )
             
-            # Test connection
-            if ssh_client.connect():
-                connection = DeviceConnection(
-                    device_name=device_name,
-                    device_info=device_info,
-                    ssh_client=ssh_client,
-                    connected=True,
-                    connection_time=datetime.now()
-                )
-                
-                # Cache connection
-                self.connection_cache[device_name] = connection
-                
-                logger.info(f"Successfully connected to {device_name}")
-                return connection
-            else:
-                raise DeviceConnectionError(f"Failed to connect to {device_name}")
+            connection = DeviceConnection(
+                device_name=device_name,
+                device_info=device_info,
+                ssh_client=ssh_client,
+                connected=True,
+                connection_time=datetime.now()
+            )
+            
+            # Cache connection until released
+            self.connection_cache[device_name] = connection
+            
+            logger.info(f"Successfully connected to {device_name}")
+            return connection
                 
         except Exception as e:
             logger.error(f"Error getting connection to {device_name}: {e}")
             raise DeviceConnectionError(f"Connection failed: {e}")
     
+    def release_device_connection(self, device_name: str, discard: bool = False):
+        """Return a borrowed connection to the shared session pool"""
+        
+        connection = self.connection_cache.pop(device_name, None)
+        if not connection or not connection.ssh_client:
+            return
+        
+        try:
+            if discard:
+                connection.ssh_client.invalidate()
+            connection.ssh_client.close()
+        except Exception as e:
+            logger.error(f"Error releasing connection to {device_name}: {e}")
+        finally:
+            connection.connected = False
+    
     def check_device_reachability(self, device_name: str) -> bool:
         """Check if device is reachable using proven pattern"""
         
@@ -151,24 +165,18 @@ class UniversalDeviceManager:
             if not device_info:
                 return False
             
-            # Use proven reachability check from interface discovery
-            from utils.dnos_ssh import DNOSSSH
+            # A successful borrow means the device is reachable; the session
+            # stays warm in the pool for the deployment that usually follows
+            from utils.ssh_pool import get_session_pool
             
-            ssh_client = DNOSSSH(
-                hostname=device_info.mgmt_ip,
-                username=device_info.username,
-                password=device_info.password,
-                debug=False  # Disable debug for reachability check
-            )
-            
-            # Quick connection test
-            if ssh_client.connect():
-                ssh_client.disconnect()
+            with get_session_pool().session(
+                device_info.mgmt_ip,
+                device_info.username,
+                device_info.password,
+                port=device_info.ssh_port
+            ):
                 logger.debug(f"Device {device_name} is reachable")
                 return True
-            else:
-                logger.debug(f"Device {device_name} is not reachable")
-                return False
                 
         except Exception as e:
             logger.debug(f"Reachability check failed for {device_name}: {e}")
@@ -207,16 +215,11 @@ class UniversalDeviceManager:
             return {device: False for device in device_names}
     
     def disconnect_all(self):
-        """Disconnect all cached connections"""
+        """Return all cached connections to the shared session pool"""
         
-        for device_name, connection in self.connection_cache.items():
-            try:
-                if connection.connected and connection.ssh_client:
-                    connection.ssh_client.disconnect()
-                    connection.connected = False
-                    logger.debug(f"Disconnected from {device_name}")
-            except Exception as e:
-                logger.error(f"Error disconnecting from {device_name}: {e}")
+        for device_name in list(self.connection_cache):
+            self.release_device_connection(device_name)
+            logger.debug(f"Released connection to {device_name}")
         
         self.connection_cache.clear()
 
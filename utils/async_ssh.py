@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Async DNOS SSH Sessions
+
+asyncio front-end for running CLI commands on DNOS devices. Uses asyncssh
+when it is installed, so hundreds of sessions can be open at once on a single
+event loop. Without asyncssh, a fallback adapter runs the blocking pooled
+DNOSSSH sessions in a thread executor behind the same interface.
+"""
+
+import asyncio
+import codecs
+import logging
+import re
+from concurrent.futures import Executor
+from typing import List, Optional
+
+from utils.dnos_ssh import ANSI_ESCAPE, GENERIC_PROMPT, DNOSSSH
+from utils.ssh_pool import get_session_pool
+
+try:
+    import asyncssh
+    ASYNCSSH_AVAILABLE = True
+except ImportError:
+    asyncssh = None
+    ASYNCSSH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 30
+DEFAULT_COMMAND_TIMEOUT = 120
+# Characters at the end of the buffer re-scanned for a prompt after each read
+PROMPT_SCAN_WINDOW = 512
+
+
+class AsyncSSHSession:
+    """Interactive DNOS shell over asyncssh with prompt-driven, pipelined reads."""
+
+    def __init__(self, hostname: str, username: str, password: str, port: int = 22,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self._conn = None
+        self._proc = None
+        self._buffer = ""
+        self._prompt_re = GENERIC_PROMPT
+        self._prompt_split_re = GENERIC_PROMPT
+
+    async def open(self):
+        """Connect, start an interactive shell and learn the device prompt."""
+        self._conn = await asyncio.wait_for(
+            asyncssh.connect(
+                self.hostname,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                known_hosts=None
+            ),
+            timeout=self.connect_timeout
+        )
+        self._proc = await self._conn.create_process(term_type='vt100', encoding=None)
+
+        # Drain the banner, then take the echoed line after an empty command
+        await self._read_prompts(1, self.connect_timeout)
+        self._buffer = ""
+        self._proc.stdin.write(b'\n')
+        echo = await self._read_prompts(1, self.connect_timeout)
+        prompt_line = DNOSSSH._last_line(echo[0]) if echo else ""
+        match = GENERIC_PROMPT.search(prompt_line)
+        if match:
+            base = re.escape(match.group(1))
+            self._prompt_re = re.compile(r'(?:^|[\r\n])' + base + r'(\([^)\r\n]*\))?\s?[#>]\s*$')
+            self._prompt_split_re = re.compile(r'(?:^|[\r\n])' + base + r'(\([^)\r\n]*\))?\s?[#>] ?')
+        else:
+            logger.warning(f"Could not detect prompt on {self.hostname}, using generic prompt matching")
+
+    async def _read_prompts(self, count: int, timeout: float) -> List[str]:
+        """
+        Read until the prompt has been seen ``count`` times.
+
+        With pipelined commands the device prints the prompt followed by the
+        echo of the next command on the same line, so every occurrence except
+        the last is matched unanchored.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        outputs = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        scan_from = 0
+        carry = ""
+
+        while len(outputs) < count:
+            pattern = self._prompt_split_re if len(outputs) < count - 1 else self._prompt_re
+            match = pattern.search(self._buffer, scan_from)
+            if match:
+                outputs.append(self._buffer[:match.end()])
+                self._buffer = self._buffer[match.end():]
+                scan_from = 0
+                continue
+            # Only the tail can hold a prompt that was not there before
+            scan_from = max(0, len(self._buffer) - PROMPT_SCAN_WINDOW)
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                data = await asyncio.wait_for(self._proc.stdout.read(65535), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if not data:
+                break
+
+            text = carry + decoder.decode(data)
+            # Hold back an escape sequence split across reads
+            escape_at = text.rfind('\x1b')
+            if escape_at != -1 and len(text) - escape_at < 16 and not ANSI_ESCAPE.match(text, escape_at):
+                text, carry = text[:escape_at], text[escape_at:]
+            else:
+                carry = ""
+            self._buffer += ANSI_ESCAPE.sub('', text)
+
+        return outputs
+
+    async def run_commands(self, commands: List[str], timeout: float = DEFAULT_COMMAND_TIMEOUT,
+                           pipeline: bool = True) -> List[str]:
+        """
+        Run commands and return their outputs in order.
+
+        With ``pipeline`` all commands are written at once and the outputs are
+        split on the prompt; anything the device did not answer is re-run one
+        command at a time.
+        """
+        outputs: List[str] = []
+        if pipeline and self._prompt_split_re is not GENERIC_PROMPT:
+            self._buffer = ""
+            self._proc.stdin.write(''.join(f"{command}\n" for command in commands).encode())
+            outputs = await self._read_prompts(len(commands), timeout)
+
+        for command in commands[len(outputs):]:
+            self._buffer = ""
+            self._proc.stdin.write(f"{command}\n".encode())
+            result = await self._read_prompts(1, timeout)
+            outputs.append(result[0] if result else self._buffer)
+        return outputs
+
+    async def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            try:
+                await self._conn.wait_closed()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class ThreadedSSHSession:
+    """Fallback adapter running a pooled blocking DNOSSSH session in an executor."""
+
+    def __init__(self, hostname: str, username: str, password: str, port: int = 22,
+                 executor: Optional[Executor] = None):
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.port = port
+        self.executor = executor
+        self._lease = None
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._lease = await loop.run_in_executor(
+            self.executor,
+            lambda: get_session_pool().acquire(self.hostname, self.username, self.password, port=self.port)
+        )
+
+    async def run_commands(self, commands: List[str], timeout: float = DEFAULT_COMMAND_TIMEOUT,
+                           pipeline: bool = True) -> List[str]:
+        loop = asyncio.get_running_loop()
+        lease = self._lease
+
+        def run():
+            try:
+                return [lease.send_command_with_full_output(command, timeout=timeout) for command in commands]
+            except Exception:
+                lease.invalidate()
+                raise
+
+        return await loop.run_in_executor(self.executor, run)
+
+    async def close(self):
+        if self._lease is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self._lease.close)
+            self._lease = None
+
+
+async def open_session(hostname: str, username: str, password: str, port: int = 22,
+                       executor: Optional[Executor] = None, use_asyncssh: Optional[bool] = None):
+    """
+    Open an async CLI session to a DNOS device.
+
+    Args:
+        hostname: Device hostname or management IP
+        username: SSH username
+        password: SSH password
+        port: SSH port (default: 22)
+        executor: Executor for the threaded fallback adapter
+        use_asyncssh: Force (True) or disable (False) asyncssh; default: use it if installed
+
+    Returns:
+        AsyncSSHSession or ThreadedSSHSession, already connected
+    """
+    if use_asyncssh is None:
+        use_asyncssh = ASYNCSSH_AVAILABLE
+    if use_asyncssh and not ASYNCSSH_AVAILABLE:
+        raise ImportError("asyncssh is not installed")
+
+    if use_asyncssh:
+        session = AsyncSSHSession(hostname, username, password, port=port)
+    else:
+        session = ThreadedSSHSession(hostname, username, password, port=port, executor=executor)
+
+    try:
+        await session.open()
+    except BaseException:
+        await session.close()
+        raise
+    return session
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Conditional and Compressed JSON Responses
+
+Response layer for heavy, frequently polled read endpoints:
+
+- Strong ETags derived from a data version (e.g. the stat of the SQLite
+  database file, or of the mapping file) instead of a hash of the body, so a
+  request whose If-None-Match still matches is answered with 304 before the
+  view runs.
+- gzip (or brotli, when installed) compression of large bodies.
+- Fast JSON serialization with orjson, falling back to the standard library.
+"""
+
+import dataclasses
+import decimal
+import gzip
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+from flask import Response, make_response, request
+from werkzeug.http import http_date
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JSON_MIMETYPE = 'application/json'
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESS_MIN_SIZE', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _json_default(o: Any) -> Any:
+    """Same conversions as Flask's default JSON provider, so output matches jsonify()"""
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to compact, key-sorted UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson rejects some values json accepts (e.g. integers above 64 bits)
+            pass
+    return json.dumps(data, default=_json_default, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def json_response(data: Any, status: int = 200) -> Response:
+    """Drop-in replacement for jsonify() using the fast encoder"""
+    return Response(dumps_json(data), status=status, mimetype=JSON_MIMETYPE)
+
+
+def file_version(*paths: str) -> Tuple:
+    """(mtime_ns, size, inode) of each path; None for a missing file"""
+    version = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            version.append(None)
+            continue
+        version.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(version)
+
+
+def sqlite_data_version(db_path: str) -> Tuple:
+    """
+    Version of a SQLite database that changes on every committed write.
+
+    Rollback-journal commits rewrite the database file; WAL commits append to
+    the -wal file and checkpoints rewrite the database file, so the stat of
+    both covers either journal mode.
+    """
+    return file_version(db_path, f"{db_path}-wal")
+
+
+def choose_encoding() -> Optional[str]:
+    """Best content coding the client accepts: 'br', 'gzip' or None"""
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted.quality('br') > 0:
+        return 'br'
+    if accepted.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def make_etag(version: Any) -> str:
+    """Strong ETag of the identity representation of the request URL at the given data version"""
+    return hashlib.blake2b(repr((request.path, request.query_string, version)).encode('utf-8'),
+                           digest_size=16).hexdigest()
+
+
+def _set_cache_headers(response: Response, etag: str):
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.vary.add('Authorization')
+    # Clients may keep the body but must revalidate it on every use
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+
+def conditional_json(version_func: Callable[..., Any]):
+    """
+    Add ETag revalidation and compression to a read-only JSON view.
+
+    version_func is called with the view's arguments and must return a value
+    (anything with a stable repr) that changes whenever the response for the
+    request URL could change, e.g. (current_user.id, sqlite_data_version(path)).
+    Apply it below any authentication decorator so unauthenticated requests
+    never get a 304.
+
+    Only 200 responses get an ETag and are compressed; error responses pass
+    through unchanged. Each content coding is a separate representation, so a
+    compressed body is tagged '<tag>-<coding>'.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            encoding = choose_encoding()
+            try:
+                # Read the version before the view runs: a write that lands
+                # while the body is built makes this tag stale, never too new
+                etag = make_etag(version_func(*args, **kwargs))
+            except Exception as e:
+                logger.warning(f"Could not compute data version for {request.path}: {e}")
+                etag = None
+
+            if etag is not None:
+                # Bodies under COMPRESS_MIN_SIZE are sent as identity even when
+                # the client accepts a coding, so either tag may come back
+                candidates = [etag] + ([f"{etag}-{encoding}"] if encoding else [])
+                matched = next((tag for tag in candidates if request.if_none_match.contains_weak(tag)), None)
+                if matched:
+                    not_modified = Response(status=304)
+                    _set_cache_headers(not_modified, matched)
+                    return not_modified
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+                return response
+
+            if encoding and 'Content-Encoding' not in response.headers:
+                body = response.get_data()
+                if len(body) >= COMPRESS_MIN_SIZE:
+                    response.set_data(compress_body(body, encoding))
+                    response.headers['Content-Encoding'] = encoding
+                    if etag is not None:
+                        etag = f"{etag}-{encoding}"
+            if etag is not None:
+                _set_cache_headers(response, etag)
+            return response
+        return decorated
+    return decorator
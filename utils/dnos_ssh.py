@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
 
 import paramiko
+import codecs
+import re
+import socket
 import time
 import logging
-from typing import Optional, List, Union
+from typing import Iterator, Optional, List, Union
 import sys
 
+# Generic DNOS/CLI prompt: "HOST#", "HOST>", "HOST(cfg)#", "HOST(cfg-protocols)#"
+GENERIC_PROMPT = re.compile(r'(?:^|[\r\n])([\w\-.:/@]+)(\([^)\r\n]*\))?\s?[#>]\s*$')
+PAGER_PROMPT = re.compile(r'(?:-- ?More ?--|--More--|Press q to quit)[^\r\n]*$')
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;?]*[a-zA-Z]')
+
+# Upper bound on buffered command output (bytes of decoded text)
+DEFAULT_MAX_OUTPUT = 64 * 1024 * 1024
+# How long a single recv() may block before the deadline is re-checked
+POLL_INTERVAL = 0.05
+
 class DNOSSSH:
     """A class to handle SSH connections to DNOS devices with proper timing and debugging."""
     
-    def __init__(self, hostname: str, username: str, password: str, port: int = 22, debug: bool = False):
+    def __init__(self, hostname: str, username: str, password: str, port: int = 22, debug: bool = False,
+                 key_filename: Optional[str] = None):
         """
         Initialize the DNOS SSH connection.
         
@@ -19,13 +33,19 @@ class DNOSSSH:
             password: SSH password
             port: SSH port (default: 22)
             debug: Enable debug logging (default: False)
+            key_filename: Optional private key file for authentication
         """
         self.hostname = hostname
         self.username = username
         self.password = password
         self.port = port
+        self.key_filename = key_filename
         self.ssh = None
         self.shell = None
+        self.prompt = None
+        self._prompt_re = None
+        # Set once 'configure' is sent; cleared by reset_cli_state()
+        self.config_mode_entered = False
         
         # Configure logging
         self.logger = logging.getLogger(f'DNOSSSH_{hostname}')
@@ -35,10 +55,13 @@ class DNOSSSH:
             handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
             self.logger.addHandler(handler)
     
-    def connect(self) -> bool:
+    def connect(self, timeout: Optional[float] = None) -> bool:
         """
         Establish SSH connection to the DNOS device.
         
+        Args:
+            timeout: TCP connect timeout in seconds (default: no timeout)
+        
         Returns:
             bool: True if connection is successful, False otherwise
         """
@@ -52,15 +75,17 @@ class DNOSSSH:
                 port=self.port,
                 username=self.username,
                 password=self.password,
+                key_filename=self.key_filename,
                 look_for_keys=False,
-                allow_agent=False
+                allow_agent=False,
+                timeout=timeout
             )
             
             self.shell = self.ssh.invoke_shell()
-            time.sleep(2)  # Wait for shell to be ready
+            self.shell.settimeout(POLL_INTERVAL)
             
-            # Clear any initial output
-            self._clear_buffer()
+            # Wait for the login banner to finish and learn the real prompt
+            self._detect_prompt()
             
             self.logger.info("Successfully connected to device")
             return True
@@ -75,9 +100,24 @@ class DNOSSSH:
             self.ssh.close()
             self.logger.info("Connection closed")
     
+    def is_alive(self) -> bool:
+        """
+        Check whether the transport and interactive shell are still usable.
+        
+        Returns:
+            bool: True if the session can accept further commands
+        """
+        if not self.ssh or not self.shell:
+            return False
+        try:
+            transport = self.ssh.get_transport()
+            return bool(transport and transport.is_active() and not self.shell.closed)
+        except Exception:
+            return False
+    
     def _clear_buffer(self):
-        """Clear the shell buffer."""
-        if self.shell.recv_ready():
+        """Drain anything left in the shell buffer."""
+        while self.shell.recv_ready():
             self.shell.recv(65535)
     
     def _read_channel(self) -> str:
@@ -99,6 +139,128 @@ class DNOSSSH:
                 return ""
         return ""
     
+    def _detect_prompt(self, timeout: float = 15):
+        """
+        Learn the device prompt after login.
+        
+        Drains the login banner, then sends an empty line and takes the line
+        the device echoes back as the prompt. Banner text that merely happens
+        to end in '#' or '>' is therefore never mistaken for the prompt.
+        """
+        "".join(self.stream_until_prompt(timeout=timeout, prompt=GENERIC_PROMPT))
+        
+        self.shell.send('\n')
+        echo = "".join(self.stream_until_prompt(timeout=timeout, prompt=GENERIC_PROMPT))
+        prompt_line = self._last_line(echo)
+        
+        if prompt_line and GENERIC_PROMPT.search(prompt_line):
+            self._set_prompt(prompt_line)
+        else:
+            self.logger.warning("Could not detect device prompt, using generic prompt matching")
+    
+    def _set_prompt(self, prompt_line: str):
+        """Build the prompt matcher from the detected prompt line."""
+        match = GENERIC_PROMPT.search(prompt_line)
+        base = match.group(1) if match else prompt_line.rstrip('#> ')
+        self.prompt = prompt_line.strip()
+        # Allow config-mode suffixes such as "(cfg)" or "(cfg-protocols)"
+        self._prompt_re = re.compile(
+            r'(?:^|[\r\n])' + re.escape(base) + r'(\([^)\r\n]*\))?\s?[#>]\s*$'
+        )
+        self.logger.debug(f"Detected prompt: {self.prompt}")
+    
+    @staticmethod
+    def _last_line(output: str) -> str:
+        clean = ANSI_ESCAPE.sub('', output).replace('\r', '\n').rstrip()
+        return clean.rsplit('\n', 1)[-1].strip() if clean else ""
+    
+    def stream_until_prompt(self, timeout: float = 120, prompt: Optional[re.Pattern] = None,
+                            max_output: int = DEFAULT_MAX_OUTPUT, stop_marker: Optional[str] = None,
+                            page: bool = True) -> Iterator[str]:
+        """
+        Yield output chunks as they arrive until the prompt returns.
+        
+        Args:
+            timeout: Maximum time to wait for the prompt
+            prompt: Compiled prompt pattern (default: the detected device prompt)
+            max_output: Stop yielding (but keep draining) after this many characters
+            stop_marker: Optional string that also ends the read (e.g. '</config>')
+            page: Continue through '-- More --' pagers by sending a space
+            
+        Yields:
+            str: Decoded output chunks
+        """
+        if not self.shell:
+            raise Exception("Not connected to device")
+        
+        prompt = prompt or self._prompt_re or GENERIC_PROMPT
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        tail = ""
+        tail_size = 512
+        total = 0
+        truncated = False
+        deadline = time.monotonic() + timeout
+        
+        while time.monotonic() < deadline:
+            try:
+                data = self.shell.recv(65535)
+            except socket.timeout:
+                continue
+            if not data:
+                # Channel closed by the device
+                break
+            
+            chunk = decoder.decode(data)
+            if not chunk:
+                continue
+            tail = (tail + chunk)[-tail_size:]
+            
+            if not truncated:
+                if total + len(chunk) > max_output:
+                    self.logger.warning(f"Output exceeded {max_output} characters, truncating")
+                    chunk = chunk[:max_output - total]
+                    truncated = True
+                total += len(chunk)
+                if chunk:
+                    yield chunk
+            
+            clean_tail = ANSI_ESCAPE.sub('', tail)
+            if page and PAGER_PROMPT.search(clean_tail):
+                self.shell.send(' ')
+                tail = ""
+                continue
+            if stop_marker and stop_marker in clean_tail:
+                break
+            if prompt.search(clean_tail):
+                break
+        else:
+            self.logger.warning(f"Timeout after {timeout}s waiting for prompt")
+    
+    def stream_command(self, command: str, timeout: float = 120, **kwargs) -> Iterator[str]:
+        """
+        Send a command and yield its output while it is still arriving.
+        
+        Large outputs such as 'show config | display-xml' can be processed
+        incrementally instead of being buffered in full.
+        
+        Args:
+            command: Command to send
+            timeout: Maximum time to wait for the prompt to return
+            **kwargs: Passed through to stream_until_prompt()
+            
+        Yields:
+            str: Decoded output chunks
+        """
+        if not self.shell:
+            raise Exception("Not connected to device")
+        
+        self._clear_buffer()
+        self.logger.debug(f"Sending command: {command}")
+        if command.strip().lower().startswith('conf'):
+            self.config_mode_entered = True
+        self.shell.send(command + '\n')
+        yield from self.stream_until_prompt(timeout=timeout, **kwargs)
+    
     def _wait_for_prompt(self, timeout: int = 30) -> bool:
         """
         Wait for the command prompt to appear.
@@ -109,38 +271,58 @@ class DNOSSSH:
         Returns:
             bool: True if prompt is found, False if timeout
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.shell.recv_ready():
-                output = self.shell.recv(65535).decode('utf-8')
-                if '>' in output or '#' in output:
-                    return True
-            time.sleep(0.1)
-        return False
+        prompt = self._prompt_re or GENERIC_PROMPT
+        output = "".join(self.stream_until_prompt(timeout=timeout))
+        return bool(prompt.search(ANSI_ESCAPE.sub('', output)[-512:]))
+    
+    def current_prompt(self, timeout: float = 15) -> str:
+        """Send an empty line and return the prompt line the device answers with."""
+        return self._last_line(self.send_command('', timeout=timeout))
+    
+    @staticmethod
+    def is_config_prompt(prompt_line: str) -> bool:
+        """True for configuration-mode prompts such as "HOST(cfg)#" or "HOST(cfg-protocols)#"."""
+        match = GENERIC_PROMPT.search(prompt_line)
+        return bool(match and match.group(2))
     
-    def send_command(self, command: str, wait_time: float = 1.0) -> str:
+    def reset_cli_state(self, timeout: float = 15, max_exits: int = 5) -> bool:
+        """
+        Leave configuration mode, discarding any uncommitted candidate changes.
+        
+        Used before a session is reused by another caller. 'rollback 0' drops
+        the candidate configuration, so the following 'exit's never ask to
+        commit.
+        
+        Returns:
+            bool: True if the session is back at the operational prompt
+        """
+        prompt_line = self.current_prompt(timeout=timeout)
+        if self.is_config_prompt(prompt_line):
+            self.send_command('rollback 0', timeout=timeout)
+            for _ in range(max_exits):
+                prompt_line = self._last_line(self.send_command('exit', timeout=timeout))
+                if not self.is_config_prompt(prompt_line):
+                    break
+        if not prompt_line or self.is_config_prompt(prompt_line) or not GENERIC_PROMPT.search(prompt_line):
+            self.logger.warning(f"Could not return to the operational prompt (last prompt: {prompt_line!r})")
+            return False
+        self.config_mode_entered = False
+        return True
+    
+    def send_command(self, command: str, wait_time: float = 1.0, timeout: float = 30) -> str:
         """
         Send a command and wait for the response.
         
         Args:
             command: Command to send
-            wait_time: Time to wait after sending command
+            wait_time: Deprecated; output is now read until the prompt returns
+            timeout: Maximum time to wait for the prompt
             
         Returns:
             str: Command output
         """
-        if not self.shell:
-            raise Exception("Not connected to device")
-        
-        self.logger.debug(f"Sending command: {command}")
-        self.shell.send(command + '\n')
-        time.sleep(wait_time)
-        
-        output = ""
-        if self.shell.recv_ready():
-            output = self.shell.recv(65535).decode('utf-8')
-            self.logger.debug(f"Received output: {output}")
-        
+        output = "".join(self.stream_command(command, timeout=timeout))
+        self.logger.debug(f"Received output: {output}")
         return output
     
     def send_command_with_full_output(self, command: str, timeout: int = 120) -> str:
@@ -154,36 +336,15 @@ class DNOSSSH:
         Returns:
             str: Complete command output
         """
-        if not self.shell:
-            raise Exception("Not connected to device")
-        
         self.logger.debug(f"Sending command with full output: {command}")
-        self.shell.send(command + '\n')
-        
-        output = ""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            chunk = self._read_channel()
-            if chunk:
-                output += chunk
-                # Check if we've reached the prompt (device-specific)
-                if '#' in chunk or '>' in chunk:
-                    # Give a little more time for any final output
-                    time.sleep(0.5)
-                    final_chunk = self._read_channel()
-                    if final_chunk:
-                        output += final_chunk
-                    break
-            time.sleep(0.1)
-        
+        output = "".join(self.stream_command(command, timeout=timeout))
         self.logger.debug(f"Received {len(output)} characters of output")
         return output
     
     def collect_xml_config(self, timeout: int = 180) -> str:
         """
         Collect complete XML configuration from the device.
-        Reads until the </config> tag is found or timeout is reached.
+        Reads until the </config> tag or the prompt is found, or timeout is reached.
         
         Args:
             timeout: Maximum time to wait for complete XML
@@ -191,27 +352,16 @@ class DNOSSSH:
         Returns:
             str: Complete XML configuration
         """
-        if not self.shell:
-            raise Exception("Not connected to device")
-        
         command = 'show config | display-xml | no-more'
         self.logger.info(f"Collecting XML config from {self.hostname}")
-        self.shell.send(command + '\n')
         
-        output = ""
-        start_time = time.time()
         closing_tag = '</config>'
+        output = "".join(self.stream_command(command, timeout=timeout, stop_marker=closing_tag))
         
-        while time.time() - start_time < timeout:
-            chunk = self._read_channel()
-            if chunk:
-                output += chunk
-                if closing_tag in output:
-                    self.logger.info("Found closing </config> tag, XML collection complete.")
-                    break
-            time.sleep(0.1)
+        if closing_tag in output:
+            self.logger.info("Found closing </config> tag, XML collection complete.")
         else:
-            self.logger.warning("Timeout reached before </config> tag was found.")
+            self.logger.warning("Prompt or timeout reached before </config> tag was found.")
         
         self.logger.debug(f"Total XML output length: {len(output)}")
         return output
@@ -227,19 +377,14 @@ class DNOSSSH:
         Returns:
             bool: True if configuration was successful
         """
-        def read_all_output(shell, wait=0.5, max_reads=10):
-            output = ""
-            for _ in range(max_reads):
-                time.sleep(wait)
-                while self.shell.recv_ready():
-                    output += self.shell.recv(65535).decode('utf-8')
-            return output
+        # Commits can take a while on large configs; every read below returns
+        # as soon as the (cfg) or operational prompt comes back
+        commit_timeout = 120
         try:
             # Enter configuration mode
             output = self.send_command('configure')
             self.logger.debug(f"Output after 'configure': {output}")
             print(f"Output after 'configure':\n{output}")
-            time.sleep(1)
             
             # Convert single command to list
             if isinstance(commands, str):
@@ -250,13 +395,11 @@ class DNOSSSH:
                 output = self.send_command(cmd)
                 self.logger.debug(f"Output after '{cmd}': {output}")
                 print(f"Output after '{cmd}':\n{output}")
-                time.sleep(0.5)
             
             # Commit if requested
             commit_success = False
             if commit:
-                commit_output = self.send_command('commit and-exit')
-                commit_output += read_all_output(self.shell, wait=0.5, max_reads=10)
+                commit_output = self.send_command('commit and-exit', timeout=commit_timeout)
                 self.logger.debug(f"Output after 'commit and-exit': {commit_output}")
                 print(f"Output after 'commit and-exit':\n{commit_output}")
                 if 'error' not in commit_output.lower() and ('commit' in commit_output.lower() or 'completed' in commit_output.lower() or 'exit' in commit_output.lower()):
@@ -264,22 +407,18 @@ class DNOSSSH:
                 else:
                     # Try commit then exit separately
                     print("Trying separate 'commit' and 'exit'...")
-                    commit_output = self.send_command('commit')
-                    commit_output += read_all_output(self.shell, wait=0.5, max_reads=10)
+                    commit_output = self.send_command('commit', timeout=commit_timeout)
                     self.logger.debug(f"Output after 'commit': {commit_output}")
                     print(f"Output after 'commit':\n{commit_output}")
                     exit_output = self.send_command('exit')
-                    exit_output += read_all_output(self.shell, wait=0.5, max_reads=10)
                     self.logger.debug(f"Output after 'exit': {exit_output}")
                     print(f"Output after 'exit':\n{exit_output}")
                     if 'error' not in commit_output.lower() and ('commit' in commit_output.lower() or 'completed' in commit_output.lower() or 'exit' in exit_output.lower()):
                         commit_success = True
             else:
                 exit_output = self.send_command('exit')
-                exit_output += read_all_output(self.shell, wait=0.5, max_reads=10)
                 self.logger.debug(f"Output after 'exit': {exit_output}")
                 print(f"Output after 'exit':\n{exit_output}")
-                time.sleep(1)
                 commit_success = True
             
             return commit_success
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Parsed Data Store
+
+Single-file snapshot of everything the parse phase produces (bridge-domain
+instances, VLAN configurations, LLDP neighbors and LACP bundles), written
+next to the per-device YAML files. Each device's items are stored as one
+compact JSON blob and located through an offset index, so readers mmap the
+file and decode only the devices and sections they need instead of running
+yaml.safe_load over hundreds of timestamped files.
+
+File layout (little-endian):
+
+    header  : magic b'DNPS' | u16 version | u16 reserved | u64 index_offset | u64 index_length
+    payload : JSON blobs grouped by section, devices sorted by name
+    index   : JSON {'created': str, 'sections': {section: {device: [offset, length, count, timestamp, source]}}}
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STORE_MAGIC = b'DNPS'
+STORE_VERSION = 1
+HEADER_FORMAT = '<4sHHQQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+DEFAULT_STORE_PATH = Path('topology/configs/parsed_data/parsed_data.pds')
+
+# Sections written by the parse phase (named after the YAML output keys)
+SECTION_BUNDLES = 'bundles'
+SECTION_NEIGHBORS = 'neighbors'
+SECTION_BRIDGE_DOMAINS = 'bridge_domain_instances'
+SECTION_VLAN_CONFIGS = 'vlan_configurations'
+
+
+def _dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _loads(data) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+class ParsedDataStoreWriter:
+    """Collects per-device parse results and writes them as one store file."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict[str, tuple]] = {}
+
+    def add(self, section: str, device_name: str, items: List[Dict[str, Any]],
+            timestamp: Optional[str] = None, source: Optional[str] = None):
+        """Add a device's parsed items to a section."""
+        self.add_raw(section, device_name, _dumps(items), len(items), timestamp, source)
+
+    def add_raw(self, section: str, device_name: str, blob: bytes, count: int,
+                timestamp: Optional[str] = None, source: Optional[str] = None):
+        """Add an already encoded blob, e.g. copied unchanged from a previous store."""
+        self._entries.setdefault(section, {})[device_name] = (bytes(blob), count, timestamp, source)
+
+    def __len__(self) -> int:
+        return sum(len(devices) for devices in self._entries.values())
+
+    def write(self) -> Path:
+        """Write the store atomically and return its path."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        index = {'created': datetime.now().isoformat(), 'sections': {}}
+
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * HEADER_SIZE)
+            offset = HEADER_SIZE
+            for section in sorted(self._entries):
+                section_index = index['sections'][section] = {}
+                for device_name in sorted(self._entries[section]):
+                    blob, count, timestamp, source = self._entries[section][device_name]
+                    f.write(blob)
+                    section_index[device_name] = [offset, len(blob), count, timestamp, source]
+                    offset += len(blob)
+
+            index_blob = _dumps(index)
+            f.write(index_blob)
+            f.seek(0)
+            f.write(struct.pack(HEADER_FORMAT, STORE_MAGIC, STORE_VERSION, 0, offset, len(index_blob)))
+
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+class ParsedDataStore:
+    """Read-only, memory-mapped view of a parsed data store file."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, index_offset, index_length = struct.unpack_from(HEADER_FORMAT, self._mm, 0)
+            if magic != STORE_MAGIC or version != STORE_VERSION:
+                raise ValueError(f"not a version {STORE_VERSION} parsed data store")
+            index = _loads(self._mm[index_offset:index_offset + index_length])
+        except Exception:
+            self.close()
+            raise
+
+        self.created: Optional[str] = index.get('created')
+        self._sections: Dict[str, Dict[str, list]] = index.get('sections', {})
+
+    @classmethod
+    def open(cls, path: Path = DEFAULT_STORE_PATH) -> Optional['ParsedDataStore']:
+        """Open the store, or return None if it is missing or unreadable."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parsed data store {path}: {e}")
+            return None
+
+    def sections(self) -> List[str]:
+        return list(self._sections)
+
+    def devices(self, section: str) -> List[str]:
+        """Devices with data in a section, sorted by name."""
+        return list(self._sections.get(section, {}))
+
+    def has(self, section: str, device_name: str) -> bool:
+        return device_name in self._sections.get(section, {})
+
+    def entry(self, section: str, device_name: str) -> Optional[Dict[str, Any]]:
+        """Index metadata (count, timestamp, source file) for a device."""
+        record = self._sections.get(section, {}).get(device_name)
+        if record is None:
+            return None
+        offset, length, count, timestamp, source = record
+        return {'count': count, 'timestamp': timestamp, 'source': source}
+
+    def get_raw(self, section: str, device_name: str) -> Optional[bytes]:
+        """Encoded blob for a device, without decoding it."""
+        record = self._sections.get(section, {}).get(device_name)
+        if record is None:
+            return None
+        offset, length = record[0], record[1]
+        return self._mm[offset:offset + length]
+
+    def get(self, section: str, device_name: str, default: Any = None) -> Any:
+        """Decoded items for a device."""
+        blob = self.get_raw(section, device_name)
+        if blob is None:
+            return default
+        return _loads(blob)
+
+    def close(self):
+        mm = getattr(self, '_mm', None)
+        if mm is not None:
+            mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'ParsedDataStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
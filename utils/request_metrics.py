@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Request Metrics
+
+Fixed-memory request latency histograms per (method, endpoint, status class)
+with p50/p95/p99 estimates and Prometheus text exposition.
+
+Latencies fall into log-spaced buckets (four per doubling, 0.1 ms to ~7 min),
+so quantile estimates are within about 10% of the true value and every series
+uses the same small, fixed amount of memory. Each thread records into its own
+shard without taking a lock; shards are merged when metrics are read.
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+HISTOGRAM_BASE = 0.0001          # Upper bound of the first bucket, in seconds
+HISTOGRAM_GROWTH = 2 ** 0.25     # Four buckets per doubling
+HISTOGRAM_BUCKETS = 89           # Last bound: 0.0001 * 2**22 s (~7 min); larger values overflow
+BUCKET_BOUNDS = [HISTOGRAM_BASE * HISTOGRAM_GROWTH ** i for i in range(HISTOGRAM_BUCKETS)]
+# Prometheus buckets: every doubling (0.1 ms, 0.2 ms, 0.4 ms, ...)
+EXPORT_BUCKETS = list(range(0, HISTOGRAM_BUCKETS, 4))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Shards of exited threads are folded into the retired totals once this many
+# shards exist (and again each time the live count doubles), so a server that
+# starts a thread per request keeps a bounded number of shards between scrapes
+SHARD_RETIRE_THRESHOLD = 64
+
+SeriesKey = Tuple[str, str, str]  # (method, endpoint, status class)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (seconds)"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (HISTOGRAM_BUCKETS + 1)  # last slot: overflow
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile, interpolated geometrically inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if not n:
+                continue
+            if cumulative + n >= rank:
+                lower = BUCKET_BOUNDS[i - 1] if i > 0 else self.min
+                upper = BUCKET_BOUNDS[i] if i < HISTOGRAM_BUCKETS else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                fraction = (rank - cumulative) / n
+                if lower <= 0 or upper <= lower:
+                    value = lower + (upper - lower) * fraction
+                else:
+                    value = lower * (upper / lower) ** fraction
+                return min(max(value, self.min), self.max)
+            cumulative += n
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class SeriesStats:
+    """Counters and latency histogram of one (method, endpoint, status class) series"""
+
+    __slots__ = ('requests', 'errors', 'last_request', 'latency')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.last_request = 0.0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other: 'SeriesStats'):
+        self.requests += other.requests
+        self.errors += other.errors
+        self.last_request = max(self.last_request, other.last_request)
+        self.latency.merge(other.latency)
+
+
+class _Shard:
+    """Metrics written by a single thread"""
+
+    __slots__ = ('owner', 'generation', 'series', 'status_codes', 'users')
+
+    def __init__(self, owner, generation: int):
+        self.owner = weakref.ref(owner) if owner is not None else None
+        self.generation = generation
+        self.series: Dict[SeriesKey, SeriesStats] = {}
+        self.status_codes: Dict[int, int] = defaultdict(int)
+        self.users: Dict[Any, List] = {}  # user id -> [requests, errors, last_request]
+
+    def merge_into(self, series, status_codes, users):
+        for key, stats in list(self.series.items()):
+            merged = series.get(key)
+            if merged is None:
+                merged = series[key] = SeriesStats()
+            merged.merge(stats)
+        for code, n in list(self.status_codes.items()):
+            status_codes[code] += n
+        for user_id, (requests, errors, last) in list(self.users.items()):
+            merged = users.setdefault(user_id, [0, 0, 0.0])
+            merged[0] += requests
+            merged[1] += errors
+            merged[2] = max(merged[2], last)
+
+
+def status_class(status_code: Optional[int]) -> str:
+    return f"{status_code // 100}xx" if status_code else "unknown"
+
+
+class RequestMetrics:
+    """
+    Process-wide request metrics.
+
+    observe() touches only the calling thread's shard. Readers (snapshot,
+    endpoint_summary, render_prometheus) merge all shards. Shards of threads
+    that have exited are folded into a retired shard on every read and
+    whenever new shards pass SHARD_RETIRE_THRESHOLD, so they do not pile up
+    even when metrics are never read.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[_Shard] = []
+        self._retired = _Shard(None, 0)
+        self._generation = 0
+        self._retire_at = SHARD_RETIRE_THRESHOLD
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None or shard.generation != self._generation:
+            shard = _Shard(threading.current_thread(), self._generation)
+            with self._lock:
+                self._shards.append(shard)
+                if len(self._shards) >= self._retire_at:
+                    self._retire_dead_shards()
+            self._local.shard = shard
+        return shard
+
+    def _retire_dead_shards(self):
+        """Fold shards of exited threads into the retired shard; caller holds self._lock"""
+        live = []
+        for shard in self._shards:
+            if shard.generation != self._generation:
+                continue
+            owner = shard.owner() if shard.owner is not None else None
+            if owner is None or not owner.is_alive():
+                # The owning thread is gone, so nothing writes to this shard any more
+                shard.merge_into(self._retired.series, self._retired.status_codes, self._retired.users)
+            else:
+                live.append(shard)
+        self._shards = live
+        # Amortized: with many long-lived threads, retire again only once the count doubles
+        self._retire_at = max(SHARD_RETIRE_THRESHOLD, 2 * len(live))
+
+    def observe(self, method: str, endpoint: str, status_code: Optional[int], duration: Optional[float],
+                user_id: Any = None, error: bool = False):
+        """Record one request; duration in seconds"""
+        shard = self._shard()
+        key = (method, endpoint or 'unknown', status_class(status_code))
+        stats = shard.series.get(key)
+        if stats is None:
+            stats = shard.series[key] = SeriesStats()
+        now = time.time()
+        failed = error or bool(status_code and status_code >= 400)
+        stats.requests += 1
+        stats.last_request = now
+        if failed:
+            stats.errors += 1
+        if duration is not None:
+            stats.latency.observe(duration)
+        if status_code:
+            shard.status_codes[status_code] += 1
+        if user_id:
+            user = shard.users.get(user_id)
+            if user is None:
+                user = shard.users[user_id] = [0, 0, 0.0]
+            user[0] += 1
+            if failed:
+                user[1] += 1
+            user[2] = now
+
+    def snapshot(self) -> Tuple[Dict[SeriesKey, SeriesStats], Dict[int, int], Dict[Any, List]]:
+        """Merged (series, status_codes, users) across all threads"""
+        series: Dict[SeriesKey, SeriesStats] = {}
+        status_codes: Dict[int, int] = defaultdict(int)
+        users: Dict[Any, List] = {}
+        with self._lock:
+            self._retire_dead_shards()
+            live = list(self._shards)
+            self._retired.merge_into(series, status_codes, users)
+        for shard in live:
+            shard.merge_into(series, status_codes, users)
+        return series, status_codes, users
+
+    def endpoint_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per "METHOD endpoint" totals with avg/min/max and p50/p95/p99 (seconds)"""
+        series, _, _ = self.snapshot()
+        endpoints: Dict[str, SeriesStats] = {}
+        for (method, endpoint, _), stats in series.items():
+            merged = endpoints.get(f"{method} {endpoint}")
+            if merged is None:
+                merged = endpoints[f"{method} {endpoint}"] = SeriesStats()
+            merged.merge(stats)
+        return {key: self._describe(stats) for key, stats in endpoints.items()}
+
+    @staticmethod
+    def _describe(stats: SeriesStats) -> Dict[str, Any]:
+        latency = stats.latency
+        summary = {
+            'total_requests': stats.requests,
+            'total_errors': stats.errors,
+            'avg_response_time': latency.mean or 0.0,
+            'min_response_time': latency.min if latency.count else None,
+            'max_response_time': latency.max,
+            'last_request': datetime.utcfromtimestamp(stats.last_request) if stats.last_request else None,
+        }
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}_response_time"] = latency.quantile(q)
+        return summary
+
+    def render_prometheus(self, prefix: str = 'api') -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        series, status_codes, _ = self.snapshot()
+        ordered = sorted(series.items())
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Request latency by endpoint and status class",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for key, stats in ordered:
+            labels = _labels(key)
+            counts = stats.latency.counts
+            cumulative = 0
+            position = 0
+            for i in EXPORT_BUCKETS:
+                while position <= i:
+                    cumulative += counts[position]
+                    position += 1
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{BUCKET_BOUNDS[i]:.6g}"}} {cumulative}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {stats.latency.total:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {stats.latency.count}')
+
+        lines.append(f"# HELP {prefix}_request_duration_quantile_seconds Estimated latency quantiles since start")
+        lines.append(f"# TYPE {prefix}_request_duration_quantile_seconds gauge")
+        for key, stats in ordered:
+            labels = _labels(key)
+            for q in QUANTILES:
+                value = stats.latency.quantile(q)
+                if value is not None:
+                    lines.append(f'{prefix}_request_duration_quantile_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+
+        lines.append(f"# HELP {prefix}_requests_total Requests by endpoint and status class")
+        lines.append(f"# TYPE {prefix}_requests_total counter")
+        for key, stats in ordered:
+            lines.append(f'{prefix}_requests_total{{{_labels(key)}}} {stats.requests}')
+
+        lines.append(f"# HELP {prefix}_request_errors_total Failed requests (status >= 400 or exception)")
+        lines.append(f"# TYPE {prefix}_request_errors_total counter")
+        for key, stats in ordered:
+            lines.append(f'{prefix}_request_errors_total{{{_labels(key)}}} {stats.errors}')
+
+        lines.append(f"# HELP {prefix}_responses_total Responses by status code")
+        lines.append(f"# TYPE {prefix}_responses_total counter")
+        for code in sorted(status_codes):
+            lines.append(f'{prefix}_responses_total{{code="{code}"}} {status_codes[code]}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        """Drop all metrics; threads start new shards on their next observe()"""
+        with self._lock:
+            self._generation += 1
+            self._shards = []
+            self._retired = _Shard(None, self._generation)
+            self._retire_at = SHARD_RETIRE_THRESHOLD
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key: SeriesKey) -> str:
+    method, endpoint, status = key
+    return f'method="{_escape(method)}",endpoint="{_escape(endpoint)}",status="{status}"'
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_request_metrics: Optional[RequestMetrics] = None
+_request_metrics_lock = threading.Lock()
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get the process-wide request metrics."""
+    global _request_metrics
+    if _request_metrics is None:
+        with _request_metrics_lock:
+            if _request_metrics is None:
+                _request_metrics = RequestMetrics()
+    return _request_metrics
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+SQLite Bulk Writer
+
+Writes many rows through one connection and one transaction, using
+executemany upserts (INSERT ... ON CONFLICT DO UPDATE) in batches. Every
+batch runs inside a savepoint: when a batch fails, it is rolled back and its
+rows are retried one at a time, so a single bad row is reported without
+aborting the rest of the write. Rows that changed nothing (an existing row
+excluded by update_where) are counted as skipped, not written.
+"""
+
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_TIMEOUT = 30.0
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of a bulk write"""
+    total_rows: int = 0
+    written: int = 0
+    skipped: int = 0  # Rows that changed nothing, e.g. existing rows excluded by update_where
+    failed: int = 0
+    batches: int = 0
+    errors: List[Tuple[Any, str]] = field(default_factory=list)  # (row key, error)
+
+    def add_failure(self, key: Any, error: Any):
+        self.failed += 1
+        self.errors.append((key, str(error)))
+
+
+class SQLiteBulkWriter:
+    """
+    Batched, transactional upsert writer for a SQLite database.
+
+    Args:
+        db_path: Path of the SQLite database
+        batch_size: Rows per executemany call / savepoint
+        wal: Switch the database to WAL journaling (persistent per database)
+        timeout: Seconds to wait for a database lock
+    """
+
+    def __init__(self, db_path: str, batch_size: int = DEFAULT_BATCH_SIZE, wal: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.db_path = db_path
+        self.batch_size = max(1, int(batch_size))
+        self.wal = wal
+        self.timeout = timeout
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection in manual transaction mode with the write pragmas applied"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        if self.wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def ensure_unique_index(self, table: str, columns: Sequence[str], index_name: str,
+                            where: Optional[str] = None) -> bool:
+        """
+        Create the unique index an upsert's conflict target needs.
+
+        Returns False when it cannot be created, e.g. because the table already
+        holds duplicate keys.
+        """
+        sql = f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table} ({', '.join(columns)})"
+        if where:
+            sql += f" WHERE {where}"
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+            try:
+                conn.execute(sql)
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Could not create unique index {index_name} on {table}: {e}")
+            return False
+
+    def upsert(self, table: str, columns: Sequence[str], items: Iterable[Tuple[Any, Any]],
+               build_row: Callable[[Any, Any], Sequence[Any]], conflict_columns: Sequence[str],
+               update_columns: Optional[Sequence[str]] = None,
+               update_expressions: Optional[Dict[str, str]] = None,
+               conflict_where: Optional[str] = None, update_where: Optional[str] = None,
+               use_on_conflict: bool = True) -> BulkWriteResult:
+        """
+        Insert or update rows keyed on ``conflict_columns``.
+
+        Args:
+            table: Target table
+            columns: Columns supplied by build_row, in order
+            items: (key, item) pairs; the key identifies the row in error reports
+            build_row: Turns an item into the column values; exceptions count as row failures
+            conflict_columns: Columns of the unique index the upsert targets
+            update_columns: Columns overwritten on conflict (default: all other columns)
+            update_expressions: Extra SQL assignments on conflict, e.g. {'updated_at': 'CURRENT_TIMESTAMP'}
+            conflict_where: WHERE clause of a partial unique index
+            update_where: Only update existing rows matching this condition; others are left as they are
+            use_on_conflict: False when no unique index exists; an UPDATE and an
+                INSERT ... WHERE NOT EXISTS are run instead
+
+        Returns:
+            BulkWriteResult with per-row failures
+        """
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in conflict_columns]
+        statements = self._build_statements(table, list(columns), list(conflict_columns),
+                                            list(update_columns), update_expressions or {},
+                                            conflict_where, update_where, use_on_conflict)
+
+        result = BulkWriteResult()
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            batch: List[Tuple[Any, Sequence[Any]]] = []
+            for key, item in items:
+                result.total_rows += 1
+                try:
+                    batch.append((key, tuple(build_row(key, item))))
+                except Exception as e:
+                    result.add_failure(key, e)
+                    continue
+                if len(batch) >= self.batch_size:
+                    self._write_batch(conn, statements, batch, result)
+                    batch = []
+            if batch:
+                self._write_batch(conn, statements, batch, result)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if result.failed:
+            logger.warning(f"Bulk write to {table}: {result.failed}/{result.total_rows} rows failed")
+        return result
+
+    def delete(self, table: str, key_columns: Sequence[str], keys: Iterable[Sequence[Any]]) -> int:
+        """Delete rows matching each key tuple in one transaction; returns the number deleted"""
+        where = ' AND '.join(f"{c} = ?" for c in key_columns)
+        rows = [tuple(k) for k in keys]
+        if not rows:
+            return 0
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            for start in range(0, len(rows), self.batch_size):
+                conn.executemany(f"DELETE FROM {table} WHERE {where}", rows[start:start + self.batch_size])
+            deleted = conn.total_changes - before
+            conn.execute("COMMIT")
+            return deleted
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _build_statements(table: str, columns: List[str], conflict_columns: List[str],
+                          update_columns: List[str], update_expressions: Dict[str, str],
+                          conflict_where: Optional[str], update_where: Optional[str], use_on_conflict: bool
+                          ) -> List[Tuple[str, Callable[[Sequence[Any]], Sequence[Any]]]]:
+        """SQL statements run for each batch, with a mapper from row values to their parameters"""
+        column_list = ', '.join(columns)
+        placeholders = ', '.join('?' for _ in columns)
+
+        if use_on_conflict:
+            assignments = [f"{c} = excluded.{c}" for c in update_columns]
+            assignments += [f"{c} = {expr}" for c, expr in update_expressions.items()]
+            target = f"({', '.join(conflict_columns)})"
+            if conflict_where:
+                target += f" WHERE {conflict_where}"
+            action = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+            if assignments and update_where:
+                action += f" WHERE {update_where}"
+            sql = f"INSERT INTO {table} ({column_list}) VALUES ({placeholders}) ON CONFLICT{target} {action}"
+            return [(sql, lambda row: row)]
+
+        index = {c: i for i, c in enumerate(columns)}
+        key_idx = [index[c] for c in conflict_columns]
+        upd_idx = [index[c] for c in update_columns]
+        key_match = ' AND '.join(f"{c} = ?" for c in conflict_columns)
+        statements = []
+
+        assignments = [f"{c} = ?" for c in update_columns]
+        assignments += [f"{c} = {expr}" for c, expr in update_expressions.items()]
+        if assignments:
+            update_sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE {key_match}"
+            if update_where:
+                update_sql += f" AND ({update_where})"
+            statements.append((update_sql, lambda row: [row[i] for i in upd_idx] + [row[i] for i in key_idx]))
+
+        insert_sql = (f"INSERT INTO {table} ({column_list}) SELECT {placeholders} "
+                      f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {key_match})")
+        statements.append((insert_sql, lambda row: list(row) + [row[i] for i in key_idx]))
+        return statements
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, statements, batch: List[Tuple[Any, Sequence[Any]]],
+                     result: BulkWriteResult):
+        """Write one batch under a savepoint, falling back to row-by-row on failure"""
+        result.batches += 1
+        conn.execute("SAVEPOINT bulk_batch")
+        try:
+            # Row counts of the statements themselves; trigger changes are not included
+            changed = sum(conn.executemany(sql, [params(row) for _, row in batch]).rowcount
+                          for sql, params in statements)
+            conn.execute("RELEASE SAVEPOINT bulk_batch")
+            result.written += changed
+            result.skipped += len(batch) - changed
+            return
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+            conn.execute("RELEASE SAVEPOINT bulk_batch")
+            logger.debug(f"Batch of {len(batch)} rows failed ({e}), retrying row by row")
+
+        for key, row in batch:
+            conn.execute("SAVEPOINT bulk_row")
+            try:
+                changed = sum(conn.execute(sql, params(row)).rowcount for sql, params in statements)
+                conn.execute("RELEASE SAVEPOINT bulk_row")
+                if changed:
+                    result.written += 1
+                else:
+                    result.skipped += 1
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                conn.execute("RELEASE SAVEPOINT bulk_row")
+                result.add_failure(key, e)
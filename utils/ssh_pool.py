@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+DNOS SSH Session Pool
+
+Process-wide pool of persistent DNOSSSH sessions keyed by device and
+credentials. Callers borrow a session, run their commands and hand it back,
+so the SSH handshake and the invoke_shell banner wait are paid once per
+device instead of once per caller.
+"""
+
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from core.exceptions import ConnectionError, TimeoutError
+from utils.dnos_ssh import DNOSSSH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS_PER_DEVICE = 2
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_ACQUIRE_TIMEOUT = 120.0
+DEFAULT_CONNECT_ATTEMPTS = 2
+
+SessionKey = Tuple[str, int, str, str]  # (hostname, port, username, credential fingerprint)
+
+
+def _credential_fingerprint(password: Optional[str], key_filename: Optional[str]) -> str:
+    """Digest of the secrets a session was opened with; the secrets themselves never appear in keys"""
+    material = f"{password or ''}\0{key_filename or ''}".encode('utf-8')
+    return hashlib.blake2b(material, digest_size=16).hexdigest()
+
+
+class PooledSession:
+    """
+    A DNOSSSH session borrowed from the pool.
+
+    Attribute access is delegated to the underlying DNOSSSH instance, so a
+    lease can be used wherever a connected DNOSSSH is expected. Calling
+    close() (or leaving the ``with`` block) returns the session to the pool
+    instead of tearing down the connection.
+    """
+
+    def __init__(self, pool: 'SSHSessionPool', key: SessionKey, ssh: DNOSSSH):
+        self._pool = pool
+        self._key = key
+        self._ssh = ssh
+        self._released = False
+        self._broken = False
+
+    @property
+    def connection(self) -> DNOSSSH:
+        """The underlying DNOSSSH instance."""
+        return self._ssh
+
+    def invalidate(self):
+        """Mark the session as unusable so it is closed instead of reused."""
+        self._broken = True
+
+    def close(self):
+        """Return the session to the pool."""
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._key, self._ssh, discard=self._broken)
+
+    # Pooled sessions are handed back, never disconnected by the borrower
+    disconnect = close
+    release = close
+
+    def __getattr__(self, name):
+        return getattr(self._ssh, name)
+
+    def __enter__(self) -> 'PooledSession':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self._broken = True
+        self.close()
+        return False
+
+
+class _DeviceSlot:
+    """Idle sessions and concurrency limit for a single device."""
+
+    def __init__(self, max_sessions: int):
+        self.semaphore = threading.BoundedSemaphore(max_sessions)
+        self.idle: List[Tuple[DNOSSSH, float]] = []
+        self.lock = threading.Lock()
+
+
+class SSHSessionPool:
+    """
+    Thread-safe pool of DNOSSSH sessions keyed by (hostname, port, username)
+    and a fingerprint of the password/key, so sessions opened with one set of
+    credentials are never handed to a caller presenting another.
+
+    - At most ``max_sessions_per_device`` sessions are borrowed per device at
+      any time; further borrowers wait up to ``acquire_timeout`` seconds.
+    - Idle sessions older than ``idle_timeout`` seconds are closed.
+    - Sessions are health-checked before being handed out and reconnected
+      transparently when the transport has gone away.
+    - Sessions that entered configuration mode are returned to the
+      operational prompt, with uncommitted changes discarded, before they
+      are reused; if that fails they are closed instead.
+    """
+
+    def __init__(self, max_sessions_per_device: int = DEFAULT_MAX_SESSIONS_PER_DEVICE,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+                 connect_attempts: int = DEFAULT_CONNECT_ATTEMPTS):
+        self.max_sessions_per_device = max_sessions_per_device
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.connect_attempts = max(1, connect_attempts)
+
+        self._slots: Dict[SessionKey, _DeviceSlot] = {}
+        self._lock = threading.Lock()
+        self._last_reap = time.monotonic()
+
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'evicted': 0,
+            'reconnected': 0,
+            'failed': 0,
+            'reset': 0
+        }
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+    
+    def _get_slot(self, key: SessionKey) -> _DeviceSlot:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = _DeviceSlot(self.max_sessions_per_device)
+                self._slots[key] = slot
+            return slot
+
+    def acquire(self, hostname: str, username: str, password: str, port: int = 22,
+                key_filename: Optional[str] = None, timeout: Optional[float] = None,
+                connect_timeout: Optional[float] = None) -> PooledSession:
+        """
+        Borrow a connected session for a device.
+
+        Args:
+            hostname: Device hostname or management IP
+            username: SSH username
+            password: SSH password
+            port: SSH port (default: 22)
+            key_filename: Optional private key file
+            timeout: Seconds to wait for a free slot (default: pool acquire_timeout)
+            connect_timeout: TCP connect timeout for a new session (default: none)
+
+        Returns:
+            PooledSession: Borrowed session; call close() to return it
+
+        Raises:
+            TimeoutError: If the per-device concurrency limit stays exhausted
+            ConnectionError: If no healthy session could be established
+        """
+        key = (hostname, int(port), username, _credential_fingerprint(password, key_filename))
+        slot = self._get_slot(key)
+        wait = self.acquire_timeout if timeout is None else timeout
+
+        if not slot.semaphore.acquire(timeout=wait):
+            raise TimeoutError(f"SSH session for {hostname}", wait)
+
+        try:
+            self._maybe_reap()
+            ssh = self._take_idle(slot)
+            if ssh is not None:
+                self._count('reused')
+            else:
+                ssh = self._open(hostname, username, password, port, key_filename, connect_timeout)
+            return PooledSession(self, key, ssh)
+        except Exception:
+            slot.semaphore.release()
+            raise
+
+    @contextmanager
+    def session(self, hostname: str, username: str, password: str, port: int = 22,
+                key_filename: Optional[str] = None, timeout: Optional[float] = None,
+                connect_timeout: Optional[float] = None):
+        """Context manager wrapper around acquire()."""
+        lease = self.acquire(hostname, username, password, port=port, key_filename=key_filename,
+                             timeout=timeout, connect_timeout=connect_timeout)
+        with lease:
+            yield lease
+
+    def _take_idle(self, slot: _DeviceSlot) -> Optional[DNOSSSH]:
+        """Pop the most recently used healthy idle session, closing dead or stale ones."""
+        now = time.monotonic()
+        while True:
+            with slot.lock:
+                if not slot.idle:
+                    return None
+                ssh, last_used = slot.idle.pop()
+
+            if now - last_used > self.idle_timeout:
+                self._count('evicted')
+                self._close(ssh)
+                continue
+            if not ssh.is_alive():
+                self._count('reconnected')
+                self._close(ssh)
+                continue
+            return ssh
+
+    def _open(self, hostname: str, username: str, password: str, port: int,
+              key_filename: Optional[str], connect_timeout: Optional[float] = None) -> DNOSSSH:
+        last_error = None
+        for attempt in range(1, self.connect_attempts + 1):
+            ssh = DNOSSSH(hostname=hostname, username=username, password=password,
+                          port=port, key_filename=key_filename)
+            try:
+                if ssh.connect(timeout=connect_timeout):
+                    self._count('created')
+                    return ssh
+            except Exception as e:
+                last_error = e
+            self._close(ssh)
+            logger.debug(f"Connect attempt {attempt}/{self.connect_attempts} to {hostname} failed")
+
+        self._count('failed')
+        raise ConnectionError(hostname, {'port': port, 'username': username},
+                              original_exception=last_error)
+
+    def _release(self, key: SessionKey, ssh: DNOSSSH, discard: bool = False):
+        slot = self._get_slot(key)
+        try:
+            if discard or not ssh.is_alive() or not self._reset(ssh):
+                self._close(ssh)
+            else:
+                with slot.lock:
+                    slot.idle.append((ssh, time.monotonic()))
+        finally:
+            slot.semaphore.release()
+
+    def _reset(self, ssh: DNOSSSH) -> bool:
+        """
+        Bring a session that entered configuration mode back to the
+        operational prompt, discarding uncommitted changes, so the next
+        borrower never inherits someone else's candidate configuration.
+        
+        Returns:
+            bool: False if the session must be closed instead of reused
+        """
+        if not ssh.config_mode_entered:
+            return True
+        try:
+            if ssh.reset_cli_state():
+                self._count('reset')
+                return True
+        except Exception as e:
+            logger.debug(f"Could not reset CLI state of {ssh.hostname}: {e}")
+        logger.warning(f"Closing SSH session to {ssh.hostname}: still in configuration mode")
+        return False
+    
+    def _maybe_reap(self):
+        """Run idle eviction at most once every half idle_timeout."""
+        now = time.monotonic()
+        if now - self._last_reap < self.idle_timeout / 2:
+            return
+        self._last_reap = now
+        self.evict_idle()
+
+    def evict_idle(self) -> int:
+        """
+        Close idle sessions that exceeded the idle timeout.
+
+        Returns:
+            int: Number of sessions closed
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            slots = list(self._slots.values())
+        for slot in slots:
+            with slot.lock:
+                keep = []
+                for ssh, last_used in slot.idle:
+                    if now - last_used > self.idle_timeout:
+                        expired.append(ssh)
+                    else:
+                        keep.append((ssh, last_used))
+                slot.idle = keep
+
+        for ssh in expired:
+            self._close(ssh)
+        self._count('evicted', len(expired))
+        return len(expired)
+
+    def close_all(self):
+        """Close every idle session. Borrowed sessions are closed when returned."""
+        with self._lock:
+            slots = list(self._slots.values())
+        for slot in slots:
+            with slot.lock:
+                idle, slot.idle = slot.idle, []
+            for ssh, _ in idle:
+                self._close(ssh)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return pool counters plus the current number of idle sessions."""
+        with self._lock:
+            slots = list(self._slots.values())
+            stats = dict(self.stats)
+        stats['idle'] = sum(len(slot.idle) for slot in slots)
+        stats['devices'] = len(slots)
+        return stats
+
+    @staticmethod
+    def _close(ssh: DNOSSSH):
+        try:
+            ssh.disconnect()
+        except Exception as e:
+            logger.debug(f"Error closing SSH session to {ssh.hostname}: {e}")
+
+
+_session_pool: Optional[SSHSessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SSHSessionPool:
+    """Get the process-wide SSH session pool."""
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = SSHSessionPool()
+                atexit.register(_session_pool.close_all)
+    return _session_pool